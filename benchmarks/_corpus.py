@@ -0,0 +1,72 @@
+"""Shared inputs for the benchmark scripts."""
+import os
+import yaml
+
+SPEC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "openapi_specs")
+
+
+def corpus_files():
+    """Returns the paths of every spec shipped in openapi_specs/."""
+    return sorted(
+        os.path.join(SPEC_DIR, name)
+        for name in os.listdir(SPEC_DIR)
+        if name.endswith((".yml", ".yaml"))
+    )
+
+
+def load_corpus():
+    """Loads every shipped spec as a raw dictionary, keyed by file name."""
+    documents = {}
+    for path in corpus_files():
+        with open(path, "r", encoding="utf-8") as f:
+            documents[os.path.basename(path)] = yaml.safe_load(f)
+    return documents
+
+
+def synthetic_spec(n_paths, n_schemas=200):
+    """Builds a large but realistic document with `n_paths` path items."""
+    schemas = {
+        f"Model{i}": {
+            "type": "object",
+            "required": ["id"],
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string", "maxLength": 64},
+                "kind": {"type": "string", "enum": ["a", "b", "c"]},
+                "parent": {"$ref": f"#/components/schemas/Model{(i + 1) % n_schemas}"},
+            },
+        }
+        for i in range(n_schemas)
+    }
+    paths = {}
+    for i in range(n_paths):
+        model = f"#/components/schemas/Model{i % n_schemas}"
+        paths[f"/resource{i}/{{itemId}}"] = {
+            "parameters": [{"name": "itemId", "in": "path", "required": True, "schema": {"type": "integer"}}],
+            "get": {
+                "operationId": f"getResource{i}",
+                "tags": [f"team{i % 10}"],
+                "parameters": [{"name": "verbose", "in": "query", "schema": {"type": "boolean"}}],
+                "responses": {
+                    "200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": model}}}},
+                    "404": {"description": "Not found"},
+                },
+            },
+            "put": {
+                "operationId": f"putResource{i}",
+                "tags": [f"team{i % 10}"],
+                "requestBody": {"required": True, "content": {"application/json": {"schema": {"$ref": model}}}},
+                "responses": {"204": {"description": "Updated"}},
+            },
+        }
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Synthetic", "version": "1.0.0"},
+        "servers": [{"url": "https://{env}.example.com/v1", "variables": {"env": {"default": "api", "enum": ["api", "staging"]}}}],
+        "paths": paths,
+        "components": {
+            "schemas": schemas,
+            "securitySchemes": {"apiKeyAuth": {"type": "apiKey", "in": "header", "name": "X-API-KEY"}},
+        },
+        "security": [{"apiKeyAuth": []}],
+    }
@@ -0,0 +1,27 @@
+"""Measures bundling and dereferencing, cold and served from the cache.
+
+    python -m benchmarks.bench_bundler [N_PATHS]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.bundler import bundle, clear_cache, dereference
+
+
+def timed(function, document):
+    start = time.perf_counter()
+    function(document)
+    return time.perf_counter() - start
+
+
+def main(n_paths=10_000):
+    document = synthetic_spec(n_paths)
+    for function in (bundle, dereference):
+        clear_cache()
+        cold = timed(function, document)
+        cached = timed(function, document)
+        print(f"{function.__name__:<12} cold {cold:.3f}s  cached {cached:.3f}s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
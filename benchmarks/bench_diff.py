@@ -0,0 +1,36 @@
+"""Times `diff_specs` on a 100k-path document with a handful of changes.
+
+    python -m benchmarks.bench_diff [N_PATHS]
+"""
+import copy
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.diff import diff_specs
+
+
+def main(n_paths=100_000):
+    old = synthetic_spec(n_paths)
+    new = copy.deepcopy(old)
+    # One path removed, one required parameter added, one component narrowed
+    del new["paths"]["/resource0/{itemId}"]
+    new["paths"]["/resource1/{itemId}"]["get"]["parameters"].append(
+        {"name": "page", "in": "query", "required": True, "schema": {"type": "integer"}}
+    )
+    new["components"]["schemas"]["Model7"]["properties"]["kind"]["enum"] = ["a", "b"]
+
+    same = copy.deepcopy(old)
+    start = time.perf_counter()
+    report = diff_specs(old, same)
+    unchanged = time.perf_counter() - start
+    print(f"{n_paths} paths, identical:  {unchanged:.2f}s, {len(report.changes)} changes")
+
+    start = time.perf_counter()
+    report = diff_specs(old, new)
+    changed = time.perf_counter() - start
+    summary = report.to_dict()["summary"]
+    print(f"{n_paths} paths, modified:   {changed:.2f}s, {summary}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,54 @@
+"""Compares discriminator dispatch with ordered trial on a 50-branch oneOf.
+
+    python -m benchmarks.bench_discriminator [N_BRANCHES]
+"""
+import sys
+import time
+from openapi_parser.validator import SchemaValidator
+
+
+def union_spec(n_branches):
+    schemas = {
+        f"Event{i}": {
+            "type": "object",
+            "required": ["kind", "id", f"field{i}"],
+            "properties": {
+                "kind": {"const": f"Event{i}"},
+                "id": {"type": "integer", "minimum": 0},
+                f"field{i}": {"type": "string", "maxLength": 32},
+                "tags": {"type": "array", "items": {"type": "string"}},
+            },
+        }
+        for i in range(n_branches)
+    }
+    schemas["Event"] = {
+        "oneOf": [{"$ref": f"#/components/schemas/Event{i}"} for i in range(n_branches)],
+        "discriminator": {"propertyName": "kind"},
+    }
+    return {"openapi": "3.1.0", "info": {"title": "Events", "version": "1"}, "paths": {}, "components": {"schemas": schemas}}
+
+
+def run(validator, payloads):
+    schema = validator.schema("Event")
+    start = time.perf_counter()
+    for payload in payloads:
+        if not validator.is_valid(payload, schema):
+            raise AssertionError(payload)
+    return time.perf_counter() - start
+
+
+def main(n_branches=50):
+    document = union_spec(n_branches)
+    payloads = [
+        {"kind": f"Event{i % n_branches}", "id": i, f"field{i % n_branches}": "x", "tags": ["a", "b"]}
+        for i in range(10_000)
+    ]
+    dispatched = run(SchemaValidator(document), payloads)
+    trial = run(SchemaValidator(document, use_discriminators=False), payloads)
+    print(f"{n_branches} branches, {len(payloads)} payloads")
+    print(f"dispatch table  {dispatched:.3f}s  ({dispatched / len(payloads) * 1e6:.1f}us/payload)")
+    print(f"ordered trial   {trial:.3f}s  ({trial / len(payloads) * 1e6:.1f}us/payload, {trial / dispatched:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+"""Compares peak memory and time of the text-mode and byte/mmap file loaders.
+
+    python -m benchmarks.bench_file_loading [N_PATHS]
+
+Peak memory is the tracemalloc peak of Python heap allocations; pages of a
+memory-mapped file belong to the OS page cache and are not counted.
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import yaml
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.parser import load_openapi_from_file, load_openapi_from_json, load_openapi_from_yaml
+
+
+def text_mode(path):
+    # The previous implementation: decode the whole file into a str first
+    with open(path, "r", encoding="utf-8") as file:
+        content = file.read()
+    if path.endswith(".json"):
+        return load_openapi_from_json(content)
+    return load_openapi_from_yaml(content)
+
+
+def measure(function, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(n_paths=2_000):
+    document = synthetic_spec(n_paths)
+    with tempfile.TemporaryDirectory() as directory:
+        files = {
+            "spec.json": json.dumps(document, indent=2),
+            "spec.yaml": yaml.safe_dump(document, sort_keys=False),
+        }
+        for name, text in files.items():
+            path = os.path.join(directory, name)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(text)
+            size = os.path.getsize(path) / 2**20
+            for label, function, kwargs in (
+                ("text mode", text_mode, {}),
+                ("bytes", load_openapi_from_file, {"mmap_threshold": 2**40}),
+                ("mmap", load_openapi_from_file, {"mmap_threshold": 0}),
+            ):
+                elapsed, peak = measure(function, path, **kwargs)
+                print(f"{name} ({size:.1f} MiB)  {label:<10} {elapsed:7.3f}s  peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
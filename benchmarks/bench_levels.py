@@ -0,0 +1,33 @@
+"""Measures the cost of each validation level of `parse_openapi`.
+
+    python -m benchmarks.bench_levels
+"""
+import time
+from benchmarks._corpus import load_corpus, synthetic_spec
+from openapi_parser.parser import ValidationLevel, parse_openapi
+
+
+def timed(content, level, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        parse_openapi(content, level=level)
+    return (time.perf_counter() - start) / repeat
+
+
+def report(label, content, repeat):
+    timings = {level: timed(content, level, repeat) for level in ValidationLevel}
+    standard = timings[ValidationLevel.STANDARD]
+    print(f"{label:<36}" + "".join(
+        f"  {level.value} {timing * 1000:8.2f}ms ({timing / standard:4.2f}x)" for level, timing in timings.items()
+    ))
+
+
+def main():
+    for name, content in load_corpus().items():
+        report(name, content, repeat=50)
+    report("synthetic (10000 paths, 200 schemas)", synthetic_spec(10_000), repeat=3)
+    report("synthetic (100 paths, 2000 schemas)", synthetic_spec(100, n_schemas=2000), repeat=10)
+
+
+if __name__ == "__main__":
+    main()
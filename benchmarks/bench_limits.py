@@ -0,0 +1,37 @@
+"""Measures the cost of resource limits on ordinary specs and how fast hostile ones are rejected.
+
+    python -m benchmarks.bench_limits [REPEATS]
+"""
+import sys
+import time
+from benchmarks._corpus import corpus_files
+from openapi_parser.exceptions import ResourceLimitError
+from openapi_parser.parser import load_openapi_from_yaml
+
+HOSTILE = {
+    "billion laughs": 'openapi: "3.1.0"\nx: &a [lol, lol, lol, lol, lol, lol, lol, lol, lol, lol]\n' + "".join(
+        f"x{i}: &a{i} [{', '.join(['*a' if i == 0 else f'*a{i - 1}'] * 10)}]\n" for i in range(9)
+    ),
+    "100k-deep nesting": "x: " + "[" * 100_000 + "]" * 100_000 + "\n",
+}
+
+
+def main(repeats=20):
+    contents = [open(path, "rb").read() for path in corpus_files()]
+    for label, limits in (("without limits", None), ("with limits", "default")):
+        options = {} if limits == "default" else {"limits": None}
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for content in contents:
+                load_openapi_from_yaml(content, **options)
+        print(f"corpus x{repeats} {label:<15} {time.perf_counter() - start:.3f}s")
+    for label, content in HOSTILE.items():
+        start = time.perf_counter()
+        try:
+            load_openapi_from_yaml(content)
+        except ResourceLimitError as error:
+            print(f"{label}: rejected ({error.limit}) in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
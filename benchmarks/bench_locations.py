@@ -0,0 +1,62 @@
+"""Measures the cost of source locations against the default loaders.
+
+    python -m benchmarks.bench_locations [N_PATHS]
+
+The eager readers (`load_yaml_with_locations`, `load_json_with_locations`)
+are pure Python and compared with libyaml's C loader and `json.loads`.  The
+parser's loaders only run them when an error needs a position, so a valid
+document pays nothing for ``track_locations=True``.
+"""
+import json
+import sys
+import time
+import yaml
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.exceptions import ParsingError
+from openapi_parser.locations import load_json_with_locations, load_yaml_with_locations, scan_yaml_locations
+from openapi_parser.parser import load_openapi_from_json, load_openapi_from_yaml
+
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def best_of(function, argument, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            function(argument)
+        except ParsingError:
+            pass
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(n_paths=2_000):
+    document = synthetic_spec(n_paths)
+    yaml_text = yaml.safe_dump(document, sort_keys=False)
+    json_text = json.dumps(document, indent=2)
+    print(f"{n_paths} paths: {len(yaml_text.splitlines())} YAML lines, {len(json_text) // 1024} KiB JSON")
+
+    plain = best_of(lambda text: yaml.load(text, Loader=_SafeLoader), yaml_text)
+    located = best_of(load_yaml_with_locations, yaml_text)
+    print(f"YAML  {_SafeLoader.__name__} {plain:.3f}s  eager locations {located:.3f}s  ({located / plain:.1f}x)")
+    scanned = best_of(scan_yaml_locations, yaml_text)
+    print(f"YAML  scan_yaml_locations (used on errors) {scanned:.3f}s")
+    plain = best_of(json.loads, json_text)
+    located = best_of(load_json_with_locations, json_text)
+    print(f"JSON  json.loads {plain:.3f}s  eager locations {located:.3f}s  ({located / plain:.1f}x)")
+
+    invalid = {**document, "info": {"title": "No version"}}
+    inputs = (
+        ("YAML", load_openapi_from_yaml, yaml_text, yaml.safe_dump(invalid, sort_keys=False)),
+        ("JSON", load_openapi_from_json, json_text, json.dumps(invalid, indent=2)),
+    )
+    for label, load, valid_text, invalid_text in inputs:
+        for state, text in (("valid", valid_text), ("invalid", invalid_text)):
+            plain = best_of(load, text)
+            located = best_of(lambda text: load(text, track_locations=True), text)
+            print(f"{label}  load_openapi {state:<7} {plain:.3f}s  track_locations {located:.3f}s  ({located / plain:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000)
@@ -0,0 +1,29 @@
+"""Times a full memory breakdown of a parsed spec, as a debug endpoint would run it.
+
+    python -m benchmarks.bench_memory [N_PATHS]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.memory import measure
+from openapi_parser.parser import parse_openapi
+
+
+def main(n_paths=2_000):
+    document = synthetic_spec(n_paths)
+    start = time.perf_counter()
+    model = parse_openapi(document)
+    parsing = time.perf_counter() - start
+    start = time.perf_counter()
+    report = measure(document, model)
+    measuring = time.perf_counter() - start
+    print(f"{n_paths} paths, {report.objects} objects, {report.total / 2**20:.1f} MiB "
+          f"(raw {report.raw / 2**20:.1f} MiB, model {report.model / 2**20:.1f} MiB)")
+    print(f"parse    {parsing:.3f}s")
+    print(f"measure  {measuring:.3f}s ({report.objects / measuring / 1e6:.1f}M objects/s)")
+    for pointer, size in report.top(3):
+        print(f"  {pointer}: {size / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
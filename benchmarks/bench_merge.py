@@ -0,0 +1,44 @@
+"""Merges the bundled corpus replicated N times into one gateway spec.
+
+    python -m benchmarks.bench_merge [REPLICAS]
+
+Each replica gets its own path prefix, so paths stay distinct while every
+component and operationId collides with the first copy: components are
+deduplicated by fingerprint, and every fifth replica changes its error schema
+to force namespacing and reference rewriting.
+"""
+import sys
+import time
+from benchmarks._corpus import load_corpus
+from openapi_parser.merge import merge_specs
+
+
+def replicate(corpus, replicas):
+    specs = {}
+    for index in range(replicas):
+        for name, document in corpus.items():
+            copy = dict(document)
+            copy["paths"] = {f"/r{index}{path}": item for path, item in document["paths"].items()}
+            if index % 5 == 4 and "components" in document:
+                schemas = dict(document["components"].get("schemas") or {})
+                for schema_name in list(schemas):
+                    if "Error" in schema_name:
+                        schemas[schema_name] = {**schemas[schema_name], "description": f"replica {index}"}
+                copy["components"] = {**document["components"], "schemas": schemas}
+            specs[f"{name}-{index}"] = copy
+    return specs
+
+
+def main(replicas=100):
+    corpus = load_corpus()
+    specs = replicate(corpus, replicas)
+    start = time.perf_counter()
+    merged, report = merge_specs(specs)
+    elapsed = time.perf_counter() - start
+    print(f"{len(specs)} specs merged in {elapsed:.2f}s: {len(merged['paths'])} paths, "
+          f"{sum(len(section) for section in merged['components'].values())} components")
+    print(f"{len(report.deduplicated)} deduplicated, {len(report.renamed)} renamed, {len(report.collisions)} collisions")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,66 @@
+"""Measures the request-path overhead of sampled response validation.
+
+    python -m benchmarks.bench_middleware [N_REQUESTS] [SAMPLE_RATE]
+"""
+import asyncio
+import json
+import sys
+import time
+from openapi_parser.middleware import ResponseValidationMiddleware
+
+DOCUMENT = {
+    "openapi": "3.1.0",
+    "paths": {
+        "/orders/{orderId}": {"get": {"responses": {"200": {"description": "OK", "content": {"application/json": {"schema": {
+            "type": "object",
+            "required": ["id", "lines"],
+            "properties": {
+                "id": {"type": "integer"},
+                "lines": {"type": "array", "items": {"type": "object", "properties": {"sku": {"type": "string"}, "quantity": {"type": "integer"}}}},
+            },
+        }}}}}}},
+    },
+}
+BODY = json.dumps({"id": 1, "lines": [{"sku": f"sku-{i}", "quantity": i} for i in range(50)]}).encode()
+
+
+async def service(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": BODY})
+
+
+async def serve(app, n_requests):
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "GET", "path": "/orders/1", "headers": []}
+    for _ in range(n_requests):
+        await app(scope, receive, send)
+
+
+def timed(app, n_requests):
+    start = time.perf_counter()
+    asyncio.run(serve(app, n_requests))
+    return time.perf_counter() - start
+
+
+def main(n_requests=20_000, sample_rate=0.01):
+    baseline = timed(service, n_requests)
+    for rate in (float(sample_rate), 1.0):
+        app = ResponseValidationMiddleware(service, DOCUMENT, sample_rate=rate, cpu_budget=0.05, seed=0)
+        elapsed = timed(app, n_requests)
+        app.drain()
+        metrics = app.metrics()
+        print(
+            f"rate {rate:<5g} {elapsed:.3f}s vs {baseline:.3f}s unwrapped "
+            f"(+{(elapsed - baseline) / n_requests * 1e6:.1f}us/request), "
+            f"validated {metrics['validated']}, dropped {metrics['dropped']}, scale {metrics['scale']:g}"
+        )
+        app.close()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) if i == 0 else float(arg) for i, arg in enumerate(sys.argv[1:])))
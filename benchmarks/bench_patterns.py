@@ -0,0 +1,41 @@
+"""Compares validating against precompiled patterns with translating and compiling them per use.
+
+    python -m benchmarks.bench_patterns [N_PATTERNS] [ROUNDS]
+
+Python's own `re` cache holds 512 expressions, so specs with more distinct
+patterns than that recompile on every use without a cache of their own.
+"""
+import re
+import sys
+import time
+from openapi_parser.patterns import PatternCache, precompile, translate
+
+
+def main(n_patterns=2_000, rounds=10):
+    document = {"components": {"schemas": {
+        f"Code{i}": {"type": "string", "pattern": f"^[A-Z]{{2}}-{i}-\\d{{1,4}}$"} for i in range(n_patterns)
+    }}}
+    expressions = [schema["pattern"] for schema in document["components"]["schemas"].values()]
+    values = [f"AB-{i}-{i % 9999}" for i in range(n_patterns)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for expression, value in zip(expressions, values):
+            re.compile(translate(expression)).search(value)
+    naive = time.perf_counter() - start
+    cache = PatternCache()
+    start = time.perf_counter()
+    issues = precompile(document, cache)
+    warm = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for expression, value in zip(expressions, values):
+            cache.get(expression).search(value)
+    cached = time.perf_counter() - start
+    print(f"{n_patterns} patterns x {rounds} rounds, {len(issues)} flagged")
+    print(f"compile per use   {naive:.3f}s")
+    print(f"precompile        {warm:.3f}s (once, at load time)")
+    print(f"cached            {cached:.3f}s ({naive / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,32 @@
+"""Measures pruning time and the parse time it saves on a spec with dead components.
+
+    python -m benchmarks.bench_prune [N_PATHS] [N_DEAD]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.parser import parse_openapi
+from openapi_parser.prune import prune_components
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(n_paths=500, n_dead=2_000):
+    document = synthetic_spec(n_paths)
+    schemas = document["components"]["schemas"]
+    template = next(iter(schemas.values()))
+    for i in range(n_dead):
+        schemas[f"Dead{i}"] = template
+    (pruned, report), prune_time = timed(prune_components, document)
+    _, before = timed(parse_openapi, document)
+    _, after = timed(parse_openapi, pruned)
+    print(f"{n_paths} paths: pruned {len(report.removed)} of {len(report.removed) + report.kept} components in {prune_time * 1e3:.1f}ms")
+    print(f"parse before {before:.3f}s, after {after:.3f}s ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
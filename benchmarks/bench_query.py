@@ -0,0 +1,59 @@
+"""Compares indexed queries with full tree scans on a synthetic spec.
+
+    python -m benchmarks.bench_query [N_PATHS] [N_QUERIES]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.query import SpecIndex
+
+
+def scan(node, key, found):
+    # What every query cost before the index: a walk of the whole document
+    if isinstance(node, dict):
+        for name, value in node.items():
+            if name == key:
+                found.append(value)
+            scan(value, key, found)
+    elif isinstance(node, list):
+        for value in node:
+            scan(value, key, found)
+    return found
+
+
+def main(n_paths=2_000, n_queries=200):
+    document = synthetic_spec(n_paths)
+    start = time.perf_counter()
+    index = SpecIndex(document)
+    built = time.perf_counter() - start
+    keys = ["operationId", "parameters", "$ref", "requestBody"]
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        scan(document, keys[i % len(keys)], [])
+    scanned = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        index.keys(key)
+    first = (time.perf_counter() - start) / len(keys)
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        index.keys(keys[i % len(keys)])
+    indexed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        index.query(f"$..{keys[i % len(keys)]}")
+    cached = time.perf_counter() - start
+
+    print(f"{n_paths} paths, index built in {built:.3f}s")
+    print(f"full scans      {scanned / n_queries * 1e3:8.3f}ms/query")
+    print(f"first lookup    {first * 1e3:8.3f}ms/query (index hit, pointers formatted)")
+    print(f"repeat lookup   {indexed / n_queries * 1e3:8.3f}ms/query ({scanned / indexed:.0f}x)")
+    print(f"repeat selector {cached / n_queries * 1e3:8.3f}ms/query")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
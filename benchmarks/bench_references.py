@@ -0,0 +1,66 @@
+"""Compares impact queries on the reference graph with repeated full scans.
+
+    python -m benchmarks.bench_references [N_PATHS] [N_QUERIES]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.references import ReferenceGraph
+
+
+def refs_in(node, found):
+    if isinstance(node, dict):
+        if isinstance(node.get("$ref"), str):
+            found.add(node["$ref"])
+        for value in node.values():
+            refs_in(value, found)
+    elif isinstance(node, list):
+        for value in node:
+            refs_in(value, found)
+    return found
+
+
+def scan_dependents(document, name):
+    # Without an index: rescan every component and operation until nothing new is found
+    targets = {f"#/components/schemas/{name}"}
+    dependents = set()
+    changed = True
+    while changed:
+        changed = False
+        for kind, members in document.get("components", {}).items():
+            for member, node in members.items():
+                ref = f"#/components/{kind}/{member}"
+                if ref not in targets and refs_in(node, set()) & targets:
+                    targets.add(ref)
+                    changed = True
+        for path, item in document["paths"].items():
+            for method, operation in item.items():
+                if (path, method) not in dependents and refs_in(operation, set()) & targets:
+                    dependents.add((path, method))
+    return dependents
+
+
+def main(n_paths=1_000, n_queries=20):
+    document = synthetic_spec(n_paths, n_schemas=50)
+    names = list(document["components"]["schemas"])
+    start = time.perf_counter()
+    graph = ReferenceGraph(document)
+    built = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        scanned = scan_dependents(document, names[i % len(names)])
+    scan_time = (time.perf_counter() - start) / n_queries
+
+    start = time.perf_counter()
+    for i in range(n_queries):
+        affected = graph.affected_operations(names[i % len(names)])
+    graph_time = (time.perf_counter() - start) / n_queries
+
+    print(f"{n_paths} paths, graph built in {built * 1e3:.1f}ms, {len(affected)} operations affected")
+    print(f"repeated scans  {scan_time * 1e3:9.3f}ms/query ({len(scanned)} operations)")
+    print(f"reference graph {graph_time * 1e3:9.3f}ms/query ({scan_time / graph_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,77 @@
+"""Compares compiled server templates with per-request regex expansion and matching.
+
+    python -m benchmarks.bench_servers [REQUESTS]
+"""
+import re
+import sys
+import time
+from openapi_parser.servers import ServerTable
+
+SERVERS = [
+    {
+        "url": "https://{env}.example.com:{port}/{basePath}",
+        "variables": {
+            "env": {"default": "prod", "enum": ["prod", "staging", "sandbox"]},
+            "port": {"default": "443"},
+            "basePath": {"default": "v1", "enum": ["v1", "v2", "v10"]},
+        },
+    },
+    {"url": "https://{region}.api.example.com/v1", "variables": {"region": {"default": "eu"}}},
+    {"url": "/local"},
+]
+DOCUMENT = {"servers": SERVERS, "paths": {"/characters": {"get": {}}}}
+URL = "https://staging.example.com:8443/v10/characters?limit=5"
+VALUES = {"env": "staging", "port": "8443"}
+
+
+def naive_expand(server, values):
+    variables = server.get("variables") or {}
+
+    def substitute(found):
+        name = found.group(1)
+        value = values.get(name, variables[name].get("default"))
+        if "enum" in variables[name] and value not in variables[name]["enum"]:
+            raise ValueError(value)
+        return value
+
+    return re.sub(r"\{([^}]+)\}", substitute, server["url"])
+
+
+def naive_match(servers, url):
+    for server in servers:
+        variables = server.get("variables") or {}
+        pattern = ""
+        for literal, name in re.findall(r"([^{]*)(?:\{([^}]+)\})?", server["url"]):
+            pattern += re.escape(literal)
+            if name:
+                enum = variables.get(name, {}).get("enum")
+                choices = "|".join(re.escape(value) for value in sorted(enum, key=len, reverse=True)) if enum else "[^/]+?"
+                pattern += f"(?P<{name}>{choices})"
+        found = re.match(pattern + r"(?P<_rest>[/?#].*)?$", url)
+        if found:
+            return found.groupdict()
+    return None
+
+
+def main(requests=50_000):
+    table = ServerTable(DOCUMENT)
+    servers = table.for_operation("/characters", "get")
+    timings = {}
+    for label, expand, match in (
+        ("per-request regex", lambda: naive_expand(SERVERS[0], VALUES), lambda: naive_match(SERVERS, URL)),
+        ("compiled", lambda: servers[0].expand(VALUES), lambda: table.match(URL)),
+    ):
+        start = time.perf_counter()
+        for _ in range(requests):
+            expand()
+        middle = time.perf_counter()
+        for _ in range(requests):
+            match()
+        timings[label] = (middle - start, time.perf_counter() - middle)
+        print(f"{label:<18} expand {timings[label][0]:.3f}s  match {timings[label][1]:.3f}s  ({requests} requests)")
+    naive, compiled = timings["per-request regex"], timings["compiled"]
+    print(f"speedup: expand {naive[0] / compiled[0]:.1f}x  match {naive[1] / compiled[1]:.1f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,31 @@
+"""Compares splitting a spec into many slices in one pass with one pass per slice.
+
+    python -m benchmarks.bench_split [N_PATHS] [N_SLICES]
+"""
+import sys
+import time
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.split import Selection, extract_spec, split_spec
+
+
+def main(n_paths=2_000, n_slices=20):
+    document = synthetic_spec(n_paths)
+    paths = list(document["paths"])
+    size = max(1, len(paths) // n_slices)
+    selections = {
+        f"slice{i}": Selection(path_prefixes=paths[i * size:(i + 1) * size]) for i in range(n_slices)
+    }
+    start = time.perf_counter()
+    for selection in selections.values():
+        extract_spec(document, path_prefixes=selection.path_prefixes)
+    separate = time.perf_counter() - start
+    start = time.perf_counter()
+    slices = split_spec(document, selections)
+    single = time.perf_counter() - start
+    print(f"{n_paths} paths into {len(slices)} slices")
+    print(f"one pass per slice {separate:.3f}s")
+    print(f"single pass        {single:.3f}s ({separate / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
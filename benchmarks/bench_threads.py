@@ -0,0 +1,52 @@
+"""Measures loader throughput against the number of threads.
+
+    python -m benchmarks.bench_threads [N_PATHS] [N_FILES]
+
+Each thread loads whole YAML and JSON files with `load_openapi_from_file`.
+On a regular (GIL) build libyaml's C parser, JSON decoding and Pydantic's
+validator still hold the GIL for most of their work, so throughput is about
+flat beyond one thread; on a free-threaded build (``python3.13t``) the
+loaders share no mutable state and scale with the cores available.
+"""
+import json
+import os
+import sys
+import sysconfig
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+from benchmarks._corpus import synthetic_spec
+from openapi_parser.parser import load_openapi_from_file
+
+
+def main(n_paths=100, n_files=64):
+    document = synthetic_spec(n_paths)
+    free_threaded = bool(sysconfig.get_config_var("Py_GIL_DISABLED"))
+    print(f"libyaml: {hasattr(yaml, 'CSafeLoader')}, free-threaded: {free_threaded}, cpus: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for extension in ("yaml", "json"):
+            path = os.path.join(directory, f"spec.{extension}")
+            with open(path, "w", encoding="utf-8") as file:
+                if extension == "json":
+                    json.dump(document, file)
+                else:
+                    yaml.safe_dump(document, file, sort_keys=False)
+            paths.append(path)
+        for path in paths:
+            load_openapi_from_file(path)
+            jobs = [path] * n_files
+            baseline = None
+            for threads in (1, 2, 4, 8, 16):
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    start = time.perf_counter()
+                    list(executor.map(load_openapi_from_file, jobs))
+                    elapsed = time.perf_counter() - start
+                rate = n_files / elapsed
+                baseline = baseline or rate
+                print(f"{os.path.basename(path):10} {threads:>2} thread(s): {rate:8.1f} files/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
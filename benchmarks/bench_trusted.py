@@ -0,0 +1,44 @@
+"""Compares validated parsing with trusted construction.
+
+    python -m benchmarks.bench_trusted
+
+`load_trusted` is timed on the three inputs it accepts: the text produced by
+`serialize_openapi`, a parsed dictionary it has to fingerprint, and a parsed
+dictionary with the fingerprint vouched for by the caller (``unsafe_fingerprint``).
+"""
+import time
+from benchmarks._corpus import load_corpus, synthetic_spec
+from openapi_parser.parser import parse_openapi
+from openapi_parser.trusted import construct_openapi, load_trusted, serialize_openapi
+from openapi_parser.utils import fingerprint
+
+
+def timed(function, argument, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(argument)
+    return (time.perf_counter() - start) / repeat
+
+
+def report(label, content):
+    text = serialize_openapi(content)
+    known = fingerprint(content)
+    validated = timed(parse_openapi, content)
+    timings = {
+        "construct": timed(construct_openapi, content),
+        "text": timed(load_trusted, text),
+        "dict": timed(load_trusted, content),
+        "dict+fp": timed(lambda document: load_trusted(document, unsafe_fingerprint=known), content),
+    }
+    columns = "  ".join(f"{name} {seconds * 1000:7.2f}ms ({validated / seconds:3.1f}x)" for name, seconds in timings.items())
+    print(f"{label:<34} validate {validated * 1000:7.2f}ms  {columns}")
+
+
+def main():
+    for name, content in load_corpus().items():
+        report(name, content)
+    report("synthetic (2000 schemas)", synthetic_spec(100, n_schemas=2000))
+
+
+if __name__ == "__main__":
+    main()
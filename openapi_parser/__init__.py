@@ -1,21 +1,20 @@
 import logging
-from .parser import parse_openapi
-from .exceptions import ParsingError, ValidationError, ReferenceResolutionError
-
-# Set up logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+from .parser import parse_openapi, validate_openapi, ValidationLevel
+from .exceptions import ParsingError, ResourceLimitError, ValidationError, ReferenceResolutionError, ValidationIssue
 
+# Handlers and levels are configured by the application, never on import
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 __all__ = [
     "parse_openapi",
+    "validate_openapi",
+    "ValidationLevel",
     "ParsingError",
+    "ResourceLimitError",
     "ValidationError",
     "ReferenceResolutionError",
+    "ValidationIssue",
 ]
 
-# Example usage of the logger within the package
-logger.info("FountainAI OpenAPI Parser package initialized.")
+logger.debug("FountainAI OpenAPI Parser package initialized.")
@@ -0,0 +1,179 @@
+"""Serving a parsed spec as ``openapi.json``/``openapi.yaml`` from an ASGI route.
+
+`OpenAPISpecApp` serializes the document once, when it is created, to JSON
+and YAML, compresses each with gzip (and brotli/zstd when those libraries are
+installed) and derives a strong ETag per representation.  Requests are then
+answered from the precomputed bytes, with ``If-None-Match`` revalidation
+answered by ``304 Not Modified``.
+
+Mount it on any ASGI framework, e.g. FastAPI/Starlette::
+
+    spec_app = OpenAPISpecApp(document)
+    app.add_route("/openapi.json", spec_app)
+    app.add_route("/openapi.yaml", spec_app)
+"""
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+import yaml
+from pydantic import BaseModel
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    from compression import zstd as _zstd  # Python 3.14+
+
+    _zstd_compress = _zstd.compress
+except ImportError:
+    try:
+        import zstandard as _zstd
+
+        _zstd_compress = _zstd.ZstdCompressor(level=19).compress
+    except ImportError:  # optional dependency
+        _zstd_compress = None
+
+MEDIA_TYPES = {"json": b"application/json", "yaml": b"application/yaml"}
+
+# Preference among equally acceptable encodings, best first
+_ENCODING_PREFERENCE = ("zstd", "br", "gzip", "identity")
+
+
+def _compressors():
+    compressors = {"gzip": lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors["br"] = lambda data: brotli.compress(data, quality=11)
+    if _zstd_compress is not None:
+        compressors["zstd"] = _zstd_compress
+    return compressors
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    weights = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[token] = weight
+    return weights
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        # If-None-Match uses the weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# One precomputed response body with its headers
+class _Representation:
+    __slots__ = ("body", "etag", "headers")
+
+    def __init__(self, body: bytes, media_type: bytes, encoding: str, cache_control: bytes):
+        self.body = body
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.headers: List[Tuple[bytes, bytes]] = [
+            (b"content-type", media_type),
+            (b"content-length", str(len(body)).encode()),
+            (b"etag", self.etag.encode()),
+            (b"vary", b"accept-encoding"),
+            (b"cache-control", cache_control),
+        ]
+        if encoding != "identity":
+            self.headers.append((b"content-encoding", encoding.encode()))
+
+
+class OpenAPISpecApp:
+    """ASGI application answering GET/HEAD with the pre-serialized spec.
+
+    The format is chosen by the request path: paths ending in ``.yaml`` or
+    ``.yml`` get YAML, anything else JSON.
+
+    Args:
+        spec: The raw document, or a parsed model (dumped by alias).
+        cache_control: Value of the ``Cache-Control`` header; the default
+            makes clients revalidate, which costs a 304 with no body.
+    """
+
+    def __init__(self, spec: Any, cache_control: str = "no-cache"):
+        if isinstance(spec, BaseModel):
+            spec = spec.model_dump(mode="json", by_alias=True, exclude_none=True)
+        bodies = {
+            "json": json.dumps(spec, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            "yaml": yaml.safe_dump(spec, sort_keys=False, allow_unicode=True).encode("utf-8"),
+        }
+        compressors = _compressors()
+        header = cache_control.encode("latin-1")
+        self.representations: Dict[str, Dict[str, _Representation]] = {}
+        for kind, body in bodies.items():
+            variants = {"identity": _Representation(body, MEDIA_TYPES[kind], "identity", header)}
+            for encoding, compress in compressors.items():
+                compressed = compress(body)
+                if len(compressed) < len(body):
+                    variants[encoding] = _Representation(compressed, MEDIA_TYPES[kind], encoding, header)
+            self.representations[kind] = variants
+
+    def select(self, path: str, accept_encoding: str = "") -> Optional[_Representation]:
+        """Returns the representation served for `path` and an ``Accept-Encoding`` value.
+
+        Returns None if the client accepts none of them (not even identity).
+        """
+        variants = self.representations["yaml" if path.endswith((".yaml", ".yml")) else "json"]
+        weights = _parse_accept_encoding(accept_encoding)
+        default = weights.get("*", None)
+        best, best_weight = None, 0.0
+        for encoding in _ENCODING_PREFERENCE:
+            if encoding not in variants:
+                continue
+            weight = weights.get(encoding, default)
+            if weight is None:
+                # identity is acceptable unless excluded; unlisted codings are not
+                weight = 1.0 if encoding == "identity" else 0.0
+            if weight > best_weight:
+                best, best_weight = variants[encoding], weight
+        return best
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await send({"type": "http.response.start", "status": 405, "headers": [(b"allow", b"GET, HEAD")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        accept_encoding, if_none_match = "", None
+        for name, value in scope.get("headers", ()):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+            elif name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        representation = self.select(scope["path"], accept_encoding)
+        if representation is None:
+            await send({"type": "http.response.start", "status": 406, "headers": [(b"vary", b"accept-encoding")]})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if if_none_match is not None and _etag_matches(if_none_match, representation.etag):
+            headers = [header for header in representation.headers if header[0] not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": 200, "headers": representation.headers})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else representation.body})
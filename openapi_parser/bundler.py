@@ -0,0 +1,291 @@
+"""Self-contained output documents: bundling and full dereferencing.
+
+`bundle` copies every external reference (``common.yaml#/components/schemas/Error``)
+into the document's own ``components`` and rewrites the reference to point
+there, leaving local references alone.  `dereference` goes further and
+replaces every reference with the referenced content; references that would
+recurse forever, or that are nested more than `max_depth` references deep,
+are kept, pointing into ``components``.
+
+Each referenced subtree is resolved once per call and shared by all its
+referrers, and results are cached by the fingerprint of the input document,
+so treat returned documents as read-only (``copy.deepcopy`` them to edit).
+`write_spec` streams either kind of output to disk as YAML or JSON.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import yaml
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.utils import fingerprint, json_pointer, open_bytes, resolve_pointer, unescape_pointer_token
+
+# Default number of references `dereference` inlines inside one another
+DEFAULT_MAX_DEPTH = 64
+
+# Outputs of recent calls, keyed by (inline, max depth, input fingerprint, base path)
+_CACHE: "OrderedDict[tuple, tuple]" = OrderedDict()
+_CACHE_SIZE = 32
+_CACHE_LOCK = threading.Lock()
+
+# Component section of the members of a container key ("parameters": [...])
+_MEMBER_KINDS = {
+    "parameters": "parameters",
+    "responses": "responses",
+    "headers": "headers",
+    "examples": "examples",
+    "links": "links",
+    "callbacks": "callbacks",
+    "paths": "pathItems",
+    "webhooks": "pathItems",
+}
+
+# Component section of the value of a key ("requestBody": {...})
+_NODE_KINDS = {"requestBody": "requestBodies"}
+
+_Target = Tuple[Optional[str], str]
+
+
+# Walks the root document, copying it and rewriting or inlining references.
+# A target is (absolute file path or None for the root document, JSON Pointer).
+class _Bundler:
+    def __init__(self, document: Dict[str, Any], base_path: Optional[str], inline: bool, max_depth: int):
+        self.root = document
+        self.max_depth = max_depth
+        self.root_file = os.path.abspath(base_path) if base_path and not os.path.isdir(base_path) else None
+        self.base_dir = os.path.dirname(self.root_file) if self.root_file else os.path.abspath(base_path or ".")
+        self.inline = inline
+        self.documents: Dict[str, Any] = {}
+        self.stamps: Dict[str, tuple] = {}
+        self.resolved: Dict[_Target, Any] = {}
+        self.internal: Dict[_Target, Tuple[str, str]] = {}
+        self.in_progress = set()
+        self.components: Dict[str, Dict[str, Any]] = {}
+
+    def run(self) -> Dict[str, Any]:
+        root_components = self.root.get("components")
+        if self.inline and isinstance(root_components, dict):
+            # Resolve components through the memo so referrers share the same subtrees
+            components = {}
+            for kind, section in root_components.items():
+                if isinstance(section, dict):
+                    section = {
+                        name: self.inline_target((None, json_pointer("components", kind, name)), kind)
+                        for name in section
+                    }
+                components[kind] = section
+            result = self.walk({**self.root, "components": None}, None, "schemas", None)
+            result["components"] = components
+        else:
+            result = self.walk(self.root, None, "schemas", None)
+        if self.components:
+            components = result.setdefault("components", {})
+            for kind, entries in self.components.items():
+                components.setdefault(kind, {}).update(entries)
+        return result
+
+    def target(self, ref: str, file: Optional[str]) -> _Target:
+        location, _, fragment = ref.partition("#")
+        if not location:
+            return file, fragment
+        if "://" in location:
+            raise ReferenceResolutionError(f"Remote reference '{ref}' is not supported.")
+        directory = os.path.dirname(file) if file else self.base_dir
+        path = os.path.normpath(os.path.join(directory, location))
+        return (None if path == self.root_file else path), fragment
+
+    def load(self, path: str) -> Any:
+        document = self.documents.get(path)
+        if document is None:
+            try:
+                with open_bytes(path) as content:
+                    document = json.loads(bytes(content)) if path.endswith(".json") else yaml.safe_load(content)
+                stat = os.stat(path)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                raise ReferenceResolutionError(f"Cannot load referenced file '{path}': {e}")
+            self.documents[path] = document
+            self.stamps[path] = (stat.st_mtime_ns, stat.st_size)
+        return document
+
+    def lookup(self, target: _Target) -> Any:
+        path, fragment = target
+        document = self.root if path is None else self.load(path)
+        try:
+            return resolve_pointer(document, "#" + fragment)
+        except ReferenceResolutionError:
+            raise ReferenceResolutionError(
+                f"Reference '{fragment}' not found in {path or 'the root document'}."
+            ) from None
+
+    def walk(self, node: Any, file: Optional[str], kind: str, members_kind: Optional[str]) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                return self.reference(node, ref, file, kind)
+            result = {}
+            for key, value in node.items():
+                if key == "discriminator" and isinstance(value, dict) and isinstance(value.get("mapping"), dict):
+                    result[key] = self.discriminator(value, file)
+                else:
+                    result[key] = self.walk(value, file, members_kind or _NODE_KINDS.get(key, "schemas"), _MEMBER_KINDS.get(key))
+            return result
+        if isinstance(node, list):
+            return [self.walk(item, file, members_kind or "schemas", None) for item in node]
+        return node
+
+    def reference(self, node: Dict[str, Any], ref: str, file: Optional[str], kind: str) -> Any:
+        target = self.target(ref, file)
+        siblings = {key: self.walk(value, file, "schemas", None) for key, value in node.items() if key != "$ref"}
+        if self.inline and target not in self.in_progress and len(self.in_progress) < self.max_depth:
+            value = self.inline_target(target, kind)
+            if siblings and isinstance(value, dict):
+                value = {**value, **siblings}
+            return value
+        return {"$ref": self.internalize(target, kind), **siblings}
+
+    def inline_target(self, target: _Target, kind: str) -> Any:
+        if target in self.resolved:
+            return self.resolved[target]
+        self.in_progress.add(target)
+        try:
+            value = self.walk(self.lookup(target), target[0], kind, None)
+        finally:
+            self.in_progress.discard(target)
+        self.resolved[target] = value
+        if target in self.internal:
+            # Internalized while in progress (a cycle); fill in its content now
+            section, name = self.internal[target]
+            self.components[section][name] = value
+        return value
+
+    def internalize(self, target: _Target, kind: str) -> str:
+        """Returns the local reference for `target`, copying it into components if external."""
+        path, fragment = target
+        if path is None:
+            return "#" + fragment
+        if target in self.internal:
+            return "#" + json_pointer("components", *self.internal[target])
+        tokens = [unescape_pointer_token(token) for token in fragment.split("/")[1:]]
+        if len(tokens) == 3 and tokens[0] == "components":
+            kind, name = tokens[1], tokens[2]
+        else:
+            name = tokens[-1] if tokens else os.path.splitext(os.path.basename(path))[0]
+        name = self.unique_name(kind, name)
+        self.internal[target] = (kind, name)
+        section = self.components.setdefault(kind, {})
+        section[name] = None
+        if not self.inline:
+            section[name] = self.walk(self.lookup(target), path, kind, None)
+        elif target not in self.in_progress:
+            section[name] = self.inline_target(target, kind)
+        return "#" + json_pointer("components", kind, name)
+
+    def unique_name(self, kind: str, name: str) -> str:
+        existing = (self.root.get("components") or {}).get(kind) or {}
+        added = self.components.get(kind, {})
+        candidate, suffix = name, 2
+        while candidate in existing or candidate in added:
+            candidate, suffix = f"{name}{suffix}", suffix + 1
+        return candidate
+
+    def discriminator(self, discriminator: Dict[str, Any], file: Optional[str]) -> Dict[str, Any]:
+        # Mapping values are references by string (or bare schema names), so
+        # they cannot be inlined; external ones are internalized in both modes.
+        mapping = {}
+        for value, ref in discriminator["mapping"].items():
+            if isinstance(ref, str) and ("#" in ref or ref.endswith((".yaml", ".yml", ".json"))):
+                ref = self.internalize(self.target(ref, file), "schemas")
+            mapping[value] = ref
+        return {**discriminator, "mapping": mapping}
+
+
+def _is_fresh(stamps: Dict[str, tuple]) -> bool:
+    for path, stamp in stamps.items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if (stat.st_mtime_ns, stat.st_size) != stamp:
+            return False
+    return True
+
+
+def _build(document: Dict[str, Any], base_path: Optional[str], inline: bool, max_depth: int) -> Dict[str, Any]:
+    key = (inline, max_depth, fingerprint(document), os.path.abspath(base_path or "."))
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is not None and _is_fresh(entry[1]):
+            _CACHE.move_to_end(key)
+            return entry[0]
+    bundler = _Bundler(document, base_path, inline, max_depth)
+    result = bundler.run()
+    with _CACHE_LOCK:
+        _CACHE[key] = (result, bundler.stamps)
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > _CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return result
+
+
+def bundle(document: Dict[str, Any], base_path: Optional[str] = None) -> Dict[str, Any]:
+    """Returns a single-file copy of `document` with external refs moved into components.
+
+    Args:
+        document: The raw OpenAPI document.
+        base_path: The file the document was loaded from (or its directory);
+            relative references are resolved against it.  Defaults to the
+            current directory.
+
+    Raises:
+        ReferenceResolutionError: If a referenced file or node does not exist.
+    """
+    return _build(document, base_path, inline=False, max_depth=0)
+
+
+def dereference(
+    document: Dict[str, Any], base_path: Optional[str] = None, max_depth: int = DEFAULT_MAX_DEPTH
+) -> Dict[str, Any]:
+    """Returns a copy of `document` with every `$ref` replaced by its target.
+
+    Recursive references cannot be inlined, and neither are references nested
+    more than `max_depth` deep inside other inlined references; both are left
+    as local refs into ``components`` (external targets are bundled there
+    first).  Discriminator mappings keep their string references.
+
+    Raises:
+        ReferenceResolutionError: If a referenced file or node does not exist.
+    """
+    return _build(document, base_path, inline=True, max_depth=max_depth)
+
+
+def clear_cache():
+    """Drops all cached `bundle`/`dereference` results."""
+    with _CACHE_LOCK:
+        _CACHE.clear()
+
+
+# YAML dumper that writes shared subtrees out in full instead of as anchors/aliases
+class _ExpandingDumper(getattr(yaml, "CSafeDumper", yaml.SafeDumper)):
+    def ignore_aliases(self, data):
+        return True
+
+
+def write_spec(document: Dict[str, Any], destination, format: Optional[str] = None):
+    """Streams `document` to a file path or text stream as YAML or JSON.
+
+    The format defaults to JSON for ``.json`` destinations and YAML otherwise.
+    """
+    if format is None:
+        name = os.fspath(destination) if isinstance(destination, (str, os.PathLike)) else getattr(destination, "name", "")
+        format = "json" if str(name).lower().endswith(".json") else "yaml"
+    if format not in ("json", "yaml"):
+        raise ValueError(f"Unsupported output format '{format}'.")
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", encoding="utf-8") as stream:
+            return write_spec(document, stream, format)
+    if format == "json":
+        json.dump(document, destination, indent=2, ensure_ascii=False)
+        destination.write("\n")
+    else:
+        yaml.dump(document, destination, Dumper=_ExpandingDumper, sort_keys=False, allow_unicode=True)
@@ -0,0 +1,228 @@
+"""Hand-written document checks used by the validation levels of `parse_openapi`.
+
+Every check is a generator of `ValidationIssue`s so callers can stop at the
+first one or collect as many as they need.
+"""
+import re
+from typing import Any, Dict, Iterator
+from openapi_parser.exceptions import ReferenceResolutionError, ValidationIssue
+from openapi_parser.patterns import pattern_issues
+from openapi_parser.utils import json_pointer, resolve_pointer
+
+SUPPORTED_VERSIONS = ["3.1.0"]
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+_TEMPLATE_VARIABLE = re.compile(r"{([^{}]+)}")
+
+
+def required_field_issues(content: Any) -> Iterator[ValidationIssue]:
+    """Yields missing or unsupported top-level fields, in document order."""
+    if not isinstance(content, dict):
+        yield ValidationIssue("", "invalid-type", "OpenAPI document must be a mapping.")
+        return
+    if "openapi" not in content:
+        yield ValidationIssue("/openapi", "missing-field", "Missing 'openapi' field.")
+    elif content["openapi"] not in SUPPORTED_VERSIONS:
+        yield ValidationIssue(
+            "/openapi", "unsupported-version", "Unsupported version '{version}'.", version=content["openapi"]
+        )
+    if "info" not in content:
+        yield ValidationIssue("/info", "missing-field", "Missing 'info' field.")
+    elif isinstance(content["info"], dict) and "version" not in content["info"]:
+        yield ValidationIssue("/info/version", "missing-field", "Missing 'version' in 'info' field.")
+    if "paths" not in content:
+        yield ValidationIssue("/paths", "missing-field", "Missing 'paths' field.")
+
+
+def _expect(node: Any, kind: type, pointer: str, what: str) -> Iterator[ValidationIssue]:
+    if not isinstance(node, kind):
+        yield ValidationIssue(
+            pointer, "invalid-type", "Expected {what} to be {kind}.",
+            what=what, kind="a mapping" if kind is dict else "a list" if kind is list else "a string",
+        )
+
+
+def shape_issues(content: Any) -> Iterator[ValidationIssue]:
+    """Yields required-field problems and shape errors down to the operation level.
+
+    Only the skeleton a router relies on is checked: info, the path and
+    webhook maps, operations and their operationIds, parameter lists and
+    responses.
+    Schemas and other component contents are not inspected.
+    """
+    yield from required_field_issues(content)
+    if not isinstance(content, dict):
+        return
+    info = content.get("info")
+    if info is not None:
+        yield from _expect(info, dict, "/info", "'info'")
+        if isinstance(info, dict):
+            if "title" not in info:
+                yield ValidationIssue("/info/title", "missing-field", "Missing 'title' in 'info' field.")
+            for key in ("title", "version"):
+                if key in info:
+                    yield from _expect(info[key], str, f"/info/{key}", f"'info.{key}'")
+    components = content.get("components")
+    if components is not None:
+        yield from _expect(components, dict, "/components", "'components'")
+        if isinstance(components, dict):
+            for kind, section in components.items():
+                yield from _expect(section, dict, json_pointer("components", kind), f"'components.{kind}'")
+    if content.get("webhooks") is not None:
+        yield from _expect(content["webhooks"], dict, "/webhooks", "'webhooks'")
+    paths = content.get("paths")
+    if paths is None or "paths" not in content:
+        return
+    if not isinstance(paths, dict):
+        yield from _expect(paths, dict, "/paths", "'paths'")
+        return
+    for path, item in paths.items():
+        item_pointer = json_pointer("paths", path)
+        if not isinstance(path, str) or not path.startswith("/"):
+            yield ValidationIssue(item_pointer, "invalid-path", "Path '{path}' must start with '/'.", path=path)
+        if not isinstance(item, dict):
+            yield from _expect(item, dict, item_pointer, f"path item '{path}'")
+            continue
+        yield from _parameter_shape_issues(item.get("parameters"), item_pointer)
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if operation is None:
+                continue
+            operation_pointer = f"{item_pointer}/{method}"
+            if not isinstance(operation, dict):
+                yield from _expect(operation, dict, operation_pointer, f"operation {method.upper()} {path}")
+                continue
+            if "operationId" in operation:
+                yield from _expect(
+                    operation["operationId"], str, operation_pointer + "/operationId", "'operationId'"
+                )
+            if "responses" not in operation:
+                yield ValidationIssue(
+                    operation_pointer + "/responses", "missing-field",
+                    "Missing 'responses' in operation {method} {path}.", method=method.upper(), path=path,
+                )
+            else:
+                yield from _expect(operation["responses"], dict, operation_pointer + "/responses", "'responses'")
+            yield from _parameter_shape_issues(operation.get("parameters"), operation_pointer)
+
+
+def _parameter_shape_issues(parameters: Any, owner_pointer: str) -> Iterator[ValidationIssue]:
+    if parameters is None:
+        return
+    pointer = owner_pointer + "/parameters"
+    if not isinstance(parameters, list):
+        yield from _expect(parameters, list, pointer, "'parameters'")
+        return
+    for index, parameter in enumerate(parameters):
+        parameter_pointer = f"{pointer}/{index}"
+        if not isinstance(parameter, dict):
+            yield from _expect(parameter, dict, parameter_pointer, "a parameter")
+        elif "$ref" not in parameter:
+            for key in ("name", "in"):
+                if key not in parameter:
+                    yield ValidationIssue(
+                        f"{parameter_pointer}/{key}", "missing-field", "Missing '{key}' in parameter.", key=key
+                    )
+
+
+def _local_refs(node: Any, pointer: str) -> Iterator[tuple]:
+    stack = [(node, pointer)]
+    while stack:
+        node, pointer = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#"):
+                yield pointer + "/$ref", ref
+            for key, value in node.items():
+                if isinstance(value, (dict, list)):
+                    stack.append((value, pointer + json_pointer(key)))
+        elif isinstance(node, list):
+            for index, value in enumerate(node):
+                if isinstance(value, (dict, list)):
+                    stack.append((value, f"{pointer}/{index}"))
+
+
+def _resolve(content: Dict[str, Any], node: Any) -> Any:
+    seen = set()
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str) and node["$ref"] not in seen:
+        seen.add(node["$ref"])
+        try:
+            node = resolve_pointer(content, node["$ref"])
+        except ReferenceResolutionError:
+            return None
+    return node
+
+
+def strict_issues(content: Dict[str, Any]) -> Iterator[ValidationIssue]:
+    """Yields unresolved local refs, duplicate operationIds, path-parameter mismatches,
+    invalid or catastrophic-backtracking patterns and invalid server variables."""
+    for pointer, ref in _local_refs(content, ""):
+        try:
+            resolve_pointer(content, ref)
+        except ReferenceResolutionError:
+            yield ValidationIssue(pointer, "unresolved-ref", "Reference '{ref}' not found.", ref=ref)
+
+    seen_operation_ids: Dict[str, str] = {}
+    # Path-level parameters are checked once per operation; report each problem once
+    reported = set()
+    for section in ("paths", "webhooks"):
+        items = content.get(section)
+        if not isinstance(items, dict):
+            # A non-mapping 'paths' already fails the standard level's validation
+            if section == "webhooks" and items is not None:
+                yield from _expect(items, dict, "/webhooks", "'webhooks'")
+            continue
+        for path, item in items.items():
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                operation = item.get(method)
+                if not isinstance(operation, dict):
+                    continue
+                operation_pointer = json_pointer(section, path, method)
+                operation_id = operation.get("operationId")
+                if operation_id is not None:
+                    first = seen_operation_ids.setdefault(operation_id, operation_pointer)
+                    if first != operation_pointer:
+                        yield ValidationIssue(
+                            operation_pointer + "/operationId", "duplicate-operation-id",
+                            "operationId '{operation_id}' is already used by {first}.",
+                            operation_id=operation_id, first=first,
+                        )
+                if section == "paths":
+                    for issue in _path_parameter_issues(content, path, item, operation, operation_pointer):
+                        if (issue.pointer, issue.code) not in reported:
+                            reported.add((issue.pointer, issue.code))
+                            yield issue
+
+    yield from pattern_issues(content)
+    # Imported here: servers takes HTTP_METHODS from this module
+    from openapi_parser.servers import server_issues
+    yield from server_issues(content)
+
+
+def _path_parameter_issues(content, path, item, operation, operation_pointer) -> Iterator[ValidationIssue]:
+    template = set(_TEMPLATE_VARIABLE.findall(path))
+    declared = {}
+    for owner, owner_pointer in ((item, json_pointer("paths", path)), (operation, operation_pointer)):
+        for index, parameter in enumerate(owner.get("parameters") or ()):
+            parameter = _resolve(content, parameter)
+            if isinstance(parameter, dict) and parameter.get("in") == "path" and "name" in parameter:
+                declared[parameter["name"]] = (parameter, f"{owner_pointer}/parameters/{index}")
+    for name in sorted(template - declared.keys()):
+        yield ValidationIssue(
+            operation_pointer + "/parameters", "undeclared-path-parameter",
+            "Path parameter '{name}' of '{path}' is not declared.", name=name, path=path,
+        )
+    for name, (parameter, pointer) in declared.items():
+        if name not in template:
+            yield ValidationIssue(
+                pointer, "unused-path-parameter",
+                "Path parameter '{name}' does not appear in '{path}'.", name=name, path=path,
+            )
+        elif parameter.get("required") is not True:
+            yield ValidationIssue(
+                pointer + "/required", "path-parameter-not-required",
+                "Path parameter '{name}' must be required.", name=name,
+            )
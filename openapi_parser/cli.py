@@ -0,0 +1,244 @@
+"""Command-line validation of OpenAPI specs.
+
+    python -m openapi_parser validate DIR_OR_FILE... [--format json] [--jobs N]
+
+Files are validated in parallel worker processes and reported with their
+parse time and every issue found.  Line and column numbers are only worked
+out for files that have issues, after their parse time was taken.  A file
+that fails unexpectedly is reported as invalid without stopping the run.
+Results are cached in a JSON file keyed by each file's path, modification
+time and size (plus the validation options), so unchanged files are skipped
+on the next run.
+
+Exit codes: 0 when every spec is valid, 1 when at least one is invalid, 2 for
+usage errors such as no spec files being found.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+import yaml
+from openapi_parser.exceptions import ParsingError, ValidationIssue
+from openapi_parser.locations import scan_json_locations, scan_yaml_locations
+from openapi_parser.parser import DEFAULT_MAX_ERRORS, ValidationLevel, load_openapi_from_file
+
+EXIT_OK = 0
+EXIT_INVALID = 1
+EXIT_USAGE = 2
+
+DEFAULT_CACHE = ".openapi_parser_cache.json"
+SPEC_EXTENSIONS = (".yaml", ".yml", ".json")
+
+# Bumped whenever cached results may no longer match what validation reports
+CACHE_VERSION = 1
+
+
+def discover(paths: Iterable[str]) -> List[str]:
+    """Expands directories into the spec files below them, in sorted order."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files) if name.lower().endswith(SPEC_EXTENSIONS))
+        else:
+            found.append(path)
+    return found
+
+
+def validate_file(path: str, level: str = "standard", max_errors: int = DEFAULT_MAX_ERRORS) -> Dict[str, Any]:
+    """Validates one file and returns its JSON-serializable result.
+
+    ``seconds`` is the time taken to load and validate the file; locating
+    the issues of an invalid file is not included.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"path": path, "valid": True, "errors": []}
+    try:
+        load_openapi_from_file(path, collect_errors=True, max_errors=max_errors, level=level)
+    except ParsingError as e:
+        result["seconds"] = round(time.perf_counter() - start, 6)
+        _locate_issues(path, e.errors)
+        result["valid"] = False
+        result["message"] = str(e)
+        result["errors"] = [issue.to_dict() for issue in e.errors]
+    except Exception as e:
+        # One broken file must not lose the results of the others
+        result["seconds"] = round(time.perf_counter() - start, 6)
+        result["valid"] = False
+        result["message"] = f"Unexpected error while validating: {type(e).__name__}: {e}"
+    else:
+        result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def _locate_issues(path: str, issues: List[ValidationIssue]):
+    if all(issue.location is not None for issue in issues):
+        return
+    scan = scan_json_locations if path.lower().endswith(".json") else scan_yaml_locations
+    try:
+        with open(path, "rb") as file:
+            source_map = scan(file.read())
+    except (OSError, ValueError, yaml.YAMLError):
+        return  # unreadable or unparsable files are reported without positions
+    for issue in issues:
+        if issue.location is None:
+            issue.location = source_map.locate(issue.pointer)
+
+
+class ResultCache:
+    """Validation results of previous runs, keyed by path and file stamp.
+
+    Args:
+        path: The cache file; None disables caching.
+        options: Validation options the cached results must have been produced with.
+    """
+
+    def __init__(self, path: Optional[str], options: List[Any]):
+        self.path = path
+        self.options = [CACHE_VERSION, *options]
+        self.entries: Dict[str, Any] = {}
+        if path is not None:
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    data = json.load(file)
+                if data.get("options") == self.options:
+                    self.entries = data.get("entries", {})
+            except (OSError, ValueError, AttributeError):
+                # A missing or corrupt cache only costs a full run
+                self.entries = {}
+
+    @staticmethod
+    def _stamp(path: str) -> Optional[List[int]]:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(os.path.abspath(path))
+        stamp = self._stamp(path)
+        if entry is None or stamp is None or entry["stamp"] != stamp:
+            return None
+        return dict(entry["result"], path=path, cached=True)
+
+    def put(self, path: str, result: Dict[str, Any]):
+        stamp = self._stamp(path)
+        if stamp is not None:
+            self.entries[os.path.abspath(path)] = {"stamp": stamp, "result": result}
+
+    def save(self):
+        if self.path is None:
+            return
+        temporary = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump({"options": self.options, "entries": self.entries}, file)
+        os.replace(temporary, self.path)
+
+
+def validate_paths(
+    files: List[str],
+    level: str = "standard",
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    jobs: Optional[int] = None,
+    cache: Optional[ResultCache] = None,
+) -> List[Dict[str, Any]]:
+    """Validates `files` in up to `jobs` processes, skipping files whose cached result is current.
+
+    Returns:
+        One result per file, in the order of `files`.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+    pending = []
+    for index, path in enumerate(files):
+        cached = cache.get(path) if cache is not None else None
+        if cached is not None:
+            results[index] = cached
+        else:
+            pending.append(index)
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(pending) <= 1:
+        fresh = [validate_file(files[index], level, max_errors) for index in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+            fresh = list(executor.map(
+                validate_file, [files[index] for index in pending], [level] * len(pending), [max_errors] * len(pending)
+            ))
+    for index, result in zip(pending, fresh):
+        results[index] = result
+        if cache is not None:
+            cache.put(files[index], result)
+    return results
+
+
+def _summary(results: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    invalid = sum(1 for result in results if not result["valid"])
+    return {
+        "files": len(results),
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "cached": sum(1 for result in results if result.get("cached")),
+        "parse_seconds": round(sum(result["seconds"] for result in results if not result.get("cached")), 6),
+        "wall_seconds": round(elapsed, 6),
+    }
+
+
+def write_human_report(results: List[Dict[str, Any]], summary: Dict[str, Any], stream: TextIO):
+    for result in results:
+        status = "ok  " if result["valid"] else "FAIL"
+        timing = "cached" if result.get("cached") else f"{result['seconds'] * 1000:.1f}ms"
+        stream.write(f"{status} {timing:>9}  {result['path']}\n")
+        if not result["valid"]:
+            issues = result["errors"] or [{"pointer": "", "message": result.get("message", "")}]
+            for issue in issues:
+                location = f" (line {issue['line']}, column {issue['column']})" if "line" in issue else ""
+                stream.write(f"       {issue['pointer'] or '/'}: {issue['message']}{location}\n")
+    stream.write(
+        f"{summary['files']} file(s): {summary['valid']} valid, {summary['invalid']} invalid, "
+        f"{summary['cached']} cached in {summary['wall_seconds']:.2f}s\n"
+    )
+
+
+def write_json_report(results: List[Dict[str, Any]], summary: Dict[str, Any], stream: TextIO):
+    json.dump({"summary": summary, "results": results}, stream, indent=2)
+    stream.write("\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m openapi_parser", description="FountainAI OpenAPI parser tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    validate = commands.add_parser("validate", help="Validate spec files and directories of specs.")
+    validate.add_argument("paths", nargs="+", help="Spec files, or directories searched for *.yaml, *.yml and *.json.")
+    validate.add_argument("--level", choices=[level.value for level in ValidationLevel], default="standard")
+    validate.add_argument("--max-errors", type=int, default=DEFAULT_MAX_ERRORS, help="Issues reported per file.")
+    validate.add_argument("--jobs", "-j", type=int, default=None, help="Worker processes (default: CPU count).")
+    validate.add_argument("--format", choices=["human", "json"], default="human")
+    validate.add_argument("--cache", default=DEFAULT_CACHE, help=f"Result cache file (default: {DEFAULT_CACHE}).")
+    validate.add_argument("--no-cache", action="store_true", help="Validate every file and leave the cache untouched.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None, stdout: Optional[TextIO] = None) -> int:
+    """Runs the command line and returns its exit code."""
+    stdout = stdout or sys.stdout
+    args = build_parser().parse_args(argv)
+    files = discover(args.paths)
+    if not files:
+        sys.stderr.write("No OpenAPI spec files found.\n")
+        return EXIT_USAGE
+    cache = None if args.no_cache else ResultCache(args.cache, [args.level, args.max_errors])
+    start = time.perf_counter()
+    results = validate_paths(files, args.level, args.max_errors, args.jobs, cache)
+    summary = _summary(results, time.perf_counter() - start)
+    if cache is not None:
+        try:
+            cache.save()
+        except OSError as e:
+            sys.stderr.write(f"Could not write cache {args.cache}: {e}\n")
+    report = write_json_report if args.format == "json" else write_human_report
+    report(results, summary, stdout)
+    return EXIT_INVALID if summary["invalid"] else EXIT_OK
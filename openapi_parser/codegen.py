@@ -0,0 +1,495 @@
+"""Ahead-of-time generation of data classes and decoders from component schemas.
+
+`generate_module` turns ``components.schemas`` into the source of a plain
+Python module.  Every object schema becomes a ``__slots__`` class with a
+``decode_<Name>(data)`` function, specialised for its properties, that checks
+types, required properties, enums, lengths and bounds and builds an instance,
+and an ``encode_<Name>(obj)`` function producing the JSON-ready dictionary.
+Other schemas (enums, arrays, ...) get value decoders.  `$ref`s become calls
+to the referenced decoder, ``allOf`` is flattened first and discriminated
+``oneOf``/``anyOf`` unions dispatch through a dictionary.  Schemas the
+generator does not specialise (undiscriminated unions, ``not``) are passed
+through unchanged; use `validator.SchemaValidator` for full validation.
+
+`write_module` only rewrites the file when the document's fingerprint
+changed, and `load_module` imports the result (or compiles it in memory).
+"""
+import importlib.util
+import keyword
+import math
+import os
+import re
+import sys
+import threading
+import types
+from typing import Any, Dict, List, Optional, Tuple
+from openapi_parser.discriminator import build_dispatch_table
+from openapi_parser.flatten import SchemaFlattener
+from openapi_parser.utils import fingerprint, json_pointer, unescape_pointer_token
+
+# Bumped whenever the generated code changes, so stale modules are regenerated
+GENERATOR_VERSION = 1
+
+_SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+_PYTHON_TYPES = {
+    "string": "str",
+    "integer": "int",
+    "number": "(int, float)",
+    "boolean": "bool",
+    "object": "dict",
+    "array": "list",
+}
+
+_FINGERPRINT_LINE = re.compile(r"^# fingerprint: ([0-9a-f]+)$", re.MULTILINE)
+
+# Module-level names of the generated code that classes and constants must not take
+_HELPERS = frozenset({"DecodeError", "FINGERPRINT", "_MISSING", "_new", "_encode", "_ENCODERS"})
+
+# Modules compiled in memory, keyed by fingerprint
+_MODULES: Dict[str, types.ModuleType] = {}
+
+
+def _identifier(name: str) -> str:
+    identifier = re.sub(r"\W", "_", name) or "_"
+    if identifier[0].isdigit():
+        identifier = "_" + identifier
+    if identifier.startswith("__"):
+        # Would be name-mangled inside the class body, or clash with its dunders
+        identifier = identifier.lstrip("_") or "_"
+    if keyword.iskeyword(identifier) or identifier in ("data", "obj", "value", "self"):
+        identifier += "_"
+    return identifier
+
+
+def _class_name(name: str) -> str:
+    identifier = _identifier(name)
+    return identifier[0].upper() + identifier[1:]
+
+
+def _types(schema: Dict[str, Any]) -> Tuple[List[str], bool]:
+    kind = schema.get("type")
+    names = kind if isinstance(kind, list) else [kind] if kind is not None else []
+    nullable = "null" in names or schema.get("nullable") is True
+    return [name for name in names if name != "null"], nullable
+
+
+def _is_object(schema: Any) -> bool:
+    if not isinstance(schema, dict) or not isinstance(schema.get("properties"), dict):
+        return False
+    names, _ = _types(schema)
+    return names in ([], ["object"]) and not any(key in schema for key in ("oneOf", "anyOf"))
+
+
+# Builds the module source; classes for nested inline objects are queued as they are met
+class _Generator:
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        self.schemas: Dict[str, Any] = (document.get("components") or {}).get("schemas") or {}
+        self.flattener = SchemaFlattener(document)
+        self.used = set(_HELPERS)
+        self.names: Dict[str, str] = {name: self.unique(_class_name(name)) for name in self.schemas}
+        self.classes: Dict[str, str] = {}  # class identifier -> encoder name, for the generic encoder
+        self.blocks: List[str] = []
+        self.constants: List[str] = []
+        self.queue: List[Tuple[str, Any]] = [(self.names[name], name) for name in self.schemas]
+
+    def unique(self, identifier: str) -> str:
+        candidate, suffix = identifier, 2
+        while candidate in self.used:
+            candidate, suffix = f"{identifier}{suffix}", suffix + 1
+        self.used.add(candidate)
+        return candidate
+
+    def constant(self, prefix: str, expression: str) -> str:
+        name = self.unique(f"_{prefix}_{len(self.constants)}")
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    def component(self, ref: Any) -> Optional[str]:
+        """Returns the identifier generated for a ``#/components/schemas/<Name>`` ref."""
+        if not isinstance(ref, str) or not ref.startswith(_SCHEMA_REF_PREFIX):
+            return None
+        name = unescape_pointer_token(ref[len(_SCHEMA_REF_PREFIX):])
+        return self.names.get(name)
+
+    def run(self) -> str:
+        while self.queue:
+            identifier, source = self.queue.pop(0)
+            schema = self.flattener.effective(source) if isinstance(source, str) else source
+            if _is_object(schema):
+                self.object_code(identifier, schema)
+            else:
+                self.value_code(identifier, schema)
+        return "\n\n\n".join(self.blocks)
+
+    # -- decoding --------------------------------------------------------
+
+    def check(self, schema: Any, var: str, pointer: str, indent: str, hint: str, depth: int = 0) -> Tuple[List[str], bool]:
+        """Returns statements validating `var` (rebinding it if converted) and whether they convert."""
+        if not isinstance(schema, dict):
+            return [], False
+        identifier = self.component(schema.get("$ref"))
+        if identifier is not None:
+            return self.call(f"decode_{identifier}", var, pointer, indent), True
+        if "$ref" in schema:
+            return [], False
+        schema = self.flattener.flatten(schema) if "allOf" in schema else schema
+        names, nullable = _types(schema)
+        inner = indent + "    " if nullable else indent
+        lines: List[str] = []
+        converts = False
+        table = build_dispatch_table(self.document, schema)
+        if table is not None and all(self.component(branch.get("$ref")) for branch in table.branches if isinstance(branch, dict)):
+            lines, converts = self.dispatch_code(schema, table, var, pointer, inner), True
+        elif _is_object(schema):
+            nested = self.unique(hint)
+            self.queue.append((nested, schema))
+            lines, converts = self.call(f"decode_{nested}", var, pointer, inner), True
+        elif names == ["array"]:
+            lines, converts = self.array_code(schema, var, pointer, inner, hint, depth)
+        elif names:
+            python_type = _PYTHON_TYPES.get(names[0]) if len(names) == 1 else None
+            if python_type is not None and not python_type.startswith("("):
+                condition = f"type({var}) is not {python_type}"
+            else:
+                allowed = ", ".join(dict.fromkeys(
+                    part for name in names for part in _PYTHON_TYPES.get(name, "object").strip("()").split(", ")
+                ))
+                condition = f"type({var}) not in ({allowed},)"
+            if "integer" in names and "number" not in names:
+                # JSON numbers such as 1.0 are integers
+                condition = f"{condition} and not (type({var}) is float and {var}.is_integer())"
+            expected = " or ".join(names)
+            lines.append(f"{inner}if {condition}:")
+            lines.append(f"{inner}    raise DecodeError({pointer}, {('Expected ' + expected + '.')!r})")
+            lines.extend(self.constraint_code(schema, names, var, pointer, inner))
+        if "enum" in schema and isinstance(schema["enum"], list):
+            values = [value for value in schema["enum"] if value is not None or not nullable]
+            try:
+                hash(tuple(values))
+                enum, enum_is_set = self.constant("ENUM", f"frozenset({values!r})"), True
+            except TypeError:
+                enum, enum_is_set = self.constant("ENUM", repr(tuple(values))), False
+            condition = f"{var} not in {enum}"
+            if enum_is_set and not (names and all(name not in ("object", "array") for name in names)):
+                # Objects and arrays are unhashable and cannot be looked up in the set
+                condition = f"type({var}) in (dict, list) or {condition}"
+            lines.append(f"{inner}if {condition}:")
+            lines.append(f"{inner}    raise DecodeError({pointer}, {('Value is not one of ' + repr(values) + '.')!r})")
+        if "const" in schema:
+            lines.append(f"{inner}if {var} != {schema['const']!r}:")
+            lines.append(f"{inner}    raise DecodeError({pointer}, {('Value is not ' + repr(schema['const']) + '.')!r})")
+        if nullable and lines:
+            lines.insert(0, f"{indent}if {var} is not None:")
+        return lines, converts
+
+    def call(self, function: str, var: str, pointer: str, indent: str) -> List[str]:
+        return [
+            f"{indent}try:",
+            f"{indent}    {var} = {function}({var})",
+            f"{indent}except DecodeError as error:",
+            f"{indent}    raise error.within({pointer}) from None",
+        ]
+
+    def constraint_code(self, schema: Dict[str, Any], names: List[str], var: str, pointer: str, indent: str) -> List[str]:
+        lines = []
+        checks = []
+        if names == ["string"]:
+            if isinstance(schema.get("minLength"), int):
+                checks.append((f"len({var}) < {schema['minLength']}", f"String is shorter than {schema['minLength']}."))
+            if isinstance(schema.get("maxLength"), int):
+                checks.append((f"len({var}) > {schema['maxLength']}", f"String is longer than {schema['maxLength']}."))
+        elif all(name in ("integer", "number") for name in names):
+            for keyword_, operator, text in (
+                ("minimum", "<", "less than"), ("exclusiveMinimum", "<=", "not greater than"),
+                ("maximum", ">", "greater than"), ("exclusiveMaximum", ">=", "not less than"),
+            ):
+                limit = schema.get(keyword_)
+                # Infinite bounds never fail (and have no literal); NaN bounds are meaningless
+                if isinstance(limit, (int, float)) and not isinstance(limit, bool) and math.isfinite(limit):
+                    checks.append((f"{var} {operator} {limit!r}", f"Value is {text} {limit!r}."))
+        for condition, message in checks:
+            lines.append(f"{indent}if {condition}:")
+            lines.append(f"{indent}    raise DecodeError({pointer}, {message!r})")
+        return lines
+
+    def array_code(self, schema, var, pointer, indent, hint, depth) -> Tuple[List[str], bool]:
+        lines = [
+            f"{indent}if type({var}) is not list:",
+            f"{indent}    raise DecodeError({pointer}, 'Expected array.')",
+        ]
+        for keyword_, operator, text in (("minItems", "<", "fewer"), ("maxItems", ">", "more")):
+            if isinstance(schema.get(keyword_), int):
+                lines.append(f"{indent}if len({var}) {operator} {schema[keyword_]}:")
+                lines.append(f"{indent}    raise DecodeError({pointer}, {f'Array has {text} than {schema[keyword_]} items.'!r})")
+        index, item = f"index{depth}", f"item{depth}"
+        item_lines, converts = self.check(
+            schema.get("items"), item, f"{pointer} + '/' + str({index})", indent + "    ", hint + "Item", depth + 1
+        )
+        if not item_lines:
+            return lines, False
+        if converts:
+            result = f"items{depth}"
+            lines.append(f"{indent}{result} = []")
+            lines.append(f"{indent}for {index}, {item} in enumerate({var}):")
+            lines.extend(item_lines)
+            lines.append(f"{indent}    {result}.append({item})")
+            lines.append(f"{indent}{var} = {result}")
+        else:
+            lines.append(f"{indent}for {index}, {item} in enumerate({var}):")
+            lines.extend(item_lines)
+        return lines, converts
+
+    def dispatch_code(self, schema, table, var, pointer, indent) -> List[str]:
+        entries = ", ".join(
+            f"{value!r}: decode_{self.component(branch['$ref'])}"
+            for value, branch in self.dispatch_branches(table).items()
+        )
+        dispatch = self.constant("DISPATCH", "{" + entries + "}")
+        property_pointer = json_pointer(table.property_name)
+        return [
+            f"{indent}if type({var}) is not dict:",
+            f"{indent}    raise DecodeError({pointer}, 'Expected object.')",
+            f"{indent}decoder = {dispatch}.get({var}.get({table.property_name!r}))",
+            f"{indent}if decoder is None:",
+            f"{indent}    raise DecodeError({pointer} + {property_pointer!r}, "
+            f"{'Unknown or missing discriminator ' + repr(table.property_name) + '.'!r})",
+            *self.call("decoder", var, pointer, indent),
+        ]
+
+    def dispatch_branches(self, table) -> Dict[str, Any]:
+        # The table maps values to resolved schemas; map them back to their $ref branches
+        by_target = {}
+        for branch in table.branches:
+            if isinstance(branch, dict) and isinstance(branch.get("$ref"), str):
+                by_target.setdefault(id(self.resolve(branch["$ref"])), branch)
+        return {value: by_target[id(target)] for value, target in table.mapping.items() if id(target) in by_target}
+
+    def resolve(self, ref: str) -> Any:
+        name = unescape_pointer_token(ref[len(_SCHEMA_REF_PREFIX):])
+        return self.schemas.get(name)
+
+    # -- encoding --------------------------------------------------------
+
+    def encode_expression(self, schema: Any, var: str, depth: int = 0) -> Optional[str]:
+        """Returns an expression encoding `var`, or None if it is already JSON-ready."""
+        if not isinstance(schema, dict):
+            return None
+        identifier = self.component(schema.get("$ref"))
+        if identifier is not None:
+            expression = f"encode_{identifier}({var})"
+        elif "$ref" in schema:
+            return None
+        else:
+            schema = self.flattener.flatten(schema) if "allOf" in schema else schema
+            names, nullable = _types(schema)
+            if build_dispatch_table(self.document, schema) is not None:
+                expression = f"_encode({var})"
+            elif _is_object(schema):
+                expression = f"_encode({var})"
+            elif names == ["array"]:
+                item = f"item{depth}"
+                inner = self.encode_expression(schema.get("items"), item, depth + 1)
+                if inner is None:
+                    return None
+                expression = f"[{inner} for {item} in {var}]"
+            else:
+                return None
+            if nullable:
+                expression = f"None if {var} is None else {expression}"
+        return expression
+
+    # -- code blocks -----------------------------------------------------
+
+    def object_code(self, identifier: str, schema: Dict[str, Any]):
+        properties = schema["properties"]
+        required = [name for name in schema.get("required") or () if name in properties]
+        attributes = {}
+        taken = set()
+        for name in properties:
+            attribute = _identifier(name)
+            while attribute in taken:
+                attribute += "_"
+            taken.add(attribute)
+            attributes[name] = attribute
+        ordered = required + [name for name in properties if name not in required]
+        defaults = {
+            name: properties[name]["default"]
+            for name in ordered
+            if name not in required and isinstance(properties[name], dict) and "default" in properties[name]
+        }
+
+        parameters = ", ".join(
+            attributes[name] if name in required else f"{attributes[name]}=None" for name in ordered
+        )
+        lines = [
+            f"class {identifier}:",
+            f"    __slots__ = {tuple(attributes[name] for name in ordered)!r}",
+            "",
+            f"    def __init__(self{', ' + parameters if parameters else ''}):",
+        ]
+        for name in ordered:
+            attribute = attributes[name]
+            if name in defaults:
+                lines.append(f"        self.{attribute} = {defaults[name]!r} if {attribute} is None else {attribute}")
+            else:
+                lines.append(f"        self.{attribute} = {attribute}")
+        if not ordered:
+            lines.append("        pass")
+        fields = ", ".join(f"{attributes[name]}={{self.{attributes[name]}!r}}" for name in ordered)
+        lines += [
+            "",
+            "    def __repr__(self):",
+            f"        return f\"{identifier}({fields})\"",
+            "",
+            "    def __eq__(self, other):",
+            f"        if type(other) is not {identifier}:",
+            "            return NotImplemented",
+            f"        return ({''.join(f'self.{attributes[name]}, ' for name in ordered).rstrip()}) == "
+            f"({''.join(f'other.{attributes[name]}, ' for name in ordered).rstrip()})",
+        ]
+        self.blocks.append("\n".join(lines))
+
+        hint = identifier
+        lines = [
+            f"def decode_{identifier}(data):",
+            "    if type(data) is not dict:",
+            "        raise DecodeError('', 'Expected object.')",
+            f"    obj = _new({identifier})",
+        ]
+        for name in ordered:
+            attribute = attributes[name]
+            pointer = repr(json_pointer(name))
+            checks, _ = self.check(properties[name], "value", pointer, "    " if name in required else "        ", hint + _class_name(attribute))
+            if name in required:
+                lines += [
+                    "    try:",
+                    f"        value = data[{name!r}]",
+                    "    except KeyError:",
+                    f"        raise DecodeError({pointer}, {('Missing required property ' + repr(name) + '.')!r}) from None",
+                    *checks,
+                    f"    obj.{attribute} = value",
+                ]
+            else:
+                lines += [
+                    f"    value = data.get({name!r}, _MISSING)",
+                    "    if value is _MISSING:",
+                    f"        obj.{attribute} = {defaults.get(name)!r}",
+                    "    else:",
+                    *checks,
+                    f"        obj.{attribute} = value",
+                ]
+        lines.append("    return obj")
+        self.blocks.append("\n".join(lines))
+
+        lines = [f"def encode_{identifier}(obj):", "    data = {}"]
+        for name in ordered:
+            attribute = attributes[name]
+            expression = self.encode_expression(properties[name], "value") or "value"
+            lines.append(f"    value = obj.{attribute}")
+            if name in required:
+                lines.append(f"    data[{name!r}] = {expression}")
+            else:
+                lines.append("    if value is not None:")
+                lines.append(f"        data[{name!r}] = {expression}")
+        lines.append("    return data")
+        self.blocks.append("\n".join(lines))
+        self.classes[identifier] = f"encode_{identifier}"
+
+    def value_code(self, identifier: str, schema: Any):
+        checks, _ = self.check(schema, "data", "''", "    ", identifier)
+        self.blocks.append("\n".join([f"def decode_{identifier}(data):", *checks, "    return data"]))
+        expression = self.encode_expression(schema, "value")
+        self.blocks.append("\n".join([f"def encode_{identifier}(value):", f"    return {expression or 'value'}"]))
+
+
+def generate_module(document: Dict[str, Any]) -> str:
+    """Returns the source of a module with classes and decoders for `document`'s schemas."""
+    generator = _Generator(document)
+    body = generator.run()
+    document_fingerprint = fingerprint({"generator": GENERATOR_VERSION, "document": document})
+    info = document.get("info") or {}
+    # Spec text only reaches the source as string literals, never as raw comment or docstring text
+    title = f"{info.get('title', 'OpenAPI document')} {info.get('version', '')}".strip()
+    encoders = ", ".join(f"{identifier}: {encoder}" for identifier, encoder in generator.classes.items())
+    return "\n".join([
+        "# Generated by openapi_parser.codegen; do not edit.",
+        f"# fingerprint: {document_fingerprint}",
+        f"# source: {title!r}",
+        repr(f"Data classes and decoders for the component schemas of {title}."),
+        "from openapi_parser.exceptions import DecodeError",
+        "",
+        f"FINGERPRINT = {document_fingerprint!r}",
+        "",
+        "_MISSING = object()",
+        "_new = object.__new__",
+        "",
+        "",
+        "def _encode(value):",
+        "    encoder = _ENCODERS.get(type(value))",
+        "    if encoder is not None:",
+        "        return encoder(value)",
+        "    if type(value) is list:",
+        "        return [_encode(item) for item in value]",
+        "    return value",
+        "",
+        "",
+        body,
+        "",
+        "",
+        *generator.constants,
+        "_ENCODERS = {" + encoders + "}",
+        "",
+    ])
+
+
+def _existing_fingerprint(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            head = f.read(512)
+    except OSError:
+        return None
+    match = _FINGERPRINT_LINE.search(head)
+    return match.group(1) if match else None
+
+
+def write_module(document: Dict[str, Any], path: str) -> bool:
+    """Writes the generated module to `path` unless it is already up to date.
+
+    Returns:
+        True if the file was (re)generated.
+    """
+    document_fingerprint = fingerprint({"generator": GENERATOR_VERSION, "document": document})
+    if _existing_fingerprint(path) == document_fingerprint:
+        return False
+    source = generate_module(document)
+    temporary = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    with open(temporary, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(temporary, path)
+    return True
+
+
+def load_module(document: Dict[str, Any], path: Optional[str] = None) -> types.ModuleType:
+    """Returns the generated module for `document`, importing it from `path` if given.
+
+    Without a path the module is compiled in memory and cached by fingerprint.
+    Either way it is named after the fingerprint, never after the file, so it
+    cannot shadow another module in `sys.modules`.
+    """
+    document_fingerprint = fingerprint({"generator": GENERATOR_VERSION, "document": document})
+    name = f"openapi_parser_generated_{document_fingerprint[:12]}"
+    if path is None:
+        module = _MODULES.get(document_fingerprint)
+        if module is None:
+            module = types.ModuleType(name)
+            exec(compile(generate_module(document), f"<{module.__name__}>", "exec"), module.__dict__)
+            _MODULES[document_fingerprint] = module
+        return module
+    write_module(document, path)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules[name] = module
+    return module
@@ -0,0 +1,536 @@
+"""Semantic diff between two versions of an OpenAPI document.
+
+Path items and components are first compared by plain equality, which runs
+in C and stops at the first difference, and only entries that differ are
+walked in detail.  Entries that are equal but refer to a changed component
+are revisited through those components only.  Differences are then
+classified as breaking or non-breaking from the point of view of an
+existing client.
+
+Every call is still linear in the size of both documents: the equality
+checks and the scan for ``$ref``s touch every node.  Only the detailed
+comparison is proportional to what changed.
+"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.utils import json_pointer, resolve_pointer
+
+COMPONENT_KINDS = (
+    "schemas", "responses", "parameters", "examples", "requestBodies",
+    "headers", "securitySchemes", "links", "callbacks", "pathItems",
+)
+
+# Constraints whose value may only grow (upper bounds) or shrink (lower bounds)
+# without rejecting previously valid requests.
+_UPPER_BOUNDS = ("maxLength", "maximum", "exclusiveMaximum", "maxItems", "maxProperties")
+_LOWER_BOUNDS = ("minLength", "minimum", "exclusiveMinimum", "minItems", "minProperties")
+
+REQUEST = "request"
+RESPONSE = "response"
+
+
+# A single classified difference between two documents
+class Change(BaseModel):
+    code: str
+    pointer: str
+    breaking: bool
+    message: str
+    direction: Optional[str] = None
+    old: Optional[Any] = None
+    new: Optional[Any] = None
+
+
+# Machine-readable result of comparing two documents
+class DiffReport(BaseModel):
+    changes: List[Change] = []
+
+    @property
+    def breaking_changes(self) -> List[Change]:
+        return [change for change in self.changes if change.breaking]
+
+    @property
+    def has_breaking_changes(self) -> bool:
+        return any(change.breaking for change in self.changes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable summary suitable for CI tooling."""
+        breaking = len(self.breaking_changes)
+        return {
+            "breaking": breaking > 0,
+            "summary": {"breaking": breaking, "non_breaking": len(self.changes) - breaking},
+            "changes": [change.model_dump() for change in self.changes],
+        }
+
+
+def _local_refs(node) -> frozenset:
+    """Returns the local ``$ref`` targets anywhere under `node`."""
+    refs = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#"):
+                refs.add(ref)
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return frozenset(refs)
+
+
+def _types(schema: Dict[str, Any]) -> Optional[frozenset]:
+    value = schema.get("type")
+    if value is None:
+        return None
+    types = frozenset([value] if isinstance(value, str) else value)
+    # "number" accepts every integer, so treat it as covering "integer"
+    if "number" in types:
+        types = types | {"integer"}
+    return types
+
+
+def _is_success(status: str) -> bool:
+    return status.startswith("2") or status.lower() == "default"
+
+
+class _Differ:
+    def __init__(self, old: Dict[str, Any], new: Dict[str, Any]):
+        self.old = old
+        self.new = new
+        self.changes: List[Change] = []
+        self.dirty = set()
+        self._refs: Dict[int, frozenset] = {}
+        self._compared = set()
+
+    # -- helpers -----------------------------------------------------------
+
+    def report(self, code, pointer, breaking, message, old=None, new=None, direction=None):
+        self.changes.append(
+            Change(
+                code=code, pointer=pointer, breaking=breaking, message=message,
+                direction=direction, old=old, new=new,
+            )
+        )
+
+    def refs(self, node) -> frozenset:
+        key = id(node)
+        value = self._refs.get(key)
+        if value is None:
+            value = self._refs[key] = _local_refs(node)
+        return value
+
+    def same(self, a, b) -> bool:
+        """True when `a` and `b` are equal and refer to no dirty component."""
+        if a != b:
+            return False
+        if not self.dirty or not isinstance(b, (dict, list)):
+            return True
+        return self.dirty.isdisjoint(self.refs(b))
+
+    @staticmethod
+    def deref(document, node, pointer):
+        """Follows local `$ref` chains, returning the target and its pointer."""
+        seen = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str):
+            ref = node["$ref"]
+            if ref in seen or not ref.startswith("#"):
+                break
+            seen.add(ref)
+            try:
+                node = resolve_pointer(document, ref)
+            except ReferenceResolutionError:
+                break
+            pointer = ref[1:]
+        return node, pointer
+
+    # -- paths and operations ------------------------------------------------
+
+    def diff_paths(self, dirty):
+        old_paths = self.old.get("paths") or {}
+        new_paths = self.new.get("paths") or {}
+        if old_paths == new_paths and not dirty:
+            return
+        for path, old_item in old_paths.items():
+            if path not in new_paths:
+                for method in HTTP_METHODS:
+                    if method in (old_item or {}):
+                        self.report(
+                            "operation-removed", json_pointer("paths", path, method), True,
+                            f"Operation {method.upper()} {path} was removed.",
+                        )
+            elif old_item != new_paths[path]:
+                self.diff_path_item(path, old_item or {}, new_paths[path] or {})
+            elif dirty and not dirty.isdisjoint(_local_refs(new_paths[path])):
+                self.diff_path_item_refs(path, old_item or {}, new_paths[path] or {})
+        for path in new_paths:
+            if path not in old_paths:
+                for method in HTTP_METHODS:
+                    if method in (new_paths[path] or {}):
+                        self.report(
+                            "operation-added", json_pointer("paths", path, method), False,
+                            f"Operation {method.upper()} {path} was added.",
+                        )
+
+    def diff_path_item(self, path, old_item, new_item):
+        for method in HTTP_METHODS:
+            old_op = old_item.get(method)
+            new_op = new_item.get(method)
+            pointer = json_pointer("paths", path, method)
+            if old_op is None and new_op is None:
+                continue
+            if new_op is None:
+                self.report("operation-removed", pointer, True, f"Operation {method.upper()} {path} was removed.")
+            elif old_op is None:
+                self.report("operation-added", pointer, False, f"Operation {method.upper()} {path} was added.")
+            else:
+                self.diff_operation(path, method, old_item, old_op, new_item, new_op)
+
+    def diff_path_item_refs(self, path, old_item, new_item):
+        """Diffs a path item whose own content is unchanged.
+
+        Only the dirty schema components it refers to can have changed, so
+        they are compared directly in the direction they are used in; every
+        other part of the operation is skipped.  The per-component memo makes
+        this constant time for components already compared elsewhere.
+        """
+        for method in HTTP_METHODS:
+            operation = new_item.get(method)
+            if operation is None:
+                continue
+            used = (
+                (REQUEST, [new_item.get("parameters"), operation.get("parameters"), operation.get("requestBody")]),
+                (RESPONSE, operation.get("responses")),
+            )
+            for direction, node in used:
+                refs = self.dirty.intersection(_local_refs(node))
+                if any(not ref.startswith("#/components/schemas/") for ref in refs):
+                    self.diff_operation(path, method, old_item, old_item[method], new_item, operation)
+                    break
+                for ref in refs:
+                    self.diff_schema({"$ref": ref}, {"$ref": ref}, ref[1:], direction)
+
+    def parameters(self, document, path, item, operation):
+        params = {}
+        for owner, prefix in ((item, ("paths", path)), (operation, None)):
+            for index, param in enumerate(owner.get("parameters") or []):
+                tokens = (prefix or ()) + ("parameters", index)
+                param_pointer = json_pointer(*tokens) if prefix else None
+                resolved, param_pointer = self.deref(document, param, param_pointer)
+                if isinstance(resolved, dict) and "name" in resolved:
+                    params[(resolved.get("in"), resolved["name"])] = (resolved, param_pointer, index)
+        return params
+
+    def diff_operation(self, path, method, old_item, old_op, new_item, new_op):
+        pointer = json_pointer("paths", path, method)
+        label = f"{method.upper()} {path}"
+
+        if old_op.get("operationId") != new_op.get("operationId"):
+            self.report(
+                "operation-id-changed", pointer + "/operationId", True,
+                f"operationId of {label} changed.", old_op.get("operationId"), new_op.get("operationId"),
+            )
+
+        old_security = old_op.get("security", self.old.get("security"))
+        new_security = new_op.get("security", self.new.get("security"))
+        if not self.same(old_security, new_security):
+            self.report(
+                "security-changed", pointer + "/security", True,
+                f"Security requirements of {label} changed.", old_security, new_security,
+            )
+
+        self.diff_parameters(label, pointer, path, old_item, old_op, new_item, new_op)
+        self.diff_request_body(label, pointer, old_op.get("requestBody"), new_op.get("requestBody"))
+        self.diff_responses(label, pointer, old_op.get("responses") or {}, new_op.get("responses") or {})
+
+    def diff_parameters(self, label, pointer, path, old_item, old_op, new_item, new_op):
+        old_params = self.parameters(self.old, path, old_item, old_op)
+        new_params = self.parameters(self.new, path, new_item, new_op)
+        for key, (new_param, new_pointer, index) in new_params.items():
+            location, name = key
+            new_pointer = new_pointer or f"{pointer}/parameters/{index}"
+            required = bool(new_param.get("required"))
+            if key not in old_params:
+                if required:
+                    self.report(
+                        "required-parameter-added", new_pointer, True,
+                        f"Required {location} parameter '{name}' was added to {label}.",
+                    )
+                else:
+                    self.report(
+                        "optional-parameter-added", new_pointer, False,
+                        f"Optional {location} parameter '{name}' was added to {label}.",
+                    )
+                continue
+            old_param = old_params[key][0]
+            if self.same(old_param, new_param):
+                continue
+            if required and not old_param.get("required"):
+                self.report(
+                    "parameter-became-required", new_pointer, True,
+                    f"{location.capitalize()} parameter '{name}' of {label} became required.",
+                )
+            elif old_param.get("required") and not required:
+                self.report(
+                    "parameter-became-optional", new_pointer, False,
+                    f"{location.capitalize()} parameter '{name}' of {label} became optional.",
+                )
+            if "schema" in old_param and "schema" in new_param:
+                self.diff_schema(old_param["schema"], new_param["schema"], new_pointer + "/schema", REQUEST)
+        for key, (old_param, old_pointer, index) in old_params.items():
+            if key not in new_params:
+                location, name = key
+                # Clients still send a removed parameter; only required ones were relied upon
+                self.report(
+                    "parameter-removed", old_pointer or f"{pointer}/parameters/{index}",
+                    bool(old_param.get("required")) or location == "path",
+                    f"{location.capitalize()} parameter '{name}' was removed from {label}.",
+                )
+
+    def diff_request_body(self, label, pointer, old_body, new_body):
+        pointer = pointer + "/requestBody"
+        old_body, _ = self.deref(self.old, old_body, pointer)
+        new_body, pointer = self.deref(self.new, new_body, pointer)
+        if old_body is None and new_body is None:
+            return
+        if old_body is None:
+            required = bool(new_body.get("required"))
+            self.report(
+                "request-body-added", pointer, required,
+                f"A {'required' if required else 'optional'} request body was added to {label}.",
+            )
+            return
+        if new_body is None:
+            self.report("request-body-removed", pointer, False, f"The request body of {label} was removed.")
+            return
+        if self.same(old_body, new_body):
+            return
+        if new_body.get("required") and not old_body.get("required"):
+            self.report("request-body-became-required", pointer, True, f"The request body of {label} became required.")
+        self.diff_content(
+            label, pointer, old_body.get("content") or {}, new_body.get("content") or {},
+            REQUEST, "request-media-type-removed", True,
+        )
+
+    def diff_responses(self, label, pointer, old_responses, new_responses):
+        old_responses = {str(code): value for code, value in old_responses.items()}
+        new_responses = {str(code): value for code, value in new_responses.items()}
+        for status, old_response in old_responses.items():
+            response_pointer = pointer + json_pointer("responses", status)
+            if status not in new_responses:
+                self.report(
+                    "response-removed", response_pointer, _is_success(status),
+                    f"Response '{status}' was removed from {label}.",
+                )
+                continue
+            old_resolved, _ = self.deref(self.old, old_response, response_pointer)
+            new_resolved, response_pointer = self.deref(self.new, new_responses[status], response_pointer)
+            if self.same(old_resolved, new_resolved) or not isinstance(old_resolved, dict) or not isinstance(new_resolved, dict):
+                continue
+            self.diff_content(
+                label, response_pointer, old_resolved.get("content") or {}, new_resolved.get("content") or {},
+                RESPONSE, "response-media-type-removed", _is_success(status),
+            )
+        for status in new_responses:
+            if status not in old_responses:
+                self.report(
+                    "response-added", pointer + json_pointer("responses", status), False,
+                    f"Response '{status}' was added to {label}.",
+                )
+
+    def diff_content(self, label, pointer, old_content, new_content, direction, removed_code, removed_breaking):
+        for media_type, old_media in old_content.items():
+            media_pointer = pointer + json_pointer("content", media_type)
+            if media_type not in new_content:
+                self.report(
+                    removed_code, media_pointer, removed_breaking,
+                    f"Media type '{media_type}' was removed from {label}.",
+                )
+                continue
+            new_media = new_content[media_type] or {}
+            old_media = old_media or {}
+            if "schema" in old_media and "schema" in new_media:
+                self.diff_schema(old_media["schema"], new_media["schema"], media_pointer + "/schema", direction)
+
+    # -- schemas -----------------------------------------------------------
+
+    def diff_schema(self, old_schema, new_schema, pointer, direction):
+        old_schema, _ = self.deref(self.old, old_schema, pointer)
+        new_schema, pointer = self.deref(self.new, new_schema, pointer)
+        if not isinstance(old_schema, dict) or not isinstance(new_schema, dict):
+            return
+        key = (id(old_schema), id(new_schema), direction)
+        if key in self._compared or self.same(old_schema, new_schema):
+            return
+        self._compared.add(key)
+        request = direction == REQUEST
+
+        old_types, new_types = _types(old_schema), _types(new_schema)
+        if old_types != new_types:
+            if request:
+                breaking = new_types is not None and (old_types is None or not old_types <= new_types)
+            else:
+                breaking = old_types is not None and (new_types is None or not new_types <= old_types)
+            self.report(
+                "type-changed", pointer, breaking, f"Schema type changed in the {direction} schema.",
+                old_schema.get("type"), new_schema.get("type"), direction=direction,
+            )
+
+        self.diff_enum(old_schema, new_schema, pointer, direction)
+        self.diff_constraints(old_schema, new_schema, pointer, direction)
+
+        old_required = set(old_schema.get("required") or ())
+        new_required = set(new_schema.get("required") or ())
+        old_properties = old_schema.get("properties") or {}
+        new_properties = new_schema.get("properties") or {}
+        if request:
+            for name in sorted(new_required - old_required):
+                self.report(
+                    "required-property-added", pointer + "/required", True,
+                    f"Property '{name}' became required in the request.", new=name, direction=direction,
+                )
+        else:
+            for name in sorted(old_required - new_required):
+                if name in new_properties or name not in old_properties:
+                    self.report(
+                        "property-became-optional", pointer + "/required", True,
+                        f"Property '{name}' is no longer guaranteed in the response.", old=name, direction=direction,
+                    )
+        for name in old_properties:
+            if name not in new_properties:
+                self.report(
+                    "property-removed", pointer + json_pointer("properties", name), not request,
+                    f"Property '{name}' was removed from the {direction} schema.", direction=direction,
+                )
+        for name, new_property in new_properties.items():
+            property_pointer = pointer + json_pointer("properties", name)
+            if name not in old_properties:
+                if not (request and name in new_required):
+                    self.report(
+                        "property-added", property_pointer, False,
+                        f"Property '{name}' was added to the {direction} schema.", direction=direction,
+                    )
+            else:
+                self.diff_schema(old_properties[name], new_property, property_pointer, direction)
+
+        for keyword in ("items", "additionalProperties", "contains", "propertyNames", "not"):
+            old_child, new_child = old_schema.get(keyword), new_schema.get(keyword)
+            if isinstance(old_child, dict) and isinstance(new_child, dict):
+                self.diff_schema(old_child, new_child, f"{pointer}/{keyword}", direction)
+
+        for keyword in ("allOf", "anyOf", "oneOf"):
+            old_branches = old_schema.get(keyword) or []
+            new_branches = new_schema.get(keyword) or []
+            if self.same(old_branches, new_branches):
+                continue
+            if len(old_branches) != len(new_branches):
+                self.report(
+                    "composition-changed", f"{pointer}/{keyword}", True,
+                    f"The '{keyword}' branches of the {direction} schema changed.",
+                    len(old_branches), len(new_branches), direction=direction,
+                )
+                continue
+            for index, (old_branch, new_branch) in enumerate(zip(old_branches, new_branches)):
+                self.diff_schema(old_branch, new_branch, f"{pointer}/{keyword}/{index}", direction)
+
+    def diff_enum(self, old_schema, new_schema, pointer, direction):
+        request = direction == REQUEST
+        old_enum, new_enum = old_schema.get("enum"), new_schema.get("enum")
+        if old_enum == new_enum:
+            return
+        if new_enum is not None and (old_enum is None or any(value not in new_enum for value in old_enum)):
+            removed = None if old_enum is None else [value for value in old_enum if value not in new_enum]
+            self.report(
+                "enum-narrowed", pointer + "/enum", request,
+                "Enum values were removed." if old_enum else "An enum restriction was added.",
+                old=removed, new=new_enum, direction=direction,
+            )
+        if old_enum is not None and (new_enum is None or any(value not in old_enum for value in new_enum)):
+            added = None if new_enum is None else [value for value in new_enum if value not in old_enum]
+            self.report(
+                "enum-widened", pointer + "/enum", not request,
+                "Enum values were added." if new_enum else "The enum restriction was removed.",
+                old=old_enum, new=added, direction=direction,
+            )
+
+    def diff_constraints(self, old_schema, new_schema, pointer, direction):
+        request = direction == REQUEST
+        for keyword in _UPPER_BOUNDS + _LOWER_BOUNDS:
+            old_value, new_value = old_schema.get(keyword), new_schema.get(keyword)
+            if old_value == new_value:
+                continue
+            upper = keyword in _UPPER_BOUNDS
+            if new_value is None:
+                narrowed = False
+            elif old_value is None:
+                narrowed = True
+            else:
+                narrowed = new_value < old_value if upper else new_value > old_value
+            self.report(
+                "constraint-narrowed" if narrowed else "constraint-widened",
+                f"{pointer}/{keyword}", narrowed == request,
+                f"'{keyword}' changed from {old_value!r} to {new_value!r}.", old_value, new_value, direction=direction,
+            )
+
+    # -- components --------------------------------------------------------
+
+    def diff_components(self):
+        """Reports added/removed components and returns the "dirty" set.
+
+        A component is dirty when it changed itself or when it refers to a
+        dirty component, so callers can skip every unchanged path item whose
+        refs avoid the dirty set.
+        """
+        old_components = self.old.get("components") or {}
+        new_components = self.new.get("components") or {}
+        dirty = set()
+        referrers: Dict[str, set] = {}
+        for kind in COMPONENT_KINDS:
+            old_section = old_components.get(kind) or {}
+            new_section = new_components.get(kind) or {}
+            unchanged = old_section == new_section
+            for name, component in new_section.items():
+                ref = "#" + json_pointer("components", kind, name)
+                # Edges are needed even through unchanged kinds, e.g. an unchanged
+                # response that refers to a changed schema
+                for target in _local_refs(component):
+                    referrers.setdefault(target, set()).add(ref)
+                if unchanged:
+                    continue
+                if name not in old_section:
+                    self.report(
+                        "component-added", ref[1:], False, f"Component '{kind}/{name}' was added.",
+                    )
+                elif old_section[name] != component:
+                    dirty.add(ref)
+            if unchanged:
+                continue
+            for name in old_section:
+                if name not in new_section:
+                    ref = "#" + json_pointer("components", kind, name)
+                    dirty.add(ref)
+                    self.report(
+                        "component-removed", ref[1:], False, f"Component '{kind}/{name}' was removed.",
+                    )
+        pending = list(dirty)
+        while pending:
+            for referrer in referrers.get(pending.pop(), ()):
+                if referrer not in dirty:
+                    dirty.add(referrer)
+                    pending.append(referrer)
+        return dirty
+
+
+def diff_specs(old: Dict[str, Any], new: Dict[str, Any]) -> DiffReport:
+    """Compares two raw OpenAPI documents and classifies every difference.
+
+    Both arguments are the plain dictionaries produced by the YAML/JSON
+    loaders.  Equal path items, operations and component subtrees are
+    skipped after an equality check; the detailed comparison only walks what
+    changed, but the checks themselves are linear in the document size.
+    """
+    differ = _Differ(old, new)
+    differ.dirty = differ.diff_components()
+    differ.diff_paths(differ.dirty)
+    return DiffReport(changes=differ.changes)
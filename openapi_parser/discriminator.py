@@ -0,0 +1,115 @@
+"""Precomputed discriminator dispatch for `oneOf`/`anyOf` polymorphism.
+
+A schema with a ``discriminator`` names the property whose value selects the
+branch an instance must match.  `DispatchTable` turns the discriminator of
+one schema into a dictionary from property value to resolved branch schema,
+built from the explicit ``mapping`` plus the implicit mapping of every
+``#/components/schemas/<Name>`` branch to ``Name``.  Selecting a branch at
+runtime is then a single dictionary lookup instead of trying each branch.
+"""
+from typing import Any, Dict, List, Optional
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.utils import escape_pointer_token, resolve_pointer, unescape_pointer_token
+
+_SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+
+class DispatchTable:
+    """Maps discriminator values of one `oneOf`/`anyOf` schema to branch schemas.
+
+    Attributes:
+        property_name: The discriminating property.
+        branches: The branches of the composition, in document order.
+        mapping: Discriminator value -> resolved branch schema.
+    """
+
+    __slots__ = ("property_name", "branches", "mapping")
+
+    def __init__(self, property_name: str, branches: List[Any], mapping: Dict[str, Any]):
+        self.property_name = property_name
+        self.branches = branches
+        self.mapping = mapping
+
+    def select(self, instance: Any) -> Optional[Any]:
+        """Returns the branch for `instance`, or None if its value is missing or unmapped."""
+        if not isinstance(instance, dict):
+            return None
+        value = instance.get(self.property_name)
+        return self.mapping.get(value) if isinstance(value, str) else None
+
+    def __repr__(self):
+        return f"DispatchTable({self.property_name!r}, {sorted(self.mapping)!r})"
+
+
+def _resolve(document: Dict[str, Any], node: Any) -> Any:
+    # Follows a $ref chain; unresolvable references are kept so validation reports them
+    seen = set()
+    while isinstance(node, dict) and isinstance(node.get("$ref"), str) and len(node) == 1 and node["$ref"] not in seen:
+        seen.add(node["$ref"])
+        try:
+            node = resolve_pointer(document, node["$ref"])
+        except ReferenceResolutionError:
+            break
+    return node
+
+
+def build_dispatch_table(document: Dict[str, Any], schema: Any) -> Optional[DispatchTable]:
+    """Builds the dispatch table of `schema`, or returns None if it has no usable discriminator."""
+    if not isinstance(schema, dict):
+        return None
+    discriminator = schema.get("discriminator")
+    branches = schema.get("oneOf") or schema.get("anyOf")
+    if not isinstance(discriminator, dict) or not isinstance(branches, list):
+        return None
+    property_name = discriminator.get("propertyName")
+    if not isinstance(property_name, str):
+        return None
+    mapping: Dict[str, Any] = {}
+    by_ref = {}
+    for branch in branches:
+        ref = branch.get("$ref") if isinstance(branch, dict) else None
+        if isinstance(ref, str):
+            by_ref[ref] = branch
+            if ref.startswith(_SCHEMA_REF_PREFIX) and "/" not in ref[len(_SCHEMA_REF_PREFIX):]:
+                mapping[unescape_pointer_token(ref[len(_SCHEMA_REF_PREFIX):])] = _resolve(document, branch)
+    explicit = discriminator.get("mapping")
+    if isinstance(explicit, dict):
+        for value, target in explicit.items():
+            if not isinstance(target, str):
+                continue
+            # Mapping values are either references or bare component names
+            ref = target if "#" in target or "/" in target else _SCHEMA_REF_PREFIX + escape_pointer_token(target)
+            mapping[str(value)] = _resolve(document, by_ref.get(ref, {"$ref": ref}))
+    return DispatchTable(property_name, branches, mapping)
+
+
+class DiscriminatorIndex:
+    """Dispatch tables for every discriminated schema of a document.
+
+    All tables are built up front; `table` also accepts schemas that are not
+    part of the document and builds theirs on first use.
+    """
+
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        # id(schema) -> (schema, table); the schema is kept so its id stays unique
+        self._tables: Dict[int, tuple] = {}
+        stack = [document]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, dict):
+                if "discriminator" in node:
+                    self.table(node)
+                stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+    def table(self, schema: Any) -> Optional[DispatchTable]:
+        """Returns the dispatch table of `schema`, or None if it has no discriminator."""
+        entry = self._tables.get(id(schema))
+        if entry is None or entry[0] is not schema:
+            entry = self._tables[id(schema)] = (schema, build_dispatch_table(self.document, schema))
+        return entry[1]
+
+    def __len__(self):
+        return sum(1 for _, table in self._tables.values() if table is not None)
@@ -1,14 +1,94 @@
+def _with_location(message, location):
+    if location is None:
+        return message
+    line, column = location
+    return f"{message} (line {line}, column {column})"
+
+
+class ValidationIssue:
+    """
+    A single structured problem found while validating an OpenAPI document.
+
+    The human-readable message is only formatted when first accessed, so
+    collecting thousands of issues stays cheap when callers only look at
+    pointers and codes.
+
+    Attributes:
+        pointer (str): JSON Pointer of the offending node ("" for the root).
+        code (str): Machine-readable error code, e.g. "missing-field".
+        message (str): Description of the problem.
+        location (tuple[int, int] | None): 1-based (line, column) in the
+            source text, when the document was loaded with location tracking.
+    """
+
+    __slots__ = ("pointer", "code", "location", "_template", "_params", "_message")
+
+    def __init__(self, pointer: str, code: str, template: str, **params):
+        self.pointer = pointer
+        self.code = code
+        self.location = None
+        self._template = template
+        self._params = params
+        self._message = None
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self._template.format(**self._params) if self._params else self._template
+        return self._message
+
+    def to_dict(self) -> dict:
+        data = {"pointer": self.pointer, "code": self.code, "message": self.message}
+        if self.location is not None:
+            data["line"], data["column"] = self.location
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        return (self.pointer, self.code, self.message) == (other.pointer, other.code, other.message)
+
+    def __repr__(self):
+        return f"ValidationIssue(pointer={self.pointer!r}, code={self.code!r}, message={self.message!r})"
+
+    def __str__(self):
+        return _with_location(f"{self.pointer or '/'}: {self.message}", self.location)
+
+
 class ParsingError(Exception):
     """
     Raised when an error occurs during parsing of the OpenAPI document.
 
     Attributes:
         message (str): Description of the parsing error.
+        errors (list[ValidationIssue]): Structured issues behind the error,
+            when known.
+        location (tuple[int, int] | None): 1-based (line, column) of the
+            offending node, when known.
     """
 
-    def __init__(self, message: str):
+    def __init__(self, message: str, errors=None, location=None):
         super().__init__(message)
         self.message = message
+        self.errors = list(errors) if errors else []
+        self.location = location
+
+    def __str__(self):
+        return _with_location(self.message, self.location)
+
+
+class ResourceLimitError(ParsingError):
+    """
+    Raised when an input document exceeds a `ResourceLimits` bound (see
+    `openapi_parser.limits`), before it has been fully loaded.
+
+    Attributes:
+        limit (str): Name of the exceeded limit, e.g. "max_depth".
+    """
+
+    def __init__(self, message: str, limit: str, location=None):
+        super().__init__(message, location=location)
+        self.limit = limit
 
 
 class ValidationError(Exception):
@@ -31,8 +111,40 @@ class ReferenceResolutionError(Exception):
 
     Attributes:
         message (str): Description of the reference resolution error.
+        pointer (str | None): JSON Pointer of the offending `$ref`, when known.
+        location (tuple[int, int] | None): 1-based (line, column) of the
+            offending `$ref`, when known.
     """
 
-    def __init__(self, message: str):
+    def __init__(self, message: str, pointer=None, location=None):
         super().__init__(message)
         self.message = message
+        self.pointer = pointer
+        self.location = location
+
+    def __str__(self):
+        return _with_location(self.message, self.location)
+
+
+class DecodeError(ValueError):
+    """
+    Raised by generated decoders (see `openapi_parser.codegen`) when a payload
+    does not match its schema, and by parameter codecs (see
+    `openapi_parser.params`) for missing or malformed request parameters.
+
+    Attributes:
+        pointer (str): JSON Pointer of the offending value in the payload.
+        message (str): Description of the problem.
+    """
+
+    def __init__(self, pointer: str, message: str):
+        super().__init__(pointer, message)
+        self.pointer = pointer
+        self.message = message
+
+    def within(self, prefix: str) -> "DecodeError":
+        """Returns the same error with `prefix` prepended to its pointer."""
+        return DecodeError(prefix + self.pointer, self.message)
+
+    def __str__(self):
+        return f"{self.pointer or '/'}: {self.message}"
@@ -0,0 +1,304 @@
+"""Flattening of `allOf` compositions into effective schemas.
+
+`SchemaFlattener` merges every `allOf` chain of a document's schemas once:
+properties are united (shared properties merged recursively), ``required``
+lists are combined, numeric/length bounds are intersected and enums and types
+narrowed.  Keywords that cannot be combined into a single value (two
+different ``pattern``s, two ``oneOf``s, ...) are kept in a residual ``allOf``
+so the effective schema accepts exactly what the original did.  So are
+whole members whose ``additionalProperties``/``unevaluatedProperties`` (or
+``items``/``unevaluatedItems`` after ``prefixItems``) would apply to a
+different set of properties (or positions) once merged.  Contradictory
+constraints (``minimum`` above ``maximum``, disjoint enums or types) are
+reported as `ValidationIssue`s.
+
+The effective schema of each component is computed on first request and
+memoized, so later lookups are a dictionary access.  Inputs are never
+modified; `$ref`s outside `allOf` are left in place.
+"""
+from math import gcd
+from typing import Any, Dict, List, Tuple
+from openapi_parser.exceptions import ReferenceResolutionError, ValidationIssue
+from openapi_parser.utils import json_pointer, resolve_pointer
+
+_SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# Keywords holding a single subschema (or a boolean schema)
+_SUBSCHEMA_KEYWORDS = (
+    "items", "contains", "propertyNames", "additionalProperties", "unevaluatedProperties",
+    "unevaluatedItems", "contentSchema", "not", "if", "then", "else",
+)
+# Keywords holding a mapping or list of subschemas
+_SUBSCHEMA_MAPS = ("properties", "patternProperties", "dependentSchemas")
+_SUBSCHEMA_LISTS = ("prefixItems", "anyOf", "oneOf")
+
+# Keywords constraining what their schema's own properties / prefixItems leave over
+_PROPERTY_REMAINDERS = ("additionalProperties", "unevaluatedProperties")
+_ITEM_REMAINDERS = ("items", "unevaluatedItems")
+
+# Subschema keywords whose values can be merged by intersecting both schemas
+_MERGEABLE_SUBSCHEMAS = (
+    "items", "contains", "propertyNames", "additionalProperties", "unevaluatedProperties",
+    "unevaluatedItems", "contentSchema",
+)
+
+_UPPER_BOUNDS = ("maximum", "exclusiveMaximum", "maxLength", "maxItems", "maxProperties", "maxContains")
+_LOWER_BOUNDS = ("minimum", "exclusiveMinimum", "minLength", "minItems", "minProperties", "minContains")
+
+# (lower, upper, whether equal bounds are contradictory)
+_BOUND_PAIRS = (
+    ("minimum", "maximum", False),
+    ("exclusiveMinimum", "maximum", True),
+    ("minimum", "exclusiveMaximum", True),
+    ("exclusiveMinimum", "exclusiveMaximum", True),
+    ("minLength", "maxLength", False),
+    ("minItems", "maxItems", False),
+    ("minProperties", "maxProperties", False),
+    ("minContains", "maxContains", False),
+)
+
+_FLAGS = ("uniqueItems", "readOnly", "writeOnly", "deprecated")
+
+# Descriptive keywords; the later (more derived) schema wins
+_ANNOTATIONS = (
+    "title", "description", "default", "example", "examples", "externalDocs", "xml", "discriminator", "$comment",
+)
+
+
+def _types(value) -> List[str]:
+    return list(value) if isinstance(value, list) else [value]
+
+
+def _intersect_types(left, right) -> List[str]:
+    right_types = _types(right)
+    result = []
+    for name in _types(left):
+        if name in right_types:
+            result.append(name)
+        elif name == "number" and "integer" in right_types:
+            result.append("integer")
+        elif name == "integer" and "number" in right_types:
+            result.append("integer")
+    return result
+
+
+def _restricts(schema: Dict[str, Any], keywords) -> bool:
+    return any(keyword in schema and schema[keyword] is not True and schema[keyword] != {} for keyword in keywords)
+
+
+def _unmergeable(parts: List[Any]) -> set:
+    # Indexes of parts whose remainder keywords would cover other names or
+    # positions after merging: `additionalProperties: false` next to
+    # `properties: {a}` must keep rejecting a `b` that another part declares.
+    schemas = [(index, part) for index, part in enumerate(parts) if isinstance(part, dict)]
+    names = [
+        (frozenset(part.get("properties") or ()), frozenset(part.get("patternProperties") or ())) for _, part in schemas
+    ]
+    all_names = (frozenset().union(*(own for own, _ in names)), frozenset().union(*(pattern for _, pattern in names)))
+    positions = {len(part.get("prefixItems") or ()) for _, part in schemas}
+    kept = set()
+    for (index, part), own in zip(schemas, names):
+        if _restricts(part, _PROPERTY_REMAINDERS) and own != all_names:
+            kept.add(index)
+        elif _restricts(part, _ITEM_REMAINDERS) and len(positions) > 1:
+            kept.add(index)
+    return kept
+
+
+class SchemaFlattener:
+    """Computes and memoizes the effective (allOf-merged) schema of each component.
+
+    Args:
+        document: The raw OpenAPI document whose ``components.schemas`` are
+            flattened.
+
+    Attributes:
+        issues: Conflicts found so far, with JSON Pointers into the document.
+    """
+
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        self.schemas: Dict[str, Any] = (document.get("components") or {}).get("schemas") or {}
+        self.issues: List[ValidationIssue] = []
+        self._effective: Dict[str, Any] = {}
+        self._in_progress = set()
+
+    def effective(self, name: str) -> Any:
+        """Returns the flattened schema of component `name`.
+
+        Raises:
+            KeyError: If the document has no such schema.
+        """
+        try:
+            return self._effective[name]
+        except KeyError:
+            pass
+        schema = self.schemas[name]
+        self._in_progress.add(name)
+        try:
+            result = self.flatten(schema, json_pointer("components", "schemas", name))
+        finally:
+            self._in_progress.discard(name)
+        self._effective[name] = result
+        return result
+
+    def flatten_all(self) -> Dict[str, Any]:
+        """Returns the effective schema of every component, keyed by name."""
+        return {name: self.effective(name) for name in self.schemas}
+
+    def flatten(self, schema: Any, pointer: str = "") -> Any:
+        """Returns `schema` with every nested `allOf` merged into its parent."""
+        if not isinstance(schema, dict) or isinstance(schema.get("$ref"), str):
+            return schema
+        result = {}
+        for key, value in schema.items():
+            if key == "allOf":
+                continue
+            if key in _SUBSCHEMA_MAPS and isinstance(value, dict):
+                value = {name: self.flatten(item, f"{pointer}/{key}{json_pointer(name)}") for name, item in value.items()}
+            elif (key in _SUBSCHEMA_LISTS or key == "items") and isinstance(value, list):
+                value = [self.flatten(item, f"{pointer}/{key}/{index}") for index, item in enumerate(value)]
+            elif key in _SUBSCHEMA_KEYWORDS:
+                value = self.flatten(value, f"{pointer}/{key}")
+            result[key] = value
+        members = schema.get("allOf")
+        if not isinstance(members, list) or not members:
+            return result
+        parts = [self._member(member, f"{pointer}/allOf/{index}") for index, member in enumerate(members)]
+        parts.append(result)
+        kept = _unmergeable(parts)
+        merged: Dict[str, Any] = {}
+        for index, part in enumerate(parts):
+            if index in kept:
+                merged.setdefault("allOf", []).append(part)
+            else:
+                self._merge(merged, part, pointer)
+        return merged
+
+    def _member(self, member: Any, pointer: str) -> Any:
+        if not isinstance(member, dict):
+            return member
+        ref = member.get("$ref")
+        if not isinstance(ref, str):
+            return self.flatten(member, pointer)
+        siblings = {key: value for key, value in member.items() if key != "$ref"}
+        if ref.startswith(_SCHEMA_REF_PREFIX) and "/" not in ref[len(_SCHEMA_REF_PREFIX):]:
+            name = ref[len(_SCHEMA_REF_PREFIX):].replace("~1", "/").replace("~0", "~")
+            if name in self._in_progress:
+                self._issue(pointer, "allof-cycle", "Schema '{name}' includes itself through allOf.", name=name)
+                return member
+            if name in self.schemas:
+                target = self.effective(name)
+                return self.flatten({"allOf": [target, siblings]}, pointer) if siblings else target
+        try:
+            target = resolve_pointer(self.document, ref)
+        except ReferenceResolutionError:
+            self._issue(pointer, "unresolved-ref", "Reference '{ref}' cannot be merged.", ref=ref)
+            return member
+        return self.flatten({"allOf": [target, siblings]} if siblings else target, pointer)
+
+    def _issue(self, pointer: str, code: str, template: str, **params):
+        self.issues.append(ValidationIssue(pointer, code, template, **params))
+
+    def _conflict(self, pointer: str, keyword: str, left, right):
+        self._issue(
+            pointer + "/allOf", "allof-conflict", "Incompatible '{keyword}' in allOf: {left!r} and {right!r}.",
+            keyword=keyword, left=left, right=right,
+        )
+
+    def _merge(self, target: Dict[str, Any], source: Any, pointer: str):
+        """Intersects `source` into `target` in place."""
+        if source is True or source == {}:
+            return
+        if not isinstance(source, dict):
+            # `false` (or an unresolved member): nothing to merge key by key
+            target.setdefault("allOf", []).append(source)
+            return
+        residual = []
+        for key, value in source.items():
+            if key not in target:
+                # Lists extended in place below are copied; memoized schemas are shared
+                target[key] = list(value) if key in ("required", "allOf") else value
+                continue
+            current = target[key]
+            if key == "allOf":
+                target[key] = current + value
+            elif key in _ANNOTATIONS:
+                target[key] = value
+            elif key == "required":
+                current.extend(name for name in value if name not in current)
+            elif key == "type":
+                types = _intersect_types(current, value)
+                if not types:
+                    self._conflict(pointer, key, current, value)
+                target[key] = types[0] if len(types) == 1 else types
+            elif key in _UPPER_BOUNDS:
+                target[key] = min(current, value)
+            elif key in _LOWER_BOUNDS:
+                target[key] = max(current, value)
+            elif key in _FLAGS:
+                target[key] = current or value
+            elif key == "enum":
+                values = [item for item in current if item in value]
+                if not values:
+                    self._conflict(pointer, key, current, value)
+                target[key] = values
+            elif key == "multipleOf":
+                target[key] = self._merge_multiple(current, value, residual)
+            elif key in _SUBSCHEMA_MAPS and isinstance(current, dict) and isinstance(value, dict):
+                combined = dict(current)
+                for name, item in value.items():
+                    combined[name] = self._intersect(combined[name], item, f"{pointer}/{key}{json_pointer(name)}") if name in combined else item
+                target[key] = combined
+            elif key == "dependentRequired" and isinstance(current, dict) and isinstance(value, dict):
+                combined = {name: list(items) for name, items in current.items()}
+                for name, items in value.items():
+                    combined.setdefault(name, []).extend(item for item in items if item not in combined[name])
+                target[key] = combined
+            elif key in _MERGEABLE_SUBSCHEMAS:
+                target[key] = self._intersect(current, value, f"{pointer}/{key}")
+            elif current != value:
+                # pattern, format, const, oneOf, not, $ref ...: both must hold
+                residual.append({key: value})
+        if "const" in target and "enum" in target and target["const"] not in target["enum"]:
+            self._conflict(pointer, "const", target["const"], target["enum"])
+        for lower, upper, exclusive in _BOUND_PAIRS:
+            if lower in target and upper in target:
+                low, high = target[lower], target[upper]
+                if low > high or (exclusive and low == high):
+                    self._conflict(pointer, f"{lower}/{upper}", low, high)
+        if residual:
+            target.setdefault("allOf", []).extend(residual)
+
+    def _intersect(self, left: Any, right: Any, pointer: str) -> Any:
+        if left is False or right is False:
+            return False
+        if left is True or left == {}:
+            return right
+        if right is True or right == {}:
+            return left
+        merged: Dict[str, Any] = {}
+        self._merge(merged, left, pointer)
+        self._merge(merged, right, pointer)
+        return merged
+
+    @staticmethod
+    def _merge_multiple(current, value, residual: list):
+        if current == value or (value and (current / value).is_integer()):
+            return current
+        if current and (value / current).is_integer():
+            return value
+        if isinstance(current, int) and isinstance(value, int):
+            return current * value // gcd(current, value)
+        residual.append({"multipleOf": value})
+        return current
+
+
+def flatten_schemas(document: Dict[str, Any]) -> Tuple[Dict[str, Any], List[ValidationIssue]]:
+    """Flattens every component schema of `document`.
+
+    Returns:
+        The effective schemas keyed by component name, and the conflicts found.
+    """
+    flattener = SchemaFlattener(document)
+    return flattener.flatten_all(), flattener.issues
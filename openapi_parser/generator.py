@@ -0,0 +1,507 @@
+"""Schema-driven generation of request payloads for load testing.
+
+`PayloadGenerator` compiles each schema it meets into a small factory
+function once (`$ref`s, ``allOf`` flattening, discriminated unions and
+format handling are all resolved at compile time), so producing a payload is
+a chain of direct calls with no schema interpretation.  Payloads honor types,
+``format``, length/size/numeric bounds, ``enum``/``const``, ``pattern``
+(best effort) and ``example``/``examples`` of scalar schemas, and always
+include required properties.
+
+Generation is deterministic for a given seed.  `PayloadGenerator.payloads`
+yields payloads lazily and `write_payloads` streams them as JSON Lines in
+batches, so millions of payloads never need to be held in memory.
+"""
+import base64
+import datetime
+import json
+import random
+import re
+import string
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.discriminator import build_dispatch_table
+from openapi_parser.flatten import SchemaFlattener
+from openapi_parser.patterns import compile_pattern
+from openapi_parser.utils import resolve_pointer
+
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+Factory = Callable[[random.Random, int], Any]
+
+# Beyond this many nested $refs only required properties and minimum item counts are produced
+DEFAULT_MAX_DEPTH = 4
+
+_LETTERS = string.ascii_lowercase
+_WORD = string.ascii_letters + string.digits + "_"
+_PRINTABLE = string.ascii_letters + string.digits + " -_.,"
+_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+_SPAN_SECONDS = 30 * 365 * 24 * 3600
+_JSON_MEDIA_TYPES = ("application/json", "application/*+json", "*/*")
+
+
+def _word(rng: random.Random, length: int) -> str:
+    return "".join(rng.choices(_LETTERS, k=length))
+
+
+def _date_time(rng, depth):
+    moment = _EPOCH + datetime.timedelta(seconds=rng.randrange(_SPAN_SECONDS))
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _date(rng, depth):
+    return (_EPOCH + datetime.timedelta(days=rng.randrange(_SPAN_SECONDS // 86400))).strftime("%Y-%m-%d")
+
+
+def _time(rng, depth):
+    return f"{rng.randrange(24):02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}Z"
+
+
+# Generators for string formats
+_FORMATS: Dict[str, Factory] = {
+    "date-time": _date_time,
+    "date": _date,
+    "time": _time,
+    "email": lambda rng, depth: f"{_word(rng, 8)}@example.com",
+    "uuid": lambda rng, depth: str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+    "uri": lambda rng, depth: f"https://example.com/{_word(rng, 8)}",
+    "url": lambda rng, depth: f"https://example.com/{_word(rng, 8)}",
+    "hostname": lambda rng, depth: f"{_word(rng, 8)}.example.com",
+    "ipv4": lambda rng, depth: ".".join(str(rng.randrange(1, 255)) for _ in range(4)),
+    "ipv6": lambda rng, depth: ":".join(f"{rng.getrandbits(16):x}" for _ in range(8)),
+    "byte": lambda rng, depth: base64.b64encode(rng.randbytes(12)).decode("ascii"),
+    "password": lambda rng, depth: "".join(rng.choices(_WORD, k=16)),
+}
+
+
+def _in_choices(items) -> str:
+    characters = []
+    for op, value in items:
+        if op is _sre_constants.LITERAL:
+            characters.append(chr(value))
+        elif op is _sre_constants.RANGE:
+            low, high = value
+            characters.extend(chr(code) for code in range(low, min(high, low + 255) + 1))
+        elif op is _sre_constants.CATEGORY:
+            characters.extend(_CATEGORIES.get(value, _LETTERS))
+    return "".join(characters) or _LETTERS
+
+
+_CATEGORIES = {
+    _sre_constants.CATEGORY_DIGIT: string.digits,
+    _sre_constants.CATEGORY_NOT_DIGIT: _LETTERS,
+    _sre_constants.CATEGORY_WORD: _WORD,
+    _sre_constants.CATEGORY_NOT_WORD: " -.,",
+    _sre_constants.CATEGORY_SPACE: " ",
+    _sre_constants.CATEGORY_NOT_SPACE: _WORD,
+}
+
+
+def _emit_regex(items, rng: random.Random, out: List[str], groups: Dict[int, str]):
+    for op, value in items:
+        if op is _sre_constants.LITERAL:
+            out.append(chr(value))
+        elif op is _sre_constants.NOT_LITERAL:
+            out.append(rng.choice(_LETTERS.replace(chr(value), "") if chr(value) in _LETTERS else _LETTERS))
+        elif op is _sre_constants.ANY:
+            out.append(rng.choice(_LETTERS))
+        elif op is _sre_constants.IN:
+            if value and value[0][0] is _sre_constants.NEGATE:
+                excluded = _in_choices(value[1:])
+                allowed = [char for char in _PRINTABLE if char not in excluded]
+                out.append(rng.choice(allowed or _LETTERS))
+            else:
+                out.append(rng.choice(_in_choices(value)))
+        elif op is _sre_constants.CATEGORY:
+            out.append(rng.choice(_CATEGORIES.get(value, _LETTERS)))
+        elif op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT):
+            low, high, sub = value
+            high = low + 4 if high is _sre_constants.MAXREPEAT or high > low + 4 else high
+            for _ in range(rng.randint(low, high)):
+                _emit_regex(sub, rng, out, groups)
+        elif op is _sre_constants.SUBPATTERN:
+            group, sub = value[0], value[-1]
+            start = len(out)
+            _emit_regex(sub, rng, out, groups)
+            if group is not None:
+                groups[group] = "".join(out[start:])
+        elif op is _sre_constants.BRANCH:
+            _emit_regex(rng.choice(value[1]), rng, out, groups)
+        elif op is _sre_constants.GROUPREF:
+            out.append(groups.get(value, ""))
+        # Anchors and lookarounds produce no text
+
+
+def _pattern_factory(pattern: str, min_length: int, max_length: Optional[int]) -> Optional[Factory]:
+    try:
+        compiled = compile_pattern(pattern)
+        parsed = _sre_parse.parse(compiled.pattern)
+    except (re.error, TypeError, ValueError):
+        return None
+
+    def factory(rng, depth):
+        candidate = ""
+        for _ in range(10):
+            out: List[str] = []
+            _emit_regex(parsed, rng, out, {})
+            candidate = "".join(out)
+            if compiled.search(candidate) and len(candidate) >= min_length and (max_length is None or len(candidate) <= max_length):
+                return candidate
+        return candidate
+
+    return factory
+
+
+def _constant(value: Any) -> Factory:
+    if isinstance(value, (dict, list)):
+        text = json.dumps(value)
+        return lambda rng, depth: json.loads(text)
+    return lambda rng, depth: value
+
+
+class PayloadGenerator:
+    """Generates payloads conforming to the schemas of one document.
+
+    Args:
+        document: The raw OpenAPI document (a parsed model is dumped first).
+        seed: Seed of the random generator; equal seeds give equal payloads.
+        optional_ratio: Probability of including each optional property.
+        max_depth: Number of nested `$ref`s after which only required
+            properties and minimum array sizes are generated, so recursive
+            schemas terminate.
+    """
+
+    def __init__(
+        self,
+        document: Union[Dict[str, Any], BaseModel],
+        seed: int = 0,
+        optional_ratio: float = 0.5,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ):
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self.document = document
+        self.seed = seed
+        self.optional_ratio = optional_ratio
+        self.max_depth = max_depth
+        self._flattener = SchemaFlattener(document)
+        self._refs: Dict[str, Factory] = {}
+        self._operations: Dict[Tuple[str, str], Factory] = {}
+
+    def operations(self) -> List[Tuple[str, str, Optional[str]]]:
+        """Returns (method, path, operationId) of every operation with a JSON request body."""
+        result = []
+        for path, item in (self.document.get("paths") or {}).items():
+            if not isinstance(item, dict):
+                continue
+            for method in HTTP_METHODS:
+                operation = item.get(method)
+                if isinstance(operation, dict) and self._body_schema(operation) is not None:
+                    result.append((method, path, operation.get("operationId")))
+        return result
+
+    def _find(self, operation: Union[str, Tuple[str, str]]) -> Dict[str, Any]:
+        paths = self.document.get("paths") or {}
+        if isinstance(operation, tuple):
+            method, path = operation
+            found = (paths.get(path) or {}).get(method.lower())
+            if isinstance(found, dict):
+                return found
+        else:
+            for item in paths.values():
+                for method in HTTP_METHODS:
+                    candidate = item.get(method) if isinstance(item, dict) else None
+                    if isinstance(candidate, dict) and candidate.get("operationId") == operation:
+                        return candidate
+        raise KeyError(f"Unknown operation {operation!r}.")
+
+    def _deref(self, node: Any) -> Any:
+        seen = set()
+        while isinstance(node, dict) and isinstance(node.get("$ref"), str) and node["$ref"] not in seen:
+            seen.add(node["$ref"])
+            node = resolve_pointer(self.document, node["$ref"])
+        return node
+
+    def _body_schema(self, operation: Dict[str, Any]) -> Optional[Any]:
+        body = self._deref(operation.get("requestBody"))
+        content = body.get("content") if isinstance(body, dict) else None
+        if not isinstance(content, dict):
+            return None
+        for media_type in _JSON_MEDIA_TYPES:
+            if isinstance(content.get(media_type), dict) and "schema" in content[media_type]:
+                return content[media_type]["schema"]
+        for media_type, entry in content.items():
+            if media_type.endswith("+json") and isinstance(entry, dict) and "schema" in entry:
+                return entry["schema"]
+        return None
+
+    def factory(self, operation: Union[str, Tuple[str, str]]) -> Factory:
+        """Returns the compiled payload factory of an operation (operationId or (method, path)).
+
+        Raises:
+            KeyError: If the operation does not exist or has no JSON request body.
+        """
+        found = self._find(operation)
+        key = (id(found), "body")
+        factory = self._operations.get(key)
+        if factory is None:
+            schema = self._body_schema(found)
+            if schema is None:
+                raise KeyError(f"Operation {operation!r} has no JSON request body.")
+            factory = self._operations[key] = self.compile(schema)
+        return factory
+
+    def payloads(self, operation: Union[str, Tuple[str, str]], count: Optional[int] = None, seed: Optional[int] = None) -> Iterator[Any]:
+        """Yields `count` payloads (forever if None) for an operation's request body."""
+        factory = self.factory(operation)
+        rng = random.Random(self.seed if seed is None else seed)
+        produced = 0
+        while count is None or produced < count:
+            yield factory(rng, 0)
+            produced += 1
+
+    def example(self, schema: Any, seed: Optional[int] = None) -> Any:
+        """Generates one value for `schema`."""
+        return self.compile(schema)(random.Random(self.seed if seed is None else seed), 0)
+
+    # -- compilation -----------------------------------------------------
+
+    def compile(self, schema: Any) -> Factory:
+        """Compiles `schema` into a factory ``(rng, depth) -> value``."""
+        if not isinstance(schema, dict):
+            return _constant(None) if schema is False else _constant({})
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            return self._ref(ref)
+        if "allOf" in schema:
+            schema = self._flattener.flatten(schema)
+            if "allOf" in schema:
+                # Residual members of a flattened allOf that are plain references
+                for member in schema["allOf"]:
+                    if isinstance(member, dict) and isinstance(member.get("$ref"), str):
+                        return self._ref(member["$ref"])
+        if "const" in schema:
+            return _constant(schema["const"])
+        if isinstance(schema.get("enum"), list) and schema["enum"]:
+            values = schema["enum"]
+            return lambda rng, depth: rng.choice(values)
+        table = build_dispatch_table(self.document, schema)
+        if table is not None and table.mapping:
+            return self._dispatch(table)
+        branches = schema.get("oneOf") or schema.get("anyOf")
+        if isinstance(branches, list) and branches:
+            factories = [self.compile(branch) for branch in branches]
+            return lambda rng, depth: rng.choice(factories)(rng, depth)
+
+        kind = schema.get("type")
+        names = kind if isinstance(kind, list) else [kind] if kind is not None else []
+        concrete = [name for name in names if name != "null"]
+        if not concrete:
+            if "properties" in schema:
+                concrete = ["object"]
+            elif "items" in schema:
+                concrete = ["array"]
+            elif "null" in names:
+                return _constant(None)
+            else:
+                concrete = ["string"]
+        if len(concrete) > 1:
+            factories = [self.compile({**schema, "type": name}) for name in concrete]
+            factory = lambda rng, depth: rng.choice(factories)(rng, depth)
+        else:
+            factory = self._typed(concrete[0], schema)
+        if "null" in names:
+            inner = factory
+            factory = lambda rng, depth: None if rng.random() < 0.1 else inner(rng, depth)
+        return factory
+
+    def _ref(self, ref: str) -> Factory:
+        factory = self._refs.get(ref)
+        if factory is None:
+            target = resolve_pointer(self.document, ref)
+            # Targets are compiled on first use, which keeps long reference chains off the stack
+            cell: List[Factory] = []
+
+            def factory(rng, depth):
+                if not cell:
+                    cell.append(self.compile(target))
+                return cell[0](rng, depth + 1)
+
+            self._refs[ref] = factory
+        return factory
+
+    def _dispatch(self, table) -> Factory:
+        # Branches are compiled through their references so recursive unions terminate
+        refs = {}
+        for branch in table.branches:
+            if isinstance(branch, dict) and isinstance(branch.get("$ref"), str):
+                refs.setdefault(id(self._deref(branch)), branch["$ref"])
+        choices = []
+        for value, branch in table.mapping.items():
+            ref = refs.get(id(branch))
+            choices.append((value, self._ref(ref) if ref is not None else self.compile(branch)))
+        name = table.property_name
+
+        def factory(rng, depth):
+            value, branch = rng.choice(choices)
+            payload = branch(rng, depth)
+            if isinstance(payload, dict):
+                payload[name] = value
+            return payload
+
+        return factory
+
+    def _typed(self, name: str, schema: Dict[str, Any]) -> Factory:
+        examples = schema.get("examples") if isinstance(schema.get("examples"), list) else None
+        if examples is None and "example" in schema:
+            examples = [schema["example"]]
+        if examples and name not in ("object", "array"):
+            return lambda rng, depth: rng.choice(examples)
+        if name == "object":
+            return self._object(schema)
+        if name == "array":
+            return self._array(schema)
+        if name == "string":
+            return self._string(schema)
+        if name in ("integer", "number"):
+            return self._number(schema, integer=name == "integer")
+        if name == "boolean":
+            return lambda rng, depth: rng.random() < 0.5
+        return _constant(None)
+
+    def _object(self, schema: Dict[str, Any]) -> Factory:
+        properties = schema.get("properties") if isinstance(schema.get("properties"), dict) else {}
+        required = [name for name in schema.get("required") or () if name in properties]
+        extra_required = [name for name in schema.get("required") or () if name not in properties]
+        required_factories = [(name, self.compile(properties[name])) for name in required]
+        # Required properties without a schema still have to be present
+        required_factories += [(name, lambda rng, depth: _word(rng, 6)) for name in extra_required]
+        optional_factories = [(name, self.compile(properties[name])) for name in properties if name not in required]
+        ratio, max_depth = self.optional_ratio, self.max_depth
+        min_properties = schema.get("minProperties") or 0
+
+        def factory(rng, depth):
+            payload = {}
+            for name, value in required_factories:
+                payload[name] = value(rng, depth)
+            if depth < max_depth:
+                for name, value in optional_factories:
+                    if rng.random() < ratio:
+                        payload[name] = value(rng, depth)
+            for name, value in optional_factories:
+                if len(payload) >= min_properties:
+                    break
+                if name not in payload:
+                    payload[name] = value(rng, depth)
+            return payload
+
+        return factory
+
+    def _array(self, schema: Dict[str, Any]) -> Factory:
+        item = self.compile(schema.get("items", {}))
+        low = schema.get("minItems") or 0
+        high = schema.get("maxItems")
+        high = low + 3 if high is None else min(high, low + 3)
+        unique = bool(schema.get("uniqueItems"))
+        max_depth = self.max_depth
+
+        def factory(rng, depth):
+            count = rng.randint(low, high) if depth < max_depth else low
+            if not unique:
+                return [item(rng, depth) for _ in range(count)]
+            values, seen = [], set()
+            for _ in range(count * 5):
+                value = item(rng, depth)
+                key = json.dumps(value, sort_keys=True)
+                if key not in seen:
+                    seen.add(key)
+                    values.append(value)
+                    if len(values) == count:
+                        break
+            return values
+
+        return factory
+
+    def _string(self, schema: Dict[str, Any]) -> Factory:
+        low = schema.get("minLength") or 0
+        high = schema.get("maxLength")
+        pattern = schema.get("pattern")
+        if isinstance(pattern, str):
+            factory = _pattern_factory(pattern, low, high)
+            if factory is not None:
+                return factory
+        formatted = _FORMATS.get(schema.get("format"))
+        if formatted is not None:
+            def factory(rng, depth):
+                value = formatted(rng, depth)
+                if len(value) < low or (high is not None and len(value) > high):
+                    return _word(rng, low if high is None else max(low, min(high, low + 8)))
+                return value
+
+            return factory
+        low = max(low, 1) if high is None or high >= 1 else low
+        high = low + 11 if high is None else high
+        return lambda rng, depth: _word(rng, rng.randint(low, high))
+
+    def _number(self, schema: Dict[str, Any], integer: bool) -> Factory:
+        low, high = schema.get("minimum"), schema.get("maximum")
+        exclusive_low, exclusive_high = schema.get("exclusiveMinimum"), schema.get("exclusiveMaximum")
+        # OpenAPI 3.0 spells exclusive bounds as booleans next to minimum/maximum
+        if exclusive_low is True:
+            exclusive_low, low = low, None
+        if exclusive_high is True:
+            exclusive_high, high = high, None
+        step = 1 if integer else 0.01
+        if isinstance(exclusive_low, (int, float)) and not isinstance(exclusive_low, bool):
+            low = max(low, exclusive_low + step) if low is not None else exclusive_low + step
+        if isinstance(exclusive_high, (int, float)) and not isinstance(exclusive_high, bool):
+            high = min(high, exclusive_high - step) if high is not None else exclusive_high - step
+        if low is None:
+            low = 0 if high is None or high >= 0 else high - 1000
+        if high is None:
+            high = low + 1000
+        multiple = schema.get("multipleOf")
+        if isinstance(multiple, (int, float)) and multiple > 0:
+            first = -(-low // multiple)
+            last = high // multiple
+            if integer and isinstance(multiple, int):
+                return lambda rng, depth: int(rng.randint(int(first), int(max(first, last)))) * multiple
+            return lambda rng, depth: round(rng.randint(int(first), int(max(first, last))) * multiple, 10)
+        if integer:
+            low, high = int(-(-low // 1)), int(high // 1)
+            return lambda rng, depth: rng.randint(low, max(low, high))
+        return lambda rng, depth: round(rng.uniform(low, high), 2)
+
+
+def write_payloads(
+    generator: PayloadGenerator,
+    operation: Union[str, Tuple[str, str]],
+    count: int,
+    stream: TextIO,
+    batch_size: int = 1000,
+    seed: Optional[int] = None,
+) -> int:
+    """Streams `count` payloads to `stream` as JSON Lines, `batch_size` at a time.
+
+    Returns:
+        The number of payloads written.
+    """
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    batch: List[str] = []
+    written = 0
+    for payload in generator.payloads(operation, count, seed=seed):
+        batch.append(encode(payload))
+        if len(batch) >= batch_size:
+            stream.write("\n".join(batch) + "\n")
+            written += len(batch)
+            batch.clear()
+    if batch:
+        stream.write("\n".join(batch) + "\n")
+        written += len(batch)
+    return written
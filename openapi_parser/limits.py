@@ -0,0 +1,328 @@
+"""Resource limits for untrusted input documents.
+
+The loaders of `openapi_parser.parser` enforce a `ResourceLimits` before
+building anything large:
+
+* ``max_bytes`` is checked against the input (or the file size) before it
+  is parsed.
+* For YAML, `load_yaml` builds the document straight from libyaml's event
+  stream, checking ``max_depth``, ``max_nodes`` and ``max_aliases`` as it
+  goes.  Every alias counts the nodes of the subtree it repeats, so alias
+  "billion laughs" documents are rejected after a handful of events, and a
+  deeply nested document is rejected at the first event past the depth
+  limit (the C composer would otherwise recurse once per level).  Skipping
+  the intermediate node graph also makes this faster than the plain C
+  loader; documents using merge keys or collection tags are checked with
+  `scan_yaml` and loaded by the regular loader instead.
+* JSON cannot repeat subtrees, so its memory is bounded by ``max_bytes``;
+  depth and node count are checked once it is loaded.
+* ``max_ref_depth`` bounds chains of ``$ref``s that point at other
+  ``$ref``s, and rejects circular chains, which no resolver can follow.
+
+Violations raise `ResourceLimitError`, a `ParsingError`.  Pass
+``limits=None`` to the loaders for trusted input.
+"""
+from typing import Any, Dict, List, Optional, Union
+import yaml
+from pydantic import BaseModel
+from openapi_parser.exceptions import ReferenceResolutionError, ResourceLimitError
+from openapi_parser.utils import resolve_pointer
+
+
+class ResourceLimits(BaseModel):
+    """Upper bounds on an input document; None disables a limit.
+
+    Attributes:
+        max_bytes: Size of the input in bytes (characters for text input).
+        max_nodes: Mappings, sequences and scalars, counting each alias as
+            the nodes it repeats.
+        max_depth: Nesting of mappings and sequences.
+        max_aliases: YAML alias uses.
+        max_ref_depth: Hops along a chain of ``$ref``s to other ``$ref``s.
+    """
+
+    max_bytes: Optional[int] = 64 << 20
+    max_nodes: Optional[int] = 2_000_000
+    max_depth: Optional[int] = 256
+    max_aliases: Optional[int] = 10_000
+    max_ref_depth: Optional[int] = 32
+
+
+DEFAULT_LIMITS = ResourceLimits()
+
+_COLLECTION_START = (yaml.MappingStartEvent, yaml.SequenceStartEvent)
+_COLLECTION_END = (yaml.MappingEndEvent, yaml.SequenceEndEvent)
+
+
+def _exceeded(limit: str, value: int, maximum: int, location=None) -> ResourceLimitError:
+    return ResourceLimitError(f"Document exceeds {limit}={maximum} ({value} or more).", limit, location)
+
+
+def check_size(content: Union[int, str, bytes], limits: ResourceLimits):
+    """Rejects inputs larger than ``max_bytes``; text is measured in UTF-8 bytes.
+
+    `content` may also be a size already known, such as a file's.
+    """
+    maximum = limits.max_bytes
+    if maximum is None:
+        return
+    if isinstance(content, int):
+        size = content
+    elif not isinstance(content, str):
+        size = len(content)
+    elif len(content) * 4 <= maximum:
+        return  # no character encodes to more than 4 bytes
+    else:
+        size = len(content) if len(content) > maximum else len(content.encode("utf-8", "surrogatepass"))
+    if size > maximum:
+        raise ResourceLimitError(f"Document exceeds max_bytes={maximum} ({size} bytes).", "max_bytes")
+
+
+def load_yaml(content: Any, limits: ResourceLimits, loader: type) -> Any:
+    """Loads a single YAML document, enforcing `limits` while it is built.
+
+    Raises:
+        ResourceLimitError: At the first event past a limit.
+        yaml.YAMLError: If the content is not valid YAML.
+    """
+    instance = loader(content)
+    try:
+        return _build(instance, limits)
+    except _Unsupported:
+        pass
+    finally:
+        instance.dispose()
+    if hasattr(content, "seek"):
+        content.seek(0)
+    scan_yaml(content, limits, loader)
+    return yaml.load(content, Loader=loader)
+
+
+class _Unsupported(Exception):
+    # Raised for constructs `_build` leaves to the regular loader
+    pass
+
+
+_STR_TAG = "tag:yaml.org,2002:str"
+_COLLECTION_TAGS = {yaml.MappingStartEvent: "tag:yaml.org,2002:map", yaml.SequenceStartEvent: "tag:yaml.org,2002:seq"}
+# Scalar tags whose SafeConstructor functions build a value from the node alone
+_SCALAR_TAGS = frozenset(
+    f"tag:yaml.org,2002:{name}" for name in ("null", "bool", "int", "float", "binary", "timestamp")
+)
+
+
+def _build(loader, limits: ResourceLimits) -> Any:
+    # Builds dicts, lists and scalars from events without composing nodes first,
+    # with the same results as SafeLoader for everything it does not reject
+    max_nodes, max_depth, max_aliases = limits.max_nodes, limits.max_depth, limits.max_aliases
+    get_event, resolve, constructors = loader.get_event, loader.resolve, loader.yaml_constructors
+    get_event()  # StreamStartEvent
+    if loader.check_event(yaml.StreamEndEvent):
+        return None
+    get_event()  # DocumentStartEvent
+    nodes = aliases = 0
+    # Built values and subtree sizes of anchors; open collections as
+    # [container, pending mapping key, anchor, node count before it]
+    anchors: Dict[str, Any] = {}
+    sizes: Dict[str, int] = {}
+    stack: List[list] = []
+    no_key = stack  # a sentinel that no key can be
+    while True:
+        event = get_event()
+        kind = event.__class__
+        if kind is yaml.ScalarEvent:
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = resolve(yaml.ScalarNode, event.value, event.implicit)
+            if tag == _STR_TAG:
+                value = event.value
+            elif tag in _SCALAR_TAGS:
+                value = constructors[tag](loader, yaml.ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style))
+            else:
+                raise _Unsupported  # merge keys, custom tags
+            nodes += 1
+            if event.anchor is not None:
+                _anchor(anchors, event, value)
+                sizes[event.anchor] = 1
+        elif kind is yaml.MappingStartEvent or kind is yaml.SequenceStartEvent:
+            if event.tag not in (None, "!", _COLLECTION_TAGS[kind]):
+                raise _Unsupported  # !!set, !!omap, custom tags
+            value = {} if kind is yaml.MappingStartEvent else []
+            if event.anchor is not None:
+                _anchor(anchors, event, value)
+            if stack:
+                entry = stack[-1]
+                if entry[0].__class__ is list:
+                    entry[0].append(value)
+                elif entry[1] is no_key:
+                    raise yaml.constructor.ConstructorError(None, None, "found unhashable key", event.start_mark)
+                else:
+                    entry[0][entry[1]] = value
+                    entry[1] = no_key
+            stack.append([value, no_key, event.anchor, nodes])
+            nodes += 1
+            if max_depth is not None and len(stack) > max_depth:
+                raise _exceeded("max_depth", len(stack), max_depth, _mark(event))
+            if max_nodes is not None and nodes > max_nodes:
+                raise _exceeded("max_nodes", nodes, max_nodes, _mark(event))
+            continue
+        elif kind is yaml.MappingEndEvent or kind is yaml.SequenceEndEvent:
+            value, _, anchor, before = stack.pop()
+            if anchor is not None:
+                sizes[anchor] = nodes - before
+            if stack:
+                continue
+            break
+        else:  # AliasEvent
+            if event.anchor not in anchors:
+                raise yaml.composer.ComposerError(None, None, f"found undefined alias {event.anchor!r}", event.start_mark)
+            if event.anchor not in sizes:
+                raise ResourceLimitError(f"Alias '*{event.anchor}' repeats a node that contains it.", "max_nodes", _mark(event))
+            aliases += 1
+            if max_aliases is not None and aliases > max_aliases:
+                raise _exceeded("max_aliases", aliases, max_aliases, _mark(event))
+            value = anchors[event.anchor]
+            nodes += sizes[event.anchor]
+        if max_nodes is not None and nodes > max_nodes:
+            raise _exceeded("max_nodes", nodes, max_nodes, _mark(event))
+        if not stack:
+            break
+        entry = stack[-1]
+        if entry[0].__class__ is list:
+            entry[0].append(value)
+        elif entry[1] is not no_key:
+            entry[0][entry[1]] = value
+            entry[1] = no_key
+        elif value.__class__ is list or value.__class__ is dict:
+            raise yaml.constructor.ConstructorError(None, None, "found unhashable key", event.start_mark)
+        else:
+            entry[1] = value
+    get_event()  # DocumentEndEvent
+    if not loader.check_event(yaml.StreamEndEvent):
+        event = get_event()
+        raise yaml.composer.ComposerError(None, None, "expected a single document in the stream", event.start_mark)
+    return value
+
+
+def _anchor(anchors: Dict[str, Any], event, value):
+    if event.anchor in anchors:
+        raise yaml.composer.ComposerError(None, None, f"found duplicate anchor {event.anchor!r}", event.start_mark)
+    anchors[event.anchor] = value
+
+
+def scan_yaml(content: Any, limits: ResourceLimits, loader: type):
+    """Checks the depth, node count and alias expansion of YAML `content` from its events.
+
+    Streams such as mapped files are rewound afterwards.
+
+    Raises:
+        ResourceLimitError: At the first event past a limit.
+        yaml.YAMLError: If the content is not valid YAML.
+    """
+    max_nodes, max_depth, max_aliases = limits.max_nodes, limits.max_depth, limits.max_aliases
+    nodes = aliases = 0
+    # Open collections as (anchor, node count before them); sizes of finished anchors
+    open_collections = []
+    sizes: Dict[str, int] = {}
+    for event in yaml.parse(content, Loader=loader):
+        if isinstance(event, _COLLECTION_START):
+            open_collections.append((event.anchor, nodes))
+            nodes += 1
+            if max_depth is not None and len(open_collections) > max_depth:
+                raise _exceeded("max_depth", len(open_collections), max_depth, _mark(event))
+        elif isinstance(event, _COLLECTION_END):
+            anchor, before = open_collections.pop()
+            if anchor is not None:
+                sizes[anchor] = nodes - before
+        elif isinstance(event, yaml.ScalarEvent):
+            nodes += 1
+            if event.anchor is not None:
+                sizes[event.anchor] = 1
+        elif isinstance(event, yaml.AliasEvent):
+            aliases += 1
+            if max_aliases is not None and aliases > max_aliases:
+                raise _exceeded("max_aliases", aliases, max_aliases, _mark(event))
+            if event.anchor not in sizes:
+                if any(anchor == event.anchor for anchor, _ in open_collections):
+                    raise ResourceLimitError(f"Alias '*{event.anchor}' repeats a node that contains it.", "max_nodes", _mark(event))
+                continue  # an undefined alias; the loader reports it
+            nodes += sizes[event.anchor]
+        else:
+            continue
+        if max_nodes is not None and nodes > max_nodes:
+            raise _exceeded("max_nodes", nodes, max_nodes, _mark(event))
+    if hasattr(content, "seek"):
+        # Mapped files are read as streams; rewind for the loader
+        content.seek(0)
+
+
+def _mark(event) -> Optional[tuple]:
+    mark = event.start_mark
+    return None if mark is None else (mark.line + 1, mark.column + 1)
+
+
+def check_tree(document: Any, limits: ResourceLimits):
+    """Checks the depth and node count of a loaded document, iteratively."""
+    max_nodes, max_depth = limits.max_nodes, limits.max_depth
+    if max_nodes is None and max_depth is None:
+        return
+    nodes = 0
+    stack = [(document, 0)]
+    while stack:
+        node, depth = stack.pop()
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise _exceeded("max_nodes", nodes, max_nodes)
+        if isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        if max_depth is not None and depth + 1 > max_depth:
+            raise _exceeded("max_depth", depth + 1, max_depth)
+        stack.extend((child, depth + 1) for child in children)
+
+
+def check_references(document: Dict[str, Any], limits: ResourceLimits):
+    """Rejects local ``$ref`` chains longer than ``max_ref_depth``, or circular ones.
+
+    Chain lengths are memoized, so the check is linear in the number of refs.
+    Unresolvable references are left to the validation levels that report them.
+    """
+    maximum = limits.max_ref_depth
+    if maximum is None:
+        return
+    lengths: Dict[str, int] = {}
+    stack = [document]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith("#") and ref not in lengths:
+                _chain_length(document, ref, lengths, maximum)
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+
+
+def _chain_length(document: Dict[str, Any], ref: str, lengths: Dict[str, int], maximum: int) -> int:
+    chain = []
+    while isinstance(ref, str) and ref.startswith("#") and ref not in lengths:
+        if ref in chain:
+            raise ResourceLimitError(f"Reference chain {' -> '.join(chain[chain.index(ref):] + [ref])} is circular.", "max_ref_depth")
+        chain.append(ref)
+        if len(chain) > maximum:
+            raise _exceeded("max_ref_depth", len(chain), maximum)
+        try:
+            target = resolve_pointer(document, ref)
+        except ReferenceResolutionError:
+            break
+        ref = target.get("$ref") if isinstance(target, dict) else None
+    length = lengths.get(ref, 0) if isinstance(ref, str) else 0
+    for hop in reversed(chain):
+        length += 1
+        if length > maximum:
+            raise _exceeded("max_ref_depth", length, maximum)
+        lengths[hop] = length
+    return length
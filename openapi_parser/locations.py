@@ -0,0 +1,297 @@
+"""Line/column tracking for YAML and JSON documents.
+
+`load_yaml_with_locations` and `load_json_with_locations` record positions
+while they parse (from the YAML composer events, or in the JSON reader
+below) into a `SourceMap` keyed by JSON Pointer.  Both are pure Python and
+several times slower than libyaml's C loader and `json.loads`.
+
+The parser's loaders therefore use `LazySourceMap`: the document is loaded
+by the fast default loader, and the source is only re-read when an error
+needs a position, by `scan_yaml_locations` (libyaml events, no document
+built) or `scan_json_locations`.
+"""
+import re
+from bisect import bisect_left
+from json.decoder import JSONDecodeError, scanstring
+from json.scanner import NUMBER_RE
+from typing import Any, Callable, Dict, Optional, Tuple
+import yaml
+from openapi_parser.utils import escape_pointer_token
+
+_COLUMN_BITS = 32
+_COLUMN_MASK = (1 << _COLUMN_BITS) - 1
+
+
+# Compact side table mapping JSON Pointers of mapping/sequence nodes to positions
+class SourceMap:
+    """Maps JSON Pointers to 1-based (line, column) positions.
+
+    Positions are packed into a single int per node to keep the table small
+    on documents with hundreds of thousands of nodes.
+    """
+
+    __slots__ = ("_positions",)
+
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+
+    def add(self, pointer: str, line: int, column: int):
+        self._positions[pointer] = (line << _COLUMN_BITS) | column
+
+    def get(self, pointer: str) -> Optional[Tuple[int, int]]:
+        """Returns the position recorded for exactly `pointer`, if any."""
+        packed = self._positions.get(pointer)
+        if packed is None:
+            return None
+        return packed >> _COLUMN_BITS, packed & _COLUMN_MASK
+
+    def locate(self, pointer: str) -> Optional[Tuple[int, int]]:
+        """Returns the position of `pointer` or of its nearest recorded ancestor.
+
+        Scalars and missing keys are not recorded, so an error at
+        ``/info/version`` resolves to the position of ``/info``.
+        """
+        while True:
+            position = self.get(pointer)
+            if position is not None or not pointer:
+                return position
+            pointer = pointer[:pointer.rfind("/")]
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, pointer):
+        return pointer in self._positions
+
+    def items(self):
+        for pointer, packed in self._positions.items():
+            yield pointer, (packed >> _COLUMN_BITS, packed & _COLUMN_MASK)
+
+
+class LazySourceMap:
+    """A `SourceMap` built on first use by re-reading `source` with `scan`.
+
+    `scan` is `scan_yaml_locations` or `scan_json_locations`.  Streams such
+    as mapped files are rewound first, so the map must be used while
+    `source` is still open.
+    """
+
+    __slots__ = ("_source", "_scan", "_map")
+
+    def __init__(self, source: Any, scan: Callable[[Any], SourceMap]):
+        self._source = source
+        self._scan = scan
+        self._map: Optional[SourceMap] = None
+
+    def resolve(self) -> SourceMap:
+        """Returns the underlying `SourceMap`, reading the source the first time."""
+        if self._map is None:
+            if hasattr(self._source, "seek"):
+                self._source.seek(0)
+            self._map = self._scan(self._source)
+            self._source = None
+        return self._map
+
+    def get(self, pointer: str) -> Optional[Tuple[int, int]]:
+        return self.resolve().get(pointer)
+
+    def locate(self, pointer: str) -> Optional[Tuple[int, int]]:
+        return self.resolve().locate(pointer)
+
+    def __len__(self):
+        return len(self.resolve())
+
+    def __contains__(self, pointer):
+        return pointer in self.resolve()
+
+    def items(self):
+        return self.resolve().items()
+
+
+# SafeLoader that records the start mark of every mapping/sequence node while composing
+class LocatingLoader(yaml.SafeLoader):
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.source_map = SourceMap()
+        self._pointers = [""]
+
+    def compose_node(self, parent, index):
+        if parent is None:
+            pointer = ""
+        elif index is None:
+            # Mapping keys are composed with no index; they are never containers we track
+            return super().compose_node(parent, index)
+        elif isinstance(index, yaml.Node):
+            key = index.value if isinstance(index, yaml.ScalarNode) else str(index.value)
+            pointer = self._pointers[-1] + "/" + escape_pointer_token(key)
+        else:
+            pointer = self._pointers[-1] + "/" + str(index)
+        event = self.peek_event()
+        if not isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            return super().compose_node(parent, index)
+        mark = event.start_mark
+        self.source_map.add(pointer, mark.line + 1, mark.column + 1)
+        self._pointers.append(pointer)
+        try:
+            return super().compose_node(parent, index)
+        finally:
+            self._pointers.pop()
+
+
+_EventLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def scan_yaml_locations(stream) -> SourceMap:
+    """Returns the `SourceMap` of a YAML document from libyaml's events alone.
+
+    Records the same positions as `load_yaml_with_locations` without
+    building the document, at a fraction of its cost.
+    """
+    source_map = SourceMap()
+    # Open collections as [pointer (None inside complex keys), is mapping, pending key or next index]
+    stack = []
+    for event in yaml.parse(stream, Loader=_EventLoader):
+        kind = event.__class__
+        if kind is yaml.MappingEndEvent or kind is yaml.SequenceEndEvent:
+            stack.pop()
+            continue
+        if kind is not yaml.ScalarEvent and kind is not yaml.AliasEvent and kind is not yaml.MappingStartEvent \
+                and kind is not yaml.SequenceStartEvent:
+            continue
+        if not stack:
+            pointer = ""
+        else:
+            entry = stack[-1]
+            if entry[1]:
+                if entry[2] is None:
+                    # A mapping key; complex keys are never tracked
+                    entry[2] = event.value if kind is yaml.ScalarEvent else ""
+                    if kind is yaml.MappingStartEvent or kind is yaml.SequenceStartEvent:
+                        stack.append([None, kind is yaml.MappingStartEvent, None if kind is yaml.MappingStartEvent else 0])
+                    continue
+                token, entry[2] = escape_pointer_token(entry[2]), None
+            else:
+                token, entry[2] = str(entry[2]), entry[2] + 1
+            pointer = None if entry[0] is None else entry[0] + "/" + token
+        if kind is yaml.MappingStartEvent or kind is yaml.SequenceStartEvent:
+            if pointer is not None:
+                mark = event.start_mark
+                source_map.add(pointer, mark.line + 1, mark.column + 1)
+            stack.append([pointer, kind is yaml.MappingStartEvent, None if kind is yaml.MappingStartEvent else 0])
+    return source_map
+
+
+def load_yaml_with_locations(stream) -> Tuple[Any, SourceMap]:
+    """Loads YAML like `yaml.safe_load` and returns it with its `SourceMap`."""
+    loader = LocatingLoader(stream)
+    try:
+        return loader.get_single_data(), loader.source_map
+    finally:
+        loader.dispose()
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NEWLINE = re.compile(r"\n")
+_CONSTANTS = {"null": None, "true": True, "false": False}
+
+
+# Single-pass JSON reader that records container positions as it goes.
+# Strings and numbers are decoded with the json module's own helpers; only the
+# container structure is walked in Python.
+class _LocatingJSONReader:
+    def __init__(self, text: str):
+        self.text = text
+        self.newlines = [match.start() for match in _NEWLINE.finditer(text)]
+        self.source_map = SourceMap()
+
+    def record(self, pointer: str, index: int):
+        line = bisect_left(self.newlines, index)
+        line_start = self.newlines[line - 1] + 1 if line else 0
+        self.source_map.add(pointer, line + 1, index - line_start + 1)
+
+    def skip(self, index: int) -> int:
+        return _WHITESPACE.match(self.text, index).end()
+
+    def value(self, index: int, parent: str, token):
+        text = self.text
+        try:
+            char = text[index]
+        except IndexError:
+            raise JSONDecodeError("Expecting value", text, index) from None
+        if char == '"':
+            return scanstring(text, index + 1, True)
+        if char == "{" or char == "[":
+            # Pointers are only built for containers; scalars are never recorded
+            pointer = "" if token is None else parent + "/" + escape_pointer_token(token)
+            return self.object(index, pointer) if char == "{" else self.array(index, pointer)
+        for literal, constant in _CONSTANTS.items():
+            if text.startswith(literal, index):
+                return constant, index + len(literal)
+        match = NUMBER_RE.match(text, index)
+        if match is not None:
+            integer, fraction, exponent = match.groups()
+            if fraction or exponent:
+                return float(integer + (fraction or "") + (exponent or "")), match.end()
+            return int(integer), match.end()
+        raise JSONDecodeError("Expecting value", text, index)
+
+    def object(self, index: int, pointer: str):
+        text = self.text
+        self.record(pointer, index)
+        result = {}
+        index = self.skip(index + 1)
+        if text.startswith("}", index):
+            return result, index + 1
+        while True:
+            if not text.startswith('"', index):
+                raise JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+            key, index = scanstring(text, index + 1, True)
+            index = self.skip(index)
+            if not text.startswith(":", index):
+                raise JSONDecodeError("Expecting ':' delimiter", text, index)
+            index = self.skip(index + 1)
+            result[key], index = self.value(index, pointer, key)
+            index = self.skip(index)
+            if text.startswith("}", index):
+                return result, index + 1
+            if not text.startswith(",", index):
+                raise JSONDecodeError("Expecting ',' delimiter", text, index)
+            index = self.skip(index + 1)
+
+    def array(self, index: int, pointer: str):
+        text = self.text
+        self.record(pointer, index)
+        result = []
+        index = self.skip(index + 1)
+        if text.startswith("]", index):
+            return result, index + 1
+        while True:
+            item, index = self.value(index, pointer, len(result))
+            result.append(item)
+            index = self.skip(index)
+            if text.startswith("]", index):
+                return result, index + 1
+            if not text.startswith(",", index):
+                raise JSONDecodeError("Expecting ',' delimiter", text, index)
+            index = self.skip(index + 1)
+
+
+def load_json_with_locations(text) -> Tuple[Any, SourceMap]:
+    """Loads JSON like `json.loads` and returns it with its `SourceMap`.
+
+    Raises:
+        json.JSONDecodeError: If `text` is not valid JSON.
+    """
+    if isinstance(text, (bytes, bytearray)):
+        text = text.decode("utf-8-sig")
+    reader = _LocatingJSONReader(text)
+    value, end = reader.value(reader.skip(0), "", None)
+    end = reader.skip(end)
+    if end != len(text):
+        raise JSONDecodeError("Extra data", text, end)
+    return value, reader.source_map
+
+
+def scan_json_locations(text) -> SourceMap:
+    """Returns the `SourceMap` of a JSON document."""
+    return load_json_with_locations(text)[1]
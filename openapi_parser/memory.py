@@ -0,0 +1,191 @@
+"""Memory footprint of parsed specs, broken down by path, operation and component.
+
+`SizeWalker` computes deep sizes with `sys.getsizeof`, counting every object
+once however many containers share it (so a component referenced from a
+hundred places, or a string interned across specs, is not counted a hundred
+times) and skipping singletons, classes and functions, which the spec does
+not own.  It understands dicts, sequences, sets, Pydantic models (fields,
+extras and bookkeeping) and plain or ``__slots__`` objects.
+
+`measure` walks a parsed result once, attributing each object to the first
+unit that reaches it: the components (``/components/<kind>/<name>``), then
+each path item (its shared fields) and operation, then everything else.  It
+accepts raw dicts, `OpenAPI` models, or both, in which case the raw document
+and the model tree are also reported separately.  The walk is iterative and
+linear in the number of objects, so it can serve a debug endpoint on a live
+worker.
+"""
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.utils import json_pointer
+
+_ATOMIC = (str, bytes, bytearray, int, float, complex, bool, type(None))
+_SKIPPED = (type, type(sys), type(len), type(lambda: None))
+_SINGLETONS = {id(None), id(True), id(False), id(Ellipsis), id(NotImplemented)}
+_MODEL_SLOTS = ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__")
+
+
+class SizeWalker:
+    """Deep `sys.getsizeof` that counts each shared object once.
+
+    One walker remembers every object it has counted, so successive calls to
+    `size` return only the bytes not already attributed by earlier calls.
+    """
+
+    def __init__(self):
+        self._seen: Set[int] = set(_SINGLETONS)
+        self.objects = 0
+
+    def size(self, root: Any) -> int:
+        """Returns the bytes of `root` and everything it references not counted before."""
+        seen = self._seen
+        total = 0
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            identity = id(node)
+            if identity in seen or isinstance(node, _SKIPPED):
+                continue
+            seen.add(identity)
+            self.objects += 1
+            total += sys.getsizeof(node)
+            if isinstance(node, _ATOMIC):
+                continue
+            if isinstance(node, dict):
+                stack.extend(node.keys())
+                stack.extend(node.values())
+            elif isinstance(node, (list, tuple, set, frozenset)):
+                stack.extend(node)
+            elif isinstance(node, BaseModel):
+                for name in _MODEL_SLOTS:
+                    value = getattr(node, name, None)
+                    if value is not None:
+                        stack.append(value)
+            else:
+                if hasattr(node, "__dict__"):
+                    stack.append(node.__dict__)
+                for name in getattr(type(node), "__slots__", ()):
+                    value = getattr(node, name, None)
+                    if value is not None:
+                        stack.append(value)
+        return total
+
+
+def deep_size(obj: Any) -> int:
+    """Returns the deep size of `obj` in bytes, counting shared objects once."""
+    return SizeWalker().size(obj)
+
+
+class MemoryReport(BaseModel):
+    """Bytes attributed to each part of a parsed spec.
+
+    Attributes:
+        total: Every object reachable from the measured values, once.
+        raw: Deep size of the raw document alone, when one was given.
+        model: Deep size of the model tree alone, when one was given.
+        components: ``/components/<kind>/<name>`` -> bytes.
+        paths: ``/paths/<path>`` -> bytes of the path item's shared fields.
+        operations: ``"<METHOD> <path>"`` -> bytes (webhooks use their name).
+        other: Bytes of everything else (info, servers, tags, containers).
+        objects: Number of distinct objects counted.
+    """
+
+    total: int = 0
+    raw: Optional[int] = None
+    model: Optional[int] = None
+    components: Dict[str, int] = {}
+    paths: Dict[str, int] = {}
+    operations: Dict[str, int] = {}
+    other: int = 0
+    objects: int = 0
+
+    def top(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Returns the `count` largest paths, operations and components."""
+        entries = [*self.components.items(), *self.paths.items(), *self.operations.items()]
+        return sorted(entries, key=lambda entry: -entry[1])[:count]
+
+    def to_dict(self, count: int = 10) -> Dict[str, Any]:
+        """Returns a JSON-serializable summary with the `count` largest entries."""
+        return {
+            "total": self.total,
+            "raw": self.raw,
+            "model": self.model,
+            "components": sum(self.components.values()),
+            "paths": sum(self.paths.values()) + sum(self.operations.values()),
+            "other": self.other,
+            "objects": self.objects,
+            "largest": [{"pointer": name, "bytes": size} for name, size in self.top(count)],
+        }
+
+
+def _member(node: Any, name: str) -> Any:
+    # A member of a raw dict or of a model, looked up by its OpenAPI name (alias)
+    if isinstance(node, dict):
+        return node.get(name)
+    if isinstance(node, BaseModel):
+        for field, info in type(node).model_fields.items():
+            if (info.alias or field) == name:
+                return getattr(node, field)
+        return (node.__pydantic_extra__ or {}).get(name)
+    return None
+
+
+def _items(node: Any) -> Iterator[Tuple[str, Any]]:
+    if isinstance(node, dict):
+        yield from node.items()
+    elif isinstance(node, BaseModel):
+        for field, info in type(node).model_fields.items():
+            value = getattr(node, field)
+            if value is not None:
+                yield info.alias or field, value
+        yield from (node.__pydantic_extra__ or {}).items()
+
+
+def _units(document: Any) -> Iterator[Tuple[str, str, Any]]:
+    # (category, name, value) of the units of one document, components first
+    components = _member(document, "components")
+    for kind, members in _items(components):
+        for name, member in _items(members) if isinstance(members, (dict, BaseModel)) else ():
+            yield "components", json_pointer("components", kind, name), member
+    for section in ("paths", "webhooks"):
+        for path, item in _items(_member(document, section)):
+            operations = [(method, operation) for method, operation in _items(item) if method in HTTP_METHODS]
+            for method, operation in operations:
+                yield "operations", f"{method.upper()} {path}", operation
+            # Shared fields only: the operations were attributed above
+            for key, value in _items(item):
+                if key not in HTTP_METHODS:
+                    yield "paths", json_pointer(section, path), value
+
+
+def measure(document: Any = None, model: Optional[BaseModel] = None) -> MemoryReport:
+    """Returns the `MemoryReport` of a raw document, a parsed model, or both.
+
+    When both are given, each entry covers the unit's model objects and its
+    raw dict, and ``raw`` and ``model`` give each tree's own deep size.
+    """
+    if isinstance(document, BaseModel) and model is None:
+        document, model = None, document
+    report = MemoryReport()
+    walker = SizeWalker()
+    roots = [root for root in (model, document) if root is not None]
+    for root in roots:
+        for category, name, value in _units(root):
+            attributed = getattr(report, category)
+            attributed[name] = attributed.get(name, 0) + walker.size(value)
+    for root in roots:
+        report.other += walker.size(root)
+    report.total = sum(report.components.values()) + sum(report.paths.values()) + sum(report.operations.values()) + report.other
+    report.objects = walker.objects
+    if document is not None and model is not None:
+        report.raw = deep_size(document)
+        report.model = deep_size(model)
+    return report
+
+
+def measure_specs(specs: Dict[str, Any]) -> Dict[str, int]:
+    """Returns the bytes each spec adds, in order; objects shared with earlier specs count once."""
+    walker = SizeWalker()
+    return {name: walker.size(spec) for name, spec in specs.items()}
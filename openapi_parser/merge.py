@@ -0,0 +1,323 @@
+"""Merging many service specs into one gateway spec.
+
+Specs are folded into the result one at a time.  Each component is compared
+with an existing component of the same name by the fingerprint of its
+structure after its own references have been renamed: equal components are
+deduplicated, different ones are namespaced as ``<Namespace>_<Name>``, and
+every reference (including discriminator mappings and security requirement
+names) is rewritten to match.  Only the specs that needed renames are
+rewritten, so merging costs one fingerprint per component plus one walk of
+each renamed spec: near-linear in the total size.
+
+Path/method pairs already defined by an earlier spec are reported and the
+later operation is dropped; duplicate operationIds are reported and
+namespaced like components.  The result declares the highest input
+``openapi`` version, and specs of another minor version (3.0 next to 3.1)
+are reported, since their schemas follow different rules.
+"""
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.utils import escape_pointer_token, fingerprint, json_pointer, unescape_pointer_token
+
+_COMPONENT_REF_PREFIX = "#/components/"
+_INVALID_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9._-]+")
+_DEFAULT_VERSION = "3.1.0"
+
+
+class Collision(BaseModel):
+    code: str
+    pointer: str
+    source: str
+    message: str
+
+
+class MergeReport(BaseModel):
+    """What merging renamed, deduplicated and dropped.
+
+    Attributes:
+        renamed: ``"<source>#<old pointer>"`` -> new pointer of components
+            and operationIds that were namespaced.
+        deduplicated: ``"<source>#<pointer>"`` of components identical to
+            one already merged.
+        collisions: Path/operation conflicts and ``openapi`` version
+            mismatches, in merge order.
+    """
+
+    renamed: Dict[str, str] = {}
+    deduplicated: List[str] = []
+    collisions: List[Collision] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable summary suitable for CI tooling."""
+        return {
+            "renamed": len(self.renamed),
+            "deduplicated": len(self.deduplicated),
+            "collisions": [collision.model_dump() for collision in self.collisions],
+        }
+
+
+def namespace_for(document: Dict[str, Any], fallback: str) -> str:
+    """Derives a component-name-safe namespace from a spec's title."""
+    title = (document.get("info") or {}).get("title") or fallback
+    return _INVALID_NAME_CHARACTERS.sub("_", str(title)).strip("_") or fallback
+
+
+def _version_key(version: Any) -> Optional[Tuple[int, ...]]:
+    """Returns ``"3.0.3"`` as ``(3, 0, 3)``, or None if it is not a version."""
+    try:
+        return tuple(int(part) for part in str(version).split("-")[0].split("."))
+    except ValueError:
+        return None
+
+
+def _component_refs(node: Any, found: Set[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str) and ref.startswith(_COMPONENT_REF_PREFIX):
+                tokens = ref[len(_COMPONENT_REF_PREFIX):].split("/")
+                if len(tokens) >= 2:
+                    found.add((tokens[0], unescape_pointer_token(tokens[1])))
+            discriminator = node.get("discriminator")
+            mapping = discriminator.get("mapping") if isinstance(discriminator, dict) else None
+            if isinstance(mapping, dict):
+                for value in mapping.values():
+                    if isinstance(value, str) and "/" not in value and "#" not in value:
+                        found.add(("schemas", value))
+            stack.extend(value for value in node.values() if isinstance(value, (dict, list)))
+        elif isinstance(node, list):
+            stack.extend(value for value in node if isinstance(value, (dict, list)))
+    return found
+
+
+def _rename_ref(ref: str, renames: Dict[Tuple[str, str], str]) -> str:
+    if not ref.startswith(_COMPONENT_REF_PREFIX):
+        return ref
+    tokens = ref[len(_COMPONENT_REF_PREFIX):].split("/")
+    if len(tokens) < 2:
+        return ref
+    renamed = renames.get((tokens[0], unescape_pointer_token(tokens[1])))
+    if renamed is None:
+        return ref
+    return _COMPONENT_REF_PREFIX + "/".join([tokens[0], escape_pointer_token(renamed), *tokens[2:]])
+
+
+def _rewrite(node: Any, renames: Dict[Tuple[str, str], str]) -> Any:
+    # Returns `node` itself when nothing below it changes, so unaffected subtrees are shared
+    if isinstance(node, dict):
+        changed = None
+        for key, value in node.items():
+            if key == "$ref" and isinstance(value, str):
+                new = _rename_ref(value, renames)
+            elif key == "discriminator" and isinstance(value, dict) and isinstance(value.get("mapping"), dict):
+                mapping = {
+                    name: (_rename_ref(target, renames) if "/" in target or "#" in target else renames.get(("schemas", target), target))
+                    if isinstance(target, str) else target
+                    for name, target in value["mapping"].items()
+                }
+                new = value if mapping == value["mapping"] else {**value, "mapping": mapping}
+            else:
+                new = _rewrite(value, renames)
+            if new is not value:
+                if changed is None:
+                    changed = dict(node)
+                changed[key] = new
+        return node if changed is None else changed
+    if isinstance(node, list):
+        changed = None
+        for index, value in enumerate(node):
+            new = _rewrite(value, renames)
+            if new is not value:
+                if changed is None:
+                    changed = list(node)
+                changed[index] = new
+        return node if changed is None else changed
+    return node
+
+
+def _rename_security(requirements: Any, renames: Dict[Tuple[str, str], str]) -> Any:
+    if not isinstance(requirements, list):
+        return requirements
+    return [
+        {renames.get(("securitySchemes", name), name): scopes for name, scopes in requirement.items()}
+        if isinstance(requirement, dict) else requirement
+        for requirement in requirements
+    ]
+
+
+class _Merger:
+    def __init__(self):
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.fingerprints: Dict[Tuple[str, str], str] = {}
+        self.paths: Dict[str, Dict[str, Any]] = {}
+        self.webhooks: Dict[str, Dict[str, Any]] = {}
+        self.tags: Dict[str, Any] = {}
+        self.operation_ids: Set[str] = set()
+        self.version: Optional[str] = None
+        self.report = MergeReport()
+
+    def unique(self, kind: str, name: str, namespace: str, reserved: Set[Tuple[str, str]]) -> str:
+        candidate = f"{namespace}_{name}"
+        suffix = 2
+        while candidate in self.components.get(kind, {}) or (kind, candidate) in reserved:
+            candidate = f"{namespace}_{name}_{suffix}"
+            suffix += 1
+        return candidate
+
+    def add(self, source: str, namespace: str, document: Dict[str, Any]):
+        self._add_version(source, document.get("openapi"))
+        members = {
+            (kind, name): member
+            for kind, section in (document.get("components") or {}).items() if isinstance(section, dict)
+            for name, member in section.items()
+        }
+        renames = self._renames(namespace, members)
+        for (kind, name), member in members.items():
+            target = renames.get((kind, name), name)
+            pointer = json_pointer("components", kind, name)
+            if target == name and name in self.components.get(kind, {}):
+                self.report.deduplicated.append(f"{source}#{pointer}")
+                continue
+            rewritten = _rewrite(member, renames) if renames else member
+            self.components.setdefault(kind, {})[target] = rewritten
+            self.fingerprints[(kind, target)] = fingerprint(rewritten)
+            if target != name:
+                self.report.renamed[f"{source}#{pointer}"] = json_pointer("components", kind, target)
+
+        default_security = _rename_security(document.get("security"), renames) if renames else document.get("security")
+        for tag in document.get("tags") or ():
+            if isinstance(tag, dict) and tag.get("name") not in self.tags:
+                self.tags[tag.get("name")] = tag
+        for section, merged in (("paths", self.paths), ("webhooks", self.webhooks)):
+            for path, item in (document.get(section) or {}).items():
+                if not isinstance(item, dict):
+                    continue
+                item = _rewrite(item, renames) if renames else item
+                self._add_item(source, namespace, section, path, item, merged, renames, default_security, document.get("servers"))
+
+    def _add_version(self, source: str, version: Any):
+        key = _version_key(version)
+        if key is None:
+            return
+        if self.version is None:
+            self.version = str(version)
+            return
+        current = _version_key(self.version)
+        if key[:2] != current[:2]:
+            self._collision("openapi-version-mismatch", "/openapi", source,
+                            f"openapi {version} differs from {self.version} of an earlier spec; its schemas may not be valid in the merged document.")
+        if key > current:
+            self.version = str(version)
+
+    def _renames(self, namespace: str, members: Dict[Tuple[str, str], Any]) -> Dict[Tuple[str, str], str]:
+        # Clashing names are renamed unless equal after renaming; renames only grow, so this terminates
+        clashing = [key for key in members if key[1] in self.components.get(key[0], {})]
+        if not clashing:
+            return {}
+        refs = {key: _component_refs(members[key], set()) for key in clashing}
+        # New names must not collide with this spec's own names, nor with each other
+        reserved = set(members)
+        renames: Dict[Tuple[str, str], str] = {}
+        pending = set(clashing)
+        while pending:
+            changed = set()
+            for key in pending:
+                if key in renames:
+                    continue
+                rewritten = _rewrite(members[key], renames) if renames else members[key]
+                if fingerprint(rewritten) != self.fingerprints.get(key):
+                    renames[key] = self.unique(key[0], key[1], namespace, reserved)
+                    reserved.add((key[0], renames[key]))
+                    changed.add(key)
+            # Only clashing members that reference something newly renamed need another look
+            pending = {key for key in clashing if key not in renames and refs[key] & changed}
+        return renames
+
+    def _add_item(self, source, namespace, section, path, item, merged, renames, default_security, servers):
+        existing = merged.get(path)
+        if existing is None:
+            existing = merged[path] = {key: value for key, value in item.items() if key not in HTTP_METHODS}
+            if servers and "servers" not in existing:
+                # Each service keeps its own servers once the root servers become the gateway's
+                existing["servers"] = servers
+        else:
+            for key, value in item.items():
+                if key not in HTTP_METHODS and key != "servers" and key in existing and existing[key] != value:
+                    self._collision("path-item-conflict", json_pointer(section, path, key), source,
+                                    f"'{key}' of {section[:-1]} '{path}' differs from an earlier spec; the first is kept.")
+        for method, operation in item.items():
+            if method not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            pointer = json_pointer(section, path, method)
+            if method in existing:
+                self._collision("path-collision", pointer, source, f"{method.upper()} {path} is already defined by an earlier spec; dropped.")
+                continue
+            operation_id = operation.get("operationId")
+            if operation_id is not None and operation_id in self.operation_ids:
+                renamed = f"{namespace}_{operation_id}"
+                suffix = 2
+                while renamed in self.operation_ids:
+                    renamed = f"{namespace}_{operation_id}_{suffix}"
+                    suffix += 1
+                self._collision("operation-id-collision", pointer + "/operationId", source,
+                                f"operationId '{operation_id}' is already used; renamed to '{renamed}'.")
+                self.report.renamed[f"{source}#{pointer}/operationId"] = renamed
+                operation = {**operation, "operationId": renamed}
+                operation_id = renamed
+            if operation_id is not None:
+                self.operation_ids.add(operation_id)
+            if "security" in operation:
+                if renames:
+                    operation = {**operation, "security": _rename_security(operation["security"], renames)}
+            elif default_security is not None:
+                # The root security of each spec no longer applies once merged
+                operation = {**operation, "security": default_security}
+            existing[method] = operation
+
+    def _collision(self, code, pointer, source, message):
+        self.report.collisions.append(Collision(code=code, pointer=pointer, source=source, message=message))
+
+
+def merge_specs(
+    specs: Union[Dict[str, Dict[str, Any]], Iterable[Dict[str, Any]]],
+    info: Optional[Dict[str, Any]] = None,
+    servers: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Any], MergeReport]:
+    """Merges service specs into one document.
+
+    Args:
+        specs: Documents keyed by source name (used in the report and, made
+            name-safe, as the namespace of renamed components), or an
+            iterable of documents named after their ``info.title``.
+        info: The merged document's ``info``; defaults to a generic title.
+        servers: The merged document's root ``servers`` (e.g. the gateway).
+            Each spec's own servers move to its path items.
+
+    Returns:
+        The merged document, sharing unchanged subtrees with the inputs, and
+        the `MergeReport`.
+    """
+    items = specs.items() if isinstance(specs, dict) else (
+        (namespace_for(document, f"spec{index}"), document) for index, document in enumerate(specs)
+    )
+    merger = _Merger()
+    for source, document in items:
+        merger.add(source, _INVALID_NAME_CHARACTERS.sub("_", source).strip("_") or "spec", document)
+    merged: Dict[str, Any] = {
+        "openapi": merger.version or _DEFAULT_VERSION,
+        "info": info or {"title": "Merged API", "version": "1.0.0"},
+    }
+    if servers:
+        merged["servers"] = servers
+    merged["paths"] = merger.paths
+    if merger.webhooks:
+        merged["webhooks"] = merger.webhooks
+    if merger.components:
+        merged["components"] = merger.components
+    if merger.tags:
+        merged["tags"] = list(merger.tags.values())
+    return merged, merger.report
@@ -0,0 +1,331 @@
+"""Sampled validation of production responses against the spec.
+
+`ResponseValidationMiddleware` wraps an ASGI application.  For a sample of
+requests to documented operations it captures the response status, media
+type and (JSON) body, and hands them to a background thread that validates
+them against the operation's response schema with `SchemaValidator`.  The
+request path only pays for the sampling decision and for copying the body
+chunks of sampled responses.
+
+Sampling is per route (``route_rates``, falling back to ``sample_rate``) and
+adaptive: the worker measures the CPU time validation takes, and every
+``window`` seconds the rates are scaled down so that validation uses at most
+``cpu_budget`` of one CPU, then scaled back up while there is headroom.  When
+the worker falls behind, samples are dropped rather than queued without
+bound.
+
+Mismatches are counted per (method, route, status, code) and exported with
+`metrics` or, in the Prometheus text format, with `prometheus`.
+"""
+import json
+import logging
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.validator import SchemaValidator
+
+logger = logging.getLogger(__name__)
+
+_TEMPLATE_SEGMENT = re.compile(r"\{[^}/]+\}")
+# Rates are never scaled below this, so a route's mismatches stay observable
+_MIN_SCALE = 0.001
+_STOP = object()
+
+
+def _is_json(media_type: str) -> bool:
+    return media_type == "application/json" or media_type.endswith("+json")
+
+
+class _Route:
+    __slots__ = ("method", "template", "rate", "operation")
+
+    def __init__(self, method: str, template: str, rate: float, operation: Dict[str, Any]):
+        self.method = method
+        self.template = template
+        self.rate = rate
+        self.operation = operation
+
+
+class _Sample:
+    __slots__ = ("route", "status", "media_type", "body")
+
+    def __init__(self, route: _Route, status: int, media_type: str, body: bytes):
+        self.route = route
+        self.status = status
+        self.media_type = media_type
+        self.body = body
+
+
+class ResponseValidationMiddleware:
+    """ASGI middleware validating a sample of responses in a background thread.
+
+    Args:
+        app: The wrapped ASGI application.
+        document: The raw OpenAPI document, or a parsed model (dumped by alias).
+        sample_rate: Fraction of requests to each operation that is validated.
+        route_rates: Rates overriding `sample_rate`, keyed by ``"GET /path"``
+            or by ``"/path"`` for every method of a path template.
+        cpu_budget: Fraction of one CPU that validation may use on average.
+        window: Seconds between adjustments of the sampling scale.
+        max_body: Responses with larger bodies are not validated.
+        queue_size: Samples waiting for the worker; further samples are dropped.
+        max_errors: Schema problems recorded per mismatching response.
+        on_mismatch: Called from the worker with each mismatch record.
+        seed: Seed of the sampling decisions, for reproducible tests.
+    """
+
+    def __init__(
+        self,
+        app: Callable,
+        document: Union[Dict[str, Any], BaseModel],
+        sample_rate: float = 0.01,
+        route_rates: Optional[Dict[str, float]] = None,
+        cpu_budget: float = 0.05,
+        window: float = 1.0,
+        max_body: int = 1 << 20,
+        queue_size: int = 1000,
+        max_errors: int = 5,
+        on_mismatch: Optional[Callable[[Dict[str, Any]], None]] = None,
+        seed: Optional[int] = None,
+    ):
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self.app = app
+        self.validator = SchemaValidator(document)
+        self.cpu_budget = cpu_budget
+        self.window = window
+        self.max_body = max_body
+        self.max_errors = max_errors
+        self.on_mismatch = on_mismatch
+        self.recent: deque = deque(maxlen=100)
+        self._random = random.Random(seed)
+        self._static: Dict[Tuple[str, str], _Route] = {}
+        self._templated: List[Tuple[str, "re.Pattern", _Route]] = []
+        self._compile_routes(document, sample_rate, route_rates or {})
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._scale = 1.0
+        self._window_start = time.monotonic()
+        self._window_cpu = 0.0
+        self._counters = {"sampled": 0, "validated": 0, "dropped": 0, "skipped": 0, "valid": 0}
+        self._mismatches: Dict[Tuple[str, str, int, str], int] = {}
+
+    def _compile_routes(self, document: Dict[str, Any], sample_rate: float, route_rates: Dict[str, float]):
+        for template, item in (document.get("paths") or {}).items():
+            if not isinstance(item, dict):
+                continue
+            for method, operation in item.items():
+                if method not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                name = method.upper()
+                rate = route_rates.get(f"{name} {template}", route_rates.get(template, sample_rate))
+                route = _Route(name, template, rate, operation)
+                if _TEMPLATE_SEGMENT.search(template):
+                    parts = _TEMPLATE_SEGMENT.split(template)
+                    expression = "[^/]+".join(re.escape(part) for part in parts)
+                    self._templated.append((name, re.compile(expression + r"\Z"), route))
+                else:
+                    self._static[(name, template)] = route
+        # Templates with more literal characters are more specific, so they match first
+        self._templated.sort(key=lambda entry: -len(_TEMPLATE_SEGMENT.sub("", entry[2].template)))
+
+    def route(self, method: str, path: str) -> Optional[_Route]:
+        """Returns the documented operation matching a request, if any."""
+        route = self._static.get((method, path))
+        if route is not None:
+            return route
+        for name, pattern, route in self._templated:
+            if name == method and pattern.match(path):
+                return route
+        return None
+
+    @property
+    def scale(self) -> float:
+        """The factor currently applied to every sampling rate by the CPU budget."""
+        return self._scale
+
+    def _should_sample(self, route: _Route) -> bool:
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            self._adjust(now)
+        return route.rate > 0 and self._random.random() < route.rate * self._scale
+
+    def _adjust(self, now: float):
+        with self._lock:
+            usage = self._window_cpu / (now - self._window_start)
+            self._window_start, self._window_cpu = now, 0.0
+        if usage > self.cpu_budget:
+            self._scale = max(self._scale * self.cpu_budget / usage, _MIN_SCALE)
+        else:
+            # Recover gradually so one quiet window does not undo the budget
+            self._scale = min(1.0, self._scale * 2)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        route = self.route(scope["method"], scope["path"])
+        if route is None or not self._should_sample(route):
+            await self.app(scope, receive, send)
+            return
+        captured = {"status": None, "media_type": "", "body": [], "size": 0}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name.lower() == b"content-type":
+                        captured["media_type"] = value.decode("latin-1").split(";")[0].strip().lower()
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                captured["size"] += len(chunk)
+                if captured["size"] > self.max_body:
+                    captured["body"] = None
+                elif captured["body"] is not None:
+                    captured["body"].append(chunk)
+                if not message.get("more_body", False):
+                    self._submit(route, captured)
+            await send(message)
+
+        await self.app(scope, receive, capture)
+
+    def _submit(self, route: _Route, captured: Dict[str, Any]):
+        self._counters["sampled"] += 1
+        if captured["body"] is None or captured["status"] is None:
+            self._counters["skipped"] += 1
+            return
+        sample = _Sample(route, captured["status"], captured["media_type"], b"".join(captured["body"]))
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(sample)
+        except queue.Full:
+            self._counters["dropped"] += 1
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="openapi-response-validation", daemon=True)
+                    self._worker.start()
+
+    def _run(self):
+        while True:
+            sample = self._queue.get()
+            try:
+                if sample is _STOP:
+                    return
+                started = time.thread_time()
+                try:
+                    self._validate(sample)
+                except Exception:
+                    logger.error("Unexpected error while validating a sampled response", exc_info=True)
+                spent = time.thread_time() - started
+                with self._lock:
+                    self._window_cpu += spent
+            finally:
+                self._queue.task_done()
+
+    def _response_schema(self, route: _Route, status: int, media_type: str) -> Tuple[Optional[str], Any]:
+        # Returns (mismatch code, schema); a None schema means there is nothing to validate
+        responses = route.operation.get("responses") or {}
+        response = responses.get(str(status), responses.get(f"{status // 100}XX", responses.get("default")))
+        if response is None:
+            return "undocumented-status", None
+        if isinstance(response, dict) and isinstance(response.get("$ref"), str):
+            response = self.validator.resolve(response["$ref"])
+        content = response.get("content") if isinstance(response, dict) else None
+        if not content:
+            return None, None
+        media = content.get(media_type) or content.get(media_type.split("/")[0] + "/*") or content.get("*/*")
+        if media is None:
+            return "undocumented-media-type", None
+        return None, media.get("schema") if _is_json(media_type) else None
+
+    def _validate(self, sample: _Sample):
+        route = sample.route
+        try:
+            code, schema = self._response_schema(route, sample.status, sample.media_type)
+        except ReferenceResolutionError:
+            code, schema = "unresolvable-response", None
+        issues = []
+        if code is None and schema is not None:
+            try:
+                instance = json.loads(sample.body)
+            except ValueError:
+                code = "invalid-json"
+            else:
+                issues = self.validator.validate(instance, schema, max_errors=self.max_errors)
+                if issues:
+                    code = "schema-mismatch"
+        with self._lock:
+            self._counters["validated"] += 1
+            if code is None:
+                self._counters["valid"] += 1
+                return
+            key = (route.method, route.template, sample.status, code)
+            self._mismatches[key] = self._mismatches.get(key, 0) + 1
+        record = {
+            "method": route.method,
+            "route": route.template,
+            "status": sample.status,
+            "media_type": sample.media_type,
+            "code": code,
+            "issues": [issue.to_dict() for issue in issues],
+        }
+        self.recent.append(record)
+        logger.warning("Response of %s %s (%s) does not match the spec: %s", route.method, route.template, sample.status, code)
+        if self.on_mismatch is not None:
+            self.on_mismatch(record)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Waits until every queued sample has been validated; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def close(self, timeout: Optional[float] = None):
+        """Validates the queued samples and stops the worker."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns the sampling counters and the mismatch counts per route."""
+        with self._lock:
+            return {
+                **self._counters,
+                "scale": self._scale,
+                "mismatches": [
+                    {"method": method, "route": template, "status": status, "code": code, "count": count}
+                    for (method, template, status, code), count in self._mismatches.items()
+                ],
+            }
+
+    def prometheus(self) -> str:
+        """Returns the metrics in the Prometheus text exposition format."""
+        metrics = self.metrics()
+        lines = []
+        for name in ("sampled", "validated", "dropped", "skipped"):
+            lines.append(f"# TYPE openapi_responses_{name}_total counter")
+            lines.append(f"openapi_responses_{name}_total {metrics[name]}")
+        lines.append("# TYPE openapi_response_sample_scale gauge")
+        lines.append(f"openapi_response_sample_scale {metrics['scale']:g}")
+        lines.append("# TYPE openapi_response_mismatches_total counter")
+        for entry in metrics["mismatches"]:
+            route = entry["route"].replace("\\", "\\\\").replace('"', '\\"')
+            lines.append(
+                f'openapi_response_mismatches_total{{method="{entry["method"]}",route="{route}",'
+                f'status="{entry["status"]}",code="{entry["code"]}"}} {entry["count"]}'
+            )
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,458 @@
+"""Compiled codecs for path, query, header and cookie parameters.
+
+`compile_parameter` turns one Parameter Object into a `ParameterCodec` whose
+``decode``/``encode`` functions were chosen once from its location, ``style``,
+``explode`` and the shape of its schema (primitive, array or object), with
+value coercion to the schema's types (``integer``, ``number``, ``boolean``)
+precompiled as well.  `OperationCodec` combines the path-level and
+operation-level parameters of an operation and decodes a whole request:
+the query string and cookies are split once, then each codec picks its
+values without inspecting the spec again.
+
+Supported styles (defaults per OpenAPI 3.1):
+
+=============== ======================================= ==========
+style           example (``explode`` false / true)      locations
+=============== ======================================= ==========
+simple          ``3,4,5`` / ``R=100,G=200``             path, header
+label           ``.3,4,5`` / ``.3.4.5``                 path
+matrix          ``;id=3,4,5`` / ``;id=3;id=4;id=5``     path
+form            ``id=3,4,5`` / ``id=3&id=4&id=5``       query, cookie
+spaceDelimited  ``id=3%204%205``                        query
+pipeDelimited   ``id=3|4|5``                            query
+deepObject      ``id[R]=100&id[G]=200``                 query
+=============== ======================================= ==========
+
+Cookies carry one ``name=value`` pair per parameter, so arrays and objects
+in cookies use the comma-separated (``explode`` false) form.
+"""
+import json
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote, unquote, unquote_plus
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.exceptions import DecodeError, ReferenceResolutionError
+from openapi_parser.flatten import SchemaFlattener
+from openapi_parser.utils import resolve_pointer
+
+LOCATIONS = ("path", "query", "header", "cookie")
+DEFAULT_STYLES = {"path": "simple", "query": "form", "header": "simple", "cookie": "form"}
+ALLOWED_STYLES = {
+    "path": ("simple", "label", "matrix"),
+    "query": ("form", "spaceDelimited", "pipeDelimited", "deepObject"),
+    "header": ("simple",),
+    "cookie": ("form",),
+}
+
+# RFC 3986 reserved characters, left unescaped for allowReserved query parameters
+_RESERVED = ":/?#[]@!$&'()*+,;="
+_INTEGER = re.compile(r"^[-+]?\d+$")
+_DELIMITERS = {"spaceDelimited": (re.compile(r"%20|\+| "), "%20"), "pipeDelimited": (re.compile(r"%7[Cc]|\|"), "|")}
+_MISSING = object()
+
+Coercer = Callable[[str], Any]
+
+
+def _identity(text: str) -> str:
+    return text
+
+
+def _integer(text: str) -> int:
+    if not _INTEGER.match(text):
+        raise DecodeError("", f"Expected an integer, got {text!r}.")
+    return int(text)
+
+
+def _number(text: str):
+    if _INTEGER.match(text):
+        return int(text)
+    try:
+        return float(text)
+    except ValueError:
+        raise DecodeError("", f"Expected a number, got {text!r}.") from None
+
+
+def _boolean(text: str) -> bool:
+    lowered = text.lower()
+    if lowered == "true":
+        return True
+    if lowered == "false":
+        return False
+    raise DecodeError("", f"Expected true or false, got {text!r}.")
+
+
+_COERCERS = {"integer": _integer, "number": _number, "boolean": _boolean}
+
+
+def _types(schema: Any) -> List[str]:
+    kind = schema.get("type") if isinstance(schema, dict) else None
+    names = kind if isinstance(kind, list) else [kind] if isinstance(kind, str) else []
+    return [name for name in names if name != "null"]
+
+
+def _coercer(schema: Any) -> Coercer:
+    for name in _types(schema):
+        if name in _COERCERS:
+            return _COERCERS[name]
+    return _identity
+
+
+def _text(value: Any) -> str:
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    return "" if value is None else str(value)
+
+
+class ParameterCodec:
+    """Precompiled decoder and encoder of one parameter.
+
+    ``decode`` takes the raw (still percent-encoded) input of the
+    parameter's location: the path segment value, the header value, the
+    cookie value, or for query parameters the mapping of decoded names to
+    lists of raw values produced by `parse_query`.  It returns the coerced
+    value, or the schema default (or nothing, see `OperationCodec`) when the
+    parameter is absent.  ``encode`` returns the path segment, header value,
+    cookie pair or query string fragment for a value.
+
+    Attributes:
+        name, location, style, explode, required, shape: As compiled.
+    """
+
+    __slots__ = ("name", "location", "style", "explode", "required", "shape", "default", "decode", "encode")
+
+    def __repr__(self):
+        return f"ParameterCodec({self.name!r}, {self.location!r}, style={self.style!r}, explode={self.explode}, shape={self.shape!r})"
+
+
+def parse_query(query_string: str) -> Dict[str, List[str]]:
+    """Splits a query string into decoded names and lists of raw values, in order."""
+    result: Dict[str, List[str]] = {}
+    for pair in query_string.split("&"):
+        if not pair:
+            continue
+        name, _, value = pair.partition("=")
+        result.setdefault(unquote_plus(name), []).append(value)
+    return result
+
+
+def parse_cookies(header: str) -> Dict[str, str]:
+    """Splits a ``Cookie`` header into names and raw values."""
+    result = {}
+    for pair in header.split(";"):
+        name, separator, value = pair.strip().partition("=")
+        if separator:
+            result.setdefault(name, value)
+    return result
+
+
+def _pairs(parts: List[str], coercers: Dict[str, Coercer], fallback: Coercer) -> Dict[str, Any]:
+    # explode=false objects alternate names and values: R,100,G,200
+    if len(parts) % 2:
+        raise DecodeError("", "Expected name,value pairs.")
+    return {parts[i]: coercers.get(parts[i], fallback)(parts[i + 1]) for i in range(0, len(parts), 2)}
+
+
+def _assignments(parts: List[str], coercers: Dict[str, Coercer], fallback: Coercer, unescape: Coercer) -> Dict[str, Any]:
+    # explode=true objects are name=value assignments: R=100,G=200
+    result = {}
+    for part in parts:
+        name, separator, value = part.partition("=")
+        if not separator:
+            raise DecodeError("", f"Expected name=value, got {part!r}.")
+        name = unescape(name)
+        result[name] = coercers.get(name, fallback)(unescape(value))
+    return result
+
+
+def _string_decoder(name, style, explode, shape, item, properties, unescape) -> Callable[[str], Any]:
+    # Decoders for locations holding one string: path, header, cookie
+    if style == "simple" or style == "form":
+        prefix, separator = "", ","
+    elif style == "label":
+        prefix, separator = ".", "." if explode else ","
+    else:  # matrix
+        prefix, separator = ";", ";"
+
+    def strip(raw: str) -> str:
+        if not raw.startswith(prefix):
+            raise DecodeError("", f"Expected a value starting with {prefix!r}.")
+        return raw[len(prefix):]
+
+    if style == "matrix":
+        assignment = f"{name}="
+
+        def values(raw: str) -> List[str]:
+            parts = strip(raw).split(";") if explode else [strip(raw)]
+            found = []
+            for part in parts:
+                if not part.startswith(assignment):
+                    raise DecodeError("", f"Expected {assignment!r}.")
+                found.extend(part[len(assignment):].split(",") if not explode else [part[len(assignment):]])
+            return found
+
+        if shape == "primitive":
+            return lambda raw: item(unescape(values(raw)[0]))
+        if shape == "array":
+            return lambda raw: [item(unescape(part)) for part in values(raw)]
+        if explode:
+            return lambda raw: _assignments(strip(raw).split(";"), properties, _identity, unescape)
+        return lambda raw: _pairs([unescape(part) for part in values(raw)], properties, _identity)
+
+    if shape == "primitive":
+        return lambda raw: item(unescape(strip(raw)))
+    if shape == "array":
+        return lambda raw: [item(unescape(part)) for part in strip(raw).split(separator)] if strip(raw) else []
+    if explode:
+        return lambda raw: _assignments(strip(raw).split(separator), properties, _identity, unescape)
+    return lambda raw: _pairs([unescape(part) for part in strip(raw).split(",")], properties, _identity)
+
+
+def _query_decoder(name, style, explode, shape, item, properties) -> Callable[[Dict[str, List[str]]], Any]:
+    unescape = unquote_plus
+    if style == "deepObject":
+        prefix = f"{name}["
+
+        def deep(query):
+            result = {}
+            for key, raw in query.items():
+                if key.startswith(prefix) and key.endswith("]"):
+                    member = key[len(prefix):-1]
+                    result[member] = properties.get(member, _identity)(unescape(raw[0]))
+            return result if result else _MISSING
+
+        return deep
+    if explode and shape == "object":
+        # Each property is its own query parameter
+        def exploded(query):
+            result = {member: coerce(unescape(query[member][0])) for member, coerce in properties.items() if member in query}
+            return result if result else _MISSING
+
+        return exploded
+    if shape == "array" and explode:
+        return lambda query: [item(unescape(raw)) for raw in query[name]] if name in query else _MISSING
+    if style in _DELIMITERS:
+        splitter = _DELIMITERS[style][0].split
+    else:
+        splitter = lambda raw: raw.split(",")
+    if shape == "primitive":
+        return lambda query: item(unescape(query[name][0])) if name in query else _MISSING
+    if shape == "array":
+        return lambda query: (
+            [item(unescape(part)) for part in splitter(query[name][0])] if query[name][0] else []
+        ) if name in query else _MISSING
+    return lambda query: _pairs([unescape(part) for part in splitter(query[name][0])], properties, _identity) if name in query else _MISSING
+
+
+def _encoder(name, location, style, explode, shape, allow_reserved) -> Callable[[Any], str]:
+    if location == "header":
+        escape = _text
+    else:
+        safe = _RESERVED if allow_reserved and location == "query" else ""
+        escape = lambda value: quote(_text(value), safe=safe)
+    key = quote(name, safe="")
+
+    def flat(value) -> List[str]:
+        if shape == "array":
+            return [escape(member) for member in value]
+        if shape == "object":
+            return [part for member, inner in value.items() for part in (escape(member), escape(inner))]
+        return [escape(value)]
+
+    if location == "query":
+        if style == "deepObject":
+            return lambda value: "&".join(f"{key}%5B{escape(member)}%5D={escape(inner)}" for member, inner in value.items())
+        if explode and shape == "object":
+            return lambda value: "&".join(f"{escape(member)}={escape(inner)}" for member, inner in value.items())
+        if explode and shape == "array":
+            return lambda value: "&".join(f"{key}={escape(member)}" for member in value)
+        delimiter = _DELIMITERS[style][1] if style in _DELIMITERS else ","
+        return lambda value: f"{key}=" + delimiter.join(flat(value))
+    if location == "cookie":
+        return lambda value: f"{name}=" + ",".join(flat(value))
+    if style == "matrix":
+        if explode and shape == "array":
+            return lambda value: "".join(f";{key}={escape(member)}" for member in value)
+        if explode and shape == "object":
+            return lambda value: "".join(f";{escape(member)}={escape(inner)}" for member, inner in value.items())
+        return lambda value: f";{key}=" + ",".join(flat(value))
+    prefix = "." if style == "label" else ""
+    separator = "." if style == "label" and explode else ","
+    if explode and shape == "object":
+        return lambda value: prefix + separator.join(f"{escape(member)}={escape(inner)}" for member, inner in value.items())
+    return lambda value: prefix + separator.join(flat(value))
+
+
+def compile_parameter(parameter: Dict[str, Any], document: Optional[Dict[str, Any]] = None,
+                      flattener: Optional[SchemaFlattener] = None) -> ParameterCodec:
+    """Compiles a Parameter Object (references are followed within `document`).
+
+    Raises:
+        ValueError: If the style is not allowed for the parameter's location.
+    """
+    document = document or {}
+    while isinstance(parameter.get("$ref"), str):
+        parameter = resolve_pointer(document, parameter["$ref"])
+    location = parameter.get("in")
+    if location not in LOCATIONS:
+        raise ValueError(f"Unknown parameter location {location!r}.")
+    name = parameter["name"]
+    style = parameter.get("style") or DEFAULT_STYLES[location]
+    if style not in ALLOWED_STYLES[location]:
+        raise ValueError(f"Style {style!r} is not allowed for {location} parameter {name!r}.")
+    explode = parameter.get("explode", style == "form")
+
+    codec = ParameterCodec()
+    codec.name, codec.location, codec.style, codec.explode = name, location, style, explode
+    codec.required = bool(parameter.get("required")) or location == "path"
+
+    if "content" in parameter and isinstance(parameter["content"], dict):
+        # Parameters with content carry one serialized (JSON) value
+        codec.shape, codec.default = "content", _MISSING
+        unescape = _identity if location == "header" else unquote_plus if location == "query" else unquote
+
+        def loads(text: str):
+            try:
+                return json.loads(unescape(text))
+            except ValueError:
+                raise DecodeError("", "Expected a JSON value.") from None
+
+        if location == "query":
+            codec.decode = lambda query: loads(query[name][0]) if name in query else _MISSING
+        else:
+            codec.decode = loads
+        dumps = lambda value: json.dumps(value, separators=(",", ":"))
+        codec.encode = {
+            "query": lambda value: f"{quote(name, safe='')}={quote(dumps(value), safe='')}",
+            "cookie": lambda value: f"{name}={quote(dumps(value), safe='')}",
+            "header": dumps,
+            "path": lambda value: quote(dumps(value), safe=""),
+        }[location]
+        return codec
+
+    schema = parameter.get("schema") or {}
+    flattener = flattener or SchemaFlattener(document)
+    try:
+        schema = flattener.flatten(_resolve(document, schema))
+    except ReferenceResolutionError:
+        schema = {}
+    types = _types(schema)
+    if "array" in types or (not types and "items" in schema):
+        shape = "array"
+    elif "object" in types or (not types and "properties" in schema):
+        shape = "object"
+    else:
+        shape = "primitive"
+    if style == "deepObject" and shape != "object":
+        raise ValueError(f"Style 'deepObject' requires an object schema for parameter {name!r}.")
+    codec.shape = shape
+    codec.default = schema.get("default", _MISSING)
+    item = _coercer(_resolve(document, schema.get("items", {}))) if shape == "array" else _coercer(schema)
+    properties = {
+        member: _coercer(_resolve(document, subschema))
+        for member, subschema in (schema.get("properties") or {}).items()
+    } if shape == "object" else {}
+
+    if location == "query":
+        codec.decode = _query_decoder(name, style, explode, shape, item, properties)
+    else:
+        unescape = _identity if location == "header" else unquote
+        # Cookie values are single name=value pairs, so their lists are never exploded
+        codec.decode = _string_decoder(name, style, explode and location != "cookie", shape, item, properties, unescape)
+    codec.encode = _encoder(name, location, style, explode and location != "cookie", shape, bool(parameter.get("allowReserved")))
+    return codec
+
+
+def _resolve(document: Dict[str, Any], schema: Any) -> Any:
+    seen = set()
+    while isinstance(schema, dict) and isinstance(schema.get("$ref"), str) and schema["$ref"] not in seen:
+        seen.add(schema["$ref"])
+        schema = resolve_pointer(document, schema["$ref"])
+    return schema
+
+
+class OperationCodec:
+    """Decoders of every parameter of one operation, path-level ones included.
+
+    Operation-level parameters override path-level ones with the same name
+    and location.
+    """
+
+    def __init__(self, codecs: List[ParameterCodec]):
+        self.codecs = codecs
+        self._by_location: Dict[str, List[ParameterCodec]] = {location: [] for location in LOCATIONS}
+        for codec in codecs:
+            self._by_location[codec.location].append(codec)
+
+    def decode(
+        self,
+        path_params: Optional[Mapping[str, str]] = None,
+        query_string: str = "",
+        headers: Optional[Mapping[str, str]] = None,
+        cookie_header: str = "",
+    ) -> Dict[str, Dict[str, Any]]:
+        """Decodes a request's raw parameters into ``{location: {name: value}}``.
+
+        `path_params` holds the raw template values matched by the router and
+        `headers` may use any case.  Absent optional parameters are omitted
+        unless their schema has a default.
+
+        Raises:
+            DecodeError: With a pointer such as ``/query/limit`` for the first
+                missing or malformed parameter.
+        """
+        sources = {
+            "path": path_params or {},
+            "query": parse_query(query_string) if self._by_location["query"] else {},
+            "header": {key.lower(): value for key, value in (headers or {}).items()} if self._by_location["header"] else {},
+            "cookie": parse_cookies(cookie_header) if self._by_location["cookie"] else {},
+        }
+        result: Dict[str, Dict[str, Any]] = {location: {} for location in LOCATIONS}
+        for location, codecs in self._by_location.items():
+            source = sources[location]
+            for codec in codecs:
+                try:
+                    if location == "query":
+                        value = codec.decode(source)
+                    else:
+                        raw = source.get(codec.name.lower() if location == "header" else codec.name, _MISSING)
+                        value = _MISSING if raw is _MISSING else codec.decode(raw)
+                except DecodeError as error:
+                    raise error.within(f"/{location}/{codec.name}") from None
+                if value is _MISSING:
+                    if codec.required:
+                        raise DecodeError(f"/{location}/{codec.name}", "Required parameter is missing.")
+                    if codec.default is _MISSING:
+                        continue
+                    value = codec.default
+                result[location][codec.name] = value
+        return result
+
+
+class ParameterCodecs:
+    """Operation codecs of a document, compiled on first use and cached."""
+
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        self._flattener = SchemaFlattener(document)
+        self._operations: Dict[Tuple[str, str], OperationCodec] = {}
+
+    def operation(self, path: str, method: str) -> OperationCodec:
+        """Returns the codec of ``method path``.
+
+        Raises:
+            KeyError: If the operation does not exist.
+        """
+        key = (path, method.lower())
+        codec = self._operations.get(key)
+        if codec is None:
+            item = (self.document.get("paths") or {}).get(path)
+            if not isinstance(item, dict) or key[1] not in HTTP_METHODS or not isinstance(item.get(key[1]), dict):
+                raise KeyError(f"Unknown operation {method.upper()} {path}.")
+            merged: Dict[Tuple[str, str], ParameterCodec] = {}
+            for parameter in [*(item.get("parameters") or ()), *(item[key[1]].get("parameters") or ())]:
+                compiled = compile_parameter(parameter, self.document, self._flattener)
+                merged[(compiled.name, compiled.location)] = compiled
+            codec = self._operations[key] = OperationCodec(list(merged.values()))
+        return codec
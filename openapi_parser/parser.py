@@ -1,14 +1,24 @@
+import json
+import os
 import yaml
 import logging
-from typing import Dict, Any, Optional
+from enum import Enum
+from itertools import islice
+from typing import Dict, Any, List, Optional, Union
 from pydantic import BaseModel, Field, ValidationError
 from openapi_parser.models import Info, Components
-from openapi_parser.exceptions import ParsingError, ReferenceResolutionError
+from openapi_parser.checks import required_field_issues, shape_issues, strict_issues
+from openapi_parser.exceptions import ParsingError, ReferenceResolutionError, ResourceLimitError, ValidationIssue
+from openapi_parser.limits import DEFAULT_LIMITS, ResourceLimits, check_references, check_size, check_tree, load_yaml
+from openapi_parser.locations import LazySourceMap, scan_json_locations, scan_yaml_locations
+from openapi_parser.utils import MMAP_THRESHOLD, escape_pointer_token, open_bytes
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is left to the application; the package only emits records
 logger = logging.getLogger(__name__)
 
+# libyaml's C loader when PyYAML was built with it; a new loader is created per call
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Define a schema validator for OpenAPI content using Pydantic
 class OpenAPISchemaValidator(BaseModel):
     openapi_version: str = Field(..., alias="openapi")
@@ -19,50 +29,239 @@ class OpenAPISchemaValidator(BaseModel):
     tags: Optional[list] = []
     externalDocs: Optional[Any] = None
 
+# Default cap on the number of issues gathered by collect-all-errors mode
+DEFAULT_MAX_ERRORS = 100
+
+# How much checking parse_openapi performs
+class ValidationLevel(str, Enum):
+    """Validation levels accepted by `parse_openapi` and the loaders.
+
+    STRUCTURAL: required top-level fields plus the shape of info, paths,
+        operations, parameters and responses, checked by a hand-written walker
+        (`checks.shape_issues`).  No Pydantic validation happens and
+        `components` is not materialized (left as None).  Its cost grows with
+        the number of operations rather than schemas: several times cheaper
+        than STANDARD on component-heavy specs, but more expensive on specs
+        with thousands of paths, which STANDARD does not inspect.
+    STANDARD: the default; required fields plus full Pydantic validation of
+        info and components.  `paths` is kept as raw data.
+    STRICT: STANDARD plus a walk of the whole document checking that every
+        local `$ref` resolves, operationIds are unique, path parameters
+        match their path templates, every ``pattern`` compiles without
+        catastrophic-backtracking risk and server variables are declared with
+        defaults in their enums (`checks.strict_issues`); about 2-3x the
+        cost of STANDARD on typical specs.
+
+    `python -m benchmarks.bench_levels` measures all three.
+    """
+    STRUCTURAL = "structural"
+    STANDARD = "standard"
+    STRICT = "strict"
+
+# Maps a Pydantic error location onto a JSON Pointer into the original document.
+# Locations contain union/validator tags (e.g. 'Schema', 'function-after[...]')
+# that have no counterpart in the data, so only tokens present in the document are kept.
+def _error_pointer(content: Any, loc) -> str:
+    tokens = []
+    node = content
+    last = len(loc) - 1
+    for index, token in enumerate(loc):
+        if isinstance(node, dict) and token in node:
+            node = node[token]
+        elif isinstance(node, list) and isinstance(token, int) and token < len(node):
+            node = node[token]
+        elif index == last:
+            node = None
+        else:
+            continue
+        tokens.append(escape_pointer_token(token))
+    return "".join("/" + token for token in tokens)
+
+# Converts a Pydantic ValidationError into structured issues, stopping at `limit`
+def _pydantic_issues(content: Any, error: ValidationError, limit: int):
+    issues = []
+    for detail in error.errors(include_url=False, include_context=False, include_input=False):
+        if len(issues) >= limit:
+            break
+        issues.append(
+            ValidationIssue(_error_pointer(content, detail["loc"]), detail["type"], "{msg}", msg=detail["msg"])
+        )
+    return issues
+
+# Runs the checks of `level`, gathering up to `max_errors` issues. Returns the
+# validated instance (None for the structural level or on failure) and the issues.
+def _collect(content: Any, max_errors: int, level: "ValidationLevel" = None):
+    level = ValidationLevel.STANDARD if level is None else level
+    checks = shape_issues if level is ValidationLevel.STRUCTURAL else required_field_issues
+    issues = list(islice(checks(content), max_errors))
+    if level is ValidationLevel.STRUCTURAL or not isinstance(content, dict) or len(issues) >= max_errors:
+        return None, issues
+    instance = None
+    try:
+        instance = OpenAPISchemaValidator.model_validate(content)
+    except ValidationError as e:
+        reported = {issue.pointer for issue in issues}
+        for issue in _pydantic_issues(content, e, max_errors):
+            # Missing required fields were already reported by the structural checks
+            if issue.code == "missing" and issue.pointer in reported:
+                continue
+            if len(issues) >= max_errors:
+                break
+            issues.append(issue)
+    if level is ValidationLevel.STRICT and len(issues) < max_errors:
+        issues.extend(islice(strict_issues(content), max_errors - len(issues)))
+    return (instance if not issues else None), issues
+
+# Function to collect every structural and schema problem of a document in one pass
+def validate_openapi(
+    content: Any, max_errors: int = DEFAULT_MAX_ERRORS, level: str = "standard"
+) -> List[ValidationIssue]:
+    return _collect(content, max_errors, ValidationLevel(level))[1]
+
+# Attaches source positions to an error and its issues when a SourceMap is available
+def _locate(error: ParsingError, source_map) -> ParsingError:
+    if source_map is not None:
+        for issue in error.errors:
+            issue.location = source_map.locate(issue.pointer)
+        if error.errors and error.location is None:
+            error.location = error.errors[0].location
+    return error
+
+# Builds the structural-level result: top-level fields only, without validation
+def _structural_instance(content: Dict[str, Any]) -> OpenAPISchemaValidator:
+    return OpenAPISchemaValidator.model_construct(
+        openapi_version=content["openapi"],
+        info=Info.model_construct(**content["info"]),
+        paths=content["paths"],
+        components=None,
+        servers=content.get("servers", []),
+        tags=content.get("tags", []),
+        externalDocs=content.get("externalDocs"),
+    )
+
 # Function to parse OpenAPI content from a dictionary
-def parse_openapi(content: Dict[str, Any]) -> OpenAPISchemaValidator:
+def parse_openapi(
+    content: Dict[str, Any],
+    collect_errors: bool = False,
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    source_map=None,
+    level: str = "standard",
+) -> OpenAPISchemaValidator:
+    level = ValidationLevel(level)
+    if collect_errors or level is not ValidationLevel.STANDARD:
+        openapi_instance, issues = _collect(content, max_errors if collect_errors else 1, level)
+        if issues:
+            if not collect_errors:
+                issue = issues[0]
+                raise _locate(ParsingError(f"Invalid OpenAPI specification: {issue.message}", errors=[issue]), source_map)
+            suffix = "" if len(issues) < max_errors else f" (stopped after {max_errors})"
+            raise _locate(ParsingError(
+                f"Invalid OpenAPI specification: {len(issues)} error(s) found{suffix}.", errors=issues
+            ), source_map)
+        if level is ValidationLevel.STRUCTURAL:
+            return _structural_instance(content)
+        return openapi_instance
+
     # Pre-validate required fields before Pydantic schema validation
-    if "openapi" not in content:
-        raise ParsingError("Invalid OpenAPI specification: Missing 'openapi' field.")
-    if content["openapi"] not in ["3.1.0"]:
-        raise ParsingError(f"Invalid OpenAPI specification: Unsupported version '{content['openapi']}'.")
-
-    if "info" not in content:
-        raise ParsingError("Invalid OpenAPI specification: Missing 'info' field.")
-    if "version" not in content["info"]:
-        raise ParsingError("Invalid OpenAPI specification: Missing 'version' in 'info' field.")
-    if "paths" not in content:
-        raise ParsingError("Invalid OpenAPI specification: Missing 'paths' field.")
-    
+    for issue in required_field_issues(content):
+        raise _locate(ParsingError(f"Invalid OpenAPI specification: {issue.message}", errors=[issue]), source_map)
+
     try:
         # Validate content against OpenAPISchemaValidator
         openapi_instance = OpenAPISchemaValidator.model_validate(content)
         return openapi_instance
     except ValidationError as e:
-        raise ParsingError(f"Invalid OpenAPI specification: {e}")
+        raise _locate(ParsingError(
+            f"Invalid OpenAPI specification: {e}", errors=_pydantic_issues(content, e, max_errors)
+        ), source_map)
     except Exception as e:
         logger.error("Unexpected error while parsing OpenAPI specification", exc_info=True)
         raise ParsingError(f"Unexpected error while parsing OpenAPI specification: {e}")
 
-# Function to load OpenAPI content from a YAML string
-def load_openapi_from_yaml(yaml_content: str) -> OpenAPISchemaValidator:
+# Position of a YAML syntax error, if PyYAML recorded one
+def _yaml_error_location(error: yaml.YAMLError):
+    mark = getattr(error, "problem_mark", None) or getattr(error, "context_mark", None)
+    return None if mark is None else (mark.line + 1, mark.column + 1)
+
+# Function to load OpenAPI content from a YAML string, bytes or mapped file.
+# `limits` are enforced on the event stream while the document is built;
+# with `track_locations`, positions are only computed if an error needs them.
+def load_openapi_from_yaml(
+    yaml_content: Union[str, bytes],
+    track_locations: bool = False,
+    limits: Optional[ResourceLimits] = DEFAULT_LIMITS,
+    **options,
+) -> OpenAPISchemaValidator:
     try:
-        content = yaml.safe_load(yaml_content)
+        if limits is not None:
+            check_size(yaml_content, limits)
+            content = load_yaml(yaml_content, limits, _SafeLoader)
+        else:
+            content = yaml.load(yaml_content, Loader=_SafeLoader)
+        if track_locations:
+            options["source_map"] = LazySourceMap(yaml_content, scan_yaml_locations)
         if not isinstance(content, dict):
             raise ParsingError("YAML content must be a dictionary representing the OpenAPI document.")
-        return parse_openapi(content)
-    except (yaml.YAMLError, ValidationError) as e:
+        if limits is not None:
+            check_references(content, limits)
+        return parse_openapi(content, **options)
+    except ParsingError:
+        raise
+    except yaml.YAMLError as e:
+        raise ParsingError(f"Invalid YAML format: {e}", location=_yaml_error_location(e))
+    except ValidationError as e:
         raise ParsingError(f"Invalid YAML format: {e}")
     except Exception as e:
         logger.error("Unexpected error while loading OpenAPI from YAML", exc_info=True)
         raise ParsingError(f"Unexpected error while loading OpenAPI from YAML: {e}")
 
-# Function to load OpenAPI content from a file
-def load_openapi_from_file(file_path: str) -> OpenAPISchemaValidator:
+# Function to load OpenAPI content from a JSON string, bytes or mapped file.
+# JSON cannot repeat subtrees, so `limits` beyond the size are checked once loaded.
+def load_openapi_from_json(
+    json_content: Union[str, bytes],
+    track_locations: bool = False,
+    limits: Optional[ResourceLimits] = DEFAULT_LIMITS,
+    **options,
+) -> OpenAPISchemaValidator:
+    if limits is not None:
+        check_size(json_content, limits)
+    try:
+        if not isinstance(json_content, (str, bytes, bytearray)):
+            # json only accepts str/bytes; decode a mapped file straight from its buffer
+            json_content = str(json_content, json.detect_encoding(json_content[:4]))
+        content = json.loads(json_content)
+        if track_locations:
+            options["source_map"] = LazySourceMap(json_content, scan_json_locations)
+    except json.JSONDecodeError as e:
+        raise ParsingError(f"Invalid JSON format: {e.msg}", location=(e.lineno, e.colno))
+    except UnicodeDecodeError as e:
+        raise ParsingError(f"Invalid JSON format: {e}")
+    except RecursionError:
+        raise ResourceLimitError("Document is nested too deeply to load.", "max_depth")
+    if not isinstance(content, dict):
+        raise ParsingError("JSON content must be an object representing the OpenAPI document.")
+    if limits is not None:
+        check_tree(content, limits)
+        check_references(content, limits)
+    return parse_openapi(content, **options)
+
+# Function to load OpenAPI content from a file (JSON by extension, YAML otherwise).
+# The raw bytes go straight to the parser; large files are memory-mapped.
+def load_openapi_from_file(
+    file_path: str,
+    mmap_threshold: int = MMAP_THRESHOLD,
+    limits: Optional[ResourceLimits] = DEFAULT_LIMITS,
+    **options,
+) -> OpenAPISchemaValidator:
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            yaml_content = file.read()
-        return load_openapi_from_yaml(yaml_content)
+        if limits is not None:
+            # Oversized files are rejected before they are read
+            check_size(os.path.getsize(file_path), limits)
+        options["limits"] = limits
+        with open_bytes(file_path, mmap_threshold) as file_content:
+            if file_path.lower().endswith(".json"):
+                return load_openapi_from_json(file_content, **options)
+            return load_openapi_from_yaml(file_content, **options)
     except FileNotFoundError as e:
         raise ParsingError(f"File not found: {e}")
     except IOError as e:
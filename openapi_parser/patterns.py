@@ -0,0 +1,411 @@
+"""Compiled ``pattern``/``patternProperties`` expressions with backtracking checks.
+
+Schema patterns are ECMA-262 regular expressions.  `translate` rewrites the
+constructs whose meaning differs in Python's `re` (``\\d``/``\\w`` are ASCII
+only, ``$`` does not match before a final newline, named groups, ``\\cX``,
+``\\u{...}``, ``[^]``), and `PatternCache` keeps the compiled results in a
+bounded, thread-safe LRU cache shared by the validator and the payload
+generator (`compile_pattern`).
+
+`analyze_pattern` inspects the parsed expression for the shapes that make a
+backtracking engine take exponential or polynomial time on a failing input:
+
+* ``nested-quantifier``: an unbounded repeat of a body that is itself an
+  unbounded repeat plus optional parts, e.g. ``(a+)+`` or ``(\\w+\\s?)*``;
+* ``overlapping-alternation``: an unbounded repeat of alternatives that can
+  start with the same character, e.g. ``(ab|\\wc)+``;
+* ``adjacent-quantifiers``: consecutive unbounded repeats where the first
+  can end with a character the second can start with, e.g. ``\\d+\\d*``.
+
+`precompile` compiles every pattern of a spec at load time (optionally on a
+thread pool) and returns the invalid and risky ones as `ValidationIssue`s;
+the ``strict`` validation level of `parse_openapi` reports them too.
+"""
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from openapi_parser.exceptions import ValidationIssue
+from openapi_parser.utils import json_pointer
+
+try:
+    from re import _constants as _sre_constants, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre_constants
+    import sre_parse as _sre_parse
+
+DEFAULT_CACHE_SIZE = 4096
+
+# Keys whose values are instance data rather than schemas
+_DATA_KEYWORDS = ("example", "examples", "const", "enum", "default")
+
+# ECMA-262 classes are ASCII; Python's match any Unicode digit/word character
+_CLASS_ESCAPES = {"d": "0-9", "w": "A-Za-z0-9_"}
+_ESCAPES = {"d": "[0-9]", "D": "[^0-9]", "w": "[A-Za-z0-9_]", "W": "[^A-Za-z0-9_]"}
+
+
+def translate(pattern: str) -> str:
+    """Rewrites an ECMA-262 regular expression into an equivalent Python one."""
+    out: List[str] = []
+    in_class = False
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == "\\" and i + 1 < n:
+            escaped = pattern[i + 1]
+            i += 2
+            if escaped == "c" and i < n and pattern[i].isalpha():
+                out.append(f"\\x{ord(pattern[i].upper()) % 32:02x}")
+                i += 1
+            elif escaped == "u" and i < n and pattern[i] == "{":
+                end = pattern.find("}", i)
+                if end == -1:
+                    out.append("\\u")
+                else:
+                    out.append(f"\\U{int(pattern[i + 1:end] or '0', 16):08x}")
+                    i = end + 1
+            elif escaped == "k" and not in_class and i < n and pattern[i] == "<":
+                end = pattern.find(">", i)
+                out.append(f"(?P={pattern[i + 1:end]})" if end != -1 else "\\k")
+                i = end + 1 if end != -1 else i
+            elif in_class and escaped in _CLASS_ESCAPES:
+                out.append(_CLASS_ESCAPES[escaped])
+            elif not in_class and escaped in _ESCAPES:
+                out.append(_ESCAPES[escaped])
+            elif escaped == "/":
+                out.append("/")
+            else:
+                out.append("\\" + escaped)
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+            elif char == "[":
+                char = "\\["
+            out.append(char)
+        elif char == "[":
+            if pattern.startswith("[^]", i):
+                out.append("[\\s\\S]")
+                i += 3
+                continue
+            if pattern.startswith("[]", i):
+                out.append("(?!)")
+                i += 2
+                continue
+            in_class = True
+            out.append(char)
+        elif char == "$":
+            out.append("\\Z")
+        elif char == "(" and pattern.startswith("(?<", i) and not pattern.startswith(("(?<=", "(?<!"), i):
+            out.append("(?P<")
+            i += 3
+            continue
+        else:
+            out.append(char)
+        i += 1
+    return "".join(out)
+
+
+class PatternCache:
+    """Bounded LRU cache of translated, compiled patterns; safe to share between threads.
+
+    Invalid patterns are cached too, so they fail fast on every later use.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Union[re.Pattern, re.error]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, expression: str) -> bool:
+        return expression in self._entries
+
+    def get(self, expression: str) -> "re.Pattern":
+        """Returns the compiled form of an ECMA-262 `expression`.
+
+        Raises:
+            re.error: If the expression is invalid.
+        """
+        with self._lock:
+            entry = self._entries.get(expression)
+            if entry is not None:
+                self._entries.move_to_end(expression)
+                self.hits += 1
+        if entry is None:
+            # Compiled outside the lock; a concurrent duplicate compile is harmless
+            try:
+                entry = re.compile(translate(expression))
+            except re.error as error:
+                entry = error
+            except (ValueError, OverflowError) as error:
+                # Bad escapes such as "\\u{zz}" fail in `translate`, huge repeat counts in `re`
+                entry = re.error(str(error), expression)
+            with self._lock:
+                self.misses += 1
+                self._entries[expression] = entry
+                if len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        if isinstance(entry, re.error):
+            raise entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+_CACHE = PatternCache()
+
+
+def compile_pattern(expression: str) -> "re.Pattern":
+    """Returns `expression` compiled through the shared `PatternCache`.
+
+    Raises:
+        re.error: If the expression is invalid.
+    """
+    return _CACHE.get(expression)
+
+
+class PatternRisk(NamedTuple):
+    code: str
+    detail: str
+
+
+# First-character sets are bitsets over ASCII, with bit 128 standing for every other character
+_ALL = (1 << 129) - 1
+_CATEGORY_SETS = {
+    _sre_constants.CATEGORY_DIGIT: sum(1 << c for c in range(48, 58)),
+    _sre_constants.CATEGORY_WORD: sum(1 << c for c in range(128) if chr(c).isalnum() or c == 95) | 1 << 128,
+    _sre_constants.CATEGORY_SPACE: sum(1 << c for c in (9, 10, 11, 12, 13, 32)) | 1 << 128,
+}
+_CATEGORY_SETS.update({
+    _sre_constants.CATEGORY_NOT_DIGIT: _ALL & ~_CATEGORY_SETS[_sre_constants.CATEGORY_DIGIT],
+    _sre_constants.CATEGORY_NOT_WORD: _ALL & ~_CATEGORY_SETS[_sre_constants.CATEGORY_WORD] | 1 << 128,
+    _sre_constants.CATEGORY_NOT_SPACE: _ALL & ~_CATEGORY_SETS[_sre_constants.CATEGORY_SPACE] | 1 << 128,
+})
+_ZERO_WIDTH = (_sre_constants.AT, _sre_constants.ASSERT, _sre_constants.ASSERT_NOT)
+_ATOMIC_GROUP = getattr(_sre_constants, "ATOMIC_GROUP", None)
+_REPEATS = (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT) + tuple(
+    getattr(_sre_constants, name) for name in ("POSSESSIVE_REPEAT",) if hasattr(_sre_constants, name)
+)
+
+
+def _char_bit(code: int) -> int:
+    return 1 << (code if code < 128 else 128)
+
+
+def _class_set(items) -> int:
+    bits, negate = 0, False
+    for op, value in items:
+        if op is _sre_constants.NEGATE:
+            negate = True
+        elif op is _sre_constants.LITERAL:
+            bits |= _char_bit(value)
+        elif op is _sre_constants.RANGE:
+            low, high = value
+            bits |= sum(1 << c for c in range(low, min(high, 127) + 1)) | (1 << 128 if high >= 128 else 0)
+        elif op is _sre_constants.CATEGORY:
+            bits |= _CATEGORY_SETS.get(value, _ALL)
+        else:
+            bits = _ALL
+    return _ALL & ~bits | 1 << 128 if negate else bits
+
+
+def _nullable(items) -> bool:
+    return all(_item_nullable(op, value) for op, value in items)
+
+
+def _item_nullable(op, value) -> bool:
+    if op in _ZERO_WIDTH:
+        return True
+    if op in _REPEATS:
+        return value[0] == 0 or _nullable(value[2])
+    if op is _sre_constants.SUBPATTERN:
+        return _nullable(value[-1])
+    if op is _sre_constants.BRANCH:
+        return any(_nullable(branch) for branch in value[1])
+    if _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+        return _nullable(value)
+    return op is _sre_constants.GROUPREF
+
+
+def _first(items, last: bool = False) -> int:
+    # The characters a match of `items` can start with (or end with, if `last`)
+    bits = 0
+    for op, value in reversed(items) if last else items:
+        bits |= _item_first(op, value, last)
+        if not _item_nullable(op, value):
+            break
+    return bits
+
+
+def _item_first(op, value, last: bool = False) -> int:
+    if op is _sre_constants.LITERAL:
+        return _char_bit(value)
+    if op is _sre_constants.NOT_LITERAL:
+        return _ALL & ~_char_bit(value) | 1 << 128
+    if op is _sre_constants.IN:
+        return _class_set(value)
+    if op is _sre_constants.ANY:
+        return _ALL & ~(1 << 10)
+    if op in _ZERO_WIDTH:
+        return 0
+    if op in _REPEATS:
+        return _first(value[2], last)
+    if op is _sre_constants.SUBPATTERN:
+        return _first(value[-1], last)
+    if op is _sre_constants.BRANCH:
+        bits = 0
+        for branch in value[1]:
+            bits |= _first(branch, last)
+        return bits
+    return _ALL
+
+
+def _body(op, value):
+    # The sub-sequence of a repeat or group, if any
+    if op in _REPEATS:
+        return value[2]
+    if op is _sre_constants.SUBPATTERN:
+        return value[-1]
+    return None
+
+
+def _unbounded(op, value) -> bool:
+    return op in (_sre_constants.MAX_REPEAT, _sre_constants.MIN_REPEAT) and value[1] == _sre_constants.MAXREPEAT
+
+
+def _inner_repeats(items) -> Iterator[Tuple[Any, Any]]:
+    # Unbounded repeats reachable through groups (not through other repeats)
+    for op, value in items:
+        if _unbounded(op, value):
+            yield op, value
+        elif op is _sre_constants.SUBPATTERN:
+            yield from _inner_repeats(value[-1])
+
+
+def _flatten_groups(items) -> List[Tuple[Any, Any]]:
+    flat = []
+    for op, value in items:
+        if op is _sre_constants.SUBPATTERN:
+            flat.extend(_flatten_groups(value[-1]))
+        else:
+            flat.append((op, value))
+    return flat
+
+
+def _analyze(items, risks: List[PatternRisk]):
+    flat = _flatten_groups(items)
+    previous = None
+    for op, value in flat:
+        if _unbounded(op, value):
+            body = value[2]
+            inner = list(_inner_repeats(body))
+            others = [item for item in _flatten_groups(body) if not _unbounded(*item)]
+            if inner and _nullable(others):
+                risks.append(PatternRisk("nested-quantifier", "An unbounded repeat contains another unbounded repeat."))
+            branches = [item for item in _flatten_groups(body) if item[0] is _sre_constants.BRANCH]
+            for _, (_, alternatives) in branches:
+                firsts = [_first(alternative) for alternative in alternatives]
+                if any(firsts[i] & firsts[j] for i in range(len(firsts)) for j in range(i + 1, len(firsts))):
+                    risks.append(PatternRisk("overlapping-alternation", "Alternatives of an unbounded repeat can start with the same character."))
+                    break
+            if previous is not None and _first(previous[2], last=True) & _first(body):
+                risks.append(PatternRisk("adjacent-quantifiers", "Consecutive unbounded repeats can match the same characters."))
+            previous = value
+        elif not _item_nullable(op, value):
+            previous = None
+        if op in _REPEATS:
+            _analyze(value[2], risks)
+        elif op is _sre_constants.BRANCH:
+            for alternative in value[1]:
+                _analyze(alternative, risks)
+        elif op in (_sre_constants.ASSERT, _sre_constants.ASSERT_NOT):
+            _analyze(value[1], risks)
+
+
+def analyze_pattern(expression: str) -> List[PatternRisk]:
+    """Returns the catastrophic-backtracking risks of an ECMA-262 expression.
+
+    Raises:
+        re.error: If the expression is invalid.
+    """
+    risks: List[PatternRisk] = []
+    _analyze(_sre_parse.parse(translate(expression)), risks)
+    return list(dict.fromkeys(risks))
+
+
+def iter_patterns(document: Any) -> Iterator[Tuple[str, str]]:
+    """Yields (pointer, expression) of every ``pattern`` and ``patternProperties`` key."""
+    stack = [((), document)]
+    while stack:
+        tokens, node = stack.pop()
+        if isinstance(node, dict):
+            if isinstance(node.get("pattern"), str):
+                yield json_pointer(*tokens, "pattern"), node["pattern"]
+            if isinstance(node.get("patternProperties"), dict):
+                for expression in node["patternProperties"]:
+                    yield json_pointer(*tokens, "patternProperties", expression), expression
+            stack.extend(
+                (tokens + (key,), value) for key, value in reversed(node.items())
+                if isinstance(value, (dict, list)) and key not in _DATA_KEYWORDS
+            )
+        elif isinstance(node, list):
+            stack.extend((tokens + (index,), value) for index, value in reversed(list(enumerate(node))) if isinstance(value, (dict, list)))
+
+
+def _check(expression: str, cache: PatternCache) -> Tuple[Optional[str], List[PatternRisk]]:
+    try:
+        cache.get(expression)
+        return None, analyze_pattern(expression)
+    except (re.error, OverflowError, ValueError) as error:
+        return str(error), []
+
+
+def _issues(pointer: str, expression: str, error: Optional[str], risks: List[PatternRisk]) -> Iterator[ValidationIssue]:
+    if error is not None:
+        yield ValidationIssue(pointer, "invalid-pattern", "Pattern '{pattern}' is invalid: {error}.", pattern=expression, error=error)
+    for risk in risks:
+        yield ValidationIssue(
+            pointer, "catastrophic-pattern", "Pattern '{pattern}' may backtrack catastrophically ({risk}): {detail}",
+            pattern=expression, risk=risk.code, detail=risk.detail,
+        )
+
+
+def pattern_issues(document: Any, cache: Optional[PatternCache] = None) -> Iterator[ValidationIssue]:
+    """Compiles the document's patterns one by one, yielding invalid and risky ones."""
+    cache = _CACHE if cache is None else cache
+    checked: Dict[str, Tuple[Optional[str], List[PatternRisk]]] = {}
+    for pointer, expression in iter_patterns(document):
+        if expression not in checked:
+            checked[expression] = _check(expression, cache)
+        yield from _issues(pointer, expression, *checked[expression])
+
+
+def precompile(document: Any, cache: Optional[PatternCache] = None, workers: int = 1) -> List[ValidationIssue]:
+    """Compiles every pattern of `document` into the cache ahead of validation.
+
+    Args:
+        document: The raw OpenAPI document.
+        cache: The cache to fill; the shared one by default.
+        workers: Threads compiling distinct expressions concurrently.
+
+    Returns:
+        The invalid and catastrophic-backtracking patterns, in document order.
+    """
+    cache = _CACHE if cache is None else cache
+    found = list(iter_patterns(document))
+    expressions = list(dict.fromkeys(expression for _, expression in found))
+    if workers > 1 and len(expressions) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(expressions, executor.map(lambda expression: _check(expression, cache), expressions)))
+    else:
+        results = {expression: _check(expression, cache) for expression in expressions}
+    return [issue for pointer, expression in found for issue in _issues(pointer, expression, *results[expression])]
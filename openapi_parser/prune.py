@@ -0,0 +1,81 @@
+"""Tree-shaking of components that nothing reachable uses.
+
+The roots of reachability are every path item and operation under ``paths``
+and ``webhooks``, anything else outside ``components`` that holds a
+reference, and the security schemes named by the root and per-operation
+``security`` requirements.  Everything the roots reference, transitively
+through `$ref`s and discriminator mappings, is kept; the rest of
+``components`` is dropped.  Building the `ReferenceGraph` and searching it
+are both linear in the size of the spec.
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.references import ReferenceGraph
+from openapi_parser.utils import json_pointer
+
+
+class PruneReport(BaseModel):
+    """Components dropped by `prune_components`, as JSON Pointers."""
+
+    removed: List[str] = []
+    kept: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable summary."""
+        return {"removed": len(self.removed), "kept": self.kept, "components": self.removed}
+
+
+def _security_schemes(document: Dict[str, Any]) -> Set[str]:
+    names = set()
+    requirements = list(document.get("security") or [])
+    for section in ("paths", "webhooks"):
+        for item in (document.get(section) or {}).values():
+            if isinstance(item, dict):
+                for method, operation in item.items():
+                    if method in HTTP_METHODS and isinstance(operation, dict):
+                        requirements.extend(operation.get("security") or [])
+    for requirement in requirements:
+        if isinstance(requirement, dict):
+            names.update(requirement)
+    return names
+
+
+def reachable_components(document: Dict[str, Any], graph: Optional[ReferenceGraph] = None) -> Set[str]:
+    """Returns the pointers of every component reachable from the document's roots."""
+    graph = graph or ReferenceGraph(document)
+    roots = [node for node in graph.nodes if not node.startswith("/components/")]
+    roots += [json_pointer("components", "securitySchemes", name) for name in _security_schemes(document)]
+    return {node for node in graph.reachable(roots) if node.startswith("/components/")}
+
+
+def prune_components(document: Dict[str, Any]) -> Tuple[Dict[str, Any], PruneReport]:
+    """Returns a copy of `document` without unreachable components, and what was dropped.
+
+    The input is not modified; the result shares every kept subtree with it.
+    Component kinds left empty are omitted, as is ``components`` itself.
+    """
+    reachable = reachable_components(document)
+    components = document.get("components")
+    if not isinstance(components, dict):
+        return dict(document), PruneReport()
+    kept: Dict[str, Any] = {}
+    report = PruneReport()
+    for kind, members in components.items():
+        if not isinstance(members, dict):
+            kept[kind] = members
+            continue
+        survivors = {}
+        for name, member in members.items():
+            pointer = json_pointer("components", kind, name)
+            if pointer in reachable:
+                survivors[name] = member
+            else:
+                report.removed.append(pointer)
+        report.kept += len(survivors)
+        if survivors:
+            kept[kind] = survivors
+    pruned = {key: value for key, value in document.items() if key != "components"}
+    if kept:
+        pruned["components"] = kept
+    return pruned, report
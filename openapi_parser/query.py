@@ -0,0 +1,336 @@
+"""Indexed queries over a spec with JSONPath and JSON Pointer selectors.
+
+`SpecIndex` walks the document once and builds secondary indexes: every
+member by key name, every ``$ref`` by target, every schema by ``type`` and
+all nodes in document order.  Selectors are then answered from the indexes:
+a recursive descent such as ``$..parameters`` is a dictionary lookup rather
+than a scan, and compiled selectors and their results are cached.
+
+Supported JSONPath syntax: ``$``, ``.name``, ``['name']``, ``.*``/``[*]``,
+``[0]``/``[-1]``, ``..name``/``..*`` and filters ``[?(@.a.b)]``,
+``[?(@.name == 'x')]`` and ``!=`` with string, number, boolean or null
+literals.  A selector starting with ``/`` (or the empty string) is a JSON
+Pointer.
+
+Matches share their values with the indexed document, which must not be
+modified afterwards.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.utils import json_pointer, resolve_pointer, unescape_pointer_token
+
+_SCHEMA_REF_PREFIX = "#/components/schemas/"
+_REQUEST_BODY_REF_PREFIX = "#/components/requestBodies/"
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<descendant>\.\.)
+      | (?P<dot>\.)
+      | \[\s*\?\(\s*(?P<filter>.*?)\s*\)\s*\]
+      | \[\s*(?P<bracket>\*|-?\d+|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")\s*\]
+      | (?P<name>\*|[A-Za-z0-9_$@\-{}~]+)
+    )""",
+    re.VERBOSE,
+)
+_FILTER = re.compile(
+    r"""^@(?P<path>(?:\.[A-Za-z0-9_$\-]+|\['(?:[^'\\]|\\.)*'\])*)\s*
+        (?:(?P<op>==|!=)\s*(?P<literal>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|true|false|null))?$""",
+    re.VERBOSE,
+)
+_FILTER_STEP = re.compile(r"\.([A-Za-z0-9_$\-]+)|\['((?:[^'\\]|\\.)*)'\]")
+_LITERALS = {"true": True, "false": False, "null": None}
+_MISSING = object()
+
+
+class Match(NamedTuple):
+    """A node selected by a query."""
+
+    pointer: str
+    value: Any
+
+
+class Operation(NamedTuple):
+    """An operation of the document's `paths`."""
+
+    method: str
+    path: str
+    operation: Dict[str, Any]
+
+    @property
+    def pointer(self) -> str:
+        return json_pointer("paths", self.path, self.method)
+
+
+def _unquote(text: str) -> str:
+    return re.sub(r"\\(.)", r"\1", text[1:-1])
+
+
+def _literal(text: str) -> Any:
+    if text[0] in "'\"":
+        return _unquote(text)
+    if text in _LITERALS:
+        return _LITERALS[text]
+    return float(text) if "." in text else int(text)
+
+
+def _compile_filter(expression: str):
+    match = _FILTER.match(expression)
+    if match is None:
+        raise ValueError(f"Unsupported filter expression '{expression}'.")
+    steps = [name or _unquote(f"'{quoted}'") for name, quoted in _FILTER_STEP.findall(match["path"])]
+    op = match["op"]
+    expected = _literal(match["literal"]) if op else None
+
+    def predicate(node):
+        for step in steps:
+            if not isinstance(node, dict) or step not in node:
+                return False
+            node = node[step]
+        if op is None:
+            return True
+        if isinstance(node, bool) or isinstance(expected, bool):
+            # bool is an int subclass; keep true from matching 1
+            equal = node is expected
+        else:
+            equal = node == expected
+        return equal if op == "==" else not equal
+
+    return predicate
+
+
+@lru_cache(maxsize=256)
+def compile_selector(selector: str) -> Tuple[tuple, ...]:
+    """Parses a JSONPath selector into steps ``(kind, argument, descendant)``.
+
+    Raises:
+        ValueError: If the selector is not supported.
+    """
+    text = selector.strip()
+    if not text.startswith("$"):
+        raise ValueError(f"JSONPath selectors start with '$': '{selector}'.")
+    steps = []
+    position, descendant, dot = 1, False, False
+    while position < len(text):
+        token = _TOKEN.match(text, position)
+        if token is None or token.end() == position or ((token["descendant"] or token["dot"]) and (descendant or dot)):
+            raise ValueError(f"Invalid selector '{selector}' at position {position}.")
+        position = token.end()
+        if token["descendant"]:
+            descendant = True
+            continue
+        if token["dot"]:
+            dot = True
+            continue
+        if token["name"] is not None and not (dot or descendant):
+            raise ValueError(f"Invalid selector '{selector}' at position {token.start()}.")
+        dot = False
+        if token["filter"] is not None:
+            steps.append(("filter", _compile_filter(token["filter"]), descendant))
+        else:
+            value = token["bracket"] if token["bracket"] is not None else token["name"]
+            if value == "*":
+                steps.append(("wildcard", None, descendant))
+            elif value[0] in "'\"":
+                steps.append(("name", _unquote(value), descendant))
+            elif token["bracket"] is not None:
+                steps.append(("index", int(value), descendant))
+            else:
+                steps.append(("name", value, descendant))
+        descendant = False
+    if descendant or dot:
+        raise ValueError(f"Selector '{selector}' ends with '.'.")
+    return tuple(steps)
+
+
+def _children(tokens: tuple, value: Any) -> Iterator[Tuple[tuple, Any]]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield tokens + (key,), child
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield tokens + (index,), child
+
+
+class SpecIndex:
+    """Secondary indexes over one document, built once and reused by every query.
+
+    Args:
+        document: The raw OpenAPI document (a parsed model is dumped first).
+    """
+
+    def __init__(self, document: Union[Dict[str, Any], BaseModel]):
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self.document = document
+        # Every node but the root as (tokens, value), in document order
+        self._nodes: List[Tuple[tuple, Any]] = []
+        self._by_key: Dict[str, List[Tuple[tuple, Any]]] = {}
+        self._by_ref: Dict[str, List[tuple]] = {}
+        self._by_type: Dict[str, List[tuple]] = {}
+        self._results: Dict[Any, Tuple[Match, ...]] = {}
+        self._operations: Optional[List[Operation]] = None
+        # Pre-order walk, so every index lists its entries in document order
+        stack = [((), document, False)]
+        while stack:
+            tokens, node, member = stack.pop()
+            if tokens:
+                self._nodes.append((tokens, node))
+                if member:
+                    self._by_key.setdefault(tokens[-1], []).append((tokens, node))
+            if isinstance(node, dict):
+                ref, kind = node.get("$ref"), node.get("type")
+                if isinstance(ref, str):
+                    self._by_ref.setdefault(ref, []).append(tokens)
+                for name in kind if isinstance(kind, list) else [kind]:
+                    if isinstance(name, str):
+                        self._by_type.setdefault(name, []).append(tokens)
+                stack.extend((tokens + (key,), value, True) for key, value in reversed(list(node.items())))
+            elif isinstance(node, list):
+                stack.extend((tokens + (index,), value, False) for index, value in reversed(list(enumerate(node))))
+
+    # -- selectors -------------------------------------------------------
+
+    def query(self, selector: str) -> List[Match]:
+        """Returns the nodes selected by a JSONPath selector or JSON Pointer.
+
+        Raises:
+            ValueError: If the selector is not supported.
+        """
+        cached = self._results.get(selector)
+        if cached is None:
+            cached = self._results[selector] = tuple(
+                Match(json_pointer(*tokens), value) for tokens, value in self._select(selector)
+            )
+        return list(cached)
+
+    def values(self, selector: str) -> List[Any]:
+        """Returns only the values selected by `selector`."""
+        return [match.value for match in self.query(selector)]
+
+    def get(self, pointer: str, default: Any = None) -> Any:
+        """Returns the node at a JSON Pointer, or `default` if there is none."""
+        try:
+            return resolve_pointer(self.document, "#" + pointer)
+        except ReferenceResolutionError:
+            return default
+
+    def _select(self, selector: str) -> List[Tuple[tuple, Any]]:
+        if selector == "" or selector.startswith("/"):
+            found = self.get(selector, _MISSING)
+            if found is _MISSING:
+                return []
+            return [(tuple(unescape_pointer_token(token) for token in selector.split("/")[1:]), found)]
+        current = [((), self.document)]
+        for kind, argument, descendant in compile_selector(selector):
+            current = self._step(current, kind, argument, descendant)
+        return current
+
+    def _descendants(self, tokens: tuple) -> List[Tuple[tuple, Any]]:
+        if not tokens:
+            return self._nodes
+        depth = len(tokens)
+        return [entry for entry in self._nodes if len(entry[0]) > depth and entry[0][:depth] == tokens]
+
+    def _step(self, current, kind, argument, descendant) -> List[Tuple[tuple, Any]]:
+        result = []
+        for tokens, value in current:
+            if descendant and kind == "name":
+                depth = len(tokens)
+                result.extend(
+                    entry for entry in self._by_key.get(argument, ())
+                    if not depth or (len(entry[0]) > depth and entry[0][:depth] == tokens)
+                )
+                continue
+            candidates = self._descendants(tokens) if descendant else None
+            if kind == "name":
+                if isinstance(value, dict) and argument in value:
+                    result.append((tokens + (argument,), value[argument]))
+            elif kind == "wildcard":
+                result.extend(candidates if descendant else _children(tokens, value))
+            elif kind == "index":
+                for entry_tokens, entry in ([(tokens, value)] + candidates if descendant else [(tokens, value)]):
+                    if isinstance(entry, list) and -len(entry) <= argument < len(entry):
+                        index = argument % len(entry)
+                        result.append((entry_tokens + (index,), entry[index]))
+            elif kind == "filter":
+                pool = candidates if descendant else _children(tokens, value)
+                result.extend(entry for entry in pool if argument(entry[1]))
+        return result
+
+    # -- indexes ---------------------------------------------------------
+
+    def references_to(self, target: str) -> List[str]:
+        """Returns the pointers of every ``{"$ref": target}`` node; bare names mean component schemas."""
+        if not target.startswith("#") and "/" not in target:
+            target = _SCHEMA_REF_PREFIX + target
+        return [json_pointer(*tokens) for tokens in self._by_ref.get(target, ())]
+
+    def of_type(self, type_name: str) -> List[Match]:
+        """Returns every schema whose ``type`` is or includes `type_name`."""
+        return [Match(json_pointer(*tokens), self._value(tokens)) for tokens in self._by_type.get(type_name, ())]
+
+    def _value(self, tokens: tuple) -> Any:
+        node = self.document
+        for token in tokens:
+            node = node[token]
+        return node
+
+    def operations(self) -> List[Operation]:
+        """Returns every operation in document order."""
+        if self._operations is None:
+            self._operations = [
+                Operation(method, path, operation)
+                for path, item in (self.document.get("paths") or {}).items() if isinstance(item, dict)
+                for method, operation in item.items() if method in HTTP_METHODS and isinstance(operation, dict)
+            ]
+        return list(self._operations)
+
+    def operations_with_request_body(self, schema: str) -> List[Operation]:
+        """Returns the operations whose request body references `schema`, directly or nested.
+
+        `schema` is a component schema name or a full reference; request
+        bodies defined in ``components/requestBodies`` are followed.
+        """
+        target = schema if schema.startswith("#") else _SCHEMA_REF_PREFIX + schema
+        keys = set()
+        for tokens in self._by_ref.get(target, ()):
+            if len(tokens) > 3 and tokens[0] == "paths" and tokens[3] == "requestBody":
+                keys.add((tokens[2], tokens[1]))
+            elif len(tokens) > 2 and tokens[:2] == ("components", "requestBodies"):
+                for body_tokens in self._by_ref.get(_REQUEST_BODY_REF_PREFIX + str(tokens[2]), ()):
+                    if len(body_tokens) == 4 and body_tokens[0] == "paths" and body_tokens[3] == "requestBody":
+                        keys.add((body_tokens[2], body_tokens[1]))
+        return [operation for operation in self.operations() if (operation.method, operation.path) in keys]
+
+    def parameters(self, name: str, location: Optional[str] = None) -> List[Match]:
+        """Returns every parameter usage named `name` (optionally only ``in: location``).
+
+        Pointers locate the usage; values are the parameter objects with
+        references followed.
+        """
+        result = []
+        for tokens, parameters in self._by_key.get("parameters", ()):
+            if not isinstance(parameters, list):
+                continue
+            for index, parameter in enumerate(parameters):
+                if isinstance(parameter, dict) and isinstance(parameter.get("$ref"), str):
+                    try:
+                        parameter = resolve_pointer(self.document, parameter["$ref"])
+                    except ReferenceResolutionError:
+                        continue
+                if isinstance(parameter, dict) and parameter.get("name") == name and location in (None, parameter.get("in")):
+                    result.append(Match(json_pointer(*tokens, index), parameter))
+        return result
+
+    def keys(self, name: str) -> List[Match]:
+        """Returns every member named `name` anywhere in the document (``$..name``)."""
+        cached = self._results.get(("keys", name))
+        if cached is None:
+            cached = self._results[("keys", name)] = tuple(
+                Match(json_pointer(*tokens), value) for tokens, value in self._by_key.get(name, ())
+            )
+        return list(cached)
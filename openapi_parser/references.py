@@ -0,0 +1,175 @@
+"""Dependency graph of a spec's ``$ref``s for component impact analysis.
+
+`ReferenceGraph` walks the document once and records, for every referencing
+unit, the components it references:
+
+* each component (``/components/<kind>/<name>``),
+* each operation (``/paths/<path>/<method>``, likewise for ``webhooks``),
+* each path item (``/paths/<path>``) for its path-level parameters and
+  servers; its operations depend on it, since they inherit those.
+
+References nested anywhere inside a unit, and discriminator mappings, count
+as edges of that unit.  Forward and reverse adjacency are both kept, so
+`dependents` and `dependencies` are breadth-first searches whose cost is
+proportional to the size of the answer.
+"""
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.utils import escape_pointer_token, json_pointer, unescape_pointer_token
+
+_SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+
+def _unit_tokens(tokens: Tuple[str, ...]) -> Tuple[str, ...]:
+    # The prefix of a pointer that names the referencing unit containing it
+    if tokens[:1] == ("components",):
+        return tokens[:3]
+    if tokens[:1] in (("paths",), ("webhooks",)):
+        return tokens[:3] if len(tokens) >= 3 and tokens[2] in HTTP_METHODS else tokens[:2]
+    return ()
+
+
+def _target(ref: str) -> Optional[str]:
+    # Local references map to the unit they point into; external ones are kept verbatim
+    if not ref.startswith("#"):
+        return ref
+    tokens = tuple(unescape_pointer_token(token) for token in ref[1:].split("/")[1:])
+    unit = _unit_tokens(tokens)
+    return json_pointer(*unit) if unit else ref[1:]
+
+
+class ReferenceGraph:
+    """Forward and reverse reference adjacency of one document.
+
+    Nodes are JSON Pointers of referencing units (see the module docstring);
+    external references appear as nodes named by their reference string.
+
+    Attributes:
+        dangling: (source pointer, reference) of local references whose
+            target does not exist.
+    """
+
+    def __init__(self, document: Union[Dict[str, Any], BaseModel]):
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self.document = document
+        # Insertion-ordered sets: node -> {neighbour: None}
+        self._forward: Dict[str, Dict[str, None]] = {}
+        self._reverse: Dict[str, Dict[str, None]] = {}
+        self.dangling: List[Tuple[str, str]] = []
+        units: Dict[tuple, None] = {}
+        stack = [((), document)]
+        while stack:
+            tokens, node = stack.pop()
+            if isinstance(node, dict):
+                unit = _unit_tokens(tokens)
+                if len(unit) == len(tokens) and unit:
+                    units[tokens] = None
+                ref = node.get("$ref")
+                if isinstance(ref, str):
+                    self._reference(json_pointer(*tokens), json_pointer(*unit), ref)
+                discriminator = node.get("discriminator")
+                mapping = discriminator.get("mapping") if isinstance(discriminator, dict) else None
+                if isinstance(mapping, dict):
+                    for value in mapping.values():
+                        if isinstance(value, str):
+                            ref = value if "#" in value or "/" in value else _SCHEMA_REF_PREFIX + escape_pointer_token(value)
+                            self._reference(json_pointer(*tokens, "discriminator", "mapping"), json_pointer(*unit), ref)
+                stack.extend((tokens + (key,), value) for key, value in node.items() if isinstance(value, (dict, list)))
+            elif isinstance(node, list):
+                stack.extend((tokens + (index,), value) for index, value in enumerate(node) if isinstance(value, (dict, list)))
+        for tokens in units:
+            self._forward.setdefault(json_pointer(*tokens), {})
+            # Operations inherit the parameters and servers of their path item
+            if len(tokens) == 3 and tokens[0] in ("paths", "webhooks"):
+                self._edge(json_pointer(*tokens), json_pointer(*tokens[:2]))
+
+    def _edge(self, source: str, target: str):
+        self._forward.setdefault(source, {})[target] = None
+        self._reverse.setdefault(target, {})[source] = None
+
+    def _reference(self, pointer: str, unit: str, ref: str):
+        target = _target(ref)
+        if ref.startswith("#") and not self._exists(ref):
+            self.dangling.append((pointer, ref))
+        if target != unit:
+            self._edge(unit, target)
+
+    def _exists(self, ref: str) -> bool:
+        node = self.document
+        for token in ref[1:].split("/")[1:]:
+            token = unescape_pointer_token(token)
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                return False
+        return True
+
+    @staticmethod
+    def node(name: str) -> str:
+        """Normalizes a pointer, a local reference or a bare schema name to a node."""
+        if name.startswith("#"):
+            return _target(name)
+        if name.startswith("/") or name == "":
+            return name
+        return "/components/schemas/" + escape_pointer_token(name)
+
+    @property
+    def nodes(self) -> List[str]:
+        """Every node with or without references."""
+        return list(dict.fromkeys([*self._forward, *self._reverse]))
+
+    def _search(self, adjacency: Dict[str, Dict[str, None]], start: str, transitive: bool) -> List[str]:
+        start = self.node(start)
+        if not transitive:
+            return list(adjacency.get(start, ()))
+        return self._breadth_first(adjacency, [start])
+
+    @staticmethod
+    def _breadth_first(adjacency: Dict[str, Dict[str, None]], starts: List[str]) -> List[str]:
+        seen = set(starts)
+        order = []
+        queue = deque(starts)
+        while queue:
+            for neighbour in adjacency.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    order.append(neighbour)
+                    queue.append(neighbour)
+        return order
+
+    def dependents(self, node: str, transitive: bool = True) -> List[str]:
+        """Returns the nodes that reference `node`, nearest first."""
+        return self._search(self._reverse, node, transitive)
+
+    def dependencies(self, node: str, transitive: bool = True) -> List[str]:
+        """Returns the nodes `node` references, nearest first."""
+        return self._search(self._forward, node, transitive)
+
+    def reachable(self, nodes: Iterable[str]) -> List[str]:
+        """Returns `nodes` and everything they reference transitively, in one search."""
+        starts = list(dict.fromkeys(self.node(node) for node in nodes))
+        return starts + self._breadth_first(self._forward, starts)
+
+    def affected_operations(self, node: str) -> List[Tuple[str, str]]:
+        """Returns (method, path) of every operation that depends on `node`, transitively."""
+        result = []
+        for pointer in self.dependents(node):
+            tokens = [unescape_pointer_token(token) for token in pointer.split("/")[1:]]
+            if len(tokens) == 3 and tokens[0] == "paths" and tokens[2] in HTTP_METHODS:
+                result.append((tokens[2], tokens[1]))
+        return result
+
+    def unreferenced(self, kinds: Iterable[str] = ("schemas",)) -> List[str]:
+        """Returns the components of `kinds` that nothing references."""
+        components = self.document.get("components") or {}
+        return [
+            json_pointer("components", kind, name)
+            for kind in kinds
+            for name in (components.get(kind) or {})
+            if not self._reverse.get(json_pointer("components", kind, name))
+        ]
@@ -0,0 +1,271 @@
+"""Compiled server URL templates: effective servers, expansion and reverse matching.
+
+`ServerTable` resolves the effective servers of every operation once: the
+operation's own ``servers``, else its path item's, else the document's, else
+the default ``/``.  Each distinct Server Object is compiled once into a
+`CompiledServer`, whose template is split into literal parts and variable
+names, so that at request time:
+
+* `CompiledServer.expand` is a ``str.format`` of positional values (the
+  all-defaults URL is precomputed);
+* `CompiledServer.match` reverse-matches an incoming URL with ``startswith``
+  and ``find`` on the literal parts, recovering the variable values and the
+  remaining request path;
+* variable values are checked against their ``enum`` by set membership.
+
+No regular expression is compiled or run after `ServerTable` is built.
+`server_issues` reports invalid server definitions; the ``strict``
+validation level of `parse_openapi` reports them too.
+"""
+from typing import Any, Dict, FrozenSet, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.exceptions import ValidationIssue
+from openapi_parser.utils import json_pointer
+
+DEFAULT_SERVER = {"url": "/"}
+
+
+def _split_template(url: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # "https://{env}.example.com" -> literals ("https://", ".example.com"), names ("env",)
+    literals, names = [], []
+    position = 0
+    while True:
+        start = url.find("{", position)
+        end = url.find("}", start + 1) if start != -1 else -1
+        if start == -1 or end == -1:
+            literals.append(url[position:])
+            return tuple(literals), tuple(names)
+        literals.append(url[position:start])
+        names.append(url[start + 1:end])
+        position = end + 1
+
+
+def _origin_length(url: str) -> int:
+    # Length of "scheme://host[:port]" at the start of `url`, 0 if it has none
+    scheme = url.find("://")
+    if scheme == -1 or "/" in url[:scheme]:
+        return 0
+    slash = url.find("/", scheme + 3)
+    return len(url) if slash == -1 else slash
+
+
+class ServerMatch(NamedTuple):
+    server: "CompiledServer"
+    variables: Dict[str, str]
+    path: str
+
+
+class CompiledServer:
+    """One Server Object with its URL template split for expansion and matching.
+
+    Attributes:
+        url: The URL template, e.g. ``https://{env}.example.com/v1``.
+        description: The server's description.
+        names: Variable names in template order.
+        default_url: The template expanded with every default.
+        relative: True for templates without a scheme and host, which are
+            matched against the path of incoming URLs.
+    """
+
+    __slots__ = (
+        "url", "description", "names", "literals", "defaults", "enums", "default_url", "relative",
+        "_format", "_name_set", "_candidates", "_prefix_length",
+    )
+
+    def __init__(self, server: Dict[str, Any]):
+        self.url = server.get("url") or "/"
+        self.description = server.get("description")
+        self.literals, self.names = _split_template(self.url)
+        variables = server.get("variables") or {}
+        self.defaults = tuple(str((variables.get(name) or {}).get("default", "")) for name in self.names)
+        self.enums: Tuple[Optional[FrozenSet[str]], ...] = tuple(
+            frozenset(str(value) for value in variables[name]["enum"])
+            if isinstance(variables.get(name), dict) and isinstance(variables[name].get("enum"), list) else None
+            for name in self.names
+        )
+        self._name_set = frozenset(self.names)
+        # Allowed values longest first, so "v10" is not read as "v1"
+        self._candidates = tuple(None if enum is None else tuple(sorted(enum, key=len, reverse=True)) for enum in self.enums)
+        escaped = [literal.replace("{", "{{").replace("}", "}}") for literal in self.literals]
+        self._format = escaped[0] + "".join(f"{{{index}}}{literal}" for index, literal in enumerate(escaped[1:]))
+        self.default_url = self._format.format(*self.defaults)
+        self.relative = "://" not in self.url and not self.url.startswith("//")
+        self._prefix_length = sum(len(literal) for literal in self.literals)
+
+    def __repr__(self):
+        return f"CompiledServer({self.url!r})"
+
+    def expand(self, values: Optional[Mapping[str, str]] = None) -> str:
+        """Returns the URL with `values` substituted and defaults elsewhere.
+
+        Raises:
+            ValueError: For an unknown variable or a value outside its ``enum``.
+        """
+        if not values:
+            return self.default_url
+        unknown = values.keys() - self._name_set
+        if unknown:
+            raise ValueError(f"Unknown server variable(s) {', '.join(sorted(unknown))} for '{self.url}'.")
+        arguments = []
+        for name, default, enum in zip(self.names, self.defaults, self.enums):
+            value = values.get(name, default)
+            if enum is not None and value not in enum:
+                raise ValueError(f"'{value}' is not an allowed value of server variable '{name}' ({', '.join(sorted(enum))}).")
+            arguments.append(value)
+        return self._format.format(*arguments)
+
+    def match(self, url: str) -> Optional[ServerMatch]:
+        """Reverse-matches an incoming URL; returns the variable values and the rest of the path.
+
+        Variables without an ``enum`` match up to the next literal part of the
+        template and never across a ``/``.  Relative templates are matched
+        against the path of `url`.
+        """
+        if self.relative:
+            url = url[_origin_length(url):]
+        literals = self.literals
+        if not url.startswith(literals[0]):
+            return None
+        position = len(literals[0])
+        values = {}
+        for index, name in enumerate(self.names):
+            following = literals[index + 1]
+            candidates = self._candidates[index]
+            if candidates is not None:
+                for value in candidates:
+                    if url.startswith(value + following, position):
+                        break
+                else:
+                    return None
+            else:
+                slash = url.find("/", position)
+                limit = len(url) if slash == -1 else slash
+                end = url.find(following, position, limit + len(following)) if following else limit
+                if end == -1 or end == position:
+                    return None
+                value = url[position:end]
+            values[name] = value
+            position += len(value) + len(following)
+        rest = url[position:]
+        if rest and rest[0] not in "/?#" and not literals[-1].endswith("/"):
+            return None
+        if literals[-1].endswith("/") and rest[:1] != "/":
+            rest = "/" + rest
+        return ServerMatch(self, values, rest)
+
+
+class ServerTable:
+    """Effective servers of every operation of a document, compiled once.
+
+    Args:
+        document: The raw OpenAPI document, or a parsed model (dumped by alias).
+    """
+
+    def __init__(self, document: Union[Dict[str, Any], BaseModel]):
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json", by_alias=True, exclude_none=True)
+        self._compiled: Dict[Tuple, CompiledServer] = {}
+        self.document_servers = self._compile_list(document.get("servers")) or (self._compile(DEFAULT_SERVER),)
+        self._operations: Dict[Tuple[str, str], Tuple[CompiledServer, ...]] = {}
+        self._operation_ids: Dict[str, Tuple[CompiledServer, ...]] = {}
+        paths = document.get("paths")
+        for path, item in (paths.items() if isinstance(paths, dict) else ()):
+            if not isinstance(item, dict):
+                continue
+            item_servers = self._compile_list(item.get("servers")) or self.document_servers
+            for method, operation in item.items():
+                if method not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                servers = self._compile_list(operation.get("servers")) or item_servers
+                self._operations[(path, method)] = servers
+                if isinstance(operation.get("operationId"), str):
+                    self._operation_ids[operation["operationId"]] = servers
+        # Candidates for matching, most specific (longest literal text) first
+        self.servers: Tuple[CompiledServer, ...] = tuple(
+            sorted(self._compiled.values(), key=lambda server: -server._prefix_length)
+        )
+
+    def _compile(self, server: Dict[str, Any]) -> CompiledServer:
+        variables = server.get("variables") or {}
+        key = (server.get("url"), server.get("description"), tuple(
+            (name, str(variable.get("default")), tuple(variable.get("enum") or ()))
+            for name, variable in sorted(variables.items()) if isinstance(variable, dict)
+        ))
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._compiled[key] = CompiledServer(server)
+        return compiled
+
+    def _compile_list(self, servers: Any) -> Tuple[CompiledServer, ...]:
+        if not isinstance(servers, list):
+            return ()
+        return tuple(self._compile(server) for server in servers if isinstance(server, dict))
+
+    def for_operation(self, path: str, method: str) -> Tuple[CompiledServer, ...]:
+        """Returns the effective servers of ``method path``, in declaration order.
+
+        Raises:
+            KeyError: If the operation does not exist.
+        """
+        return self._operations[(path, method.lower())]
+
+    def for_operation_id(self, operation_id: str) -> Tuple[CompiledServer, ...]:
+        """Returns the effective servers of the operation with `operation_id`.
+
+        Raises:
+            KeyError: If no operation has that id.
+        """
+        return self._operation_ids[operation_id]
+
+    def url(self, path: str, method: str, values: Optional[Mapping[str, str]] = None) -> str:
+        """Returns the first effective server of an operation, expanded with `values`."""
+        return self.for_operation(path, method)[0].expand(values)
+
+    def match(self, url: str, servers: Optional[Tuple[CompiledServer, ...]] = None) -> Optional[ServerMatch]:
+        """Returns the first of `servers` (by default all, most specific first) matching `url`."""
+        for server in self.servers if servers is None else servers:
+            found = server.match(url)
+            if found is not None:
+                return found
+        return None
+
+
+def server_issues(document: Dict[str, Any]) -> Iterator[ValidationIssue]:
+    """Yields server variables that are undeclared, lack a default or whose default is outside the enum."""
+    lists: List[Tuple[Tuple, Any]] = [(("servers",), document.get("servers"))]
+    paths = document.get("paths")
+    for path, item in (paths.items() if isinstance(paths, dict) else ()):
+        if isinstance(item, dict):
+            lists.append((("paths", path, "servers"), item.get("servers")))
+            for method in HTTP_METHODS:
+                if isinstance(item.get(method), dict):
+                    lists.append((("paths", path, method, "servers"), item[method].get("servers")))
+    for tokens, servers in lists:
+        if not isinstance(servers, list):
+            continue
+        for index, server in enumerate(servers):
+            if not isinstance(server, dict) or not isinstance(server.get("url"), str):
+                continue
+            pointer = json_pointer(*tokens, index)
+            variables = server.get("variables") if isinstance(server.get("variables"), dict) else {}
+            for name in _split_template(server["url"])[1]:
+                if name not in variables:
+                    yield ValidationIssue(
+                        pointer + "/url", "undeclared-server-variable",
+                        "Server variable '{name}' of '{url}' is not declared.", name=name, url=server["url"],
+                    )
+            for name, variable in variables.items():
+                if not isinstance(variable, dict):
+                    continue
+                variable_pointer = json_pointer(*tokens, index, "variables", name)
+                enum = variable.get("enum")
+                if "default" not in variable:
+                    yield ValidationIssue(variable_pointer, "missing-server-default", "Server variable '{name}' has no default.", name=name)
+                elif isinstance(enum, list) and variable["default"] not in enum:
+                    yield ValidationIssue(
+                        variable_pointer + "/default", "server-default-not-in-enum",
+                        "Default '{default}' of server variable '{name}' is not in its enum.", default=variable["default"], name=name,
+                    )
+                if isinstance(enum, list) and not enum:
+                    yield ValidationIssue(variable_pointer + "/enum", "empty-server-enum", "Enum of server variable '{name}' is empty.", name=name)
@@ -0,0 +1,145 @@
+"""Extraction of sub-specs by tag, path prefix or operationId.
+
+`split_spec` produces any number of slices from one walk of the document: a
+single `ReferenceGraph` is built, each operation is visited once and
+assigned to every slice that selects it, and each slice then collects its
+components with a breadth-first search over the graph, which costs time
+proportional to the slice rather than to the whole spec.
+
+A slice keeps the document's top-level fields, the selected operations with
+their path items' shared fields (``parameters``, ``servers``, ...), the tags
+its operations use and exactly the components they reference transitively,
+plus the security schemes its security requirements name.  Slices share
+their subtrees with the input document.
+"""
+from typing import Any, Dict, Iterable, List, Optional
+from pydantic import BaseModel
+from openapi_parser.checks import HTTP_METHODS
+from openapi_parser.references import ReferenceGraph
+from openapi_parser.utils import json_pointer
+
+_OPERATION_SECTIONS = ("paths", "webhooks")
+
+
+class Selection(BaseModel):
+    """Operations selected for one slice; an operation matching any criterion is selected.
+
+    Path prefixes match whole segments: ``/characters`` selects
+    ``/characters`` and ``/characters/{id}`` but not ``/characterSets``.
+    Webhooks are selected by tag or operationId only.
+    """
+
+    tags: List[str] = []
+    path_prefixes: List[str] = []
+    operation_ids: List[str] = []
+
+    def matches(self, section: str, path: str, operation: Dict[str, Any]) -> bool:
+        if self.tags and any(tag in self.tags for tag in operation.get("tags") or ()):
+            return True
+        if self.operation_ids and operation.get("operationId") in self.operation_ids:
+            return True
+        if section == "paths":
+            for prefix in self.path_prefixes:
+                prefix = prefix.rstrip("/")
+                if not prefix or path == prefix or path.startswith(prefix + "/"):
+                    return True
+        return False
+
+
+class _Slice:
+    __slots__ = ("sections", "roots", "security")
+
+    def __init__(self):
+        self.sections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.roots: List[str] = []
+        self.security = set()
+
+
+def _requirement_names(requirements: Any) -> Iterable[str]:
+    for requirement in requirements or ():
+        if isinstance(requirement, dict):
+            yield from requirement
+
+
+def split_spec(
+    document: Dict[str, Any], selections: Dict[str, Selection], graph: Optional[ReferenceGraph] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Returns one sub-spec per named selection, built in a single pass over the operations."""
+    graph = graph or ReferenceGraph(document)
+    slices = {name: _Slice() for name in selections}
+    shared_roots = [node for node in graph.nodes if not node.startswith(("/components/", "/paths/", "/webhooks/"))]
+    for section in _OPERATION_SECTIONS:
+        for path, item in (document.get(section) or {}).items():
+            if not isinstance(item, dict):
+                continue
+            for method, operation in item.items():
+                if method not in HTTP_METHODS or not isinstance(operation, dict):
+                    continue
+                for name, selection in selections.items():
+                    if not selection.matches(section, path, operation):
+                        continue
+                    target = slices[name]
+                    sliced_item = target.sections.setdefault(section, {}).get(path)
+                    if sliced_item is None:
+                        sliced_item = target.sections[section][path] = {
+                            key: value for key, value in item.items() if key not in HTTP_METHODS
+                        }
+                        target.roots.append(json_pointer(section, path))
+                    sliced_item[method] = operation
+                    target.roots.append(json_pointer(section, path, method))
+                    target.security.update(_requirement_names(operation.get("security")))
+    root_security = set(_requirement_names(document.get("security")))
+    # Component pointer -> (document position, kind, name, member), so slices never scan all components
+    catalog = {}
+    for kind, members in (document.get("components") or {}).items():
+        if isinstance(members, dict):
+            for member_name, member in members.items():
+                catalog[json_pointer("components", kind, member_name)] = (len(catalog), kind, member_name, member)
+    return {name: _build(document, graph, catalog, target, shared_roots, root_security) for name, target in slices.items()}
+
+
+def _build(document, graph, catalog, target: _Slice, shared_roots, root_security) -> Dict[str, Any]:
+    roots = shared_roots + target.roots
+    roots += [json_pointer("components", "securitySchemes", name) for name in root_security | target.security]
+    reachable = sorted(catalog[node] for node in graph.reachable(roots) if node in catalog)
+    result = {key: value for key, value in document.items() if key not in ("paths", "webhooks", "components", "tags")}
+    result["paths"] = target.sections.get("paths", {})
+    if "webhooks" in target.sections:
+        result["webhooks"] = target.sections["webhooks"]
+    used_tags = {
+        tag for items in target.sections.values() for item in items.values()
+        for method, operation in item.items() if method in HTTP_METHODS for tag in operation.get("tags") or ()
+    }
+    if isinstance(document.get("tags"), list):
+        tags = [tag for tag in document["tags"] if isinstance(tag, dict) and tag.get("name") in used_tags]
+        if tags:
+            result["tags"] = tags
+    components: Dict[str, Dict[str, Any]] = {}
+    for _, kind, name, member in reachable:
+        components.setdefault(kind, {})[name] = member
+    if components:
+        result["components"] = components
+    return result
+
+
+def extract_spec(
+    document: Dict[str, Any],
+    tags: Iterable[str] = (),
+    path_prefixes: Iterable[str] = (),
+    operation_ids: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Returns the sub-spec of the operations matching any of the given criteria."""
+    selection = Selection(tags=list(tags), path_prefixes=list(path_prefixes), operation_ids=list(operation_ids))
+    return split_spec(document, {"slice": selection})["slice"]
+
+
+def split_by_tag(document: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Returns one sub-spec per tag, declared or used by an operation, in one pass."""
+    names = [tag["name"] for tag in document.get("tags") or () if isinstance(tag, dict) and isinstance(tag.get("name"), str)]
+    for section in _OPERATION_SECTIONS:
+        for item in (document.get(section) or {}).values():
+            if isinstance(item, dict):
+                for method, operation in item.items():
+                    if method in HTTP_METHODS and isinstance(operation, dict):
+                        names.extend(tag for tag in operation.get("tags") or () if isinstance(tag, str))
+    return split_spec(document, {name: Selection(tags=[name]) for name in dict.fromkeys(names)})
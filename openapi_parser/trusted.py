@@ -0,0 +1,246 @@
+"""Zero-validation construction of the model tree for already-validated specs.
+
+A document that passed validation once (typically in CI) does not need to be
+validated again at every worker start.  `construct_openapi` builds the same
+model tree as `parse_openapi` through Pydantic's `model_construct`, following
+the field annotations of each model without validating or coercing values.
+`load_trusted` only takes that path for documents whose fingerprint is on an
+allowlist or that were produced by `serialize_openapi` in this process, and
+falls back to full validation for anything else.
+
+Pydantic's validation is compiled, so construction is only about 1.3x
+faster than `parse_openapi`.  Fingerprinting a parsed dictionary (canonical
+JSON plus SHA-256) costs about as much as validating it, and so does
+decoding the text of `serialize_openapi`; only a fingerprint supplied by the
+caller keeps the gain (`python -m benchmarks.bench_trusted`).
+"""
+import copy as _copy
+import hashlib
+import json
+import logging
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Union, get_args, get_origin
+from pydantic import BaseModel, RootModel, TypeAdapter
+from openapi_parser.parser import OpenAPISchemaValidator, parse_openapi
+from openapi_parser.utils import canonical_json, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Fingerprints of documents serialized by this process
+_SERIALIZED = set()
+_SERIALIZED_LOCK = threading.Lock()
+
+# Per-model construction plans, built on first use
+_PLANS: Dict[type, "_Plan"] = {}
+
+_object_setattr = object.__setattr__
+
+_PLAIN_TYPES = (Any, str, int, float, bool, object, type(None))
+
+
+def _identity(value):
+    return value
+
+
+def _union_converter(members) -> Callable[[Any], Any]:
+    # Mirrors Pydantic's "smart" union mode for valid input: among the model
+    # members whose required fields are present, the one matching the most
+    # keys wins, ties going to the first member.
+    models = []
+    list_converter = None
+    for member in members:
+        if isinstance(member, type) and issubclass(member, RootModel):
+            models.append((member, frozenset(), frozenset()))
+        elif isinstance(member, type) and issubclass(member, BaseModel):
+            keys, required = set(), set()
+            populate_by_name = member.model_config.get("populate_by_name", False)
+            for name, field in member.model_fields.items():
+                key = field.alias or name
+                keys.add(key)
+                if populate_by_name:
+                    keys.add(name)
+                if field.is_required():
+                    required.add(key)
+            models.append((member, frozenset(keys), frozenset(required)))
+        elif get_origin(member) in (list, tuple) or member in (list, tuple):
+            list_converter = _converter(member)
+
+    def convert(value):
+        if isinstance(value, dict) and models:
+            best, best_count = None, -1
+            for model, keys, required in models:
+                if required <= value.keys():
+                    count = len(keys.intersection(value))
+                    if count > best_count:
+                        best, best_count = model, count
+            if best is not None:
+                return construct_model(best, value)
+        if isinstance(value, list) and list_converter is not None:
+            return list_converter(value)
+        return value
+
+    return convert
+
+
+def _converter(annotation) -> Callable[[Any], Any]:
+    """Returns a function turning raw input for `annotation` into its model value."""
+    if annotation in _PLAIN_TYPES:
+        return _identity
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+    if origin is Union:
+        members = [arg for arg in args if arg is not type(None)]
+        inner = _converter(members[0]) if len(members) == 1 else _union_converter(members)
+        if inner is _identity:
+            return _identity
+        return lambda value: None if value is None else inner(value)
+    if origin is dict or annotation is dict:
+        item = _converter(args[1]) if args else _identity
+        if item is _identity:
+            return dict
+        return lambda value: {key: item(entry) for key, entry in value.items()}
+    if origin is list or annotation is list:
+        item = _converter(args[0]) if args else _identity
+        if item is _identity:
+            return list
+        return lambda value: [item(entry) for entry in value]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return lambda value: construct_model(annotation, value)
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    # Leaf types with their own normal form (URLs, e-mail addresses) are
+    # rare; build them exactly as validation would so the trees compare equal.
+    return TypeAdapter(annotation).validate_python
+
+
+# Construction plan of a model: converters keyed by input key, default values
+# and whether the inlined `model_construct` below can be used.
+class _Plan:
+    __slots__ = ("fields", "defaults", "mutable_defaults", "fast")
+
+    def __init__(self, model: type):
+        self.fields: Dict[str, tuple] = {}
+        self.defaults: Dict[str, Any] = {}
+        self.mutable_defaults = []
+        populate_by_name = model.model_config.get("populate_by_name", False)
+        for name, field in model.model_fields.items():
+            convert = _converter(field.annotation)
+            self.fields[field.alias or name] = (name, convert)
+            if field.alias and populate_by_name:
+                self.fields.setdefault(name, (name, convert))
+            if not field.is_required():
+                default = field.get_default(call_default_factory=True)
+                self.defaults[name] = default
+                if isinstance(default, (list, dict, set)):
+                    self.mutable_defaults.append(name)
+        self.fast = (
+            not issubclass(model, RootModel)
+            and not model.__pydantic_post_init__
+            and model.model_config.get("extra") != "allow"
+        )
+
+
+def _plan(model: type) -> _Plan:
+    plan = _PLANS.get(model)
+    if plan is None:
+        plan = _PLANS[model] = _Plan(model)
+    return plan
+
+
+def construct_model(model: type, data: Any):
+    """Builds `model` from trusted `data` without validation, recursively.
+
+    This is `BaseModel.model_construct` specialised per model: converters and
+    defaults are computed once, and only the keys present in `data` are
+    visited instead of every declared field.
+    """
+    plan = _PLANS.get(model) or _plan(model)
+    if issubclass(model, RootModel):
+        return model.model_construct(root=plan.fields["root"][1](data))
+    values = {}
+    fields = plan.fields
+    for key, value in data.items():
+        entry = fields.get(key)
+        if entry is not None and entry[0] not in values:
+            values[entry[0]] = entry[1](value)
+    if not plan.fast:
+        return model.model_construct(_fields_set=set(values), **values)
+    fields_set = set(values)
+    merged = dict(plan.defaults)
+    for name in plan.mutable_defaults:
+        if name not in fields_set:
+            merged[name] = _copy.copy(merged[name])
+    merged.update(values)
+    instance = model.__new__(model)
+    _object_setattr(instance, "__dict__", merged)
+    _object_setattr(instance, "__pydantic_fields_set__", fields_set)
+    _object_setattr(instance, "__pydantic_extra__", None)
+    _object_setattr(instance, "__pydantic_private__", None)
+    return instance
+
+
+def construct_openapi(content: Dict[str, Any]) -> OpenAPISchemaValidator:
+    """Builds the `parse_openapi` result for `content` without any validation.
+
+    Only call this for documents known to be valid; invalid input produces
+    a model tree with the wrong types instead of an error.
+    """
+    return construct_model(OpenAPISchemaValidator, content)
+
+
+def serialize_openapi(content: Dict[str, Any]) -> str:
+    """Validates `content` and returns its canonical JSON serialization.
+
+    The fingerprint of the output (``sha256`` of the returned text, which is
+    also `utils.fingerprint(content)`) is remembered so that `load_trusted`
+    accepts it in this process; publish it in an allowlist for other
+    processes.
+    """
+    parse_openapi(content)
+    text = canonical_json(content)
+    with _SERIALIZED_LOCK:
+        _SERIALIZED.add(hashlib.sha256(text.encode("utf-8")).hexdigest())
+    return text
+
+
+def is_trusted(document_fingerprint: str, allowlist: Optional[Iterable[str]] = None) -> bool:
+    """True if the fingerprint is allowlisted or was produced by `serialize_openapi`."""
+    if allowlist is not None and document_fingerprint in allowlist:
+        return True
+    return document_fingerprint in _SERIALIZED
+
+
+def load_trusted(
+    document: Union[str, bytes, Dict[str, Any]],
+    allowlist: Optional[Iterable[str]] = None,
+    unsafe_fingerprint: Optional[str] = None,
+) -> OpenAPISchemaValidator:
+    """Loads a document, skipping validation when its fingerprint is trusted.
+
+    `document` is either the parsed dictionary or the JSON text produced by
+    `serialize_openapi`; for text the fingerprint is a single hash of the
+    bytes, and a dictionary is fingerprinted with `utils.fingerprint`.
+    Untrusted documents go through `parse_openapi` as usual.
+
+    `unsafe_fingerprint` skips the hashing: it is looked up in place of the
+    document's fingerprint and never compared with the content.  Only pass
+    it for a document you vouch for yourself (for example one read back from
+    your own store under that fingerprint); a wrong value lets an invalid
+    document through unvalidated, with fields of the wrong types.
+    """
+    if isinstance(document, (str, bytes)):
+        data = document.encode("utf-8") if isinstance(document, str) else document
+        content = json.loads(data)
+    else:
+        data, content = None, document
+    if unsafe_fingerprint is not None:
+        document_fingerprint = unsafe_fingerprint
+    elif data is not None:
+        document_fingerprint = hashlib.sha256(data).hexdigest()
+    else:
+        document_fingerprint = fingerprint(content)
+    if is_trusted(document_fingerprint, allowlist):
+        return construct_openapi(content)
+    logger.debug("Document %s is not trusted; validating", document_fingerprint)
+    return parse_openapi(content)
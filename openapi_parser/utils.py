@@ -1,37 +1,145 @@
 import os
+import json
+import mmap
+import hashlib
+from contextlib import contextmanager
 from openapi_parser.exceptions import ReferenceResolutionError
 
+# Files of at least this many bytes are memory-mapped instead of read
+MMAP_THRESHOLD = 1 << 20
+
 def load_file(path):
     """Loads a file from the given path."""
-    # Check if the file exists, and raise OSError if it does not
-    if not os.path.exists(path):
-        raise OSError(f"File not found: {path}")
-    # Open and read the file content
-    with open(path, 'r') as f:
-        return f.read()
-
-def resolve_references(openapi_instance):
+    # A missing file surfaces from open() itself; no separate existence check
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except FileNotFoundError:
+        raise OSError(f"File not found: {path}") from None
+
+@contextmanager
+def open_bytes(path, mmap_threshold=MMAP_THRESHOLD):
+    """Yields the raw contents of a file without decoding them.
+
+    Files smaller than `mmap_threshold` bytes are read with a single call and
+    yielded as ``bytes``; larger ones are yielded as a read-only ``mmap`` that
+    is closed when the block exits, so they are never copied into the heap.
+
+    Raises:
+        OSError: If the file cannot be opened or read.
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or size < mmap_threshold:
+            yield f.read()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+def escape_pointer_token(token):
+    """Escapes a single JSON Pointer reference token (RFC 6901)."""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+def unescape_pointer_token(token):
+    """Reverses `escape_pointer_token`."""
+    return token.replace("~1", "/").replace("~0", "~")
+
+def json_pointer(*tokens):
+    """Builds a JSON Pointer such as ``/paths/~1users/get`` from raw tokens."""
+    return "".join("/" + escape_pointer_token(token) for token in tokens)
+
+def resolve_pointer(document, ref):
+    """Resolves a local reference (``#/components/schemas/Name``) in `document`.
+
+    Raises:
+        ReferenceResolutionError: If the reference is not local or does not
+        point at an existing node.
+    """
+    if not isinstance(ref, str) or not ref.startswith("#"):
+        raise ReferenceResolutionError(f"Reference '{ref}' is not a local reference.")
+    node = document
+    for token in ref[1:].split("/")[1:]:
+        token = unescape_pointer_token(token)
+        try:
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ReferenceResolutionError(f"Reference '{ref}' not found.")
+    return node
+
+def _stringify_keys(node):
+    if isinstance(node, dict):
+        return {str(key): _stringify_keys(value) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_stringify_keys(item) for item in node]
+    return node
+
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+def canonical_json(node):
+    """Serializes `node` to a canonical (sorted, compact) JSON string.
+
+    YAML documents may contain non-string keys (``200:`` rather than
+    ``'200':``) or dates; keys are stringified and other values fall back to
+    ``str`` so that any loaded document has a stable representation.
+    """
+    try:
+        return _CANONICAL_ENCODER.encode(node)
+    except TypeError:
+        return _CANONICAL_ENCODER.encode(_stringify_keys(node))
+
+def fingerprint(node):
+    """Returns a hex SHA-256 digest of the canonical JSON form of `node`."""
+    return hashlib.sha256(canonical_json(node).encode("utf-8")).hexdigest()
+
+def resolve_references(openapi_instance, source_map=None):
     """Resolves all `$ref` references in the OpenAPI instance.
 
+    The input is not modified: the result is a new document in which the
+    containers along each resolved reference are copied and every other
+    subtree is shared with the input, so concurrent callers may resolve the
+    same document safely.
+
+    When `source_map` (see `openapi_parser.locations`) is given, errors carry
+    the line and column of the offending node.
+
     Raises:
         ReferenceResolutionError: If a reference cannot be resolved.
     """
+    pointer = ""
     try:
+        resolved_paths = {}
         # Traverse the OpenAPI paths and look for references
         for path, item in openapi_instance.get("paths", {}).items():
+            resolved_item = resolved_paths[path] = dict(item)
             for method, details in item.items():
                 responses = details.get("responses", {})
+                resolved_responses = {}
                 for code, response in responses.items():
                     content = response.get("content", {})
+                    resolved_content = {}
                     for mime_type, schema in content.items():
+                        pointer = json_pointer("paths", path, method, "responses", code, "content", mime_type)
+                        resolved_content[mime_type] = schema
                         # Check for an unresolved reference in the schema
                         if "$ref" in schema["schema"]:
                             ref = schema["schema"]["$ref"]
                             ref_path = ref.split('/')[-1]
                             if ref_path not in openapi_instance.get("components", {}).get("schemas", {}):
-                                raise ReferenceResolutionError(f"Reference '{ref}' not found.")
-                            schema["schema"] = openapi_instance["components"]["schemas"][ref_path]
-        return openapi_instance
+                                pointer += "/schema"
+                                raise ReferenceResolutionError(
+                                    f"Reference '{ref}' not found.",
+                                    pointer=pointer,
+                                    location=source_map.locate(pointer) if source_map is not None else None,
+                                )
+                            resolved_content[mime_type] = {**schema, "schema": openapi_instance["components"]["schemas"][ref_path]}
+                    resolved_responses[code] = {**response, "content": resolved_content} if "content" in response else response
+                if "responses" in details:
+                    resolved_item[method] = {**details, "responses": resolved_responses}
+        return {**openapi_instance, "paths": resolved_paths} if "paths" in openapi_instance else dict(openapi_instance)
     except KeyError as e:
         # Raise ReferenceResolutionError if the structure is missing expected keys
-        raise ReferenceResolutionError(f"Unresolved reference due to missing key: {e}")
+        raise ReferenceResolutionError(
+            f"Unresolved reference due to missing key: {e}",
+            pointer=pointer or None,
+            location=source_map.locate(pointer) if source_map is not None and pointer else None,
+        )
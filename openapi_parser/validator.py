@@ -0,0 +1,254 @@
+"""Validation of JSON instances (request/response payloads) against spec schemas.
+
+`SchemaValidator` checks decoded JSON values against the raw schemas of an
+OpenAPI 3.1 document: types, enums and constants, string/number/array/object
+constraints, local `$ref`s and the ``allOf``/``anyOf``/``oneOf``/``not``
+compositions.  Problems are reported as `ValidationIssue`s whose pointers
+point into the instance.  ``format`` is treated as an annotation, and
+``pattern``s are ECMA-262 expressions compiled once through the shared
+`openapi_parser.patterns` cache.
+
+Discriminated compositions are dispatched through a `DiscriminatorIndex`, so
+only the selected branch is validated; without a discriminator the branches
+are tried in order.
+"""
+from typing import Any, Dict, Iterator, List, Optional
+from openapi_parser.discriminator import DiscriminatorIndex
+from openapi_parser.exceptions import ReferenceResolutionError, ValidationIssue
+from openapi_parser.patterns import compile_pattern
+from openapi_parser.utils import escape_pointer_token, resolve_pointer
+
+def _is_type(instance: Any, name: str) -> bool:
+    if name == "object":
+        return isinstance(instance, dict)
+    if name == "array":
+        return isinstance(instance, list)
+    if name == "string":
+        return isinstance(instance, str)
+    if name == "boolean":
+        return isinstance(instance, bool)
+    if name == "null":
+        return instance is None
+    if isinstance(instance, bool):
+        return False
+    if name == "integer":
+        return isinstance(instance, int) or (isinstance(instance, float) and instance.is_integer())
+    if name == "number":
+        return isinstance(instance, (int, float))
+    return False
+
+
+def _equal(left: Any, right: Any) -> bool:
+    # JSON equality: 1 == 1.0 but True != 1
+    if isinstance(left, bool) or isinstance(right, bool):
+        return type(left) is type(right) and left == right
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(_equal(a, b) for a, b in zip(left, right))
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(_equal(value, right[key]) for key, value in left.items())
+    return left == right
+
+
+class SchemaValidator:
+    """Validates instances against the schemas of one OpenAPI document.
+
+    Args:
+        document: The raw OpenAPI document; `$ref`s are resolved against it.
+        use_discriminators: Dispatch discriminated ``oneOf``/``anyOf`` through
+            precomputed tables.  When False, branches are always tried in order.
+    """
+
+    def __init__(self, document: Dict[str, Any], use_discriminators: bool = True):
+        self.document = document
+        self.discriminators = DiscriminatorIndex(document) if use_discriminators else None
+        self._refs: Dict[str, Any] = {}
+
+    def schema(self, name: str) -> Any:
+        """Returns the component schema `name` (``#/components/schemas/<name>``)."""
+        return self.resolve("#/components/schemas/" + escape_pointer_token(name))
+
+    def resolve(self, ref: str) -> Any:
+        """Resolves a local reference, caching the result.
+
+        Raises:
+            ReferenceResolutionError: If the reference cannot be resolved.
+        """
+        try:
+            return self._refs[ref]
+        except KeyError:
+            target = self._refs[ref] = resolve_pointer(self.document, ref)
+            return target
+
+    def validate(self, instance: Any, schema: Any, max_errors: Optional[int] = None) -> List[ValidationIssue]:
+        """Returns the problems of `instance` against `schema`, at most `max_errors` of them."""
+        issues = []
+        for issue in self.iter_errors(instance, schema):
+            issues.append(issue)
+            if max_errors is not None and len(issues) >= max_errors:
+                break
+        return issues
+
+    def is_valid(self, instance: Any, schema: Any) -> bool:
+        """True if `instance` matches `schema`; stops at the first problem."""
+        for _ in self.iter_errors(instance, schema):
+            return False
+        return True
+
+    def iter_errors(self, instance: Any, schema: Any, pointer: str = "") -> Iterator[ValidationIssue]:
+        """Yields the problems of `instance` against `schema` lazily."""
+        if schema is True or schema is None:
+            return
+        if schema is False:
+            yield ValidationIssue(pointer, "not-allowed", "No value is allowed here.")
+            return
+        if not isinstance(schema, dict):
+            return
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            try:
+                target = self.resolve(ref)
+            except ReferenceResolutionError:
+                yield ValidationIssue(pointer, "unresolved-ref", "Reference '{ref}' cannot be resolved.", ref=ref)
+                return
+            yield from self.iter_errors(instance, target, pointer)
+            if len(schema) == 1:
+                return
+
+        kind = schema.get("type")
+        if kind is not None:
+            names = kind if isinstance(kind, list) else (kind,)
+            if not any(_is_type(instance, name) for name in names):
+                yield ValidationIssue(
+                    pointer, "invalid-type", "Expected {expected}, got {actual}.",
+                    expected=" or ".join(names), actual=type(instance).__name__,
+                )
+                return
+        if "enum" in schema and not any(_equal(instance, value) for value in schema["enum"]):
+            yield ValidationIssue(pointer, "not-in-enum", "Value {value!r} is not one of {enum!r}.", value=instance, enum=schema["enum"])
+        if "const" in schema and not _equal(instance, schema["const"]):
+            yield ValidationIssue(pointer, "const-mismatch", "Value {value!r} is not {const!r}.", value=instance, const=schema["const"])
+
+        if isinstance(instance, str):
+            yield from self._string_errors(instance, schema, pointer)
+        elif isinstance(instance, (int, float)) and not isinstance(instance, bool):
+            yield from self._number_errors(instance, schema, pointer)
+        elif isinstance(instance, list):
+            yield from self._array_errors(instance, schema, pointer)
+        elif isinstance(instance, dict):
+            yield from self._object_errors(instance, schema, pointer)
+
+        if "allOf" in schema:
+            for member in schema["allOf"]:
+                yield from self.iter_errors(instance, member, pointer)
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in schema:
+                yield from self._composition_errors(instance, schema, keyword, pointer)
+        if "not" in schema and self.is_valid(instance, schema["not"]):
+            yield ValidationIssue(pointer, "not-matched", "Value must not match the 'not' schema.")
+
+    def _string_errors(self, instance: str, schema: Dict[str, Any], pointer: str) -> Iterator[ValidationIssue]:
+        if "minLength" in schema and len(instance) < schema["minLength"]:
+            yield ValidationIssue(pointer, "too-short", "String is shorter than {limit}.", limit=schema["minLength"])
+        if "maxLength" in schema and len(instance) > schema["maxLength"]:
+            yield ValidationIssue(pointer, "too-long", "String is longer than {limit}.", limit=schema["maxLength"])
+        if "pattern" in schema and not compile_pattern(schema["pattern"]).search(instance):
+            yield ValidationIssue(pointer, "pattern-mismatch", "String does not match '{pattern}'.", pattern=schema["pattern"])
+
+    def _number_errors(self, instance, schema: Dict[str, Any], pointer: str) -> Iterator[ValidationIssue]:
+        if "minimum" in schema and instance < schema["minimum"]:
+            yield ValidationIssue(pointer, "below-minimum", "{value} is less than {limit}.", value=instance, limit=schema["minimum"])
+        if "exclusiveMinimum" in schema and instance <= schema["exclusiveMinimum"]:
+            yield ValidationIssue(pointer, "below-minimum", "{value} is not greater than {limit}.", value=instance, limit=schema["exclusiveMinimum"])
+        if "maximum" in schema and instance > schema["maximum"]:
+            yield ValidationIssue(pointer, "above-maximum", "{value} is greater than {limit}.", value=instance, limit=schema["maximum"])
+        if "exclusiveMaximum" in schema and instance >= schema["exclusiveMaximum"]:
+            yield ValidationIssue(pointer, "above-maximum", "{value} is not less than {limit}.", value=instance, limit=schema["exclusiveMaximum"])
+        if "multipleOf" in schema:
+            factor = schema["multipleOf"]
+            if isinstance(instance, int) and isinstance(factor, int):
+                remainder = instance % factor
+            else:
+                quotient = instance / factor
+                remainder = abs(quotient - round(quotient)) > 1e-9 * max(1.0, abs(quotient))
+            if remainder:
+                yield ValidationIssue(pointer, "not-multiple", "{value} is not a multiple of {factor}.", value=instance, factor=schema["multipleOf"])
+
+    def _array_errors(self, instance: list, schema: Dict[str, Any], pointer: str) -> Iterator[ValidationIssue]:
+        if "minItems" in schema and len(instance) < schema["minItems"]:
+            yield ValidationIssue(pointer, "too-few-items", "Array has fewer than {limit} items.", limit=schema["minItems"])
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            yield ValidationIssue(pointer, "too-many-items", "Array has more than {limit} items.", limit=schema["maxItems"])
+        if schema.get("uniqueItems"):
+            for index, item in enumerate(instance):
+                if any(_equal(item, other) for other in instance[:index]):
+                    yield ValidationIssue(f"{pointer}/{index}", "duplicate-items", "Array items must be unique.")
+                    break
+        prefix = schema.get("prefixItems") or ()
+        for index, item_schema in enumerate(prefix[:len(instance)]):
+            yield from self.iter_errors(instance[index], item_schema, f"{pointer}/{index}")
+        items = schema.get("items")
+        if items is not None:
+            for index in range(len(prefix), len(instance)):
+                yield from self.iter_errors(instance[index], items, f"{pointer}/{index}")
+
+    def _object_errors(self, instance: dict, schema: Dict[str, Any], pointer: str) -> Iterator[ValidationIssue]:
+        for name in schema.get("required") or ():
+            if name not in instance:
+                yield ValidationIssue(
+                    f"{pointer}/{escape_pointer_token(name)}", "missing-property", "Missing required property '{name}'.", name=name
+                )
+        if "minProperties" in schema and len(instance) < schema["minProperties"]:
+            yield ValidationIssue(pointer, "too-few-properties", "Object has fewer than {limit} properties.", limit=schema["minProperties"])
+        if "maxProperties" in schema and len(instance) > schema["maxProperties"]:
+            yield ValidationIssue(pointer, "too-many-properties", "Object has more than {limit} properties.", limit=schema["maxProperties"])
+        properties = schema.get("properties") or {}
+        patterns = schema.get("patternProperties") or {}
+        additional = schema.get("additionalProperties", True)
+        if not properties and not patterns and additional is True:
+            return
+        for name, value in instance.items():
+            matched = False
+            if name in properties:
+                matched = True
+                yield from self.iter_errors(value, properties[name], f"{pointer}/{escape_pointer_token(name)}")
+            for expression, pattern_schema in patterns.items():
+                if compile_pattern(expression).search(name):
+                    matched = True
+                    yield from self.iter_errors(value, pattern_schema, f"{pointer}/{escape_pointer_token(name)}")
+            if not matched and additional is not True:
+                if additional is False:
+                    yield ValidationIssue(
+                        f"{pointer}/{escape_pointer_token(name)}", "additional-property",
+                        "Property '{name}' is not allowed.", name=name,
+                    )
+                else:
+                    yield from self.iter_errors(value, additional, f"{pointer}/{escape_pointer_token(name)}")
+
+    def _composition_errors(self, instance: Any, schema: Dict[str, Any], keyword: str, pointer: str) -> Iterator[ValidationIssue]:
+        table = self.discriminators.table(schema) if self.discriminators is not None else None
+        # A dispatch table is built from oneOf when present, else from anyOf
+        if table is not None and table.branches is schema[keyword] and isinstance(instance, dict):
+            branch = table.select(instance)
+            if branch is not None:
+                yield from self.iter_errors(instance, branch, pointer)
+                return
+            name = table.property_name
+            value_pointer = f"{pointer}/{escape_pointer_token(name)}"
+            if name not in instance:
+                yield ValidationIssue(value_pointer, "missing-discriminator", "Missing discriminator property '{name}'.", name=name)
+            else:
+                yield ValidationIssue(
+                    value_pointer, "unknown-discriminator", "Discriminator value {value!r} does not select any of {known}.",
+                    value=instance[name], known=", ".join(sorted(table.mapping)),
+                )
+            return
+        matches = 0
+        for branch in schema[keyword]:
+            if self.is_valid(instance, branch):
+                matches += 1
+                if keyword == "anyOf" or matches > 1:
+                    break
+        if matches == 0:
+            yield ValidationIssue(pointer, "no-branch-matched", "Value does not match any {keyword} branch.", keyword=keyword)
+        elif keyword == "oneOf" and matches > 1:
+            yield ValidationIssue(pointer, "multiple-branches-matched", "Value matches more than one oneOf branch.")
@@ -1,24 +1,9 @@
-import os
-import yaml
-from openapi_parser.parser import parse_openapi  # Ensure this import matches your setup
+"""Validates every spec in openapi_specs/; kept as a shortcut for the CLI.
 
-# Directory containing the OpenAPI specifications
-openapi_dir = 'openapi_specs'
-
-# Iterate over each OpenAPI file in the directory
-for filename in os.listdir(openapi_dir):
-    if filename.endswith('.yml') or filename.endswith('.yaml'):
-        file_path = os.path.join(openapi_dir, filename)
-        print(f"Testing {filename}")
-
-        try:
-            # Load YAML content
-            with open(file_path, 'r') as file:
-                openapi_content = yaml.safe_load(file)
-
-            # Parse OpenAPI content
-            parsed_spec = parse_openapi(openapi_content)
-            print(f"{filename} parsed successfully.")
-        except Exception as e:
-            print(f"Failed to parse {filename}: {e}")
+Equivalent to ``python -m openapi_parser validate openapi_specs``.
+"""
+import sys
+from openapi_parser.cli import main
 
+if __name__ == "__main__":
+    sys.exit(main(["validate", "openapi_specs", *sys.argv[1:]]))
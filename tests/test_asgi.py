@@ -0,0 +1,79 @@
+import asyncio
+import gzip
+import json
+import yaml
+from openapi_parser.asgi import OpenAPISpecApp
+from openapi_parser.parser import parse_openapi
+
+spec = {
+    "openapi": "3.1.0",
+    "info": {"title": "Served API", "version": "1.0.0"},
+    "paths": {f"/items{i}": {"get": {"responses": {"200": {"description": "OK"}}}} for i in range(20)},
+}
+
+
+def request(app, path="/openapi.json", method="GET", **headers):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http", "method": method, "path": path,
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    }
+    asyncio.run(app(scope, receive, send))
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+def test_serves_json_and_yaml():
+    app = OpenAPISpecApp(spec)
+    status, headers, body = request(app)
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(body) == spec
+    assert int(headers[b"content-length"]) == len(body)
+    status, headers, body = request(app, "/docs/openapi.yaml")
+    assert headers[b"content-type"] == b"application/yaml"
+    assert yaml.safe_load(body) == spec
+
+
+def test_negotiates_gzip():
+    app = OpenAPISpecApp(spec)
+    status, headers, body = request(app, accept_encoding="br;q=0.5, gzip")
+    assert headers[b"content-encoding"] == b"gzip"
+    assert json.loads(gzip.decompress(body)) == spec
+    _, identity_headers, _ = request(app)
+    assert identity_headers[b"etag"] != headers[b"etag"]
+    status, _, _ = request(app, accept_encoding="identity;q=0, gzip;q=0")
+    assert status == 406
+
+
+def test_conditional_request():
+    app = OpenAPISpecApp(spec)
+    _, headers, _ = request(app)
+    etag = headers[b"etag"].decode()
+    status, headers, body = request(app, if_none_match=f'"other", W/{etag}')
+    assert status == 304
+    assert body == b""
+    assert headers[b"etag"].decode() == etag
+    status, _, _ = request(app, if_none_match='"stale"')
+    assert status == 200
+
+
+def test_head_and_methods():
+    app = OpenAPISpecApp(spec)
+    status, headers, body = request(app, method="HEAD")
+    assert status == 200 and body == b"" and int(headers[b"content-length"]) > 0
+    status, headers, _ = request(app, method="POST")
+    assert status == 405 and headers[b"allow"] == b"GET, HEAD"
+
+
+def test_accepts_parsed_model():
+    app = OpenAPISpecApp(parse_openapi(spec))
+    _, _, body = request(app)
+    assert json.loads(body)["info"]["title"] == "Served API"
@@ -0,0 +1,124 @@
+import io
+import json
+import pytest
+import yaml
+from openapi_parser.bundler import bundle, clear_cache, dereference, write_spec
+from openapi_parser.exceptions import ReferenceResolutionError
+from openapi_parser.parser import parse_openapi
+
+
+@pytest.fixture
+def spec_dir(tmp_path):
+    clear_cache()
+    (tmp_path / "common.yaml").write_text(yaml.safe_dump({
+        "components": {
+            "schemas": {
+                "Error": {"type": "object", "properties": {"code": {"$ref": "#/components/schemas/Code"}}},
+                "Code": {"type": "integer"},
+            },
+            "parameters": {"Limit": {"name": "limit", "in": "query", "schema": {"type": "integer"}}},
+        }
+    }))
+    (tmp_path / "node.yaml").write_text(yaml.safe_dump({
+        "type": "object",
+        "properties": {"children": {"type": "array", "items": {"$ref": "node.yaml"}}},
+    }))
+    return tmp_path
+
+
+def document():
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Bundled", "version": "1.0.0"},
+        "paths": {
+            "/items": {
+                "get": {
+                    "parameters": [{"$ref": "common.yaml#/components/parameters/Limit"}],
+                    "responses": {
+                        "200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}}},
+                        "default": {"description": "Error", "content": {"application/json": {"schema": {"$ref": "common.yaml#/components/schemas/Error"}}}},
+                    },
+                }
+            }
+        },
+        "components": {
+            "schemas": {
+                "Item": {"type": "object", "properties": {"tree": {"$ref": "node.yaml"}}},
+                "Error": {"type": "string"},
+            }
+        },
+    }
+
+
+def test_bundle_internalizes_external_refs(spec_dir):
+    result = bundle(document(), base_path=str(spec_dir / "openapi.yaml"))
+    operation = result["paths"]["/items"]["get"]
+    assert operation["parameters"] == [{"$ref": "#/components/parameters/Limit"}]
+    assert operation["responses"]["200"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/Item"}
+    assert operation["responses"]["default"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/Error2"}
+    schemas = result["components"]["schemas"]
+    assert schemas["Error"] == {"type": "string"}
+    assert schemas["Error2"]["properties"]["code"] == {"$ref": "#/components/schemas/Code"}
+    assert schemas["Code"] == {"type": "integer"}
+    assert schemas["node"]["properties"]["children"]["items"] == {"$ref": "#/components/schemas/node"}
+    assert "$ref" not in json.dumps(result).replace('"$ref": "#', "")
+    parse_openapi(result)
+
+
+def test_dereference_inlines_and_keeps_cycles(spec_dir):
+    result = dereference(document(), base_path=str(spec_dir))
+    operation = result["paths"]["/items"]["get"]
+    assert operation["parameters"][0]["name"] == "limit"
+    error = operation["responses"]["default"]["content"]["application/json"]["schema"]
+    assert error["properties"]["code"] == {"type": "integer"}
+    item = operation["responses"]["200"]["content"]["application/json"]["schema"]
+    # The self-referencing schema is inlined once and then points at its bundled copy
+    assert item["properties"]["tree"]["properties"]["children"]["items"] == {"$ref": "#/components/schemas/node"}
+    assert result["components"]["schemas"]["node"] is item["properties"]["tree"]
+    # Memoized subtrees are shared between referrers
+    assert result["components"]["schemas"]["Item"] is item
+
+
+def test_results_are_cached_by_fingerprint(spec_dir):
+    first = bundle(document(), base_path=str(spec_dir))
+    assert bundle(document(), base_path=str(spec_dir)) is first
+    (spec_dir / "common.yaml").write_text(yaml.safe_dump({
+        "components": {"schemas": {"Error": {"type": "null"}}, "parameters": {"Limit": {"name": "limit", "in": "query"}}}
+    }))
+    second = bundle(document(), base_path=str(spec_dir))
+    assert second is not first
+    assert second["components"]["schemas"]["Error2"] == {"type": "null"}
+
+
+def test_missing_reference(spec_dir):
+    broken = document()
+    broken["components"]["schemas"]["Item"] = {"$ref": "common.yaml#/components/schemas/Missing"}
+    with pytest.raises(ReferenceResolutionError, match="Missing"):
+        bundle(broken, base_path=str(spec_dir))
+    broken["components"]["schemas"]["Item"] = {"$ref": "absent.yaml"}
+    with pytest.raises(ReferenceResolutionError, match="absent.yaml"):
+        dereference(broken, base_path=str(spec_dir))
+
+
+def test_write_spec_round_trips(spec_dir):
+    result = dereference(document(), base_path=str(spec_dir))
+    write_spec(result, spec_dir / "out.json")
+    write_spec(result, spec_dir / "out.yaml")
+    assert json.loads((spec_dir / "out.json").read_text()) == result
+    text = (spec_dir / "out.yaml").read_text()
+    assert "&id" not in text and "*id" not in text
+    assert yaml.safe_load(text) == result
+    stream = io.StringIO()
+    write_spec(result, stream, format="json")
+    assert json.loads(stream.getvalue()) == result
+
+
+def test_dereference_depth_limit(spec_dir):
+    chain = {f"S{i}": {"type": "object", "properties": {"next": {"$ref": f"#/components/schemas/S{i + 1}"}}} for i in range(500)}
+    chain["S500"] = {"type": "string"}
+    spec = {**document(), "paths": {}, "components": {"schemas": chain}}
+    result = dereference(spec, base_path=str(spec_dir), max_depth=3)
+    first = result["components"]["schemas"]["S0"]
+    assert first["properties"]["next"]["properties"]["next"]["properties"]["next"] == {"$ref": "#/components/schemas/S3"}
+    deep = dereference(spec, base_path=str(spec_dir))
+    assert "properties" in deep["components"]["schemas"]["S0"]["properties"]["next"]
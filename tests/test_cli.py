@@ -0,0 +1,99 @@
+import io
+import json
+import os
+from openapi_parser import cli
+from openapi_parser.cli import EXIT_INVALID, EXIT_OK, EXIT_USAGE, discover, main, validate_file
+from openapi_parser.locations import scan_yaml_locations
+
+VALID = "openapi: 3.1.0\ninfo:\n  title: Test\n  version: '1.0'\npaths: {}\n"
+INVALID = "openapi: 3.1.0\ninfo:\n  title: Test\npaths: {}\n"
+
+
+def run(*argv):
+    stdout = io.StringIO()
+    code = main(list(argv), stdout=stdout)
+    return code, stdout.getvalue()
+
+
+def write_specs(tmp_path):
+    specs = tmp_path / "specs"
+    (specs / "nested").mkdir(parents=True)
+    (specs / "a.yaml").write_text(VALID)
+    (specs / "nested" / "b.json").write_text(json.dumps({"openapi": "3.1.0", "info": {"title": "B", "version": "1"}, "paths": {}}))
+    (specs / "notes.txt").write_text("ignored")
+    return specs
+
+
+def test_discover_expands_directories(tmp_path):
+    specs = write_specs(tmp_path)
+    assert discover([str(specs)]) == [str(specs / "a.yaml"), str(specs / "nested" / "b.json")]
+
+
+def test_validate_reports_and_exit_codes(tmp_path):
+    specs = write_specs(tmp_path)
+    cache = str(tmp_path / "cache.json")
+    code, output = run("validate", str(specs), "--cache", cache, "--jobs", "2")
+    assert code == EXIT_OK
+    assert "2 file(s): 2 valid, 0 invalid, 0 cached" in output
+
+    (specs / "c.yml").write_text(INVALID)
+    code, output = run("validate", str(specs), "--cache", cache, "--format", "json")
+    assert code == EXIT_INVALID
+    report = json.loads(output)
+    assert report["summary"]["invalid"] == 1 and report["summary"]["cached"] == 2
+    failed = next(result for result in report["results"] if not result["valid"])
+    assert failed["path"].endswith("c.yml")
+    assert failed["errors"][0]["pointer"] == "/info/version" and failed["errors"][0]["line"] == 3
+    assert failed["seconds"] >= 0
+
+
+def test_changed_files_are_revalidated(tmp_path):
+    specs = write_specs(tmp_path)
+    cache = str(tmp_path / "cache.json")
+    run("validate", str(specs), "--cache", cache, "--jobs", "1")
+    (specs / "a.yaml").write_text(INVALID + "\n")
+    code, output = run("validate", str(specs), "--cache", cache, "--jobs", "1")
+    assert code == EXIT_INVALID
+    assert "1 cached" in output and "FAIL" in output
+    # Other options never reuse the cached results
+    code, output = run("validate", str(specs), "--cache", cache, "--level", "strict")
+    assert "0 cached" in output
+
+
+def test_no_cache_and_no_files(tmp_path, monkeypatch):
+    specs = write_specs(tmp_path)
+    monkeypatch.chdir(tmp_path)
+    code, _ = run("validate", str(specs), "--no-cache")
+    assert code == EXIT_OK and not os.path.exists(".openapi_parser_cache.json")
+    assert run("validate", str(tmp_path / "missing"))[0] == EXIT_INVALID
+    (tmp_path / "empty").mkdir()
+    assert run("validate", str(tmp_path / "empty"))[0] == EXIT_USAGE
+
+
+def test_only_invalid_files_are_located(tmp_path, monkeypatch):
+    scanned = []
+    monkeypatch.setattr(cli, "scan_yaml_locations", lambda content: scanned.append(content) or scan_yaml_locations(content))
+    valid, invalid = tmp_path / "valid.yaml", tmp_path / "invalid.yaml"
+    valid.write_text(VALID)
+    invalid.write_text(INVALID)
+    assert validate_file(str(valid))["valid"] and not scanned
+    assert validate_file(str(invalid))["errors"][0]["line"] == 3 and len(scanned) == 1
+
+
+def test_unexpected_failures_are_reported_per_file(tmp_path, monkeypatch):
+    specs = write_specs(tmp_path)
+    (specs / "c.json").write_bytes(b"\xff\xff{}")
+    load = cli.load_openapi_from_file
+
+    def failing_load(path, **options):
+        if path.endswith("a.yaml"):
+            raise MemoryError("out of memory")
+        return load(path, **options)
+
+    monkeypatch.setattr(cli, "load_openapi_from_file", failing_load)
+    code, output = run("validate", str(specs), "--no-cache", "--jobs", "1", "--format", "json")
+    assert code == EXIT_INVALID
+    results = {os.path.basename(result["path"]): result for result in json.loads(output)["results"]}
+    assert results["b.json"]["valid"]
+    assert not results["a.yaml"]["valid"] and "MemoryError: out of memory" in results["a.yaml"]["message"]
+    assert not results["c.json"]["valid"] and "Invalid JSON format" in results["c.json"]["message"]
@@ -0,0 +1,130 @@
+import json
+import sys
+import pytest
+from openapi_parser.codegen import generate_module, load_module, write_module
+from openapi_parser.exceptions import DecodeError
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Shop", "version": "1.0.0"},
+    "paths": {},
+    "components": {
+        "schemas": {
+            "Status": {"type": "string", "enum": ["new", "sold"]},
+            "Base": {"type": "object", "required": ["id"], "properties": {"id": {"type": "integer", "minimum": 1}}},
+            "Item": {
+                "allOf": [{"$ref": "#/components/schemas/Base"}],
+                "required": ["name"],
+                "properties": {
+                    "name": {"type": "string", "maxLength": 10},
+                    "class": {"type": "string", "default": "basic"},
+                    "status": {"$ref": "#/components/schemas/Status"},
+                    "price": {"type": ["number", "null"]},
+                    "tags": {"type": "array", "items": {"type": "array", "items": {"type": "string"}}},
+                    "dimensions": {"type": "object", "properties": {"width": {"type": "number"}}},
+                    "related": {"type": "array", "items": {"$ref": "#/components/schemas/Item"}},
+                },
+            },
+            "Cat": {"type": "object", "required": ["kind"], "properties": {"kind": {"type": "string"}, "lives": {"type": "integer"}}},
+            "Dog": {"type": "object", "required": ["kind"], "properties": {"kind": {"type": "string"}}},
+            "Pet": {
+                "oneOf": [{"$ref": "#/components/schemas/Cat"}, {"$ref": "#/components/schemas/Dog"}],
+                "discriminator": {"propertyName": "kind", "mapping": {"cat": "Cat", "dog": "Dog"}},
+            },
+        }
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def module():
+    return load_module(document)
+
+
+def test_decodes_into_slotted_classes(module):
+    item = module.decode_Item({
+        "id": 1, "name": "box", "status": "new", "price": None, "tags": [["a"], []],
+        "dimensions": {"width": 2.5}, "related": [{"id": 2, "name": "lid"}],
+    })
+    assert isinstance(item, module.Item)
+    assert not hasattr(item, "__dict__")
+    assert (item.id, item.name, item.class_, item.price) == (1, "box", "basic", None)
+    assert item.dimensions.width == 2.5
+    assert item.related == [module.Item(id=2, name="lid")]
+    assert module.encode_Item(item) == {
+        "id": 1, "name": "box", "class": "basic", "status": "new", "tags": [["a"], []],
+        "dimensions": {"width": 2.5}, "related": [{"id": 2, "name": "lid", "class": "basic"}],
+    }
+
+
+@pytest.mark.parametrize("payload, pointer", [
+    ([], ""),
+    ({"name": "box"}, "/id"),
+    ({"id": 0, "name": "box"}, "/id"),
+    ({"id": 1, "name": "x" * 11}, "/name"),
+    ({"id": 1, "name": "box", "status": "lost"}, "/status"),
+    ({"id": 1, "name": "box", "tags": [["a", 3]]}, "/tags/0/1"),
+    ({"id": 1, "name": "box", "related": [{"id": 2, "name": "lid", "price": "free"}]}, "/related/0/price"),
+])
+def test_decode_errors_point_into_payload(module, payload, pointer):
+    with pytest.raises(DecodeError) as raised:
+        module.decode_Item(payload)
+    assert raised.value.pointer == pointer
+
+
+def test_discriminated_union(module):
+    assert isinstance(module.decode_Pet({"kind": "cat", "lives": 9}), module.Cat)
+    assert isinstance(module.decode_Pet({"kind": "Dog"}), module.Dog)
+    with pytest.raises(DecodeError) as raised:
+        module.decode_Pet({"kind": "fish"})
+    assert raised.value.pointer == "/kind"
+    assert module.encode_Pet(module.Cat(kind="cat", lives=9)) == {"kind": "cat", "lives": 9}
+
+
+def test_write_module_regenerates_only_on_change(tmp_path):
+    path = str(tmp_path / "shop_models.py")
+    assert write_module(document, path)
+    assert not write_module(document, path)
+    changed = {**document, "info": {"title": "Shop", "version": "2.0.0"}}
+    assert write_module(changed, path)
+    module = load_module(changed, path)
+    assert module.FINGERPRINT in generate_module(changed)
+    assert module.decode_Status("sold") == "sold"
+
+
+def test_spec_text_cannot_inject_code(tmp_path, capsys):
+    hostile = {
+        **document,
+        "info": {"title": "Shop\nprint('INJECTED')\n#\"\"\"", "version": "1"},
+        "components": {"schemas": {"Price": {"type": "number", "minimum": 0, "maximum": float("inf")}}},
+    }
+    module = load_module(hostile)
+    assert capsys.readouterr().out == ""
+    assert "INJECTED" in module.__doc__
+    assert module.decode_Price(1e308) == 1e308
+    json_module = load_module(hostile, str(tmp_path / "json.py"))
+    # Named after the fingerprint, so the file does not replace the standard json module
+    assert sys.modules["json"] is json and json_module.__name__.startswith("openapi_parser_generated_")
+
+
+def test_reserved_and_helper_names_are_renamed():
+    clashing = {
+        **document,
+        "components": {"schemas": {
+            "_new": {"type": "object", "properties": {"self": {"type": "string"}, "__init__": {"type": "integer"}, "_MISSING": {}}},
+            "_ENUM_0": {"enum": ["a", 1]},
+            "Loose": {"type": "object", "properties": {"mode": {"enum": ["on", 0]}}},
+        }},
+    }
+    module = load_module(clashing)
+    obj = module.decode__new2({"self": "me", "__init__": 3})
+    assert (obj.self_, obj.init__, obj._MISSING) == ("me", 3, None)
+    assert module.encode__new2(obj) == {"self": "me", "__init__": 3}
+    assert module.decode__ENUM_0(1) == 1
+    # Untyped enums reject objects and arrays instead of failing on an unhashable lookup
+    for payload in ({}, []):
+        with pytest.raises(DecodeError) as raised:
+            module.decode_Loose({"mode": payload})
+        assert raised.value.pointer == "/mode"
+        with pytest.raises(DecodeError):
+            module.decode__ENUM_0(payload)
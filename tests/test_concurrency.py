@@ -0,0 +1,64 @@
+import copy
+import glob
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from openapi_parser.exceptions import ParsingError
+from openapi_parser.parser import load_openapi_from_file, load_openapi_from_yaml, parse_openapi
+from openapi_parser.utils import resolve_references
+
+SPECS = sorted(glob.glob("openapi_specs/*.yml"))
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Pets", "version": "1.0.0"},
+    "paths": {
+        "/pets": {
+            "get": {
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}}}
+            }
+        }
+    },
+    "components": {"schemas": {"Pet": {"type": "object", "properties": {"name": {"type": "string"}}}}},
+}
+
+
+def test_resolve_references_leaves_input_untouched():
+    original = copy.deepcopy(document)
+    resolved = resolve_references(document)
+    assert document == original
+    media = resolved["paths"]["/pets"]["get"]["responses"]["200"]["content"]["application/json"]
+    assert media["schema"] is document["components"]["schemas"]["Pet"]
+    # Subtrees without references are shared rather than copied
+    assert resolved["components"] is document["components"]
+
+
+@pytest.mark.skipif(not SPECS, reason="no bundled specs")
+def test_concurrent_loading_matches_serial_loading():
+    expected = {path: load_openapi_from_file(path).model_dump() for path in SPECS}
+    jobs = SPECS * 20
+
+    def load(path):
+        return path, load_openapi_from_file(path).model_dump()
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for path, result in executor.map(load, jobs):
+            assert result == expected[path]
+
+
+def test_concurrent_parse_and_resolve_share_no_state():
+    original = copy.deepcopy(document)
+    invalid = "openapi: 3.1.0\ninfo:\n  title: Broken\npaths: {}\n"
+
+    def work(index):
+        if index % 3 == 0:
+            with pytest.raises(ParsingError) as excinfo:
+                load_openapi_from_yaml(invalid, collect_errors=True, track_locations=True)
+            return [issue.pointer for issue in excinfo.value.errors]
+        resolved = resolve_references(document)
+        parse_openapi(resolved)
+        return resolved["paths"]["/pets"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["type"]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(work, range(600)))
+    assert results == [["/info/version"] if index % 3 == 0 else "object" for index in range(600)]
+    assert document == original
@@ -0,0 +1,99 @@
+import copy
+import yaml
+import pytest
+from openapi_parser.diff import diff_specs
+
+with open("openapi_specs/Character-Service.yml", "r", encoding="utf-8") as f:
+    base_spec = yaml.safe_load(f)
+
+
+def codes(report):
+    return {(change.code, change.breaking) for change in report.changes}
+
+
+def test_identical_specs_have_no_changes():
+    report = diff_specs(base_spec, copy.deepcopy(base_spec))
+    assert report.changes == []
+    assert not report.has_breaking_changes
+
+
+def test_removed_and_added_operations():
+    new_spec = copy.deepcopy(base_spec)
+    del new_spec["paths"]["/characters"]["post"]
+    new_spec["paths"]["/health"] = {"get": {"responses": {"200": {"description": "OK"}}}}
+    report = diff_specs(base_spec, new_spec)
+    assert ("operation-removed", True) in codes(report)
+    assert ("operation-added", False) in codes(report)
+    removed = [c for c in report.changes if c.code == "operation-removed"][0]
+    assert removed.pointer == "/paths/~1characters/post"
+
+
+def test_new_required_parameter_is_breaking():
+    new_spec = copy.deepcopy(base_spec)
+    new_spec["paths"]["/characters"]["get"]["parameters"] = [
+        {"name": "page", "in": "query", "required": True, "schema": {"type": "integer"}}
+    ]
+    report = diff_specs(base_spec, new_spec)
+    assert codes(report) == {("required-parameter-added", True)}
+
+
+def test_narrowed_enum_and_response_type_change():
+    old = {
+        "openapi": "3.1.0",
+        "info": {"title": "T", "version": "1"},
+        "paths": {
+            "/items": {
+                "post": {
+                    "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}}},
+                    "responses": {"200": {"description": "ok", "content": {"application/json": {"schema": {"type": "object"}}}}},
+                }
+            }
+        },
+        "components": {"schemas": {"Item": {"type": "object", "properties": {"kind": {"type": "string", "enum": ["a", "b"]}}}}},
+    }
+    new = copy.deepcopy(old)
+    new["components"]["schemas"]["Item"]["properties"]["kind"]["enum"] = ["a"]
+    new["paths"]["/items"]["post"]["responses"]["200"]["content"]["application/json"]["schema"] = {"type": "array"}
+    report = diff_specs(old, new)
+    by_code = {change.code: change for change in report.changes}
+    assert by_code["enum-narrowed"].breaking
+    assert by_code["enum-narrowed"].pointer == "/components/schemas/Item/properties/kind/enum"
+    assert by_code["enum-narrowed"].old == ["b"]
+    assert by_code["type-changed"].breaking
+    assert report.to_dict()["summary"] == {"breaking": 2, "non_breaking": 0}
+
+
+def test_response_property_added_is_not_breaking():
+    new_spec = copy.deepcopy(base_spec)
+    new_spec["components"]["schemas"]["Character"]["properties"]["nickname"] = {"type": "string"}
+    report = diff_specs(base_spec, new_spec)
+    assert report.changes
+    assert not report.has_breaking_changes
+
+
+def test_changes_propagate_through_unchanged_component_kinds():
+    old = {
+        "openapi": "3.1.0",
+        "info": {"title": "T", "version": "1"},
+        "paths": {"/foo": {"get": {"responses": {"200": {"$ref": "#/components/responses/Ok"}}}}},
+        "components": {
+            "responses": {"Ok": {"description": "ok", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Foo"}}}}},
+            "schemas": {"Foo": {"type": "object"}},
+        },
+    }
+    new = copy.deepcopy(old)
+    new["components"]["schemas"]["Foo"] = {"type": "array"}
+    report = diff_specs(old, new)
+    assert report.has_breaking_changes
+    assert report.changes[0].pointer.startswith("/components/schemas/Foo")
+
+
+def test_removed_required_parameter_is_breaking():
+    old = copy.deepcopy(base_spec)
+    old["paths"]["/characters"]["get"]["parameters"] = [
+        {"name": "page", "in": "query", "required": True, "schema": {"type": "integer"}},
+        {"name": "verbose", "in": "query", "schema": {"type": "boolean"}},
+    ]
+    new = copy.deepcopy(old)
+    new["paths"]["/characters"]["get"]["parameters"] = []
+    assert codes(diff_specs(old, new)) == {("parameter-removed", True), ("parameter-removed", False)}
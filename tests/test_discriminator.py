@@ -0,0 +1,67 @@
+from openapi_parser.discriminator import DiscriminatorIndex, build_dispatch_table
+from openapi_parser.validator import SchemaValidator
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Pets", "version": "1.0.0"},
+    "paths": {},
+    "components": {
+        "schemas": {
+            "Pet": {
+                "oneOf": [
+                    {"$ref": "#/components/schemas/Cat"},
+                    {"$ref": "#/components/schemas/Dog"},
+                    {"$ref": "#/components/schemas/Lizard"},
+                ],
+                "discriminator": {"propertyName": "petType", "mapping": {"dog": "#/components/schemas/Dog", "lizard": "Lizard"}},
+            },
+            "Cat": {"type": "object", "required": ["petType", "lives"], "properties": {"petType": {"enum": ["Cat"]}, "lives": {"type": "integer"}}},
+            "Dog": {"type": "object", "required": ["petType", "bark"], "properties": {"petType": {"enum": ["Dog", "dog"]}, "bark": {"type": "boolean"}}},
+            "Lizard": {"type": "object", "required": ["petType"], "properties": {"petType": {"enum": ["Lizard", "lizard"]}, "lovesRocks": {"type": "boolean"}}},
+            "Shape": {"anyOf": [{"type": "object", "required": ["radius"]}, {"type": "object", "required": ["side"]}]},
+        }
+    },
+}
+schemas = document["components"]["schemas"]
+
+
+def test_dispatch_table_combines_explicit_and_implicit_mappings():
+    table = build_dispatch_table(document, schemas["Pet"])
+    assert table.property_name == "petType"
+    assert table.mapping == {"Cat": schemas["Cat"], "Dog": schemas["Dog"], "Lizard": schemas["Lizard"], "dog": schemas["Dog"], "lizard": schemas["Lizard"]}
+    assert table.select({"petType": "dog"}) is schemas["Dog"]
+    assert table.select({"petType": "Hamster"}) is None
+    assert table.select({"petType": 3}) is None
+    assert build_dispatch_table(document, schemas["Shape"]) is None
+
+
+def test_index_precomputes_every_discriminated_schema():
+    index = DiscriminatorIndex(document)
+    assert len(index) == 1
+    assert index.table(schemas["Pet"]) is index.table(schemas["Pet"])
+    assert index.table(schemas["Cat"]) is None
+
+
+def test_validator_dispatches_on_discriminator():
+    validator = SchemaValidator(document)
+    pet = schemas["Pet"]
+    assert validator.validate({"petType": "dog", "bark": True}, pet) == []
+    assert validator.validate({"petType": "Cat", "lives": 9}, pet) == []
+    # Only the selected branch is checked, so its own error is reported
+    [issue] = validator.validate({"petType": "dog", "lives": 9}, pet)
+    assert (issue.pointer, issue.code) == ("/bark", "missing-property")
+    [issue] = validator.validate({"petType": "Hamster"}, pet)
+    assert (issue.pointer, issue.code) == ("/petType", "unknown-discriminator")
+    [issue] = validator.validate({"lives": 9}, pet)
+    assert (issue.pointer, issue.code) == ("/petType", "missing-discriminator")
+
+
+def test_validator_falls_back_to_ordered_trial():
+    validator = SchemaValidator(document, use_discriminators=False)
+    pet = schemas["Pet"]
+    assert validator.is_valid({"petType": "dog", "bark": True}, pet)
+    assert validator.is_valid({"petType": "Cat", "lives": 9}, pet)
+    # Without dispatch the branch's own problem is lost behind the composition error
+    assert [issue.code for issue in validator.validate({"petType": "dog", "lives": 9}, pet)] == ["no-branch-matched"]
+    assert validator.is_valid({"side": 2}, schemas["Shape"])
+    assert [issue.code for issue in validator.validate({"width": 2}, schemas["Shape"])] == ["no-branch-matched"]
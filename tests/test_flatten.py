@@ -0,0 +1,101 @@
+import copy
+from openapi_parser.flatten import SchemaFlattener, flatten_schemas
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Flatten", "version": "1.0.0"},
+    "paths": {},
+    "components": {
+        "schemas": {
+            "Base": {
+                "type": "object",
+                "description": "Base",
+                "required": ["id"],
+                "properties": {"id": {"type": "integer", "minimum": 0}, "name": {"type": "string", "maxLength": 100}},
+            },
+            "Named": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Base"},
+                    {"required": ["name"], "properties": {"name": {"maxLength": 20, "pattern": "^[a-z]+$"}}},
+                ],
+                "description": "Named",
+            },
+            "Leaf": {
+                "allOf": [{"$ref": "#/components/schemas/Named"}],
+                "properties": {"tags": {"type": "array", "items": {"allOf": [{"type": "string"}, {"minLength": 1}]}}},
+            },
+        }
+    },
+}
+
+
+def test_allof_chain_is_merged():
+    flattener = SchemaFlattener(document)
+    leaf = flattener.effective("Leaf")
+    assert leaf["type"] == "object"
+    assert leaf["description"] == "Named"
+    assert leaf["required"] == ["id", "name"]
+    assert leaf["properties"]["name"] == {"type": "string", "maxLength": 20, "pattern": "^[a-z]+$"}
+    assert leaf["properties"]["id"] == {"type": "integer", "minimum": 0}
+    assert leaf["properties"]["tags"]["items"] == {"type": "string", "minLength": 1}
+    assert "allOf" not in leaf
+    assert flattener.issues == []
+
+
+def test_effective_schemas_are_memoized_and_inputs_untouched():
+    original = copy.deepcopy(document)
+    flattener = SchemaFlattener(document)
+    named = flattener.effective("Named")
+    assert flattener.effective("Named") is named
+    flattener.effective("Leaf")
+    assert flattener.effective("Named") == named
+    assert document == original
+
+
+def test_constraint_intersection_and_residuals():
+    spec = {"components": {"schemas": {"S": {"allOf": [
+        {"type": ["number", "null"], "maximum": 10, "multipleOf": 4, "enum": [1, 2, 4, 8], "pattern": "a"},
+        {"type": "integer", "maximum": 5, "minimum": 2, "multipleOf": 6, "enum": [2, 4, 16], "pattern": "b"},
+    ]}}}}
+    schemas, issues = flatten_schemas(spec)
+    assert schemas["S"] == {
+        "type": "integer", "maximum": 5, "minimum": 2, "multipleOf": 12, "enum": [2, 4], "pattern": "a",
+        "allOf": [{"pattern": "b"}],
+    }
+    assert issues == []
+
+
+def test_conflicts_are_reported():
+    spec = {"components": {"schemas": {
+        "Bounds": {"allOf": [{"minimum": 10}, {"maximum": 5}]},
+        "Types": {"allOf": [{"type": "string"}, {"type": "object"}]},
+        "Enums": {"properties": {"kind": {"allOf": [{"enum": ["a"]}, {"enum": ["b"]}]}}},
+        "Loop": {"allOf": [{"$ref": "#/components/schemas/Loop"}]},
+    }}}
+    _, issues = flatten_schemas(spec)
+    assert {(issue.pointer, issue.code) for issue in issues} == {
+        ("/components/schemas/Bounds/allOf", "allof-conflict"),
+        ("/components/schemas/Types/allOf", "allof-conflict"),
+        ("/components/schemas/Enums/properties/kind/allOf", "allof-conflict"),
+        ("/components/schemas/Loop/allOf/0", "allof-cycle"),
+    }
+    assert "'minimum/maximum'" in next(issue.message for issue in issues if "Bounds" in issue.pointer)
+
+
+def test_closed_members_with_other_properties_are_kept():
+    closed = {"type": "object", "properties": {"a": {"type": "string"}}, "additionalProperties": False}
+    spec = {"components": {"schemas": {
+        "Open": {"allOf": [closed, {"properties": {"b": {"type": "integer"}}}]},
+        "Same": {"allOf": [closed, {"required": ["a"], "properties": {"a": {"maxLength": 3}}}]},
+        "Tuple": {"allOf": [{"prefixItems": [{"type": "string"}], "items": False}, {"items": {"type": "integer"}}]},
+    }}}
+    schemas, issues = flatten_schemas(spec)
+    # Merging would let `b` through; the closed member still rejects it
+    assert schemas["Open"] == {"properties": {"b": {"type": "integer"}}, "allOf": [closed]}
+    assert schemas["Same"] == {
+        "type": "object", "properties": {"a": {"type": "string", "maxLength": 3}},
+        "additionalProperties": False, "required": ["a"],
+    }
+    # `items` starts after different prefixes in each member
+    assert schemas["Tuple"] == spec["components"]["schemas"]["Tuple"]
+    assert issues == []
@@ -0,0 +1,112 @@
+import io
+import json
+import re
+from openapi_parser.generator import PayloadGenerator, write_payloads
+from openapi_parser.validator import SchemaValidator
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Orders", "version": "1.0.0"},
+    "paths": {
+        "/orders": {
+            "post": {
+                "operationId": "createOrder",
+                "requestBody": {"$ref": "#/components/requestBodies/Order"},
+                "responses": {"201": {"description": "Created"}},
+            },
+            "get": {"operationId": "listOrders", "responses": {"200": {"description": "OK"}}},
+        },
+        "/pets": {
+            "put": {
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}},
+                "responses": {"204": {"description": "Updated"}},
+            }
+        },
+    },
+    "components": {
+        "requestBodies": {"Order": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Order"}}}}},
+        "schemas": {
+            "Order": {
+                "allOf": [{"$ref": "#/components/schemas/Base"}],
+                "type": "object",
+                "required": ["id", "items", "status", "email", "placed", "sku"],
+                "properties": {
+                    "id": {"type": "string", "format": "uuid"},
+                    "email": {"type": "string", "format": "email"},
+                    "placed": {"type": "string", "format": "date-time"},
+                    "sku": {"type": "string", "pattern": "^[A-Z]{3}-\\d{4}$"},
+                    "status": {"enum": ["open", "paid", "shipped"]},
+                    "note": {"type": ["string", "null"], "maxLength": 5},
+                    "city": {"type": "string", "example": "Berlin"},
+                    "items": {"type": "array", "minItems": 1, "maxItems": 20, "uniqueItems": True, "items": {"$ref": "#/components/schemas/Item"}},
+                    "parent": {"$ref": "#/components/schemas/Order"},
+                },
+            },
+            "Base": {"type": "object", "required": ["version"], "properties": {"version": {"type": "integer", "minimum": 1, "exclusiveMaximum": 5}}},
+            "Item": {
+                "type": "object",
+                "required": ["quantity", "price"],
+                "properties": {
+                    "quantity": {"type": "integer", "minimum": 1, "maximum": 100, "multipleOf": 5},
+                    "price": {"type": "number", "exclusiveMinimum": 0, "maximum": 10},
+                    "name": {"type": "string", "minLength": 3, "maxLength": 8},
+                },
+            },
+            "Pet": {
+                "oneOf": [{"$ref": "#/components/schemas/Cat"}, {"$ref": "#/components/schemas/Dog"}],
+                "discriminator": {"propertyName": "petType", "mapping": {"cat": "Cat", "dog": "Dog"}},
+            },
+            "Cat": {"type": "object", "required": ["petType", "lives"], "properties": {"petType": {"type": "string"}, "lives": {"type": "integer"}}},
+            "Dog": {"type": "object", "required": ["petType"], "properties": {"petType": {"type": "string"}, "bark": {"type": "boolean"}}},
+        },
+    },
+}
+schemas = document["components"]["schemas"]
+
+
+def test_operations_lists_json_request_bodies():
+    assert PayloadGenerator(document).operations() == [("post", "/orders", "createOrder"), ("put", "/pets", None)]
+
+
+def test_payloads_conform_to_request_body_schema():
+    validator = SchemaValidator(document)
+    payloads = list(PayloadGenerator(document, seed=7).payloads("createOrder", 200))
+    assert len(payloads) == 200
+    for payload in payloads:
+        assert validator.validate(payload, schemas["Order"]) == []
+        assert re.fullmatch(r"[A-Z]{3}-\d{4}", payload["sku"])
+        assert payload.get("city", "Berlin") == "Berlin"
+    # Optional and recursive properties are generated, but recursion stops
+    assert any("parent" in payload for payload in payloads)
+
+
+def test_discriminated_payloads_carry_mapped_values():
+    validator = SchemaValidator(document)
+    payloads = list(PayloadGenerator(document, seed=1).payloads(("PUT", "/pets"), 50))
+    assert {payload["petType"] for payload in payloads} == {"Cat", "Dog", "cat", "dog"}
+    assert all(validator.validate(payload, schemas["Pet"]) == [] for payload in payloads)
+
+
+def test_generation_is_deterministic_per_seed():
+    first = list(PayloadGenerator(document, seed=3).payloads("createOrder", 20))
+    assert first == list(PayloadGenerator(document, seed=3).payloads("createOrder", 20))
+    assert first != list(PayloadGenerator(document, seed=4).payloads("createOrder", 20))
+
+
+def test_write_payloads_streams_json_lines():
+    stream = io.StringIO()
+    generator = PayloadGenerator(document, seed=5)
+    assert write_payloads(generator, "createOrder", 25, stream, batch_size=10) == 25
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == list(PayloadGenerator(document, seed=5).payloads("createOrder", 25))
+
+
+def test_unknown_operation_raises_key_error():
+    generator = PayloadGenerator(document)
+    for operation in ("missing", "listOrders"):
+        try:
+            generator.factory(operation)
+        except KeyError:
+            pass
+        else:
+            raise AssertionError(operation)
@@ -0,0 +1,95 @@
+import json
+import pytest
+import yaml
+from openapi_parser.exceptions import ParsingError, ResourceLimitError
+from openapi_parser.limits import DEFAULT_LIMITS, ResourceLimits, load_yaml
+from openapi_parser.parser import load_openapi_from_file, load_openapi_from_json, load_openapi_from_yaml
+
+HEADER = 'openapi: "3.1.0"\ninfo:\n  title: Limits\n  version: "1.0.0"\npaths: {}\n'
+
+BILLION_LAUGHS = HEADER + "x-laughs:\n  a: &a [lol, lol, lol, lol, lol, lol, lol, lol, lol, lol]\n" + "".join(
+    f"  {chr(98 + i)}: &{chr(98 + i)} [{', '.join(['*' + chr(97 + i)] * 10)}]\n" for i in range(8)
+)
+
+
+def test_alias_expansion_is_rejected_before_loading():
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_yaml(BILLION_LAUGHS)
+    assert error.value.limit == "max_nodes"
+    # Rejected on the line of the alias that crossed the limit, not after building the document
+    assert error.value.location[0] < BILLION_LAUGHS.count("\n")
+    assert isinstance(error.value, ParsingError)
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_yaml(BILLION_LAUGHS, limits=ResourceLimits(max_nodes=None, max_aliases=20))
+    assert error.value.limit == "max_aliases"
+
+
+def test_deep_nesting_is_rejected_from_events():
+    deep = HEADER + "x-deep: " + "[" * 100_000 + "]" * 100_000 + "\n"
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_yaml(deep)
+    assert error.value.limit == "max_depth"
+    deep_json = '{"openapi": "3.1.0", "info": {"title": "t", "version": "1"}, "paths": {}, "x": ' + "[" * 300 + "]" * 300 + "}"
+    with pytest.raises(ResourceLimitError):
+        load_openapi_from_json(deep_json)
+    assert load_openapi_from_json(deep_json, limits=ResourceLimits(max_depth=None)).info.title == "t"
+
+
+def test_size_limits(tmp_path):
+    limits = ResourceLimits(max_bytes=50)
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_yaml(HEADER, limits=limits)
+    assert error.value.limit == "max_bytes"
+    spec = tmp_path / "spec.yaml"
+    spec.write_text(HEADER)
+    with pytest.raises(ResourceLimitError):
+        load_openapi_from_file(str(spec), limits=limits)
+    for threshold in (0, 1 << 20):
+        assert load_openapi_from_file(str(spec), mmap_threshold=threshold).info.title == "Limits"
+
+
+def test_reference_chains():
+    def document(schemas):
+        return json.dumps({"openapi": "3.1.0", "info": {"title": "t", "version": "1"}, "paths": {}, "components": {"schemas": schemas}})
+
+    chain = {f"S{i}": {"$ref": f"#/components/schemas/S{i + 1}"} for i in range(10)}
+    chain["S10"] = {"type": "string"}
+    assert load_openapi_from_json(document(chain), limits=ResourceLimits(max_ref_depth=10))
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_json(document(chain), limits=ResourceLimits(max_ref_depth=9))
+    assert error.value.limit == "max_ref_depth"
+    circular = {"A": {"$ref": "#/components/schemas/B"}, "B": {"$ref": "#/components/schemas/A"}}
+    with pytest.raises(ResourceLimitError, match="circular"):
+        load_openapi_from_json(document(circular))
+
+
+def test_ordinary_documents_and_anchors_still_load():
+    shared = HEADER + "x-common: &common {a: 1}\nx-copy: *common\n"
+    assert load_openapi_from_yaml(shared).info.title == "Limits"
+    assert load_openapi_from_yaml(shared, track_locations=True).info.title == "Limits"
+    with pytest.raises(ResourceLimitError):
+        load_openapi_from_yaml(HEADER + "x: &x [a, *x]\n")
+
+
+def test_text_size_is_measured_in_bytes():
+    content = HEADER + "x-note: " + "é" * 40 + "\n"
+    limits = ResourceLimits(max_bytes=len(content) + 10)
+    with pytest.raises(ResourceLimitError) as error:
+        load_openapi_from_yaml(content, limits=limits)
+    assert error.value.limit == "max_bytes"
+    assert load_openapi_from_yaml(content.encode("utf-8"), limits=ResourceLimits(max_bytes=len(content) + 40))
+
+
+def test_limited_loading_matches_safe_loader():
+    content = HEADER + (
+        "x-types: {int: 1, float: 2.5, bool: true, none: ~, date: 2001-12-14, text: !!str 12}\n"
+        "x-shared: &shared {a: [1, 2]}\nx-copy: *shared\n"
+    )
+    assert load_yaml(content, DEFAULT_LIMITS, yaml.SafeLoader) == yaml.safe_load(content)
+    # Merge keys and tagged collections fall back to the regular loader, still within limits
+    merged = content + "x-merged:\n  <<: *shared\n  b: 3\nx-set: !!set {a, b}\n"
+    assert load_yaml(merged, DEFAULT_LIMITS, yaml.SafeLoader) == yaml.safe_load(merged)
+    with pytest.raises(ResourceLimitError):
+        load_yaml(BILLION_LAUGHS + "x-merged:\n  <<: *a\n", DEFAULT_LIMITS, yaml.SafeLoader)
+    with pytest.raises(yaml.YAMLError, match="single document"):
+        load_yaml(HEADER + "---\n" + HEADER, DEFAULT_LIMITS, yaml.SafeLoader)
@@ -0,0 +1,115 @@
+import json
+import pytest
+import yaml
+from openapi_parser.exceptions import ParsingError, ReferenceResolutionError
+from openapi_parser.locations import (
+    LazySourceMap, SourceMap, load_json_with_locations, load_yaml_with_locations, scan_yaml_locations,
+)
+from openapi_parser.parser import load_openapi_from_file, load_openapi_from_json, load_openapi_from_yaml
+from openapi_parser.utils import resolve_references
+
+yaml_content = """openapi: "3.1.0"
+info:
+  title: Test API
+paths:
+  /items:
+    get:
+      responses:
+        "200":
+          description: OK
+          content:
+            application/json:
+              schema:
+                $ref: "#/components/schemas/Missing"
+components:
+  securitySchemes:
+    apiKeyAuth:
+      type: not-a-type
+"""
+
+
+def test_source_map_packs_and_locates():
+    source_map = SourceMap()
+    source_map.add("", 1, 1)
+    source_map.add("/info", 2, 3)
+    assert source_map.get("/info") == (2, 3)
+    assert source_map.get("/info/version") is None
+    assert source_map.locate("/info/version") == (2, 3)
+    assert source_map.locate("/nowhere/deep") == (1, 1)
+
+
+def test_yaml_locations_match_safe_load():
+    content, source_map = load_yaml_with_locations(yaml_content)
+    assert content == yaml.safe_load(yaml_content)
+    assert source_map.get("") == (1, 1)
+    assert source_map.get("/info") == (3, 3)
+    assert source_map.get("/paths/~1items/get") == (7, 7)
+    # Scalars are not recorded
+    assert "/info/title" not in source_map
+
+
+def test_json_locations_match_json_loads():
+    text = json.dumps(yaml.safe_load(yaml_content), indent=2)
+    content, source_map = load_json_with_locations(text)
+    assert content == json.loads(text)
+    lines = text.splitlines()
+    line, column = source_map.get("/paths/~1items/get/responses")
+    assert lines[line - 1][column - 1] == "{"
+    assert lines[line - 1].strip().startswith('"responses"')
+
+
+def test_json_reader_rejects_invalid_input():
+    with pytest.raises(json.JSONDecodeError):
+        load_json_with_locations('{"a": [1, 2,]}')
+    with pytest.raises(json.JSONDecodeError):
+        load_json_with_locations('{"a": 1} x')
+
+
+def test_parsing_errors_carry_locations():
+    with pytest.raises(ParsingError) as exc_info:
+        load_openapi_from_yaml(yaml_content, track_locations=True, collect_errors=True)
+    issues = {issue.pointer: issue.location for issue in exc_info.value.errors}
+    assert issues["/info/version"] == (3, 3)
+    assert issues["/components/securitySchemes/apiKeyAuth/type"] == (17, 7)
+    assert exc_info.value.location == exc_info.value.errors[0].location
+
+    with pytest.raises(ParsingError, match=r"\(line 3, column 3\)"):
+        load_openapi_from_yaml(yaml_content, track_locations=True)
+
+
+def test_syntax_errors_carry_locations():
+    with pytest.raises(ParsingError) as exc_info:
+        load_openapi_from_yaml("openapi: [3.1.0\ninfo: {}\n")
+    assert exc_info.value.location is not None
+    with pytest.raises(ParsingError) as exc_info:
+        load_openapi_from_json('{\n  "openapi": }')
+    assert exc_info.value.location == (2, 14)
+
+
+def test_reference_errors_carry_locations():
+    content, source_map = load_yaml_with_locations(yaml_content)
+    with pytest.raises(ReferenceResolutionError) as exc_info:
+        resolve_references(content, source_map=source_map)
+    assert exc_info.value.pointer == "/paths/~1items/get/responses/200/content/application~1json/schema"
+    assert exc_info.value.location == (13, 17)
+    assert str(exc_info.value).endswith("(line 13, column 17)")
+
+
+def test_locations_are_computed_only_for_errors(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(LazySourceMap, "resolve", lambda self, original=LazySourceMap.resolve: calls.append(1) or original(self))
+    valid = 'openapi: "3.1.0"\ninfo:\n  title: Test API\n  version: "1"\npaths: {}\n'
+    load_openapi_from_yaml(valid, track_locations=True)
+    assert calls == []
+    # Mapped files are rewound before they are re-read for positions
+    spec = tmp_path / "spec.yaml"
+    spec.write_text(yaml_content)
+    with pytest.raises(ParsingError) as exc_info:
+        load_openapi_from_file(str(spec), mmap_threshold=0, track_locations=True, collect_errors=True)
+    assert {issue.pointer: issue.location for issue in exc_info.value.errors}["/info/version"] == (3, 3)
+    assert calls
+
+
+def test_scanned_yaml_locations_match_loader():
+    _, source_map = load_yaml_with_locations(yaml_content)
+    assert dict(scan_yaml_locations(yaml_content).items()) == dict(source_map.items())
@@ -0,0 +1,56 @@
+import sys
+from openapi_parser.memory import SizeWalker, deep_size, measure, measure_specs
+from openapi_parser.parser import parse_openapi
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Memory", "version": "1.0.0"},
+    "paths": {
+        "/characters": {
+            "parameters": [{"name": "limit", "in": "query", "schema": {"type": "integer"}}],
+            "get": {"responses": {"200": {"description": "A list of characters " * 20}}},
+            "post": {"responses": {"201": {"description": "Created"}}},
+        }
+    },
+    "components": {
+        "schemas": {
+            "Character": {"type": "object", "properties": {f"field{i}": {"type": "string"} for i in range(50)}},
+            "Name": {"type": "string"},
+        }
+    },
+}
+
+
+def test_shared_objects_are_counted_once():
+    shared = ["x" * 1000]
+    single = deep_size({"a": shared})
+    assert deep_size({"a": shared, "b": shared}) == single + sys.getsizeof({"a": 0, "b": 0}) - sys.getsizeof({"a": 0}) + sys.getsizeof("b")
+    walker = SizeWalker()
+    first = walker.size(shared)
+    assert first >= 1000 and walker.size({"again": shared}) < first
+
+
+def test_breakdown_of_raw_document():
+    report = measure(document)
+    assert set(report.components) == {"/components/schemas/Character", "/components/schemas/Name"}
+    assert report.components["/components/schemas/Character"] > report.components["/components/schemas/Name"]
+    assert set(report.operations) == {"GET /characters", "POST /characters"}
+    assert report.operations["GET /characters"] > report.operations["POST /characters"]
+    assert set(report.paths) == {"/paths/~1characters"}
+    assert report.total == deep_size(document)
+    assert report.top(1)[0][0] == "/components/schemas/Character"
+
+
+def test_raw_and_model_totals():
+    model = parse_openapi(document)
+    report = measure(document, model)
+    assert report.raw == deep_size(document) and report.model == deep_size(model)
+    # Strings are shared between the raw document and the models built from it
+    assert report.total < report.raw + report.model
+    assert measure(model).components.keys() == report.components.keys()
+    assert report.to_dict(count=2)["largest"][0]["pointer"] == "/components/schemas/Character"
+
+
+def test_specs_sharing_objects():
+    sizes = measure_specs({"first": document, "second": {**document, "info": {"title": "Second", "version": "1.0.0"}}})
+    assert sizes["second"] < sizes["first"] / 4
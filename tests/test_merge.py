@@ -0,0 +1,106 @@
+import copy
+import glob
+import yaml
+from openapi_parser.merge import merge_specs
+from openapi_parser.parser import parse_openapi
+from openapi_parser.references import ReferenceGraph
+
+
+def service(title, error, path, operation_id, scheme="apiKey"):
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": title, "version": "1.0.0"},
+        "servers": [{"url": f"https://{title.lower().replace(' ', '-')}.local"}],
+        "security": [{scheme: []}],
+        "tags": [{"name": "shared"}],
+        "paths": {
+            path: {
+                "get": {
+                    "operationId": operation_id,
+                    "tags": ["shared"],
+                    "responses": {
+                        "200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Envelope"}}}},
+                        "default": {"description": "Error", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Error"}}}},
+                    },
+                }
+            }
+        },
+        "components": {
+            "schemas": {
+                "Envelope": {"type": "object", "properties": {"error": {"$ref": "#/components/schemas/Error"}}},
+                "Error": error,
+            },
+            "securitySchemes": {scheme: {"type": "apiKey", "name": "key", "in": "header"}},
+        },
+    }
+
+
+ERROR = {"type": "object", "properties": {"message": {"type": "string"}}}
+OTHER_ERROR = {"type": "object", "properties": {"code": {"type": "integer"}}}
+
+
+def test_identical_components_are_deduplicated_and_different_ones_namespaced():
+    specs = {
+        "Characters": service("Characters", ERROR, "/characters", "list"),
+        "Scripts": service("Scripts", ERROR, "/scripts", "listScripts"),
+        "Actions Service": service("Actions", OTHER_ERROR, "/actions", "list"),
+    }
+    originals = copy.deepcopy(specs)
+    merged, report = merge_specs(specs, servers=[{"url": "https://gateway.local"}])
+    assert specs == originals
+    schemas = merged["components"]["schemas"]
+    assert list(schemas) == ["Envelope", "Error", "Actions_Service_Envelope", "Actions_Service_Error"]
+    # Envelope is only renamed because the Error it references is
+    assert schemas["Actions_Service_Envelope"]["properties"]["error"] == {"$ref": "#/components/schemas/Actions_Service_Error"}
+    actions = merged["paths"]["/actions"]
+    assert actions["servers"] == [{"url": "https://actions.local"}]
+    assert actions["get"]["responses"]["default"]["content"]["application/json"]["schema"]["$ref"] == "#/components/schemas/Actions_Service_Error"
+    assert actions["get"]["operationId"] == "Actions_Service_list"
+    assert report.deduplicated == [
+        "Scripts#/components/schemas/Envelope", "Scripts#/components/schemas/Error", "Scripts#/components/securitySchemes/apiKey",
+        "Actions Service#/components/securitySchemes/apiKey",
+    ]
+    assert [collision.code for collision in report.collisions] == ["operation-id-collision"]
+    assert merged["tags"] == [{"name": "shared"}] and merged["servers"] == [{"url": "https://gateway.local"}]
+    parse_openapi(merged)
+    assert ReferenceGraph(merged).dangling == []
+
+
+def test_path_collisions_and_renamed_security_schemes():
+    first = service("One", ERROR, "/items", "one")
+    second = service("Two", ERROR, "/items", "two", scheme="token")
+    second["components"]["securitySchemes"]["token"] = {"type": "http", "scheme": "bearer"}
+    third = service("Three", ERROR, "/things", "three", scheme="token")
+    merged, report = merge_specs([first, second, third])
+    [collision] = report.collisions
+    assert (collision.code, collision.pointer, collision.source) == ("path-collision", "/paths/~1items/get", "Two")
+    assert merged["paths"]["/items"]["get"]["operationId"] == "one"
+    assert list(merged["components"]["securitySchemes"]) == ["apiKey", "token", "Three_token"]
+    assert merged["paths"]["/things"]["get"]["security"] == [{"Three_token": []}]
+    assert report.renamed == {"Three#/components/securitySchemes/token": "/components/securitySchemes/Three_token"}
+
+
+def test_merged_version_is_the_highest_and_mixed_minor_versions_are_reported():
+    first = service("One", ERROR, "/one", "one")
+    second = service("Two", ERROR, "/two", "two")
+    first["openapi"], second["openapi"] = "3.0.3", "3.0.1"
+    merged, report = merge_specs([first, second])
+    assert merged["openapi"] == "3.0.3" and report.collisions == []
+    third = service("Three", ERROR, "/three", "three")
+    merged, report = merge_specs([first, third, second])
+    assert merged["openapi"] == "3.1.0"
+    assert [(collision.code, collision.pointer, collision.source) for collision in report.collisions] == [
+        ("openapi-version-mismatch", "/openapi", "Three"),
+        ("openapi-version-mismatch", "/openapi", "Two"),
+    ]
+
+
+def test_merging_the_bundled_corpus():
+    documents = {}
+    for path in sorted(glob.glob("openapi_specs/*.yml")):
+        with open(path) as f:
+            documents[path] = yaml.safe_load(f)
+    merged, report = merge_specs(documents)
+    parse_openapi(merged)
+    assert ReferenceGraph(merged).dangling == []
+    assert len(merged["paths"]) == sum(len(document["paths"]) for document in documents.values()) - len(report.collisions)
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+from openapi_parser.middleware import ResponseValidationMiddleware
+
+document = {
+    "openapi": "3.1.0",
+    "paths": {
+        "/characters/{characterId}": {
+            "get": {"responses": {"200": {"$ref": "#/components/responses/Character"}}},
+        },
+        "/characters/me": {
+            "get": {"responses": {"2XX": {"description": "OK", "content": {"text/plain": {}}}}},
+        },
+        "/health": {"get": {"responses": {"204": {"description": "No content"}}}},
+    },
+    "components": {
+        "responses": {
+            "Character": {
+                "description": "OK",
+                "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}},
+            }
+        },
+        "schemas": {
+            "Character": {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}},
+        },
+    },
+}
+
+
+async def service(scope, receive, send):
+    # Character 1 is valid; character 2 is missing its name; anything else is a 404
+    bodies = {"/characters/1": {"name": "Ada"}, "/characters/2": {"nickname": "Ada"}, "/characters/me": {"name": "Me"}}
+    body = bodies.get(scope["path"])
+    status = 200 if body is not None else 404
+    payload = json.dumps(body or {}).encode()
+    await send({"type": "http.response.start", "status": status, "headers": [(b"content-type", b"application/json; charset=utf-8")]})
+    await send({"type": "http.response.body", "body": payload[:5], "more_body": True})
+    await send({"type": "http.response.body", "body": payload[5:]})
+
+
+def call(app, path, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(app({"type": "http", "method": method, "path": path, "headers": []}, receive, send))
+    return messages
+
+
+def test_validates_sampled_responses_off_the_request_path():
+    mismatches = []
+    app = ResponseValidationMiddleware(service, document, sample_rate=1.0, on_mismatch=mismatches.append, seed=1)
+    messages = call(app, "/characters/1")
+    assert b"".join(message.get("body", b"") for message in messages[1:]) == b'{"name": "Ada"}'
+    call(app, "/characters/2")
+    call(app, "/characters/3")
+    call(app, "/unknown")
+    assert app.drain(timeout=5)
+    metrics = app.metrics()
+    assert (metrics["sampled"], metrics["validated"], metrics["valid"]) == (3, 3, 1)
+    assert sorted((entry["status"], entry["code"]) for entry in metrics["mismatches"]) == [
+        (200, "schema-mismatch"), (404, "undocumented-status"),
+    ]
+    assert mismatches[0]["issues"][0]["code"] == "missing-property"
+    assert 'route="/characters/{characterId}",status="200",code="schema-mismatch"} 1' in app.prometheus()
+    app.close(timeout=5)
+
+
+def test_route_rates_and_specific_templates():
+    app = ResponseValidationMiddleware(service, document, sample_rate=0.0, route_rates={"GET /characters/me": 1.0}, seed=1)
+    assert app.route("GET", "/characters/me").template == "/characters/me"
+    assert app.route("GET", "/characters/7").template == "/characters/{characterId}"
+    assert app.route("POST", "/characters/7") is None
+    call(app, "/characters/2")
+    call(app, "/characters/me")
+    assert app.drain(timeout=5)
+    assert app.metrics()["sampled"] == 1
+    # application/json is not among the documented media types of /characters/me
+    assert app.metrics()["mismatches"][0]["code"] == "undocumented-media-type"
+
+
+def test_cpu_budget_scales_sampling_down_and_back_up():
+    app = ResponseValidationMiddleware(service, document, sample_rate=1.0, cpu_budget=0.1, window=0.05)
+    app._window_cpu = 0.04
+    app._window_start = time.monotonic() - 0.1
+    app._should_sample(app.route("GET", "/characters/1"))
+    assert 0.2 < app.scale < 0.3
+    app._window_start = time.monotonic() - 0.1
+    app._should_sample(app.route("GET", "/characters/1"))
+    assert 0.4 < app.scale < 0.6
+
+
+def test_oversized_bodies_and_full_queue_are_not_validated():
+    app = ResponseValidationMiddleware(service, document, sample_rate=1.0, max_body=4)
+    call(app, "/characters/1")
+    assert app.metrics()["skipped"] == 1
+    app = ResponseValidationMiddleware(service, document, sample_rate=1.0, queue_size=1)
+    app._ensure_worker = lambda: None
+    call(app, "/characters/1")
+    call(app, "/characters/1")
+    assert app.metrics()["dropped"] == 1
@@ -0,0 +1,117 @@
+import pytest
+from openapi_parser.exceptions import DecodeError
+from openapi_parser.params import ParameterCodecs, compile_parameter, parse_query
+
+ARRAY = {"type": "array", "items": {"type": "integer"}}
+OBJECT = {"type": "object", "properties": {"R": {"type": "integer"}, "G": {"type": "integer"}}}
+
+
+def codec(location, schema, **extra):
+    return compile_parameter({"name": "id", "in": location, "schema": schema, **extra})
+
+
+@pytest.mark.parametrize("style, explode, schema, raw, value", [
+    ("simple", False, {"type": "integer"}, "5", 5),
+    ("simple", False, ARRAY, "3,4,5", [3, 4, 5]),
+    ("simple", False, OBJECT, "R,100,G,200", {"R": 100, "G": 200}),
+    ("simple", True, OBJECT, "R=100,G=200", {"R": 100, "G": 200}),
+    ("label", False, {"type": "string"}, ".a%20b", "a b"),
+    ("label", False, ARRAY, ".3,4,5", [3, 4, 5]),
+    ("label", True, ARRAY, ".3.4.5", [3, 4, 5]),
+    ("label", True, OBJECT, ".R=100.G=200", {"R": 100, "G": 200}),
+    ("matrix", False, {"type": "boolean"}, ";id=true", True),
+    ("matrix", False, ARRAY, ";id=3,4,5", [3, 4, 5]),
+    ("matrix", True, ARRAY, ";id=3;id=4;id=5", [3, 4, 5]),
+    ("matrix", False, OBJECT, ";id=R,100,G,200", {"R": 100, "G": 200}),
+    ("matrix", True, OBJECT, ";R=100;G=200", {"R": 100, "G": 200}),
+])
+def test_path_styles_round_trip(style, explode, schema, raw, value):
+    compiled = codec("path", schema, style=style, explode=explode)
+    assert compiled.decode(raw) == value
+    assert compiled.decode(compiled.encode(value)) == value
+
+
+@pytest.mark.parametrize("style, explode, schema, query, value", [
+    ("form", True, {"type": "number"}, "id=2.5", 2.5),
+    ("form", True, ARRAY, "id=3&id=4&id=5", [3, 4, 5]),
+    ("form", False, ARRAY, "id=3,4,5", [3, 4, 5]),
+    ("form", True, OBJECT, "R=100&G=200", {"R": 100, "G": 200}),
+    ("form", False, OBJECT, "id=R,100,G,200", {"R": 100, "G": 200}),
+    ("spaceDelimited", False, ARRAY, "id=3%204%205", [3, 4, 5]),
+    ("pipeDelimited", False, ARRAY, "id=3|4|5", [3, 4, 5]),
+    ("deepObject", True, OBJECT, "id[R]=100&id[G]=200", {"R": 100, "G": 200}),
+])
+def test_query_styles_round_trip(style, explode, schema, query, value):
+    compiled = codec("query", schema, style=style, explode=explode)
+    assert compiled.decode(parse_query(query)) == value
+    assert compiled.decode(parse_query(compiled.encode(value))) == value
+
+
+def test_defaults_per_location_and_reserved_characters():
+    query = codec("query", {"type": "string"}, allowReserved=True)
+    assert (query.style, query.explode) == ("form", True)
+    assert query.encode("a/b?c") == "id=a/b?c"
+    assert codec("query", {"type": "string"}).encode("a/b c") == "id=a%2Fb%20c"
+    header = codec("header", ARRAY)
+    assert (header.style, header.explode) == ("simple", False)
+    with pytest.raises(ValueError):
+        codec("header", ARRAY, style="form")
+    with pytest.raises(ValueError):
+        codec("query", ARRAY, style="deepObject")
+
+
+document = {
+    "openapi": "3.1.0",
+    "paths": {
+        "/characters/{characterId}": {
+            "parameters": [
+                {"$ref": "#/components/parameters/CharacterId"},
+                {"name": "X-Trace", "in": "header", "schema": {"type": "string"}},
+            ],
+            "get": {
+                "parameters": [
+                    {"name": "limit", "in": "query", "schema": {"type": "integer", "default": 20}},
+                    {"name": "tags", "in": "query", "schema": {"type": "array", "items": {"type": "string"}}},
+                    {"name": "filter", "in": "query", "content": {"application/json": {"schema": {"type": "object"}}}},
+                    {"name": "session", "in": "cookie", "required": True, "schema": {"type": "string"}},
+                    {"name": "X-Trace", "in": "header", "required": True, "schema": {"type": "string"}},
+                ],
+                "responses": {"200": {"description": "OK"}},
+            },
+        }
+    },
+    "components": {
+        "parameters": {"CharacterId": {"name": "characterId", "in": "path", "required": True, "schema": {"$ref": "#/components/schemas/Id"}}},
+        "schemas": {"Id": {"type": "integer"}},
+    },
+}
+
+
+def test_operation_decodes_every_location():
+    codecs = ParameterCodecs(document)
+    operation = codecs.operation("/characters/{characterId}", "GET")
+    assert codecs.operation("/characters/{characterId}", "get") is operation
+    decoded = operation.decode(
+        {"characterId": "42"},
+        "tags=a&tags=b%20c&filter=%7B%22x%22%3A1%7D",
+        {"x-trace": "abc"},
+        "theme=dark; session=s1",
+    )
+    assert decoded == {
+        "path": {"characterId": 42},
+        "query": {"limit": 20, "tags": ["a", "b c"], "filter": {"x": 1}},
+        "header": {"X-Trace": "abc"},
+        "cookie": {"session": "s1"},
+    }
+
+
+def test_operation_errors_carry_the_parameter_pointer():
+    operation = ParameterCodecs(document).operation("/characters/{characterId}", "get")
+    with pytest.raises(DecodeError) as error:
+        operation.decode({"characterId": "x"}, "", {"X-Trace": "t"}, "session=s")
+    assert error.value.pointer == "/path/characterId"
+    with pytest.raises(DecodeError) as error:
+        operation.decode({"characterId": "1"}, "", {"X-Trace": "t"})
+    assert str(error.value) == "/cookie/session: Required parameter is missing."
+    with pytest.raises(KeyError):
+        ParameterCodecs(document).operation("/missing", "get")
@@ -68,3 +68,18 @@ def test_load_openapi_from_file(tmp_path):
     ''')
     with pytest.raises(ParsingError):
         load_openapi_from_file(str(invalid_file))
+
+@pytest.mark.parametrize("mmap_threshold", [0, 1, 1 << 20])
+def test_load_openapi_from_file_bytes_and_mmap(tmp_path, mmap_threshold):
+    yaml_file = tmp_path / "spec.yaml"
+    yaml_file.write_text('openapi: "3.1.0"\ninfo:\n  title: "Caf\u00e9 API"\n  version: "1.0.0"\npaths: {}\n', encoding="utf-8")
+    json_file = tmp_path / "spec.json"
+    json_file.write_text('{"openapi": "3.1.0", "info": {"title": "Caf\u00e9 API", "version": "1.0.0"}, "paths": {}}', encoding="utf-8-sig")
+    for path in (yaml_file, json_file):
+        for track_locations in (False, True):
+            result = load_openapi_from_file(str(path), mmap_threshold=mmap_threshold, track_locations=track_locations)
+            assert result.info.title == "Caf\u00e9 API"
+    # Undecodable files fail like any other malformed input, mapped or not
+    json_file.write_bytes(b'\xff\xff{"openapi": "3.1.0"}')
+    with pytest.raises(ParsingError, match="Invalid JSON format"):
+        load_openapi_from_file(str(json_file), mmap_threshold=mmap_threshold)
@@ -0,0 +1,71 @@
+import pytest
+from openapi_parser import parse_openapi, validate_openapi
+from openapi_parser.exceptions import ParsingError, ValidationIssue
+from openapi_parser.parser import load_openapi_from_yaml
+
+
+broken_spec = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API"},
+    "paths": {},
+    "components": {
+        "securitySchemes": {"apiKeyAuth": {"type": "not-a-type"}},
+        "parameters": {"id": {"name": "id"}},
+    },
+}
+
+
+def test_validate_openapi_returns_every_issue():
+    issues = validate_openapi(broken_spec)
+    pointers = {(issue.pointer, issue.code) for issue in issues}
+    assert ("/openapi", "unsupported-version") in pointers
+    assert ("/info/version", "missing-field") in pointers
+    assert ("/components/securitySchemes/apiKeyAuth/type", "enum") in pointers
+    assert ("/components/parameters/id/in", "missing") in pointers
+    # The structural check and Pydantic both see the missing version; it is reported once
+    assert [issue.pointer for issue in issues].count("/info/version") == 1
+
+
+def test_validate_openapi_valid_document():
+    assert validate_openapi({"openapi": "3.1.0", "info": {"title": "T", "version": "1"}, "paths": {}}) == []
+
+
+def test_parse_openapi_collect_errors_raises_with_all_issues():
+    with pytest.raises(ParsingError) as exc_info:
+        parse_openapi(broken_spec, collect_errors=True)
+    assert len(exc_info.value.errors) == len(validate_openapi(broken_spec))
+    assert "error(s) found" in str(exc_info.value)
+
+
+def test_max_errors_caps_collection():
+    issues = validate_openapi(broken_spec, max_errors=2)
+    assert len(issues) == 2
+    with pytest.raises(ParsingError, match="stopped after 2"):
+        parse_openapi(broken_spec, collect_errors=True, max_errors=2)
+
+
+def test_default_mode_attaches_single_issue():
+    with pytest.raises(ParsingError) as exc_info:
+        parse_openapi({"info": {"title": "T", "version": "1"}, "paths": {}})
+    assert str(exc_info.value) == "Invalid OpenAPI specification: Missing 'openapi' field."
+    assert [issue.to_dict() for issue in exc_info.value.errors] == [
+        {"pointer": "/openapi", "code": "missing-field", "message": "Missing 'openapi' field."}
+    ]
+
+
+def test_loader_passes_collect_errors_through():
+    yaml_content = '''
+    openapi: "3.1.0"
+    info:
+      title: "Test API"
+    '''
+    with pytest.raises(ParsingError) as exc_info:
+        load_openapi_from_yaml(yaml_content, collect_errors=True)
+    assert {issue.pointer for issue in exc_info.value.errors} == {"/info/version", "/paths"}
+
+
+def test_issue_message_is_formatted_lazily():
+    issue = ValidationIssue("/a", "code", "Value {value!r} is invalid.", value=3)
+    assert issue._message is None
+    assert issue.message == "Value 3 is invalid."
+    assert str(issue) == "/a: Value 3 is invalid."
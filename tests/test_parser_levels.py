@@ -0,0 +1,102 @@
+import copy
+import pytest
+from openapi_parser import ValidationLevel, parse_openapi, validate_openapi
+from openapi_parser.exceptions import ParsingError
+from openapi_parser.parser import load_openapi_from_yaml
+
+spec = {
+    "openapi": "3.1.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "paths": {
+        "/items/{itemId}": {
+            "parameters": [{"$ref": "#/components/parameters/itemId"}],
+            "get": {"operationId": "getItem", "responses": {"200": {"description": "OK"}}},
+            "put": {"operationId": "putItem", "responses": {"204": {"description": "Updated"}}},
+        }
+    },
+    "components": {
+        "parameters": {"itemId": {"name": "itemId", "in": "path", "required": True, "schema": {"type": "string"}}},
+        "schemas": {"Item": {"type": "object"}},
+    },
+}
+
+
+def test_all_levels_accept_valid_document():
+    for level in ValidationLevel:
+        result = parse_openapi(spec, level=level)
+        assert result.info.title == "Test API"
+        assert result.paths == spec["paths"]
+
+
+def test_structural_level_skips_components():
+    broken = copy.deepcopy(spec)
+    broken["components"]["schemas"]["Item"] = {"type": "object", "maxLength": "not-a-number"}
+    result = parse_openapi(broken, level="structural")
+    assert result.components is None
+    with pytest.raises(ParsingError):
+        parse_openapi(broken)
+
+
+def test_structural_level_checks_shapes():
+    broken = copy.deepcopy(spec)
+    broken["paths"]["items"] = {"get": {"operationId": 3}}
+    issues = validate_openapi(broken, level="structural")
+    assert {(issue.pointer, issue.code) for issue in issues} == {
+        ("/paths/items", "invalid-path"),
+        ("/paths/items/get/operationId", "invalid-type"),
+        ("/paths/items/get/responses", "missing-field"),
+    }
+
+
+def test_strict_level_reports_refs_ids_and_path_parameters():
+    broken = copy.deepcopy(spec)
+    broken["paths"]["/items/{itemId}"]["put"]["operationId"] = "getItem"
+    broken["paths"]["/other/{otherId}"] = {
+        "get": {
+            "parameters": [{"name": "stray", "in": "path", "schema": {"type": "string"}}],
+            "responses": {"200": {"$ref": "#/components/responses/Missing"}},
+        }
+    }
+    assert validate_openapi(broken) == []
+    codes = {(issue.pointer, issue.code) for issue in validate_openapi(broken, level="strict")}
+    assert codes == {
+        ("/paths/~1other~1{otherId}/get/responses/200/$ref", "unresolved-ref"),
+        ("/paths/~1items~1{itemId}/put/operationId", "duplicate-operation-id"),
+        ("/paths/~1other~1{otherId}/get/parameters", "undeclared-path-parameter"),
+        ("/paths/~1other~1{otherId}/get/parameters/0", "unused-path-parameter"),
+    }
+    with pytest.raises(ParsingError, match="Invalid OpenAPI specification: Reference"):
+        parse_openapi(broken, level="strict")
+
+
+def test_strict_level_reports_non_mapping_sections():
+    broken = {**spec, "webhooks": ["not", "a", "mapping"]}
+    for level in ("structural", "strict"):
+        assert [(issue.pointer, issue.code) for issue in validate_openapi(broken, level=level)] == [("/webhooks", "invalid-type")]
+    with pytest.raises(ParsingError, match="Expected 'webhooks' to be a mapping"):
+        parse_openapi(broken, level="strict")
+    codes = [(issue.pointer, issue.code) for issue in validate_openapi({**spec, "paths": ["x"]}, level="structural")]
+    assert codes == [("/paths", "invalid-type")]
+    # The standard level rejects the paths list itself; the strict checks skip it without crashing
+    assert [issue.pointer for issue in validate_openapi({**spec, "paths": ["x"]}, level="strict")] == ["/paths"]
+
+
+def test_loaders_accept_level():
+    yaml_content = '''
+    openapi: "3.1.0"
+    info:
+      title: "Test API"
+      version: "1.0.0"
+    paths:
+      /a/{id}:
+        get:
+          responses: {}
+    '''
+    assert load_openapi_from_yaml(yaml_content, level="structural").paths
+    with pytest.raises(ParsingError, match="Path parameter 'id'"):
+        load_openapi_from_yaml(yaml_content, level="strict")
+
+
+def test_unknown_level_is_rejected():
+    with pytest.raises(ValueError):
+        parse_openapi(spec, level="paranoid")
@@ -0,0 +1,88 @@
+import re
+import pytest
+from openapi_parser.parser import validate_openapi
+from openapi_parser.patterns import PatternCache, analyze_pattern, precompile, translate
+from openapi_parser.validator import SchemaValidator
+
+
+@pytest.mark.parametrize("pattern, text, expected", [
+    (r"^\d+$", "١٢٣", False),  # Arabic-Indic digits are not ECMA-262 \d
+    (r"^\w+$", "é", False),
+    (r"^[\w-]+$", "a-b", True),
+    (r"^abc$", "abc\n", False),
+    (r"^(?<year>\d{4})-\k<year>$", "2024-2024", True),
+    (r"^\cJ$", "\n", True),
+    (r"^\u{1F600}$", "\U0001F600", True),
+    (r"^[^]$", "\n", True),
+    (r"a[]", "a", False),
+    (r"^a\/b$", "a/b", True),
+])
+def test_translation_follows_ecma_262(pattern, text, expected):
+    assert bool(re.search(translate(pattern), text)) is expected
+
+
+@pytest.mark.parametrize("pattern, codes", [
+    (r"^(a+)+$", ["nested-quantifier"]),
+    (r"^(\w+\s?)*$", ["nested-quantifier"]),
+    (r"^(ab|\wc)+$", ["overlapping-alternation"]),
+    (r"^\d+\d*$", ["adjacent-quantifiers"]),
+    (r"^[a-z]+(-[a-z]+)*$", []),
+    (r"^([a-z0-9]+[-.])*[a-z0-9]+$", []),
+    (r"^\d{3}-\d{4}$", []),
+])
+def test_analysis_flags_catastrophic_backtracking(pattern, codes):
+    assert [risk.code for risk in analyze_pattern(pattern)] == codes
+
+
+def test_cache_is_bounded_and_remembers_invalid_patterns():
+    cache = PatternCache(maxsize=2)
+    first = cache.get("a+")
+    assert cache.get("a+") is first
+    cache.get("b+")
+    cache.get("c+")
+    assert len(cache) == 2 and "a+" not in cache
+    with pytest.raises(re.error):
+        cache.get("(")
+    with pytest.raises(re.error):
+        cache.get("(")
+    assert (cache.hits, cache.misses) == (2, 4)
+    # Escapes that fail in translation are cached and raised as re.error too
+    for _ in range(2):
+        with pytest.raises(re.error, match="zz"):
+            cache.get(r"\u{zz}")
+    assert (cache.hits, cache.misses) == (3, 5)
+
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Patterns", "version": "1.0.0"},
+    "paths": {},
+    "components": {
+        "schemas": {
+            "Slug": {"type": "string", "pattern": "^[a-z]+(-[a-z]+)*$", "example": {"pattern": "("}},
+            "Risky": {"type": "string", "pattern": "^(a+)+$"},
+            "Broken": {"type": "string", "pattern": "("},
+            "Labels": {"type": "object", "patternProperties": {"^x-\\w+$": {"type": "string"}}},
+        }
+    },
+}
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_precompile_reports_invalid_and_risky_patterns(workers):
+    cache = PatternCache()
+    issues = precompile(document, cache, workers=workers)
+    assert [(issue.pointer, issue.code) for issue in issues] == [
+        ("/components/schemas/Risky/pattern", "catastrophic-pattern"),
+        ("/components/schemas/Broken/pattern", "invalid-pattern"),
+    ]
+    assert len(cache) == 4
+
+
+def test_strict_level_and_validator_use_translated_patterns():
+    codes = {(issue.pointer, issue.code) for issue in validate_openapi(document, level="strict")}
+    assert ("/components/schemas/Risky/pattern", "catastrophic-pattern") in codes
+    validator = SchemaValidator(document)
+    assert validator.is_valid({"x-id": "abc"}, validator.schema("Labels"))
+    assert not validator.is_valid({"x-id": 1}, validator.schema("Labels"))
+    assert not validator.is_valid("slug\n", validator.schema("Slug"))
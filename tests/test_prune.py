@@ -0,0 +1,63 @@
+import copy
+from openapi_parser.parser import parse_openapi
+from openapi_parser.prune import prune_components, reachable_components
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Characters", "version": "1.0.0"},
+    "security": [{"apiKey": []}],
+    "paths": {
+        "/characters": {
+            "get": {
+                "security": [{"oauth": ["read"]}],
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}}}},
+            }
+        }
+    },
+    "webhooks": {"renamed": {"post": {"requestBody": {"$ref": "#/components/requestBodies/Rename"}, "responses": {"200": {"description": "OK"}}}}},
+    "components": {
+        "schemas": {
+            "Character": {"type": "object", "properties": {"pet": {"$ref": "#/components/schemas/Pet"}}},
+            "Pet": {"oneOf": [{"type": "object"}], "discriminator": {"propertyName": "kind", "mapping": {"cat": "Cat"}}},
+            "Cat": {"type": "object"},
+            "Name": {"type": "string"},
+            "Orphan": {"type": "object", "properties": {"other": {"$ref": "#/components/schemas/OrphanChild"}}},
+            "OrphanChild": {"type": "string"},
+        },
+        "requestBodies": {"Rename": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Name"}}}}},
+        "parameters": {"Unused": {"name": "q", "in": "query", "schema": {"type": "string"}}},
+        "securitySchemes": {
+            "apiKey": {"type": "apiKey", "name": "key", "in": "header"},
+            "oauth": {"type": "oauth2", "flows": {}},
+            "basic": {"type": "http", "scheme": "basic"},
+        },
+    },
+}
+
+
+def test_prune_drops_unreachable_components():
+    original = copy.deepcopy(document)
+    pruned, report = prune_components(document)
+    assert document == original
+    assert report.removed == [
+        "/components/schemas/Orphan",
+        "/components/schemas/OrphanChild",
+        "/components/parameters/Unused",
+        "/components/securitySchemes/basic",
+    ]
+    assert report.kept == 7
+    assert list(pruned["components"]) == ["schemas", "requestBodies", "securitySchemes"]
+    assert list(pruned["components"]["schemas"]) == ["Character", "Pet", "Cat", "Name"]
+    assert pruned["paths"] is document["paths"]
+    parse_openapi(pruned)
+    assert prune_components(pruned)[1].removed == []
+    assert report.to_dict()["removed"] == 4
+
+
+def test_reachability_and_documents_without_components():
+    assert "/components/schemas/Cat" in reachable_components(document)
+    bare = {"openapi": "3.1.0", "info": {"title": "T", "version": "1"}, "paths": {}}
+    pruned, report = prune_components(bare)
+    assert pruned == bare and report.removed == []
+    pruned, _ = prune_components({**bare, "components": {"schemas": {"A": {"type": "string"}}}})
+    assert "components" not in pruned
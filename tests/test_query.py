@@ -0,0 +1,93 @@
+import pytest
+from openapi_parser.query import SpecIndex, compile_selector
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Characters", "version": "1.0.0"},
+    "paths": {
+        "/characters": {
+            "post": {
+                "operationId": "createCharacter",
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}}},
+                "responses": {"201": {"description": "Created"}},
+            },
+            "put": {
+                "operationId": "replaceCharacters",
+                "requestBody": {"$ref": "#/components/requestBodies/Characters"},
+                "responses": {"204": {"description": "Replaced"}},
+            },
+        },
+        "/characters/{characterId}": {
+            "parameters": [{"$ref": "#/components/parameters/CharacterId"}],
+            "get": {
+                "operationId": "getCharacter",
+                "parameters": [{"name": "verbose", "in": "query", "required": False, "schema": {"type": "boolean"}}],
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}}}},
+            },
+            "patch": {
+                "operationId": "renameCharacter",
+                "parameters": [{"name": "characterId", "in": "path", "required": True, "schema": {"type": "integer"}}],
+                "requestBody": {"content": {"application/json": {"schema": {"type": "object", "properties": {"name": {"type": "string"}}}}}},
+                "responses": {"200": {"description": "OK"}},
+            },
+        },
+    },
+    "components": {
+        "schemas": {"Character": {"type": "object", "properties": {"id": {"type": "integer"}, "name": {"type": "string"}}}},
+        "parameters": {"CharacterId": {"name": "characterId", "in": "path", "required": True, "schema": {"type": "integer"}}},
+        "requestBodies": {
+            "Characters": {"content": {"application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/Character"}}}}}
+        },
+    },
+}
+
+
+def test_jsonpath_selectors():
+    index = SpecIndex(document)
+    assert index.values("$.info.title") == ["Characters"]
+    assert index.values("$.paths['/characters'].*.operationId") == ["createCharacter", "replaceCharacters"]
+    assert index.values("$..operationId") == ["createCharacter", "replaceCharacters", "getCharacter", "renameCharacter"]
+    assert [match.pointer for match in index.query("$.paths..parameters[?(@.name == 'verbose')]")] == [
+        "/paths/~1characters~1{characterId}/get/parameters/0"
+    ]
+    assert index.values("$..parameters[?(@.required == true)].in") == ["path", "path"]
+    assert index.values("$..parameters[-1].name") == ["verbose", "characterId"]
+    assert index.values("$.components.schemas.Character.properties[?(@.type != 'string')].type") == ["integer"]
+    assert index.values("$..content['application/json'][?(@.items)].type") == ["array"]
+    assert index.query("$.missing") == []
+
+
+def test_json_pointer_selectors():
+    index = SpecIndex(document)
+    [match] = index.query("/paths/~1characters/post/operationId")
+    assert match == ("/paths/~1characters/post/operationId", "createCharacter")
+    assert index.query("") == [("", document)]
+    assert index.query("/paths/missing") == []
+    assert index.get("/info/version") == "1.0.0"
+
+
+def test_secondary_indexes():
+    index = SpecIndex(document)
+    assert [op.operation["operationId"] for op in index.operations_with_request_body("Character")] == ["createCharacter", "replaceCharacters"]
+    assert [(match.pointer, match.value["in"]) for match in index.parameters("characterId")] == [
+        ("/paths/~1characters~1{characterId}/parameters/0", "path"),
+        ("/paths/~1characters~1{characterId}/patch/parameters/0", "path"),
+    ]
+    assert index.parameters("verbose", location="path") == []
+    assert index.references_to("Character") == [
+        "/paths/~1characters/post/requestBody/content/application~1json/schema",
+        "/paths/~1characters~1{characterId}/get/responses/200/content/application~1json/schema",
+        "/components/requestBodies/Characters/content/application~1json/schema/items",
+    ]
+    assert [match.pointer for match in index.of_type("array")] == ["/components/requestBodies/Characters/content/application~1json/schema"]
+    assert len(index.keys("operationId")) == 4
+    assert [op.pointer for op in index.operations()][:1] == ["/paths/~1characters/post"]
+
+
+def test_results_are_cached_and_invalid_selectors_rejected():
+    index = SpecIndex(document)
+    assert index.query("$..name") == index.query("$..name")
+    assert compile_selector("$..name") is compile_selector("$..name")
+    for selector in ("paths", "$..", "$.a.", "$a", "$[?(@.a ~ 1)]", "$.a[", "$...a"):
+        with pytest.raises(ValueError):
+            index.query(selector)
@@ -0,0 +1,72 @@
+from openapi_parser.references import ReferenceGraph
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Characters", "version": "1.0.0"},
+    "paths": {
+        "/characters": {
+            "get": {"responses": {"200": {"$ref": "#/components/responses/CharacterList"}}},
+            "post": {
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}}},
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+        "/characters/{characterId}": {
+            "parameters": [{"$ref": "#/components/parameters/CharacterId"}],
+            "delete": {"responses": {"204": {"description": "Deleted"}}},
+        },
+        "/health": {"get": {"responses": {"200": {"description": "OK"}}}},
+    },
+    "components": {
+        "schemas": {
+            "Character": {
+                "type": "object",
+                "properties": {"id": {"$ref": "#/components/schemas/Id"}, "friends": {"type": "array", "items": {"$ref": "#/components/schemas/Character"}}},
+            },
+            "Id": {"type": "integer"},
+            "Pet": {"oneOf": [{"type": "object"}], "discriminator": {"propertyName": "kind", "mapping": {"hero": "Character", "ghost": "#/components/schemas/Ghost"}}},
+            "Unused": {"type": "string"},
+        },
+        "responses": {
+            "CharacterList": {"description": "OK", "content": {"application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/Character"}}}}}
+        },
+        "parameters": {"CharacterId": {"name": "characterId", "in": "path", "required": True, "schema": {"$ref": "#/components/schemas/Id/properties/x"}}},
+    },
+}
+
+
+def test_transitive_dependents():
+    graph = ReferenceGraph(document)
+    assert set(graph.dependents("Id")) == {
+        "/components/schemas/Character",
+        "/components/parameters/CharacterId",
+        "/paths/~1characters/post",
+        "/components/responses/CharacterList",
+        "/components/schemas/Pet",
+        "/paths/~1characters~1{characterId}",
+        "/paths/~1characters/get",
+        "/paths/~1characters~1{characterId}/delete",
+    }
+    # Nearest dependents come first
+    assert set(graph.dependents("Id")[:2]) == set(graph.dependents("Id", transitive=False)) == {
+        "/components/schemas/Character", "/components/parameters/CharacterId"
+    }
+    assert sorted(graph.affected_operations("#/components/schemas/Character")) == [("get", "/characters"), ("post", "/characters")]
+    # Self-references are not dependents
+    assert "/components/schemas/Character" not in graph.dependents("Character")
+
+
+def test_dependencies_and_dangling_references():
+    graph = ReferenceGraph(document)
+    assert graph.dependencies("/paths/~1characters/get") == [
+        "/components/responses/CharacterList", "/paths/~1characters", "/components/schemas/Character", "/components/schemas/Id"
+    ]
+    assert set(graph.dependencies("/paths/~1characters~1{characterId}/delete")) == {
+        "/paths/~1characters~1{characterId}", "/components/parameters/CharacterId", "/components/schemas/Id"
+    }
+    assert graph.dependencies("/paths/~1health/get") == ["/paths/~1health"]
+    assert sorted(graph.dangling) == [
+        ("/components/parameters/CharacterId/schema", "#/components/schemas/Id/properties/x"),
+        ("/components/schemas/Pet/discriminator/mapping", "#/components/schemas/Ghost"),
+    ]
+    assert graph.unreferenced() == ["/components/schemas/Pet", "/components/schemas/Unused"]
@@ -0,0 +1,93 @@
+import pytest
+from openapi_parser.parser import parse_openapi, validate_openapi
+from openapi_parser.servers import CompiledServer, ServerTable, server_issues
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Servers", "version": "1.0.0"},
+    "servers": [
+        {
+            "url": "https://{env}.example.com:{port}/{basePath}",
+            "variables": {
+                "env": {"default": "prod", "enum": ["prod", "staging"]},
+                "port": {"default": "443"},
+                "basePath": {"default": "v1", "enum": ["v1", "v10"]},
+            },
+        },
+        {"url": "/local"},
+    ],
+    "paths": {
+        "/characters": {
+            "get": {"operationId": "listCharacters", "responses": {"200": {"description": "OK"}}},
+            "post": {
+                "operationId": "createCharacter",
+                "servers": [{"url": "https://write.example.com"}],
+                "responses": {"201": {"description": "Created"}},
+            },
+        },
+        "/scripts": {
+            "servers": [{"url": "https://scripts.example.com/{version}", "variables": {"version": {"default": "v2"}}}],
+            "get": {"responses": {"200": {"description": "OK"}}},
+        },
+    },
+}
+
+
+def test_effective_servers():
+    table = ServerTable(document)
+    assert [server.url for server in table.for_operation("/characters", "GET")] == [
+        "https://{env}.example.com:{port}/{basePath}", "/local",
+    ]
+    assert table.for_operation_id("createCharacter")[0].url == "https://write.example.com"
+    assert table.url("/scripts", "get") == "https://scripts.example.com/v2"
+    # The document's servers are compiled once and shared by every operation using them
+    assert table.for_operation("/characters", "get")[0] is table.document_servers[0]
+    assert ServerTable(parse_openapi(document)).url("/characters", "get") == "https://prod.example.com:443/v1"
+    assert ServerTable({"paths": {"/a": {"get": {}}}}).url("/a", "get") == "/"
+    with pytest.raises(KeyError):
+        table.for_operation("/characters", "delete")
+
+
+def test_expand():
+    server = ServerTable(document).document_servers[0]
+    assert server.default_url == "https://prod.example.com:443/v1"
+    assert server.expand({"env": "staging", "port": "8443"}) == "https://staging.example.com:8443/v1"
+    with pytest.raises(ValueError, match="not an allowed value"):
+        server.expand({"env": "dev"})
+    with pytest.raises(ValueError, match="Unknown server variable"):
+        server.expand({"region": "eu"})
+    assert CompiledServer({"url": "/api/}x"}).expand() == "/api/}x"
+
+
+def test_match():
+    table = ServerTable(document)
+    found = table.match("https://staging.example.com:8443/v10/characters?limit=5")
+    assert found.variables == {"env": "staging", "port": "8443", "basePath": "v10"}
+    assert found.path == "/characters?limit=5"
+    assert table.match("https://dev.example.com:443/v1/characters") is None
+    assert table.match("https://scripts.example.com/v3/scripts").variables == {"version": "v3"}
+    # Relative templates match the path of absolute URLs, on a segment boundary
+    assert table.match("http://localhost:8080/local/characters").path == "/characters"
+    assert table.match("/localhost/characters") is None
+    assert table.match("/characters", table.for_operation("/characters", "post")) is None
+
+
+def test_server_issues():
+    broken = {
+        "servers": [{"url": "https://{region}.example.com/{stage}", "variables": {"stage": {"enum": []}}}],
+        "paths": {"/a": {"get": {"servers": [{"url": "/", "variables": {"v": {"default": "x", "enum": ["y"]}}}]}}},
+    }
+    issues = {(issue.pointer, issue.code) for issue in server_issues(broken)}
+    assert issues == {
+        ("/servers/0/url", "undeclared-server-variable"),
+        ("/servers/0/variables/stage", "missing-server-default"),
+        ("/servers/0/variables/stage/enum", "empty-server-enum"),
+        ("/paths/~1a/get/servers/0/variables/v/default", "server-default-not-in-enum"),
+    }
+    assert not list(server_issues(document))
+    invalid = {**document, "servers": [{"url": "https://{env}.example.com"}]}
+    codes = {issue.code for issue in validate_openapi(invalid, level="strict")}
+    assert "undeclared-server-variable" in codes
+    # Malformed sections are left to the structural checks
+    assert not list(server_issues({"paths": ["x"], "servers": "x"}))
+    assert ServerTable({"paths": ["x"]}).document_servers[0].url == "/"
@@ -0,0 +1,88 @@
+import copy
+from openapi_parser.parser import parse_openapi
+from openapi_parser.split import Selection, extract_spec, split_by_tag, split_spec
+
+document = {
+    "openapi": "3.1.0",
+    "info": {"title": "Story", "version": "1.0.0"},
+    "tags": [{"name": "characters"}, {"name": "scripts"}, {"name": "unused"}],
+    "security": [{"apiKey": []}],
+    "paths": {
+        "/characters": {
+            "get": {
+                "operationId": "listCharacters",
+                "tags": ["characters"],
+                "responses": {"200": {"description": "OK", "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Character"}}}}},
+            },
+        },
+        "/characters/{characterId}": {
+            "parameters": [{"$ref": "#/components/parameters/CharacterId"}],
+            "get": {"operationId": "getCharacter", "tags": ["characters"], "responses": {"200": {"description": "OK"}}},
+            "delete": {
+                "operationId": "deleteCharacter",
+                "tags": ["admin"],
+                "security": [{"oauth": ["admin"]}],
+                "responses": {"204": {"description": "Deleted"}},
+            },
+        },
+        "/characterSets": {"get": {"operationId": "listSets", "responses": {"200": {"description": "OK"}}}},
+        "/scripts": {
+            "post": {
+                "operationId": "createScript",
+                "tags": ["scripts"],
+                "requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Script"}}}},
+                "responses": {"201": {"description": "Created"}},
+            }
+        },
+    },
+    "components": {
+        "schemas": {
+            "Character": {"type": "object", "properties": {"name": {"$ref": "#/components/schemas/Name"}}},
+            "Script": {"type": "object", "properties": {"cast": {"type": "array", "items": {"$ref": "#/components/schemas/Character"}}}},
+            "Name": {"type": "string"},
+        },
+        "parameters": {"CharacterId": {"name": "characterId", "in": "path", "required": True, "schema": {"type": "string"}}},
+        "securitySchemes": {"apiKey": {"type": "apiKey", "name": "key", "in": "header"}, "oauth": {"type": "oauth2", "flows": {}}},
+    },
+}
+
+
+def test_slices_keep_exactly_their_operations_and_components():
+    original = copy.deepcopy(document)
+    slices = split_spec(document, {
+        "characters": Selection(path_prefixes=["/characters"]),
+        "scripts": Selection(tags=["scripts"]),
+        "admin": Selection(operation_ids=["deleteCharacter"]),
+    })
+    assert document == original
+
+    characters = slices["characters"]
+    assert list(characters["paths"]) == ["/characters", "/characters/{characterId}"]
+    assert list(characters["paths"]["/characters/{characterId}"]) == ["parameters", "get", "delete"]
+    assert list(characters["components"]["schemas"]) == ["Character", "Name"]
+    assert list(characters["components"]["securitySchemes"]) == ["apiKey", "oauth"]
+    assert characters["tags"] == [{"name": "characters"}]
+
+    scripts = slices["scripts"]
+    assert list(scripts["paths"]) == ["/scripts"]
+    assert list(scripts["components"]["schemas"]) == ["Character", "Script", "Name"]
+    assert "parameters" not in scripts["components"]
+
+    admin = slices["admin"]
+    assert list(admin["paths"]["/characters/{characterId}"]) == ["parameters", "delete"]
+    assert list(admin["components"]) == ["parameters", "securitySchemes"]
+    assert "tags" not in admin
+
+    for sliced in slices.values():
+        parse_openapi(sliced)
+
+
+def test_extract_and_split_by_tag():
+    sliced = extract_spec(document, operation_ids=["listSets"])
+    assert list(sliced["paths"]) == ["/characterSets"]
+    assert list(sliced["components"]) == ["securitySchemes"]
+    by_tag = split_by_tag(document)
+    assert list(by_tag) == ["characters", "scripts", "unused", "admin"]
+    assert by_tag["unused"]["paths"] == {}
+    parse_openapi(by_tag["unused"])
+    assert list(by_tag["characters"]["paths"]["/characters/{characterId}"]) == ["parameters", "get"]
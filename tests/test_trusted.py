@@ -0,0 +1,82 @@
+import os
+import pytest
+import yaml
+from openapi_parser.parser import parse_openapi
+from openapi_parser.trusted import construct_openapi, is_trusted, load_trusted, serialize_openapi
+from openapi_parser.utils import fingerprint
+
+SPEC_DIR = "openapi_specs"
+
+rich_spec = {
+    "openapi": "3.1.0",
+    "info": {
+        "title": "Rich API",
+        "version": "1.0.0",
+        "contact": {"name": "Ops", "email": "ops@example.com", "url": "https://example.com"},
+        "license": {"name": "MIT", "url": "https://opensource.org/licenses/MIT"},
+    },
+    "paths": {"/pets": {"get": {"responses": {"200": {"description": "OK"}}}}},
+    "components": {
+        "schemas": {
+            "Pet": {
+                "type": "object",
+                "required": ["kind"],
+                "properties": {"kind": {"type": "string", "enum": ["cat", "dog"]}, "tags": {"type": "array", "items": {"type": "string"}}},
+                "discriminator": {"propertyName": "kind", "mapping": {"cat": "#/components/schemas/Cat"}},
+                "additionalProperties": False,
+            },
+            "Cat": {"allOf": [{"$ref": "#/components/schemas/Pet"}], "not": {"type": "null"}},
+            "Alias": {"$ref": "#/components/schemas/Pet", "summary": "alias"},
+        },
+        "parameters": {"limit": {"name": "limit", "in": "query", "style": "form", "explode": True}},
+        "responses": {"NotFound": {"description": "Not found"}, "Ref": {"$ref": "#/components/responses/NotFound"}},
+        "securitySchemes": {
+            "oauth": {
+                "type": "oauth2",
+                "flows": {"clientCredentials": {"tokenUrl": "https://example.com/token", "scopes": {"read": "Read"}}},
+            }
+        },
+        "callbacks": {"onEvent": {"{$request.body#/url}": {"post": {"responses": {"200": {"description": "OK"}}}}}},
+    },
+    "servers": [{"url": "https://api.example.com"}],
+    "tags": [{"name": "pets"}],
+}
+
+
+@pytest.mark.parametrize("filename", sorted(f for f in os.listdir(SPEC_DIR) if f.endswith(".yml")))
+def test_constructed_equals_validated_on_corpus(filename):
+    with open(os.path.join(SPEC_DIR, filename), "r", encoding="utf-8") as f:
+        content = yaml.safe_load(f)
+    validated = parse_openapi(content)
+    constructed = construct_openapi(content)
+    assert constructed == validated
+    assert constructed.model_dump(exclude_unset=True) == validated.model_dump(exclude_unset=True)
+
+
+def test_constructed_equals_validated_on_rich_document():
+    validated = parse_openapi(rich_spec)
+    constructed = construct_openapi(rich_spec)
+    assert constructed == validated
+    schemas = constructed.components.schemas
+    assert type(schemas["Alias"]).__name__ == "Reference"
+    assert type(constructed.components.responses["Ref"]).__name__ == "Reference"
+
+
+def test_load_trusted_uses_allowlist(monkeypatch):
+    calls = []
+    monkeypatch.setattr("openapi_parser.trusted.parse_openapi", lambda content: calls.append(content) or "validated")
+    assert load_trusted(rich_spec, allowlist={fingerprint(rich_spec)}) == parse_openapi(rich_spec)
+    assert calls == []
+    assert load_trusted(rich_spec, allowlist=set()) == "validated"
+    # An unsafe fingerprint is the caller's word for the content: looked up as is, without hashing
+    monkeypatch.setattr("openapi_parser.trusted.fingerprint", None)
+    assert load_trusted(rich_spec, allowlist={"published"}, unsafe_fingerprint="published") == parse_openapi(rich_spec)
+    assert len(calls) == 1
+    assert load_trusted(rich_spec, allowlist={"published"}, unsafe_fingerprint="other") == "validated"
+
+
+def test_serialized_documents_are_trusted():
+    text = serialize_openapi(rich_spec)
+    assert is_trusted(fingerprint(rich_spec))
+    assert load_trusted(text) == parse_openapi(rich_spec)
+    assert not is_trusted(fingerprint({"openapi": "3.1.0"}))
@@ -1,8 +1,9 @@
 import pytest
-from openapi_parser.utils import resolve_references, load_file
+from openapi_parser.utils import resolve_references, load_file, open_bytes
 from openapi_parser.exceptions import ReferenceResolutionError
 import tempfile
 import os
+import mmap
 
 # Test for loading an existing file
 def test_load_file():
@@ -52,3 +53,17 @@ def test_resolve_references():
     }
     result = resolve_references(openapi_instance)
     assert result["paths"]["/test"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]["properties"]["id"]["type"] == "string"
+
+# Test that open_bytes reads small files and maps large ones
+def test_open_bytes(tmp_path):
+    path = tmp_path / "spec.yaml"
+    path.write_bytes(b"openapi: 3.1.0\n")
+    with open_bytes(str(path)) as content:
+        assert content == b"openapi: 3.1.0\n"
+    with open_bytes(str(path), mmap_threshold=1) as content:
+        assert isinstance(content, mmap.mmap)
+        assert content[:] == b"openapi: 3.1.0\n"
+    assert content.closed
+    with pytest.raises(FileNotFoundError):
+        with open_bytes(str(tmp_path / "missing.yaml")):
+            pass
@@ -0,0 +1,56 @@
+from openapi_parser.validator import SchemaValidator
+
+document = {
+    "components": {
+        "schemas": {
+            "Item": {
+                "type": "object",
+                "required": ["id", "name"],
+                "additionalProperties": False,
+                "properties": {
+                    "id": {"type": "integer", "minimum": 1},
+                    "name": {"type": "string", "minLength": 1, "maxLength": 5, "pattern": "^[a-z]+$"},
+                    "price": {"type": "number", "multipleOf": 0.01, "exclusiveMaximum": 100},
+                    "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True, "maxItems": 3},
+                    "status": {"enum": ["new", "sold"]},
+                    "parent": {"anyOf": [{"$ref": "#/components/schemas/Item"}, {"type": "null"}]},
+                },
+            }
+        }
+    }
+}
+
+
+def test_valid_instance():
+    validator = SchemaValidator(document)
+    item = {"id": 1, "name": "box", "price": 19.99, "tags": ["a", "b"], "status": "new", "parent": None}
+    assert validator.validate(item, validator.schema("Item")) == []
+    assert validator.is_valid({**item, "parent": {"id": 2, "name": "crate"}}, validator.schema("Item"))
+
+
+def test_invalid_instance_reports_instance_pointers():
+    validator = SchemaValidator(document)
+    item = {
+        "id": 0, "name": "Box-too-long", "price": 100, "tags": ["a", "a", 3, "d"],
+        "status": "lost", "parent": {"id": True}, "extra": 1,
+    }
+    found = {(issue.pointer, issue.code) for issue in validator.validate(item, {"$ref": "#/components/schemas/Item"})}
+    assert found == {
+        ("/id", "below-minimum"),
+        ("/name", "too-long"),
+        ("/name", "pattern-mismatch"),
+        ("/price", "above-maximum"),
+        ("/tags", "too-many-items"),
+        ("/tags/1", "duplicate-items"),
+        ("/tags/2", "invalid-type"),
+        ("/status", "not-in-enum"),
+        ("/parent", "no-branch-matched"),
+        ("/extra", "additional-property"),
+    }
+    assert len(validator.validate(item, validator.schema("Item"), max_errors=2)) == 2
+
+
+def test_unresolved_reference():
+    validator = SchemaValidator(document)
+    [issue] = validator.validate({}, {"$ref": "#/components/schemas/Missing"})
+    assert issue.code == "unresolved-ref"